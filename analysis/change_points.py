@@ -0,0 +1,279 @@
+"""
+Détection de ruptures dans les séries d'albédo
+==============================================
+
+Deux méthodes complémentaires, appliquées à chaque série de fraction :
+
+- PELT (Killick et al. 2012) : segmentation optimale pénalisée avec élagage,
+  en temps moyen O(n). Les coûts de segment (changement de moyenne, ou de
+  moyenne et de variance) sont lus en O(1) dans des sommes cumulées.
+- Test de Pettitt (1979) : rupture unique la plus probable. La statistique
+  U_t = 2·Σ_{i≤t} r_i − t(n+1) est obtenue des rangs r_i en O(n log n), au lieu
+  des O(n²) comparaisons de la définition.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import rankdata
+
+PELT_MODELS = ('mean', 'meanvar')
+
+
+class _SegmentCost:
+    """Coûts de segment [s, t) à partir de sommes cumulées"""
+
+    def __init__(self, values, model):
+        if model not in PELT_MODELS:
+            raise ValueError(f"model doit être parmi {PELT_MODELS}")
+        self.model = model
+        self.s1 = np.concatenate([[0.0], np.cumsum(values)])
+        self.s2 = np.concatenate([[0.0], np.cumsum(values ** 2)])
+
+    def __call__(self, starts, end):
+        length = end - starts
+        s1 = self.s1[end] - self.s1[starts]
+        s2 = self.s2[end] - self.s2[starts]
+        sse = np.maximum(s2 - s1 ** 2 / length, 0.0)
+        if self.model == 'mean':
+            return sse
+        # -2 log-vraisemblance gaussienne (constantes omises)
+        variance = np.maximum(sse / length, 1e-12)
+        return length * np.log(variance)
+
+
+def _noise_scale(values):
+    """Écart-type robuste du bruit (MAD des différences premières / √2)"""
+    diffs = np.diff(values)
+    if len(diffs) == 0:
+        return 1.0
+    mad = np.median(np.abs(diffs - np.median(diffs)))
+    scale = 1.4826 * mad / np.sqrt(2)
+    return scale if scale > 0 else (np.std(values) or 1.0)
+
+
+def pelt(values, model='mean', penalty=None, min_size=10):
+    """
+    Segmentation PELT d'une série
+
+    Args:
+        values (array): Série (sans NaN)
+        model (str): 'mean' (changements de moyenne) ou 'meanvar'
+            (changements de moyenne et de variance)
+        penalty (float, optional): Pénalité par rupture (défaut: 2·log(n), la
+            série étant normalisée par l'écart-type robuste du bruit)
+        min_size (int): Longueur minimale d'un segment
+
+    Returns:
+        list: Indices de début des nouveaux segments (ruptures), triés
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < 2 * min_size:
+        return []
+
+    values = (values - np.mean(values)) / _noise_scale(values)
+    cost = _SegmentCost(values, model)
+    if penalty is None:
+        penalty = 2 * np.log(n)
+
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    last_change = np.zeros(n + 1, dtype=int)
+    candidates = np.array([0])
+
+    for end in range(min_size, n + 1):
+        # Le départ end - min_size devient admissible (segment de longueur min_size)
+        if end - min_size >= min_size:
+            candidates = np.append(candidates, end - min_size)
+
+        totals = best[candidates] + cost(candidates, end) + penalty
+        i = int(np.argmin(totals))
+        best[end] = totals[i]
+        last_change[end] = candidates[i]
+        # Élagage : un départ déjà moins bon que l'optimum ne redeviendra jamais optimal
+        candidates = candidates[totals - penalty <= best[end]]
+
+    change_points = []
+    position = n
+    while position > 0:
+        position = last_change[position]
+        if position > 0:
+            change_points.append(int(position))
+    return sorted(change_points)
+
+
+def pettitt_test(values, alpha=0.05):
+    """
+    Test de Pettitt d'une rupture unique de position inconnue
+
+    Args:
+        values (array): Série (sans NaN)
+        alpha (float): Seuil de significativité
+
+    Returns:
+        dict: change_index (début du second segment, None si K = 0), K,
+            U (statistique signée), p_value, significant
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    if n < 3:
+        return {'change_index': None, 'K': np.nan, 'U': np.nan,
+                'p_value': np.nan, 'significant': False}
+
+    ranks = rankdata(values)
+    t = np.arange(1, n)
+    u = 2 * np.cumsum(ranks)[:-1] - t * (n + 1)
+    i = int(np.argmax(np.abs(u)))
+    k = abs(u[i])
+    if k == 0:
+        # Série constante (ou sans déséquilibre de rangs) : aucune rupture
+        return {'change_index': None, 'K': 0.0, 'U': 0.0,
+                'p_value': 1.0, 'significant': False}
+    p_value = float(min(1.0, 2 * np.exp(-6 * k ** 2 / (n ** 3 + n ** 2))))
+
+    return {
+        'change_index': i + 1,
+        'K': float(k),
+        'U': float(u[i]),
+        'p_value': p_value,
+        'significant': bool(p_value < alpha)
+    }
+
+
+def detect_change_points(times, values, dates=None, model='mean', penalty=None,
+                         min_size=10, alpha=0.05):
+    """
+    PELT + Pettitt sur une série
+
+    Args:
+        times (array): Temps (années décimales)
+        values (array): Valeurs
+        dates (array, optional): Dates correspondantes (pour l'affichage)
+        model, penalty, min_size: Paramètres de pelt()
+        alpha (float): Seuil du test de Pettitt
+
+    Returns:
+        dict: Résultats 'pettitt' et 'pelt'
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    valid = ~np.isnan(values)
+    times, values = times[valid], values[valid]
+    if dates is not None:
+        dates = pd.to_datetime(np.asarray(dates)[valid])
+
+    def date_at(index):
+        return dates[index] if dates is not None else None
+
+    pettitt = pettitt_test(values, alpha)
+    index = pettitt['change_index']
+    if index is not None:
+        pettitt.update({
+            'change_time': times[index],
+            'change_date': date_at(index),
+            'mean_before': float(np.mean(values[:index])),
+            'mean_after': float(np.mean(values[index:])),
+        })
+        pettitt['shift'] = pettitt['mean_after'] - pettitt['mean_before']
+
+    breaks = pelt(values, model=model, penalty=penalty, min_size=min_size)
+    bounds = [0, *breaks, len(values)]
+    segment_means = [float(np.mean(values[a:b])) for a, b in zip(bounds[:-1], bounds[1:])]
+
+    return {
+        'n_obs': len(values),
+        'pettitt': pettitt,
+        'pelt': {
+            'model': model,
+            'change_indices': breaks,
+            'change_times': [times[b] for b in breaks],
+            'change_dates': [date_at(b) for b in breaks],
+            'n_change_points': len(breaks),
+            'segment_means': segment_means
+        }
+    }
+
+
+class ChangePointAnalyzer:
+    """
+    Détection de ruptures pour toutes les fractions d'un jeu de données
+
+    Args:
+        data_handler: Instance d'AlbedoDataHandler avec données chargées
+        fraction_classes (list): Fractions à analyser
+        model (str): Modèle PELT ('mean' ou 'meanvar')
+        penalty (float, optional): Pénalité PELT
+        min_size (int): Longueur minimale d'un segment PELT
+    """
+
+    def __init__(self, data_handler, fraction_classes, model='mean', penalty=None,
+                 min_size=10, alpha=0.05):
+        self.data_handler = data_handler
+        self.fraction_classes = list(fraction_classes)
+        self.model = model
+        self.penalty = penalty
+        self.min_size = min_size
+        self.alpha = alpha
+
+    def analyze(self, variable='mean'):
+        """
+        Détecte les ruptures de chaque fraction
+
+        Args:
+            variable (str): Variable à analyser ('mean' ou 'median')
+
+        Returns:
+            dict: Résultats par fraction (voir detect_change_points)
+        """
+        results = {}
+        for fraction in self.fraction_classes:
+            try:
+                fraction_data = self.data_handler.get_fraction_data(fraction, variable, dropna=True)
+            except ValueError:
+                continue
+            if len(fraction_data) < 2 * self.min_size:
+                continue
+
+            fraction_data = fraction_data.sort_values('decimal_year')
+            results[fraction] = detect_change_points(
+                fraction_data['decimal_year'].values,
+                fraction_data['value'].values,
+                fraction_data['date'].values,
+                model=self.model, penalty=self.penalty,
+                min_size=self.min_size, alpha=self.alpha
+            )
+        return results
+
+
+def change_point_summary(results, class_labels=None, dataset=None):
+    """
+    Tableau de résumé des ruptures (une ligne par fraction)
+
+    Args:
+        results (dict): Résultats de ChangePointAnalyzer.analyze()
+        class_labels (dict, optional): Libellés des fractions
+        dataset (str, optional): Nom du produit ajouté en colonne
+
+    Returns:
+        pd.DataFrame: Colonnes Pettitt et PELT
+    """
+    rows = []
+    for fraction, result in results.items():
+        pettitt = result['pettitt']
+        pelt_result = result['pelt']
+        change_date = pettitt.get('change_date')
+        row = {
+            'Fraction': (class_labels or {}).get(fraction, fraction),
+            'N_obs': result['n_obs'],
+            'Pettitt_date': change_date.strftime('%Y-%m-%d') if change_date is not None else None,
+            'Pettitt_K': pettitt['K'],
+            'Pettitt_p_value': pettitt['p_value'],
+            'Pettitt_saut': pettitt.get('shift', np.nan),
+            'PELT_n_ruptures': pelt_result['n_change_points'],
+            'PELT_dates': ', '.join(d.strftime('%Y-%m-%d') for d in pelt_result['change_dates']
+                                    if d is not None)
+        }
+        if dataset is not None:
+            row = {'Dataset': dataset, **row}
+        rows.append(row)
+    return pd.DataFrame(rows)
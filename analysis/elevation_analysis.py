@@ -17,15 +17,9 @@ import warnings
 warnings.filterwarnings('ignore')
 
 from scipy import stats
-from sklearn.linear_model import TheilSenRegressor
 
-# Import optionnel de pymannkendall avec fallback
-try:
-    import pymannkendall as mk
-    HAS_PYMANNKENDALL = True
-except ImportError:
-    HAS_PYMANNKENDALL = False
-    warnings.warn("pymannkendall non disponible. Utilisation de scipy.stats pour les tendances.")
+from analysis.elevation_bands import ElevationBandCube, LEGACY_ZONES
+from config import ELEVATION_CONFIG
 
 def manual_mann_kendall(data):
     """Implémentation simplifiée de Mann-Kendall si pymannkendall n'est pas disponible"""
@@ -65,31 +59,220 @@ def manual_mann_kendall(data):
     return {'trend': trend, 'p': p_value, 'Tau': tau}
 
 def manual_sens_slope(data):
-    """Calcul simplifié de la pente de Sen"""
+    """Calcul simplifié de la pente de Sen (pas de temps unitaire)"""
+    from utils.sen_slope import sen_slope
+
     n = len(data)
     if n < 2:
         return 0.0
     
-    slopes = []
-    for i in range(n-1):
-        for j in range(i+1, n):
-            slope = (data[j] - data[i]) / (j - i)
-            slopes.append(slope)
+    return sen_slope(np.arange(n), np.asarray(data, dtype=float))[0]
+
+def _batch_spatial_median(points, mask, max_iter=300, tol=1.0e-3):
+    """
+    Médiane spatiale (Weiszfeld modifié) de plusieurs nuages de points à la fois
+    
+    Même algorithme que sklearn (_spatial_median), appliqué colonne par colonne
+    en parallèle.
+    
+    Args:
+        points (np.ndarray): Points (n_points × n_colonnes × n_dim)
+        mask (np.ndarray): Points valides (n_points × n_colonnes)
+        max_iter (int): Nombre maximal d'itérations
+        tol (float): Tolérance de convergence
+        
+    Returns:
+        np.ndarray: Médiane spatiale par colonne (n_colonnes × n_dim)
+    """
+    eps = np.finfo(np.double).eps
+    weights = mask.astype(float)
+    n_points = weights.sum(axis=0)
+    points = np.where(mask[..., None], points, 0.0)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        current = points.sum(axis=0) / n_points[:, None]
+    active = n_points > 0
+    tol2 = tol ** 2
+    
+    for _ in range(max_iter):
+        if not active.any():
+            break
+        diff = points - current[None]
+        norm = np.sqrt(np.sum(diff ** 2, axis=2))
+        use = mask & (norm >= eps)
+        inv_norm = np.where(use, 1.0 / np.where(use, norm, 1.0), 0.0)
+        # Le point courant coïncide avec un des points
+        is_in = (use.sum(axis=0) < n_points).astype(float)
+        
+        quotient = np.linalg.norm(np.sum(diff * inv_norm[..., None], axis=0), axis=1)
+        inv_sum = inv_norm.sum(axis=0)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            direction = np.sum(points * inv_norm[..., None], axis=0) / inv_sum[:, None]
+        ok = quotient > eps
+        direction = np.where(ok[:, None], direction, 1.0)
+        quotient = np.where(ok, quotient, 1.0)
+        
+        ratio = is_in / quotient
+        new = (np.maximum(0.0, 1.0 - ratio)[:, None] * direction
+               + np.minimum(1.0, ratio)[:, None] * current)
+        
+        converged = np.sum((current - new) ** 2, axis=1) < tol2
+        current = np.where(active[:, None], new, current)
+        active &= ~converged
+    
+    return current
+
+def batch_trend_estimates(times, values, alpha=0.05):
+    """
+    Tendances Mann-Kendall, Sen, OLS et Theil-Sen pour plusieurs séries en une passe
+    
+    Toutes les séries partagent le même axe temporel; les NaN sont ignorés
+    série par série. Les différences par paires (n_paires × n_séries) sont
+    calculées une seule fois et réutilisées par tous les estimateurs.
+    
+    Args:
+        times (array-like): Axe temporel commun (ex. années), longueur n
+        values (np.ndarray): Valeurs (n × n_séries), NaN = donnée manquante
+        alpha (float): Seuil de significativité du test Mann-Kendall
+        
+    Returns:
+        pd.DataFrame: Une ligne par série (n, mk_s, mk_var_s, mk_z, mk_p, mk_tau,
+            mk_trend, sens_slope, sens_intercept, linear_slope, linear_intercept,
+            linear_r, linear_p, linear_stderr, theilsen_slope, theilsen_intercept,
+            mean, std, min, max, first, last, first_year, last_year)
+    """
+    times = np.asarray(times, dtype=float)
+    values = np.asarray(values, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    n_obs, n_series = values.shape
+    
+    finite = np.isfinite(values)
+    n = finite.sum(axis=0)
+    
+    # Différences par paires i < j
+    i_idx, j_idx = np.triu_indices(n_obs, k=1)
+    dy = values[j_idx] - values[i_idx]
+    dx = (times[j_idx] - times[i_idx])[:, None]
+    pair_ok = finite[i_idx] & finite[j_idx]
+    
+    # --- Mann-Kendall (original_test de pymannkendall) ---
+    s = np.where(pair_ok, np.sign(dy), 0.0).sum(axis=0)
+    
+    # Correction des ex-aequo: tailles des groupes de valeurs égales par série
+    sorted_values = np.sort(values, axis=0)  # NaN en fin de colonne
+    new_group = np.vstack([np.ones((1, n_series), dtype=bool),
+                           sorted_values[1:] != sorted_values[:-1]])
+    group_id = np.cumsum(new_group, axis=0) - 1
+    sorted_finite = np.isfinite(sorted_values)
+    keys = (group_id + np.arange(n_series) * n_obs)[sorted_finite]
+    tie_sizes = np.bincount(keys, minlength=n_obs * n_series).astype(float)
+    tie_term = (tie_sizes * (tie_sizes - 1) * (2 * tie_sizes + 5)).reshape(n_series, n_obs).sum(axis=1)
+    var_s = (n * (n - 1) * (2 * n + 5) - tie_term) / 18
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        z = np.where(s > 0, (s - 1) / np.sqrt(var_s),
+                     np.where(s < 0, (s + 1) / np.sqrt(var_s), 0.0))
+        z = np.where(var_s > 0, z, 0.0)
+        p = 2 * stats.norm.sf(np.abs(z))
+        tau = np.where(n > 1, s / (0.5 * n * (n - 1)), 0.0)
+    h = np.abs(z) > stats.norm.ppf(1 - alpha / 2)
+    mk_trend = np.where(h & (z > 0), 'increasing',
+                        np.where(h & (z < 0), 'decreasing', 'no trend'))
+    
+    # --- Pente de Sen (médiane des pentes par paires) ---
+    with np.errstate(invalid='ignore', divide='ignore'), warnings.catch_warnings():
+        # Séries entièrement manquantes: moyennes et médianes NaN attendues
+        warnings.simplefilter('ignore', RuntimeWarning)
+        pair_slopes = np.where(pair_ok, dy / dx, np.nan)
+        has_pairs = pair_ok.any(axis=0)
+        sens_slope = np.full(n_series, np.nan)
+        if has_pairs.any():
+            sens_slope[has_pairs] = np.nanmedian(pair_slopes[:, has_pairs], axis=0)
+        
+        masked_t = np.where(finite, times[:, None], np.nan)
+        masked_y = np.where(finite, values, np.nan)
+        t_mean = np.nanmean(masked_t, axis=0)
+        y_mean = np.nanmean(masked_y, axis=0)
+        sens_intercept = np.nanmedian(masked_y, axis=0) - sens_slope * np.nanmedian(masked_t, axis=0)
+    
+        # --- Régression linéaire (scipy.stats.linregress) ---
+        dt = np.where(finite, times[:, None] - t_mean, 0.0)
+        dv = np.where(finite, values - y_mean, 0.0)
+        ss_t = (dt ** 2).sum(axis=0)
+        ss_y = (dv ** 2).sum(axis=0)
+        ss_ty = (dt * dv).sum(axis=0)
+        linear_slope = ss_ty / ss_t
+        linear_intercept = y_mean - linear_slope * t_mean
+        r = np.clip(ss_ty / np.sqrt(ss_t * ss_y), -1.0, 1.0)
+        r = np.where(ss_y > 0, r, 0.0)
+        df = n - 2
+        t_stat = r * np.sqrt(df / ((1.0 - r) * (1.0 + r)))
+        linear_p = np.where(np.abs(r) == 1.0, 0.0, 2 * stats.t.sf(np.abs(t_stat), np.maximum(df, 1)))
+        linear_p = np.where(df > 0, linear_p, np.nan)
+        linear_stderr = np.sqrt((1 - r ** 2) * ss_y / ss_t / df)
+        
+        # --- Theil-Sen (sklearn TheilSenRegressor: médiane spatiale des droites par paires) ---
+        pair_intercepts = values[i_idx] - pair_slopes * times[i_idx][:, None]
+    pair_lines = np.stack([np.nan_to_num(pair_intercepts), np.nan_to_num(pair_slopes)], axis=2)
+    theilsen = _batch_spatial_median(pair_lines, pair_ok)
+    
+    # --- Statistiques descriptives ---
+    with np.errstate(invalid='ignore'), warnings.catch_warnings():
+        warnings.simplefilter('ignore', RuntimeWarning)
+        std = np.nanstd(masked_y, axis=0)
+        vmin = np.nanmin(masked_y, axis=0)
+        vmax = np.nanmax(masked_y, axis=0)
+    first_idx = np.argmax(finite, axis=0)
+    last_idx = n_obs - 1 - np.argmax(finite[::-1], axis=0)
+    cols = np.arange(n_series)
+    empty = n == 0
     
-    return np.median(slopes) if slopes else 0.0
+    return pd.DataFrame({
+        'n': n,
+        'mk_s': s,
+        'mk_var_s': var_s,
+        'mk_z': z,
+        'mk_p': p,
+        'mk_tau': tau,
+        'mk_trend': mk_trend,
+        'sens_slope': sens_slope,
+        'sens_intercept': sens_intercept,
+        'linear_slope': linear_slope,
+        'linear_intercept': linear_intercept,
+        'linear_r': r,
+        'linear_p': linear_p,
+        'linear_stderr': linear_stderr,
+        'theilsen_slope': theilsen[:, 1],
+        'theilsen_intercept': theilsen[:, 0],
+        'mean': y_mean,
+        'std': std,
+        'min': vmin,
+        'max': vmax,
+        'first': np.where(empty, np.nan, values[first_idx, cols]),
+        'last': np.where(empty, np.nan, values[last_idx, cols]),
+        'first_year': np.where(empty, np.nan, times[first_idx]),
+        'last_year': np.where(empty, np.nan, times[last_idx]),
+    })
 
 class ElevationAnalyzer:
     """
     Analyseur pour les données d'albédo par fraction × élévation
     """
     
-    def __init__(self, csv_path, output_dir="results/elevation_analysis"):
+    def __init__(self, csv_path, output_dir="results/elevation_analysis", band_width_m=None,
+                 median_buffer_m=None):
         """
         Initialise l'analyseur
         
         Args:
             csv_path: Chemin vers le CSV des données fraction × élévation
             output_dir: Répertoire de sortie pour les résultats
+            band_width_m: Largeur des bandes d'élévation analysées pour un CSV
+                par bandes (None = ELEVATION_CONFIG['band_width_m'], bandes du
+                CSV telles quelles si non configurée)
+            median_buffer_m: Demi-largeur de la zone 'at_median'
+                (None = ELEVATION_CONFIG['median_buffer_m'])
         """
         self.csv_path = Path(csv_path)
         self.output_dir = Path(output_dir)
@@ -98,12 +281,18 @@ class ElevationAnalyzer:
         # Configuration des zones et fractions
         self.elevation_zones = ['above_median', 'at_median', 'below_median']
         self.fraction_classes = ['mostly_ice', 'pure_ice']
-        self.combinations = []
-        
-        # Générer toutes les combinaisons
-        for fraction in self.fraction_classes:
-            for zone in self.elevation_zones:
-                self.combinations.append(f"{fraction}_{zone}")
+        if band_width_m is None:
+            band_width_m = ELEVATION_CONFIG.get('band_width_m')
+        if median_buffer_m is None:
+            median_buffer_m = ELEVATION_CONFIG.get('median_buffer_m', 100.0)
+        self.band_width_m = band_width_m
+        self.median_buffer_m = float(median_buffer_m)
+        self._set_combinations()
+        
+        # Cube natif du CSV (jour × bande × fraction), jamais remplacé:
+        # les regroupements en sont dérivés sans relire le CSV
+        self.cube = None
+        self.zone_centers = {}
         
         self.data = None
         self.annual_data = None
@@ -115,7 +304,13 @@ class ElevationAnalyzer:
         print(f"🔢 Combinaisons: {len(self.combinations)}")
     
     def load_data(self):
-        """Charge et valide les données"""
+        """
+        Charge et valide les données
+        
+        Returns:
+            ElevationBandCube: Cube utilisé pour l'analyse (regroupé à
+            band_width_m pour un CSV par bandes); self.cube reste le cube natif
+        """
         print(f"\n📂 Chargement des données: {self.csv_path}")
         
         if not self.csv_path.exists():
@@ -126,9 +321,18 @@ class ElevationAnalyzer:
         
         # Convertir la date
         self.data['date'] = pd.to_datetime(self.data['date'])
-        self.data['year'] = self.data['date'].dt.year
-        self.data['month'] = self.data['date'].dt.month
-        self.data['doy'] = self.data['date'].dt.dayofyear
+        
+        self.cube = ElevationBandCube.from_frame(self.data, self.fraction_classes, zones=LEGACY_ZONES)
+        cube = self.cube
+        if cube.band_edges is not None:
+            # CSV par bandes d'élévation: les zones analysées sont les bandes
+            if self.band_width_m:
+                cube = cube.regroup_width(self.band_width_m)
+            print(f"🏔️ {len(cube.band_labels)} bandes d'élévation "
+                  f"({cube.band_edges[0]:.0f}-{cube.band_edges[-1]:.0f} m)")
+            self._use_cube(cube)
+        
+        self._add_date_columns()
         
         # Valider les colonnes essentielles
         self._validate_columns()
@@ -138,7 +342,66 @@ class ElevationAnalyzer:
         
         print(f"📅 Période: {self.data['date'].min()} à {self.data['date'].max()}")
         print(f"🗓️ Années: {self.data['year'].min()}-{self.data['year'].max()}")
+        return cube
         
+    def _set_combinations(self):
+        """Génère toutes les combinaisons fraction × zone"""
+        self.combinations = [f"{fraction}_{zone}"
+                             for fraction in self.fraction_classes
+                             for zone in self.elevation_zones]
+    
+    def _add_date_columns(self):
+        self.data['year'] = self.data['date'].dt.year
+        self.data['month'] = self.data['date'].dt.month
+        self.data['doy'] = self.data['date'].dt.dayofyear
+    
+    def _use_cube(self, cube):
+        """Remplace les données journalières par celles d'un cube (zones = bandes du cube)"""
+        self.data = cube.to_wide_frame(self.median_buffer_m)
+        # Ordre historique: de la zone la plus haute à la plus basse
+        self.elevation_zones = list(reversed(cube.band_labels))
+        centers = cube.band_centers
+        self.zone_centers = ({} if centers is None else
+                             dict(zip(cube.band_labels, centers.tolist())))
+        self._set_combinations()
+    
+    def apply_banding(self, zone_edges=None, zone_labels=None, band_width=None, median_zones=False):
+        """
+        Change le découpage en zones d'élévation sans relire le CSV
+        
+        Les zones sont obtenues en sommant les bandes du cube (comptes et
+        sommes), puis les données annuelles sont recalculées.
+        
+        Args:
+            zone_edges: Bornes d'élévation des zones (croissantes)
+            zone_labels: Libellés des zones (optionnel)
+            band_width: Largeur de bandes régulières (m), alternative à zone_edges
+            median_zones: Zones au-dessus / à / sous la médiane (±median_buffer_m)
+            
+        Returns:
+            ElevationBandCube: Cube regroupé utilisé pour l'analyse
+        """
+        if self.cube is None:
+            raise ValueError("Données non chargées: appeler load_data() d'abord")
+        
+        if median_zones:
+            cube = self.cube.median_zones(self.median_buffer_m)
+        elif band_width is not None:
+            cube = self.cube.regroup_width(band_width)
+        elif zone_edges is not None:
+            cube = self.cube.regroup(zone_edges, zone_labels)
+        else:
+            cube = self.cube
+        
+        self._use_cube(cube)
+        self._add_date_columns()
+        self._validate_columns()
+        self._create_annual_data()
+        self.trends = {}
+        
+        print(f"🔁 Découpage: {len(cube.band_labels)} zones, {len(self.valid_combinations)} combinaisons")
+        return cube
+    
     def _validate_columns(self):
         """Valide la présence des colonnes nécessaires"""
         required_base_cols = [
@@ -166,34 +429,34 @@ class ElevationAnalyzer:
     
     def _create_annual_data(self):
         """Crée les moyennes annuelles pour l'analyse de tendance"""
-        annual_means = []
-        
-        for year in sorted(self.data['year'].unique()):
-            year_data = self.data[self.data['year'] == year]
-            annual_row = {'year': year}
-            
-            for combination in self.valid_combinations:
-                mean_col = f"{combination}_mean"
-                count_col = f"{combination}_count"
-                
-                # Filtrer les données valides (avec pixels suffisants)
-                valid_data = year_data[
-                    (year_data[count_col] >= 3) & 
-                    (year_data[mean_col].notna())
-                ]
-                
-                if len(valid_data) > 0:
-                    annual_row[f"{combination}_mean"] = valid_data[mean_col].mean()
-                    annual_row[f"{combination}_count"] = len(valid_data)
-                    annual_row[f"{combination}_total_pixels"] = valid_data[count_col].sum()
-                else:
-                    annual_row[f"{combination}_mean"] = np.nan
-                    annual_row[f"{combination}_count"] = 0
-                    annual_row[f"{combination}_total_pixels"] = 0
-            
-            annual_means.append(annual_row)
-        
-        self.annual_data = pd.DataFrame(annual_means)
+        mean_cols = [f"{c}_mean" for c in self.valid_combinations]
+        count_cols = [f"{c}_count" for c in self.valid_combinations]
+        years = self.data['year'].values
+        
+        # Une seule réduction groupée et masquée pour toutes les combinaisons
+        # (observation valide = pixels suffisants et moyenne définie)
+        means = self.data[mean_cols].to_numpy(dtype=float)
+        counts = self.data[count_cols].to_numpy(dtype=float)
+        valid = (counts >= 3) & ~np.isnan(means)
+        
+        grouped = pd.DataFrame(
+            np.hstack([np.where(valid, means, 0.0), valid, np.where(valid, counts, 0.0)])
+        ).groupby(years, sort=True).sum()
+        n_comb = len(self.valid_combinations)
+        sums = grouped.iloc[:, :n_comb].to_numpy()
+        n_valid = grouped.iloc[:, n_comb:2 * n_comb].to_numpy().astype(int)
+        total_pixels = grouped.iloc[:, 2 * n_comb:].to_numpy()
+        
+        with np.errstate(invalid='ignore', divide='ignore'):
+            annual_means = np.where(n_valid > 0, sums / n_valid, np.nan)
+        
+        annual = {'year': grouped.index.values}
+        for k, combination in enumerate(self.valid_combinations):
+            annual[f"{combination}_mean"] = annual_means[:, k]
+            annual[f"{combination}_count"] = n_valid[:, k]
+            annual[f"{combination}_total_pixels"] = total_pixels[:, k]
+        
+        self.annual_data = pd.DataFrame(annual)
         print(f"📊 Données annuelles créées: {len(self.annual_data)} années")
     
     def calculate_trends(self):
@@ -202,106 +465,75 @@ class ElevationAnalyzer:
         
         self.trends = {}
         
-        for combination in self.valid_combinations:
-            mean_col = f"{combination}_mean"
+        combinations = [c for c in self.valid_combinations
+                        if f"{c}_mean" in self.annual_data.columns]
+        if not combinations:
+            print(f"📊 Tendances calculées pour 0 combinaisons")
+            return
+        
+        years = self.annual_data['year'].values
+        values = self.annual_data[[f"{c}_mean" for c in combinations]].to_numpy(dtype=float)
+        
+        # MK, Sen, OLS et Theil-Sen pour toutes les combinaisons en une passe
+        results = batch_trend_estimates(years, values)
+        
+        for k, combination in enumerate(combinations):
+            result = results.iloc[k]
+            n_years = int(result['n'])
             
-            if mean_col not in self.annual_data.columns:
+            if n_years < 3:  # Minimum 3 années pour une tendance
+                print(f"⚠️ {combination}: Données insuffisantes ({n_years} années)")
                 continue
             
-            # Données valides pour cette combinaison
-            valid_data = self.annual_data[self.annual_data[mean_col].notna()]
-            
-            if len(valid_data) < 3:  # Minimum 3 années pour une tendance
-                print(f"⚠️ {combination}: Données insuffisantes ({len(valid_data)} années)")
-                continue
+            sen_slope = result['sens_slope']
+            total_change = result['last'] - result['first']
+            relative_change = (total_change / result['first']) * 100
             
-            years = valid_data['year'].values
-            albedo = valid_data[mean_col].values
+            # Déterminer zone et fraction
+            fraction = next(f for f in self.fraction_classes if combination.startswith(f"{f}_"))
+            zone = combination[len(fraction) + 1:]  # above_median, at_median, below_median, band_...
             
-            try:
-                # Test Mann-Kendall (avec ou sans pymannkendall)
-                if HAS_PYMANNKENDALL:
-                    mk_result = mk.original_test(albedo)
-                    # pymannkendall n'a pas sens_estimator, utiliser la méthode manuelle
-                    sen_slope = manual_sens_slope(albedo)
-                else:
-                    mk_result = manual_mann_kendall(albedo)
-                    sen_slope = manual_sens_slope(albedo)
-                    # Créer un objet compatible avec les attributs attendus
-                    class MKResult:
-                        def __init__(self, result_dict):
-                            self.trend = result_dict['trend']
-                            self.p = result_dict['p']
-                            self.Tau = result_dict['Tau']
-                    mk_result = MKResult(mk_result)
+            self.trends[combination] = {
+                'fraction_class': fraction,
+                'elevation_zone': zone,
+                'years_analyzed': n_years,
+                'period': f"{int(result['first_year'])}-{int(result['last_year'])}",
                 
-                # Régression linéaire pour comparaison
-                lr_slope, lr_intercept, lr_r, lr_p, lr_se = stats.linregress(years, albedo)
+                # Mann-Kendall
+                'mk_trend': result['mk_trend'],
+                'mk_p_value': result['mk_p'],
+                'mk_tau': result['mk_tau'],
+                'mk_significant': result['mk_p'] < 0.05,
                 
-                # Theil-Sen estimator (plus robuste)
-                ts_reg = TheilSenRegressor(random_state=42)
-                ts_reg.fit(years.reshape(-1, 1), albedo)
-                ts_slope = ts_reg.coef_[0]
+                # Sen's slope
+                'sens_slope': sen_slope,
+                'sens_slope_per_decade': sen_slope * 10,
                 
-                # Statistiques descriptives
-                albedo_stats = {
-                    'mean': np.mean(albedo),
-                    'std': np.std(albedo),
-                    'min': np.min(albedo),
-                    'max': np.max(albedo),
-                    'range': np.max(albedo) - np.min(albedo)
-                }
-                
-                # Changement total sur la période
-                total_change = albedo[-1] - albedo[0]
-                relative_change = (total_change / albedo[0]) * 100
+                # Régression linéaire
+                'linear_slope': result['linear_slope'],
+                'linear_r': result['linear_r'],
+                'linear_p': result['linear_p'],
                 
-                # Déterminer zone et fraction
-                parts = combination.split('_')
-                fraction = parts[0] + '_' + parts[1]  # mostly_ice ou pure_ice
-                zone = '_'.join(parts[2:])  # above_median, at_median, below_median
+                # Theil-Sen
+                'theilsen_slope': result['theilsen_slope'],
                 
-                self.trends[combination] = {
-                    'fraction_class': fraction,
-                    'elevation_zone': zone,
-                    'years_analyzed': len(valid_data),
-                    'period': f"{years[0]}-{years[-1]}",
-                    
-                    # Mann-Kendall
-                    'mk_trend': mk_result.trend,
-                    'mk_p_value': mk_result.p,
-                    'mk_tau': mk_result.Tau,
-                    'mk_significant': mk_result.p < 0.05,
-                    
-                    # Sen's slope
-                    'sens_slope': sen_slope,
-                    'sens_slope_per_decade': sen_slope * 10,
-                    
-                    # Régression linéaire
-                    'linear_slope': lr_slope,
-                    'linear_r': lr_r,
-                    'linear_p': lr_p,
-                    
-                    # Theil-Sen
-                    'theilsen_slope': ts_slope,
-                    
-                    # Statistiques descriptives
-                    **albedo_stats,
-                    
-                    # Changements
-                    'total_change': total_change,
-                    'relative_change_percent': relative_change,
-                    
-                    # Classification de tendance
-                    'trend_direction': 'decreasing' if sen_slope < 0 else 'increasing' if sen_slope > 0 else 'stable',
-                    'trend_magnitude': 'strong' if abs(sen_slope) > 0.01 else 'moderate' if abs(sen_slope) > 0.005 else 'weak'
-                }
+                # Statistiques descriptives
+                'mean': result['mean'],
+                'std': result['std'],
+                'min': result['min'],
+                'max': result['max'],
+                'range': result['max'] - result['min'],
                 
-                print(f"✅ {combination}: {mk_result.trend} (p={mk_result.p:.3f}, slope={sen_slope:.4f})")
+                # Changements
+                'total_change': total_change,
+                'relative_change_percent': relative_change,
                 
-            except Exception as e:
-                print(f"❌ Erreur pour {combination}: {e}")
-                continue
+                # Classification de tendance
+                'trend_direction': 'decreasing' if sen_slope < 0 else 'increasing' if sen_slope > 0 else 'stable',
+                'trend_magnitude': 'strong' if abs(sen_slope) > 0.01 else 'moderate' if abs(sen_slope) > 0.005 else 'weak'
+            }
+            
+            print(f"✅ {combination}: {result['mk_trend']} (p={result['mk_p']:.3f}, slope={sen_slope:.4f})")
         
         print(f"📊 Tendances calculées pour {len(self.trends)} combinaisons")
     
@@ -358,11 +590,20 @@ class ElevationAnalyzer:
             strongest_decline_zone = 'no_data'
             zone_slopes = {'no_data': 0.0}
         
+        # Bandes d'élévation: la bande la plus en déclin doit être à ±median_buffer_m de la médiane
+        if strongest_decline_zone in self.zone_centers:
+            strongest_center = self.zone_centers[strongest_decline_zone]
+            at_median_strongest = abs(strongest_center - elevation_info['glacier_median']) <= self.median_buffer_m
+        else:
+            strongest_center = None
+            at_median_strongest = strongest_decline_zone == 'at_median'
+        
         transient_snowline_hypothesis = {
             'strongest_decline_zone': strongest_decline_zone,
-            'at_median_strongest': strongest_decline_zone == 'at_median',
+            'strongest_decline_elevation': strongest_center,
+            'at_median_strongest': at_median_strongest,
             'zone_slopes': zone_slopes,
-            'hypothesis_supported': strongest_decline_zone == 'at_median'
+            'hypothesis_supported': at_median_strongest
         }
         
         self.elevation_analysis = {
@@ -458,7 +699,8 @@ class ElevationAnalyzer:
             zone_elevations = {
                 'above_median': glacier_median + 150,  # Approximation centre zone haute
                 'at_median': glacier_median,           # Zone médiane
-                'below_median': glacier_median - 150   # Approximation centre zone basse
+                'below_median': glacier_median - 150,  # Approximation centre zone basse
+                **self.zone_centers                    # Centres des bandes d'élévation
             }
             
             elevation_zone = trend['elevation_zone']
@@ -491,19 +733,24 @@ class ElevationAnalyzer:
         
         return wm_df
 
-def run_elevation_analysis(csv_path=None, output_dir="results/elevation_analysis"):
+def run_elevation_analysis(csv_path=None, output_dir=None, band_width_m=None, median_buffer_m=None):
     """
     Lance l'analyse complète des données fraction × élévation
     
     Args:
         csv_path: Chemin vers le CSV (None = utilise config par défaut)
-        output_dir: Répertoire de sortie
+        output_dir: Répertoire de sortie (None = utilise config par défaut)
+        band_width_m: Largeur des bandes pour un CSV par bandes d'élévation
+            (None = utilise config par défaut)
+        median_buffer_m: Demi-largeur de la zone 'at_median' (None = config)
     
     Returns:
         ElevationAnalyzer: Instance configurée avec tous les résultats
     """
     if csv_path is None:
-        csv_path = "data/csv/MOD10A1_daily_snow_albedo_fraction_elevation_williamson_2010_2024.csv"
+        csv_path = ELEVATION_CONFIG['csv_path']
+    if output_dir is None:
+        output_dir = ELEVATION_CONFIG.get('output_dir', "results/elevation_analysis")
     
     print(f"\n{'='*60}")
     print(f"🏔️ ANALYSE FRACTION × ÉLÉVATION - WILLIAMSON & MENOUNOS (2021)")
@@ -511,7 +758,8 @@ def run_elevation_analysis(csv_path=None, output_dir="results/elevation_analysis
     
     try:
         # Initialiser l'analyseur
-        analyzer = ElevationAnalyzer(csv_path, output_dir)
+        analyzer = ElevationAnalyzer(csv_path, output_dir, band_width_m=band_width_m,
+                                     median_buffer_m=median_buffer_m)
         
         # Charger les données
         analyzer.load_data()
@@ -0,0 +1,363 @@
+#!/usr/bin/env python3
+"""
+BANDES D'ÉLÉVATION - Cube (jour × bande × fraction)
+===================================================
+
+Stocke les données fraction × élévation sous forme de tenseurs de comptes et de
+sommes (jour × bande × fraction) pour un nombre arbitraire de bandes
+d'élévation (ex. tous les 50 m). Les zones plus grossières (au-dessus / à /
+sous la médiane de Williamson & Menounos 2021, ou tout autre découpage) sont
+obtenues en sommant les bandes, sans relire le CSV ni recalculer les pixels.
+
+Format CSV des bandes: colonnes ``{fraction}_band_{bas}_{haut}_mean`` et
+``{fraction}_band_{bas}_{haut}_count`` (bornes en mètres). Les CSV à trois
+zones existants sont aussi acceptés (une "bande" par zone).
+"""
+
+import re
+import numpy as np
+import pandas as pd
+
+# Zones historiques, de la plus basse à la plus haute
+LEGACY_ZONES = ['below_median', 'at_median', 'above_median']
+
+# Demi-largeur de la zone 'at_median' (Williamson & Menounos 2021)
+MEDIAN_BUFFER_M = 100.0
+
+# Seuil de pixels d'une observation journalière valide (ElevationAnalyzer)
+MIN_DAILY_COUNT = 3
+
+BAND_COLUMN_PATTERN = re.compile(r'^(?P<fraction>.+)_band_(?P<lower>-?\d+(?:\.\d+)?)_(?P<upper>-?\d+(?:\.\d+)?)_mean$')
+
+
+def band_label(lower, upper):
+    """Libellé d'une bande d'élévation (ex. band_2450_2500)"""
+    return f"band_{lower:g}_{upper:g}"
+
+
+def band_edges_for(elevation, band_width):
+    """
+    Bornes de bandes régulières couvrant une plage d'élévations
+
+    Args:
+        elevation (array-like): Élévations (m)
+        band_width (float): Largeur des bandes (m)
+
+    Returns:
+        np.ndarray: Bornes (n_bandes + 1), multiples de band_width
+    """
+    elevation = np.asarray(elevation, dtype=float)
+    elevation = elevation[np.isfinite(elevation)]
+    lower = np.floor(elevation.min() / band_width) * band_width
+    upper = (np.floor(elevation.max() / band_width) + 1) * band_width
+    return np.arange(lower, upper + band_width / 2, band_width)
+
+
+def median_zone_edges(median_elevation, buffer_m=MEDIAN_BUFFER_M):
+    """
+    Bornes des trois zones relatives à la médiane du glacier
+
+    Args:
+        median_elevation (float): Élévation médiane du glacier (m)
+        buffer_m (float): Demi-largeur de la zone 'at_median'
+
+    Returns:
+        tuple: (bornes, libellés) de la plus basse à la plus haute
+    """
+    edges = [-np.inf, median_elevation - buffer_m, median_elevation + buffer_m, np.inf]
+    return edges, list(LEGACY_ZONES)
+
+
+class ElevationBandCube:
+    """
+    Tenseurs comptes/sommes (jour × bande × fraction) de l'albédo par élévation
+    """
+
+    def __init__(self, dates, counts, sums, fraction_classes, band_labels,
+                 band_edges=None, median_elevation=None):
+        """
+        Initialise le cube
+
+        Args:
+            dates (array-like): Dates des observations (n_jours)
+            counts (np.ndarray): Nombre de pixels (jour × bande × fraction)
+            sums (np.ndarray): Somme des albédos (jour × bande × fraction)
+            fraction_classes (list): Classes de fraction (axe 2)
+            band_labels (list): Libellés des bandes, de la plus basse à la plus haute
+            band_edges (array-like, optional): Bornes d'élévation (n_bandes + 1);
+                None pour des zones sans bornes connues (CSV à trois zones)
+            median_elevation (float, optional): Élévation médiane du glacier
+        """
+        self.dates = pd.DatetimeIndex(pd.to_datetime(dates))
+        self.counts = np.asarray(counts, dtype=float)
+        self.sums = np.asarray(sums, dtype=float)
+        self.fraction_classes = list(fraction_classes)
+        self.band_labels = list(band_labels)
+        self.band_edges = None if band_edges is None else np.asarray(band_edges, dtype=float)
+        self.median_elevation = median_elevation
+
+        expected = (len(self.dates), len(self.band_labels), len(self.fraction_classes))
+        if self.counts.shape != expected or self.sums.shape != expected:
+            raise ValueError(f"Tenseurs de forme {self.counts.shape}/{self.sums.shape}, attendu {expected}")
+
+    @property
+    def shape(self):
+        return self.counts.shape
+
+    @property
+    def band_centers(self):
+        """Élévation centrale de chaque bande (None si bornes inconnues)"""
+        if self.band_edges is None:
+            return None
+        return (self.band_edges[:-1] + self.band_edges[1:]) / 2
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_pixels(cls, dates, values, elevation, fraction_class, fraction_classes,
+                    band_width=50.0, band_edges=None):
+        """
+        Construit le cube à partir des pixels (un seul bincount pour tous les jours)
+
+        Args:
+            dates (array-like): Dates (n_jours)
+            values (np.ndarray): Albédo par jour et pixel (n_jours × n_pixels), NaN = invalide
+            elevation (np.ndarray): Élévation par pixel (n_pixels)
+            fraction_class (np.ndarray): Index de classe de fraction par pixel (-1 = hors glacier)
+            fraction_classes (list): Noms des classes de fraction
+            band_width (float): Largeur des bandes (m) si band_edges n'est pas fourni
+            band_edges (array-like, optional): Bornes explicites des bandes
+
+        Returns:
+            ElevationBandCube: Cube construit
+        """
+        values = np.asarray(values, dtype=float)
+        elevation = np.asarray(elevation, dtype=float)
+        fraction_class = np.asarray(fraction_class, dtype=np.intp)
+        n_days = values.shape[0]
+        n_fractions = len(fraction_classes)
+
+        glacier = (fraction_class >= 0) & np.isfinite(elevation)
+        if band_edges is None:
+            band_edges = band_edges_for(elevation[glacier], band_width)
+        band_edges = np.asarray(band_edges, dtype=float)
+        n_bands = len(band_edges) - 1
+
+        band = np.searchsorted(band_edges, elevation, side='right') - 1
+        inside = glacier & (band >= 0) & (band < n_bands)
+        key = np.where(inside, band * n_fractions + fraction_class, -1)
+
+        # Clé (jour, bande, fraction) de chaque observation valide
+        valid = np.isfinite(values) & (key >= 0)[None, :]
+        day_idx, pixel_idx = np.nonzero(valid)
+        flat_key = day_idx * (n_bands * n_fractions) + key[pixel_idx]
+        size = n_days * n_bands * n_fractions
+
+        counts = np.bincount(flat_key, minlength=size).reshape(n_days, n_bands, n_fractions)
+        sums = np.bincount(flat_key, weights=values[valid], minlength=size).reshape(n_days, n_bands, n_fractions)
+
+        labels = [band_label(lo, hi) for lo, hi in zip(band_edges[:-1], band_edges[1:])]
+        median = float(np.median(elevation[glacier])) if glacier.any() else None
+        return cls(dates, counts, sums, fraction_classes, labels, band_edges, median)
+
+    @classmethod
+    def from_frame(cls, df, fraction_classes, zones=None):
+        """
+        Construit le cube à partir d'un DataFrame large (CSV fraction × élévation)
+
+        Les colonnes ``{fraction}_band_{bas}_{haut}_mean/_count`` sont utilisées
+        si présentes; sinon les colonnes ``{fraction}_{zone}_mean/_count`` des
+        zones historiques.
+
+        Args:
+            df (pd.DataFrame): Données avec une colonne 'date'
+            fraction_classes (list): Classes de fraction à charger
+            zones (list, optional): Zones (de la plus basse à la plus haute) du format historique
+
+        Returns:
+            ElevationBandCube: Cube construit
+        """
+        bands = {}
+        for column in df.columns:
+            match = BAND_COLUMN_PATTERN.match(column)
+            if match and match.group('fraction') in fraction_classes:
+                bands[(float(match.group('lower')), float(match.group('upper')))] = True
+
+        median = None
+        if 'glacier_median_elevation' in df.columns and df['glacier_median_elevation'].notna().any():
+            median = float(df['glacier_median_elevation'].dropna().iloc[0])
+
+        if bands:
+            bounds = sorted(bands)
+            edges = [bounds[0][0]] + [upper for _, upper in bounds]
+            labels = [band_label(lower, upper) for lower, upper in bounds]
+        else:
+            edges = None
+            labels = list(zones or LEGACY_ZONES)
+
+        n_days = len(df)
+        counts = np.zeros((n_days, len(labels), len(fraction_classes)))
+        sums = np.zeros_like(counts)
+        for b, label in enumerate(labels):
+            for f, fraction in enumerate(fraction_classes):
+                mean_col = f"{fraction}_{label}_mean"
+                count_col = f"{fraction}_{label}_count"
+                if mean_col not in df.columns or count_col not in df.columns:
+                    continue
+                mean = df[mean_col].to_numpy(dtype=float)
+                count = df[count_col].to_numpy(dtype=float)
+                ok = np.isfinite(mean) & np.isfinite(count)
+                counts[:, b, f] = np.where(ok, count, 0.0)
+                sums[:, b, f] = np.where(ok, mean * count, 0.0)
+
+        cube = cls(df['date'].values, counts, sums, fraction_classes, labels, edges, median)
+        if cube.median_elevation is None and edges is not None:
+            cube.median_elevation = cube.estimate_median_elevation()
+        return cube
+
+    # ------------------------------------------------------------------
+    # Regroupement et réductions
+    # ------------------------------------------------------------------
+
+    def regroup(self, zone_edges, zone_labels=None):
+        """
+        Regroupe les bandes en zones plus grossières en sommant les tenseurs
+
+        Chaque bande est attribuée à la zone qui contient son élévation centrale;
+        les bandes hors de toutes les zones sont ignorées.
+
+        Args:
+            zone_edges (array-like): Bornes des zones (n_zones + 1), croissantes
+            zone_labels (list, optional): Libellés des zones (défaut: band_{bas}_{haut})
+
+        Returns:
+            ElevationBandCube: Nouveau cube (jour × zone × fraction)
+        """
+        if self.band_edges is None:
+            raise ValueError("Bornes d'élévation inconnues: regroupement impossible pour ce cube")
+
+        zone_edges = np.asarray(zone_edges, dtype=float)
+        n_zones = len(zone_edges) - 1
+        if zone_labels is None:
+            zone_labels = [band_label(lo, hi) for lo, hi in zip(zone_edges[:-1], zone_edges[1:])]
+        if len(zone_labels) != n_zones:
+            raise ValueError(f"{len(zone_labels)} libellés pour {n_zones} zones")
+
+        zone_of_band = np.searchsorted(zone_edges, self.band_centers, side='right') - 1
+        membership = np.zeros((len(self.band_labels), n_zones))
+        in_zone = (zone_of_band >= 0) & (zone_of_band < n_zones)
+        membership[np.flatnonzero(in_zone), zone_of_band[in_zone]] = 1.0
+
+        counts = np.einsum('dbf,bz->dzf', self.counts, membership)
+        sums = np.einsum('dbf,bz->dzf', self.sums, membership)
+
+        # Bornes réelles des zones = bornes des bandes regroupées
+        finite_edges = zone_edges.copy()
+        finite_edges[0] = max(zone_edges[0], self.band_edges[0])
+        finite_edges[-1] = min(zone_edges[-1], self.band_edges[-1])
+
+        return ElevationBandCube(self.dates, counts, sums, self.fraction_classes, zone_labels,
+                                 finite_edges, self.median_elevation)
+
+    def regroup_width(self, band_width):
+        """Regroupe en bandes régulières plus larges (ex. 50 m → 100 m)"""
+        if self.band_edges is None:
+            raise ValueError("Bornes d'élévation inconnues: regroupement impossible pour ce cube")
+        lower = np.floor(self.band_edges[0] / band_width) * band_width
+        upper = np.ceil(self.band_edges[-1] / band_width) * band_width
+        return self.regroup(np.arange(lower, upper + band_width / 2, band_width))
+
+    def median_zones(self, buffer_m=MEDIAN_BUFFER_M):
+        """Regroupe en zones au-dessus / à / sous la médiane (±buffer_m)"""
+        if self.median_elevation is None:
+            raise ValueError("Élévation médiane inconnue")
+        edges, labels = median_zone_edges(self.median_elevation, buffer_m)
+        return self.regroup(edges, labels)
+
+    def estimate_median_elevation(self):
+        """Médiane d'élévation pondérée par le nombre moyen de pixels par bande"""
+        if self.band_edges is None:
+            return None
+        weights = self.counts.sum(axis=(0, 2))
+        if weights.sum() == 0:
+            return None
+        cumulative = np.cumsum(weights) / weights.sum()
+        b = int(np.searchsorted(cumulative, 0.5))
+        below = cumulative[b - 1] if b > 0 else 0.0
+        position = (0.5 - below) / (cumulative[b] - below) if cumulative[b] > below else 0.5
+        return float(self.band_edges[b] + position * (self.band_edges[b + 1] - self.band_edges[b]))
+
+    def daily_means(self, min_count=MIN_DAILY_COUNT):
+        """
+        Albédo moyen journalier par bande et fraction
+
+        Args:
+            min_count (int): Pixels minimum pour une observation valide
+
+        Returns:
+            np.ndarray: Moyennes (jour × bande × fraction), NaN si invalide
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = self.sums / self.counts
+        return np.where(self.counts >= max(min_count, 1), means, np.nan)
+
+    def annual_means(self, min_count=MIN_DAILY_COUNT):
+        """
+        Moyennes annuelles des moyennes journalières valides (règle count >= 3)
+
+        Returns:
+            tuple: (années, moyennes année × bande × fraction, jours valides année × bande × fraction)
+        """
+        daily = self.daily_means(min_count)
+        valid = np.isfinite(daily)
+        years, year_idx = np.unique(self.dates.year, return_inverse=True)
+
+        shape = (len(years),) + daily.shape[1:]
+        totals = np.zeros(shape)
+        n_valid = np.zeros(shape)
+        np.add.at(totals, year_idx, np.where(valid, daily, 0.0))
+        np.add.at(n_valid, year_idx, valid)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            annual = np.where(n_valid > 0, totals / n_valid, np.nan)
+        return years, annual, n_valid.astype(int)
+
+    def to_wide_frame(self, buffer_m=MEDIAN_BUFFER_M):
+        """
+        DataFrame large au format ElevationAnalyzer ({fraction}_{zone}_mean/_count)
+
+        Args:
+            buffer_m (float): Demi-largeur de la zone 'at_median' (colonnes de seuils)
+
+        Returns:
+            pd.DataFrame: Une ligne par jour
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(self.counts > 0, self.sums / self.counts, np.nan)
+
+        columns = {'date': self.dates}
+        for f, fraction in enumerate(self.fraction_classes):
+            for b, label in enumerate(self.band_labels):
+                columns[f"{fraction}_{label}_mean"] = means[:, b, f]
+                columns[f"{fraction}_{label}_count"] = self.counts[:, b, f]
+
+        df = pd.DataFrame(columns)
+        if self.median_elevation is not None:
+            df['glacier_median_elevation'] = self.median_elevation
+            df['above_median_threshold'] = self.median_elevation + buffer_m
+            df['below_median_threshold'] = self.median_elevation - buffer_m
+        return df
+
+    def summary(self):
+        """Résumé du cube"""
+        return {
+            'days': len(self.dates),
+            'bands': len(self.band_labels),
+            'fractions': len(self.fraction_classes),
+            'band_range_m': None if self.band_edges is None else
+                (float(self.band_edges[0]), float(self.band_edges[-1])),
+            'median_elevation': self.median_elevation,
+            'total_observations': int(self.counts.sum()),
+        }
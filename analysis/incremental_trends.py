@@ -0,0 +1,312 @@
+"""
+État incrémental des tendances Mann-Kendall / pente de Sen
+==========================================================
+
+Quand quelques jours d'observations s'ajoutent à une série, ce module met à
+jour S de Mann-Kendall, les termes d'égalités et la pente de Sen sans refaire
+les ~n²/2 comparaisons :
+
+- S : les valeurs déjà vues sont gardées triées ; chaque nouveau point (plus
+  récent que tous les autres) ajoute #(anciennes < x) - #(anciennes > x),
+  obtenu par recherche dichotomique (O(k log n) par lot de k points)
+- égalités : compteurs valeur → effectif, le terme Σ t(t-1)(2t+5) est mis à
+  jour en O(1) par point
+- pente de Sen : les ~n²/2 pentes par paires ne sont pas conservées ; la
+  médiane et les bornes de l'intervalle de confiance sont obtenues par
+  sélection de rang sur l'ensemble implicite des pentes
+  (``utils.sen_slope.PairwiseSlopes``), en O(n log n) de mémoire
+
+Les résultats reproduisent ``pymannkendall.original_test`` et
+``scipy.stats.theilslopes`` (mêmes clés que ``perform_mann_kendall_test`` et
+``calculate_sen_slope``). L'état (série, S et termes d'égalités) se
+sauvegarde dans un fichier ``.npz`` de taille O(n).
+"""
+
+from collections import Counter
+
+import numpy as np
+from scipy.stats import norm
+
+from utils.sen_slope import PairwiseSlopes
+
+
+def _tie_weight(count):
+    """Contribution t(t-1)(2t+5) d'un groupe de t valeurs égales"""
+    return count * (count - 1) * (2 * count + 5)
+
+
+class IncrementalTrendState:
+    """
+    État persistant d'une série pour la mise à jour incrémentale des tendances
+
+    Args:
+        alpha (float): Seuil de significativité du test Mann-Kendall
+        confidence (float): Niveau de l'intervalle de confiance de la pente de Sen
+    """
+
+    def __init__(self, alpha=0.05, confidence=0.95):
+        self.alpha = alpha
+        self.confidence = confidence
+
+        self.times = np.empty(0)
+        self.values = np.empty(0)
+        self.sorted_values = np.empty(0)
+        self.s = 0
+
+        self._value_counts = Counter()
+        self._time_counts = Counter()
+        self._value_ties = 0
+        self._time_ties = 0
+        self._slopes = None
+
+    @classmethod
+    def from_series(cls, times, values, alpha=0.05, confidence=0.95):
+        """
+        Construit l'état à partir d'une série complète
+
+        Args:
+            times (array): Temps (années décimales)
+            values (array): Valeurs d'albédo
+
+        Returns:
+            IncrementalTrendState: État initialisé
+        """
+        times = np.asarray(times, dtype=float)
+        values = np.asarray(values, dtype=float)
+        order = np.argsort(times, kind='stable')
+
+        state = cls(alpha=alpha, confidence=confidence)
+        state.update(times[order], values[order])
+        return state
+
+    @property
+    def n(self):
+        return len(self.values)
+
+    # ------------------------------------------------------------------
+    # Mise à jour
+    # ------------------------------------------------------------------
+
+    def update(self, new_times, new_values):
+        """
+        Ajoute des observations plus récentes que celles déjà présentes
+
+        Args:
+            new_times (array): Temps des nouvelles observations
+            new_values (array): Nouvelles valeurs (les NaN sont ignorés)
+
+        Returns:
+            int: Nombre d'observations ajoutées
+
+        Raises:
+            ValueError: Si une nouvelle observation précède la dernière connue
+        """
+        new_times = np.atleast_1d(np.asarray(new_times, dtype=float))
+        new_values = np.atleast_1d(np.asarray(new_values, dtype=float))
+        if new_times.shape != new_values.shape:
+            raise ValueError("new_times et new_values doivent avoir la même taille")
+
+        valid = ~(np.isnan(new_times) | np.isnan(new_values))
+        new_times, new_values = new_times[valid], new_values[valid]
+        if len(new_times) == 0:
+            return 0
+
+        order = np.argsort(new_times, kind='stable')
+        new_times, new_values = new_times[order], new_values[order]
+        if self.n and new_times[0] < self.times[-1]:
+            raise ValueError(
+                f"Observation antérieure à la dernière connue ({new_times[0]:.4f} < "
+                f"{self.times[-1]:.4f}) : reconstruire l'état avec from_series()"
+            )
+
+        self.s += self._score_increment(new_times, new_values)
+        self._slopes = None
+
+        for value in new_values:
+            count = self._value_counts[value]
+            self._value_ties += _tie_weight(count + 1) - _tie_weight(count)
+            self._value_counts[value] = count + 1
+        for t in new_times:
+            count = self._time_counts[t]
+            self._time_ties += _tie_weight(count + 1) - _tie_weight(count)
+            self._time_counts[t] = count + 1
+
+        positions = np.searchsorted(self.sorted_values, np.sort(new_values))
+        self.sorted_values = np.insert(self.sorted_values, positions, np.sort(new_values))
+        self.times = np.concatenate([self.times, new_times])
+        self.values = np.concatenate([self.values, new_values])
+        return len(new_values)
+
+    def _score_increment(self, new_times, new_values):
+        """Contribution des nouveaux points à S (anciens × nouveaux + intra-lot)"""
+        below = np.searchsorted(self.sorted_values, new_values, side='left')
+        above = self.n - np.searchsorted(self.sorted_values, new_values, side='right')
+        increment = int(np.sum(below - above))
+
+        # Paires à l'intérieur du lot (ordre chronologique du lot)
+        for j in range(1, len(new_values)):
+            increment += int(np.sign(new_values[j] - new_values[:j]).sum())
+        return increment
+
+    @property
+    def slopes(self):
+        """Ensemble implicite des pentes par paires de la série courante"""
+        if self._slopes is None:
+            self._slopes = PairwiseSlopes(self.times, self.values)
+        return self._slopes
+
+    # ------------------------------------------------------------------
+    # Résultats
+    # ------------------------------------------------------------------
+
+    def variance_s(self):
+        """Variance de S avec correction des égalités"""
+        n = self.n
+        return (n * (n - 1) * (2 * n + 5) - self._value_ties) / 18
+
+    def mann_kendall(self):
+        """
+        Test de Mann-Kendall sur l'état courant
+
+        Returns:
+            dict: Résultats avec keys: trend, p_value, tau, s, z, var_s, method
+        """
+        n = self.n
+        s = self.s
+        var_s = self.variance_s()
+
+        if s > 0 and var_s > 0:
+            z = (s - 1) / np.sqrt(var_s)
+        elif s < 0 and var_s > 0:
+            z = (s + 1) / np.sqrt(var_s)
+        else:
+            z = 0.0
+
+        p_value = 2 * (1 - norm.cdf(abs(z)))
+        significant = abs(z) > norm.ppf(1 - self.alpha / 2)
+        if significant and z > 0:
+            trend = 'increasing'
+        elif significant and z < 0:
+            trend = 'decreasing'
+        else:
+            trend = 'no trend'
+
+        return {
+            'trend': trend,
+            'p_value': p_value,
+            'tau': s / (0.5 * n * (n - 1)) if n > 1 else np.nan,
+            's': s,
+            'z': z,
+            'var_s': var_s,
+            'method': 'incremental'
+        }
+
+    def sen_slope(self):
+        """
+        Pente de Sen et intervalle de confiance sur l'état courant
+
+        Returns:
+            dict: Même structure que calculate_sen_slope()
+        """
+        nt = self.slopes.size
+        if nt == 0:
+            return {
+                'slope': np.nan,
+                'slope_per_decade': np.nan,
+                'intercept': np.nan,
+                'confidence_interval': {
+                    'low': np.nan,
+                    'high': np.nan,
+                    'low_per_decade': np.nan,
+                    'high_per_decade': np.nan
+                },
+                'method': 'failed'
+            }
+
+        slope = self.slopes.median()
+        intercept = self._sorted_median(self.sorted_values) - slope * self._sorted_median(self.times)
+
+        # Sen (1968), équation 2.6 : même indexation que scipy.stats.theilslopes
+        alpha = 1 - self.confidence
+        z = norm.ppf(min(alpha, 1 - alpha) / 2)
+        n = self.n
+        sigma_sq = (n * (n - 1) * (2 * n + 5) - self._time_ties - self._value_ties) / 18
+        if sigma_sq < 0:
+            low_slope = high_slope = np.nan
+        else:
+            sigma = np.sqrt(sigma_sq)
+            upper = min(int(np.round((nt - z * sigma) / 2)), nt - 1)
+            lower = max(int(np.round((nt + z * sigma) / 2)) - 1, 0)
+            low_slope, high_slope = self.slopes.select(lower), self.slopes.select(upper)
+
+        return {
+            'slope': slope,
+            'slope_per_decade': slope * 10,
+            'intercept': intercept,
+            'confidence_interval': {
+                'low': low_slope,
+                'high': high_slope,
+                'low_per_decade': low_slope * 10,
+                'high_per_decade': high_slope * 10
+            },
+            'method': 'incremental'
+        }
+
+    @staticmethod
+    def _sorted_median(sorted_array):
+        """Médiane d'un tableau déjà trié (lecture directe des indices centraux)"""
+        n = len(sorted_array)
+        mid = n // 2
+        if n % 2:
+            return sorted_array[mid]
+        return (sorted_array[mid - 1] + sorted_array[mid]) / 2
+
+    # ------------------------------------------------------------------
+    # Persistance
+    # ------------------------------------------------------------------
+
+    def save(self, path):
+        """
+        Sauvegarde l'état dans un fichier .npz (série, S et termes d'égalités)
+
+        Args:
+            path (str): Chemin du fichier
+        """
+        np.savez(
+            path,
+            times=self.times,
+            values=self.values,
+            s=np.array(self.s),
+            ties=np.array([self._value_ties, self._time_ties]),
+            params=np.array([self.alpha, self.confidence])
+        )
+
+    @classmethod
+    def load(cls, path):
+        """
+        Recharge un état sauvegardé par save()
+
+        Args:
+            path (str): Chemin du fichier .npz
+
+        Returns:
+            IncrementalTrendState: État restauré
+        """
+        with np.load(path) as archive:
+            alpha, confidence = archive['params']
+            state = cls(alpha=float(alpha), confidence=float(confidence))
+            state.times = archive['times']
+            state.values = archive['values']
+            state.s = int(archive['s'])
+            ties = archive['ties'] if 'ties' in archive.files else None
+
+        state.sorted_values = np.sort(state.values)
+        state._value_counts = Counter(state.values.tolist())
+        state._time_counts = Counter(state.times.tolist())
+        if ties is not None:
+            state._value_ties, state._time_ties = (int(t) for t in ties)
+        else:
+            # Anciens fichiers (avec le tableau des pentes) : termes recalculés
+            state._value_ties = sum(_tie_weight(c) for c in state._value_counts.values())
+            state._time_ties = sum(_tie_weight(c) for c in state._time_counts.values())
+        return state
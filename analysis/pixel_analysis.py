@@ -9,10 +9,14 @@ for each fraction and temporal period.
 import numpy as np
 import pandas as pd
 from datetime import datetime
+from pathlib import Path
 
 # Import from package
 from config import FRACTION_CLASSES, CLASS_LABELS, MONTH_NAMES
 from utils.helpers import print_section_header, format_pvalue
+from data.zip_source import read_csv_source, csv_source_freshness
+from data.shared_store import load_shared_frame
+from utils.instrumentation import traced
 
 
 class PixelCountAnalyzer:
@@ -117,8 +121,10 @@ class PixelCountAnalyzer:
         try:
             print_section_header("Chargement des données QA (0-3)", level=2)
             
-            # Load QA data
-            qa_data = pd.read_csv(self.qa_csv_path)
+            # Load QA data (attached from the shared store when another process published it)
+            qa_data = load_shared_frame(f"qa:{Path(self.qa_csv_path).resolve()}",
+                                        lambda: read_csv_source(self.qa_csv_path),
+                                        csv_source_freshness(self.qa_csv_path))
             
             # Convert date
             qa_data['date'] = pd.to_datetime(qa_data['date'])
@@ -140,6 +146,7 @@ class PixelCountAnalyzer:
             print(f"❌ Erreur lors du chargement des données QA: {e}")
             return None
     
+    @traced('qa.aggregate')
     def analyze_true_qa_statistics(self):
         """
         Analyze true QA statistics (0-3 scores) by melt season
@@ -294,6 +301,7 @@ class PixelCountAnalyzer:
             'average_total_pixels': self.qa_data['total_pixels'].mean() if 'total_pixels' in self.qa_data.columns else 0
         }
     
+    @traced('qa.aggregate')
     def analyze_seasonal_qa_statistics(self):
         """
         Analyze data quality statistics by melt season
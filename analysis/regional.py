@@ -0,0 +1,223 @@
+"""
+ANALYSE RÉGIONALE - Tendances et comparaisons multi-glaciers
+============================================================
+
+Mode batch sur plusieurs glaciers : chaque produit est chargé une fois sous
+forme de cube (région × jour × fraction), puis les tendances (Mann-Kendall,
+pente de Sen, par fraction) et la comparaison MCD43A3 / MOD10A1 de chaque
+région sont calculées dans un pool de processus, une tâche par région et par
+analyse. Les tâches sont indépendantes et ne reçoivent que la tranche de leur
+région, donc le temps total croît linéairement avec le nombre de régions et
+se divise par le nombre de cœurs.
+
+Les résultats sont partitionnés par région :
+
+    output/regions/<région>/<produit>_trends_<variable>.csv
+    output/regions/<région>/comparison_<variable>.csv
+
+avec en plus les tables combinées (colonne 'region') à la racine.
+"""
+
+import io
+import os
+import time
+import traceback
+from contextlib import redirect_stdout
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+import pandas as pd
+
+from data.region_cube import RegionCube, RegionSliceHandler
+from utils.helpers import print_section_header, ensure_directory_exists
+from utils.instrumentation import span, count
+
+DATASETS = ('MCD43A3', 'MOD10A1')
+DEFAULT_REGIONAL_DIR = os.path.join('output', 'regions')
+
+
+# ===========================================
+# TÂCHES (exécutées dans les processus du pool)
+# ===========================================
+
+def region_trends(dataset, region, variable, frame):
+    """
+    Tendances de toutes les fractions d'une région (TrendCalculator)
+
+    Args:
+        dataset (str): Produit
+        region (str): Région
+        variable (str): Variable ('mean' ou 'median')
+        frame (pd.DataFrame): Tranche de la région (RegionCube.region_frame)
+
+    Returns:
+        pd.DataFrame: Tableau de résumé des tendances, avec region et dataset
+    """
+    from analysis.trends import TrendCalculator
+
+    # Les messages par fraction de dizaines de régions seraient illisibles
+    with redirect_stdout(io.StringIO()):
+        calculator = TrendCalculator(RegionSliceHandler(frame, dataset, region))
+        calculator.calculate_basic_trends(variable)
+        summary = calculator.get_summary_table(variable)
+
+    summary.insert(0, 'region', region)
+    summary.insert(1, 'dataset', dataset)
+    return summary
+
+
+def region_comparison(region, variable, mcd43a3_frame, mod10a1_frame):
+    """
+    Corrélations MCD43A3 / MOD10A1 par fraction d'une région
+
+    Returns:
+        pd.DataFrame: Une ligne par fraction, avec region
+    """
+    from analysis.comparison import analyze_correlation
+
+    with redirect_stdout(io.StringIO()):
+        result = analyze_correlation(RegionSliceHandler(mcd43a3_frame, 'MCD43A3', region),
+                                     RegionSliceHandler(mod10a1_frame, 'MOD10A1', region),
+                                     variable)
+
+    rows = []
+    for fraction, correlation in (result.get('correlations') or {}).items():
+        row = {'region': region, 'fraction': fraction,
+               'merged_observations': result.get('merged_observations')}
+        row.update({key: value for key, value in correlation.items() if np.isscalar(value)})
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _run_task(func, *args):
+    """Exécute une tâche et renvoie (résultat, erreur) sans lever d'exception"""
+    try:
+        return func(*args), None
+    except Exception as e:
+        return None, f"{type(e).__name__}: {e}\n{traceback.format_exc()}"
+
+
+# ===========================================
+# BATCH
+# ===========================================
+
+def run_regional_batch(regions=None, datasets=DATASETS, variable='mean', comparison=True,
+                       max_workers=None, output_dir=DEFAULT_REGIONAL_DIR, cubes=None):
+    """
+    Tendances et comparaisons de plusieurs régions sur un pool de processus
+
+    Args:
+        regions (list, optional): Régions (défaut: toutes les régions configurées)
+        datasets (tuple): Produits analysés
+        variable (str): Variable ('mean' ou 'median')
+        comparison (bool): Comparer MCD43A3 et MOD10A1 dans chaque région
+        max_workers (int, optional): Processus du pool (défaut: nombre de cœurs)
+        output_dir (str, optional): Répertoire des résultats (None: pas d'export)
+        cubes (dict, optional): Cubes déjà chargés (produit -> RegionCube)
+
+    Returns:
+        dict: 'cubes', 'trends' et 'comparison' (tables combinées),
+              'files' (chemins écrits) et 'errors' (tâche -> message)
+    """
+    print_section_header(f"Analyse régionale - Variable: {variable}", level=1)
+    start = time.perf_counter()
+
+    cubes = dict(cubes or {})
+    for dataset in datasets:
+        if dataset not in cubes:
+            with span('regional.load', dataset=dataset):
+                cubes[dataset] = RegionCube.load(dataset, regions, variable)
+
+    # Une tâche par (analyse, région), avec la seule tranche de la région
+    tasks = {}
+    for dataset in datasets:
+        cube = cubes[dataset]
+        for region in cube.regions:
+            tasks[('trends', dataset, region)] = (region_trends, dataset, region, variable,
+                                                  cube.region_frame(region))
+    if comparison and {'MCD43A3', 'MOD10A1'} <= set(cubes):
+        shared = [r for r in cubes['MCD43A3'].regions if r in cubes['MOD10A1'].regions]
+        for region in shared:
+            tasks[('comparison', 'MCD43A3-MOD10A1', region)] = (
+                region_comparison, region, variable,
+                cubes['MCD43A3'].region_frame(region), cubes['MOD10A1'].region_frame(region))
+
+    n_workers = max_workers or os.cpu_count() or 1
+    print(f"🚀 {len(tasks)} tâches sur {n_workers} processus")
+
+    results, errors = {}, {}
+    with span('regional.batch', tasks=len(tasks)):
+        with ProcessPoolExecutor(max_workers=n_workers) as executor:
+            futures = {executor.submit(_run_task, *task): key for key, task in tasks.items()}
+            for done, future in enumerate(as_completed(futures), 1):
+                key = futures[future]
+                result, error = future.result()
+                if error is None:
+                    results[key] = result
+                else:
+                    errors[key] = error
+                    print(f"  ❌ {' / '.join(key)}: {error.splitlines()[0]}")
+                if done % 10 == 0 or done == len(tasks):
+                    print(f"  ⏳ {done}/{len(tasks)} tâches terminées")
+    count('regions_processed', len({key[2] for key in results}))
+
+    trends = [results[key] for key in tasks if key[0] == 'trends' and key in results]
+    comparisons = [results[key] for key in tasks if key[0] == 'comparison' and key in results]
+    output = {
+        'cubes': cubes,
+        'trends': pd.concat(trends, ignore_index=True) if trends else pd.DataFrame(),
+        'comparison': pd.concat(comparisons, ignore_index=True) if comparisons else pd.DataFrame(),
+        'files': [],
+        'errors': {' / '.join(key): error for key, error in errors.items()},
+    }
+
+    if output_dir:
+        output['files'] = export_regional_results(output, variable, output_dir)
+
+    elapsed = time.perf_counter() - start
+    print(f"✅ Analyse régionale terminée en {elapsed:.1f} s "
+          f"({len(results)} tâches réussies, {len(errors)} en erreur)")
+    return output
+
+
+def export_regional_results(output, variable, output_dir=DEFAULT_REGIONAL_DIR):
+    """
+    Écrit les résultats partitionnés par région, plus les tables combinées
+
+    Args:
+        output (dict): Résultat de run_regional_batch
+        variable (str): Variable analysée
+        output_dir (str): Répertoire racine
+
+    Returns:
+        list: Chemins des fichiers écrits
+    """
+    ensure_directory_exists(output_dir)
+    files = []
+
+    trends = output['trends']
+    if len(trends):
+        for (region, dataset), table in trends.groupby(['region', 'dataset'], sort=False):
+            region_dir = os.path.join(output_dir, region)
+            ensure_directory_exists(region_dir)
+            path = os.path.join(region_dir, f"{dataset.lower()}_trends_{variable}.csv")
+            table.to_csv(path, index=False)
+            files.append(path)
+        path = os.path.join(output_dir, f"regional_trends_{variable}.csv")
+        trends.to_csv(path, index=False)
+        files.append(path)
+
+    comparison = output['comparison']
+    if len(comparison):
+        for region, table in comparison.groupby('region', sort=False):
+            region_dir = os.path.join(output_dir, region)
+            ensure_directory_exists(region_dir)
+            path = os.path.join(region_dir, f"comparison_{variable}.csv")
+            table.to_csv(path, index=False)
+            files.append(path)
+        path = os.path.join(output_dir, f"regional_comparison_{variable}.csv")
+        comparison.to_csv(path, index=False)
+        files.append(path)
+
+    print(f"📁 {len(files)} fichiers exportés dans {output_dir}")
+    return files
@@ -0,0 +1,199 @@
+"""
+Balayage des tendances par fenêtres glissantes
+==============================================
+
+Calcule Mann-Kendall (S, tau, p-value) et la pente de Sen sur des fenêtres de
+plusieurs saisons (ex. 5, 7 et 10 ans) avancées d'une saison à la fois, pour
+toutes les fractions et variables.
+
+Les signes des comparaisons par paires ne sont calculés qu'une fois par couple
+de saisons (a, b) et résumés en un S partiel : le S d'une fenêtre [p, q] est
+la somme d'une sous-matrice des S par bloc (O(saisons²)). La pente de Sen de
+chaque fenêtre est obtenue par sélection de rang sur l'ensemble implicite des
+pentes (``utils.sen_slope.PairwiseSlopes``) : aucune pente n'est conservée et
+la mémoire reste en O(n log n) par fenêtre.
+"""
+
+import numpy as np
+import pandas as pd
+from scipy.stats import norm
+
+from utils.sen_slope import PairwiseSlopes
+
+
+class SeasonBlocks:
+    """
+    Comparaisons par paires d'une série, regroupées par couple de saisons
+
+    Args:
+        times (array): Temps (années décimales), triés
+        values (array): Valeurs
+        seasons (array): Saison (année) de chaque observation
+    """
+
+    def __init__(self, times, values, seasons):
+        self.seasons = np.unique(seasons)
+        index = np.searchsorted(self.seasons, seasons)
+        self.times = [times[index == b] for b in range(len(self.seasons))]
+        self.values = [values[index == b] for b in range(len(self.seasons))]
+        self.counts = np.array([len(v) for v in self.values])
+
+        n_blocks = len(self.seasons)
+        self.s = np.zeros((n_blocks, n_blocks), dtype=np.int64)
+
+        for a in range(n_blocks):
+            for b in range(a, n_blocks):
+                if a == b:
+                    rows, cols = np.triu_indices(self.counts[a], k=1)
+                    dv = self.values[a][cols] - self.values[a][rows]
+                else:
+                    dv = (self.values[b][:, np.newaxis] - self.values[a]).ravel()
+                self.s[a, b] = np.sign(dv).sum()
+
+    def window_trend(self, first, last, alpha=0.05):
+        """
+        Mann-Kendall et pente de Sen sur les saisons d'indices [first, last]
+
+        Returns:
+            dict: n_obs, s, tau, z, p_value, trend, slope, slope_per_decade
+        """
+        block = slice(first, last + 1)
+        n = int(self.counts[block].sum())
+        s = int(self.s[block, block].sum())
+
+        window_values = np.concatenate(self.values[block])
+        _, ties = np.unique(window_values, return_counts=True)
+        var_s = (n * (n - 1) * (2 * n + 5) - np.sum(ties * (ties - 1) * (2 * ties + 5))) / 18
+
+        if s > 0 and var_s > 0:
+            z = (s - 1) / np.sqrt(var_s)
+        elif s < 0 and var_s > 0:
+            z = (s + 1) / np.sqrt(var_s)
+        else:
+            z = 0.0
+        p_value = 2 * (1 - norm.cdf(abs(z)))
+        significant = abs(z) > norm.ppf(1 - alpha / 2)
+        trend = ('increasing' if z > 0 else 'decreasing') if significant else 'no trend'
+
+        slopes = PairwiseSlopes(np.concatenate(self.times[block]), window_values)
+        slope = slopes.median() if slopes.size else np.nan
+
+        return {
+            'n_obs': n,
+            's': s,
+            'tau': s / (0.5 * n * (n - 1)) if n > 1 else np.nan,
+            'z': z,
+            'p_value': p_value,
+            'trend': trend,
+            'slope': slope,
+            'slope_per_decade': slope * 10
+        }
+
+
+class RollingTrendScanner:
+    """
+    Tendances sur fenêtres glissantes pour toutes les fractions
+
+    Args:
+        data_handler: Instance d'AlbedoDataHandler avec données chargées
+        fraction_classes (list): Fractions à balayer
+        alpha (float): Seuil de significativité
+        min_obs (int): Observations minimales dans une fenêtre
+    """
+
+    def __init__(self, data_handler, fraction_classes, alpha=0.05, min_obs=10):
+        self.data_handler = data_handler
+        self.fraction_classes = list(fraction_classes)
+        self.alpha = alpha
+        self.min_obs = min_obs
+
+    def scan(self, window_years=(5, 7, 10), variables=('mean', 'median'), step=1):
+        """
+        Balaye toutes les fenêtres pour chaque fraction et variable
+
+        Args:
+            window_years (tuple): Longueurs de fenêtre en saisons
+            variables (tuple): Variables à analyser
+            step (int): Pas d'avancement en saisons
+
+        Returns:
+            pd.DataFrame: Une ligne par (fenêtre, variable, fraction)
+        """
+        rows = []
+        for variable in variables:
+            for fraction in self.fraction_classes:
+                try:
+                    fraction_data = self.data_handler.get_fraction_data(
+                        fraction, variable, dropna=True
+                    )
+                except ValueError:
+                    continue
+                if len(fraction_data) < self.min_obs:
+                    continue
+
+                fraction_data = fraction_data.sort_values('decimal_year')
+                blocks = SeasonBlocks(
+                    fraction_data['decimal_year'].to_numpy(dtype=float),
+                    fraction_data['value'].to_numpy(dtype=float),
+                    pd.to_datetime(fraction_data['date']).dt.year.to_numpy()
+                )
+
+                for width in window_years:
+                    for first in range(0, len(blocks.seasons) - width + 1, step):
+                        last = first + width - 1
+                        if blocks.counts[first:last + 1].sum() < self.min_obs:
+                            continue
+                        result = blocks.window_trend(first, last, self.alpha)
+                        start, end = int(blocks.seasons[first]), int(blocks.seasons[last])
+                        rows.append({
+                            'window_years': width,
+                            'start_year': start,
+                            'end_year': end,
+                            'window': f"{start}-{end}",
+                            'variable': variable,
+                            'fraction': fraction,
+                            **result
+                        })
+
+        return pd.DataFrame(rows)
+
+    def to_matrix(self, scan_results, metric='slope_per_decade', variable='mean',
+                  window_years=5):
+        """
+        Matrice (fenêtre × fraction) d'une métrique, prête pour une heatmap
+
+        Args:
+            scan_results (pd.DataFrame): Résultat de scan()
+            metric (str): 'slope_per_decade', 'tau', 'p_value', ...
+            variable (str): Variable
+            window_years (int): Longueur de fenêtre
+
+        Returns:
+            pd.DataFrame: Index = fenêtres, colonnes = fractions
+        """
+        return rolling_trend_matrix(scan_results, metric, variable, window_years,
+                                    self.fraction_classes)
+
+
+def rolling_trend_matrix(scan_results, metric='slope_per_decade', variable='mean',
+                         window_years=5, fraction_classes=None):
+    """
+    Pivot (fenêtre × fraction) des résultats de RollingTrendScanner.scan()
+
+    Args:
+        scan_results (pd.DataFrame): Résultats du balayage
+        metric (str): Colonne à pivoter
+        variable (str): Variable
+        window_years (int): Longueur de fenêtre
+        fraction_classes (list, optional): Ordre des colonnes
+
+    Returns:
+        pd.DataFrame: Index = fenêtres (ordre chronologique), colonnes = fractions
+    """
+    subset = scan_results[(scan_results['variable'] == variable) &
+                          (scan_results['window_years'] == window_years)]
+    matrix = subset.pivot(index='window', columns='fraction', values=metric)
+    matrix = matrix.loc[subset.drop_duplicates('window').sort_values('start_year')['window']]
+    if fraction_classes is not None:
+        matrix = matrix.reindex(columns=[f for f in fraction_classes if f in matrix.columns])
+    return matrix
@@ -14,7 +14,93 @@ import seaborn as sns
 # Import from package
 from config import (FRACTION_CLASSES, CLASS_LABELS, MONTH_NAMES, FRACTION_COLORS,
                       PLOT_STYLES, get_significance_marker)
-from utils.helpers import print_section_header, format_pvalue, validate_data
+from scipy.stats import norm
+from utils.helpers import (print_section_header, format_pvalue, validate_data,
+                           perform_mann_kendall_test, calculate_sen_slope)
+
+MELT_SEASON_MONTHS = [6, 7, 8, 9]
+
+
+def seasonal_kendall(cube, years=None, alpha=0.05):
+    """
+    Test de Mann-Kendall saisonnier (Hirsch & Slack 1984) et pente de Sen saisonnière
+    
+    Tout est calculé en une passe vectorisée sur un cube (année × saison × série) :
+    les signes de toutes les paires d'années donnent S par saison, la variance
+    (corrigée des égalités) et la covariance inter-saisons à partir des rangs.
+    Les valeurs manquantes contribuent un signe nul.
+    
+    Args:
+        cube (np.ndarray): Valeurs de forme (années, saisons, séries), NaN si manquant
+        years (array, optional): Années de l'axe 0 (défaut: 0..n-1)
+        alpha (float): Seuil de significativité
+        
+    Returns:
+        dict: Par série (axe 2) : s, var_s, z, p_value, trend, tau et
+            slope (par an) ; par saison : season_s, season_var ; covariance (saisons × saisons × séries)
+    """
+    cube = np.asarray(cube, dtype=float)
+    n_years = cube.shape[0]
+    years = np.arange(n_years) if years is None else np.asarray(years, dtype=float)
+    
+    # Signes de toutes les paires d'années (j - i), NaN -> 0
+    signs = np.nan_to_num(np.sign(cube[:, np.newaxis] - cube[np.newaxis, :]))
+    upper = np.triu(np.ones((n_years, n_years), dtype=bool), k=1)
+    pair_signs = signs[upper.T]                       # (paires i<j, saisons, séries)
+    
+    season_s = pair_signs.sum(axis=0)                 # (saisons, séries)
+    
+    # Variance par saison avec correction des égalités (n = années observées)
+    observed = ~np.isnan(cube)
+    n_obs = observed.sum(axis=0)
+    tie_term = np.zeros_like(season_s)
+    for season in range(cube.shape[1]):
+        for series in range(cube.shape[2]):
+            column = cube[observed[:, season, series], season, series]
+            _, counts = np.unique(column, return_counts=True)
+            tie_term[season, series] = np.sum(counts * (counts - 1) * (2 * counts + 5))
+    season_var = (n_obs * (n_obs - 1) * (2 * n_obs + 5) - tie_term) / 18
+    
+    # Covariance inter-saisons (Hirsch & Slack 1984, éq. 4)
+    concordance = np.einsum('pgf,phf->ghf', pair_signs, pair_signs)
+    ranks = (n_years + 1 + signs.sum(axis=1)) / 2   # (années, saisons, séries)
+    rank_products = np.einsum('jgf,jhf->ghf', ranks, ranks)
+    covariance = (concordance + 4 * rank_products - n_years * (n_years + 1) ** 2) / 3
+    diagonal = np.arange(cube.shape[1])
+    covariance[diagonal, diagonal] = season_var
+    
+    s = season_s.sum(axis=0)
+    var_s = covariance.sum(axis=(0, 1))
+    with np.errstate(divide='ignore', invalid='ignore'):
+        z = np.where(var_s > 0, (s - np.sign(s)) / np.sqrt(var_s), 0.0)
+    p_value = 2 * (1 - norm.cdf(np.abs(z)))
+    significant = np.abs(z) > norm.ppf(1 - alpha / 2)
+    trend = np.where(significant, np.where(z > 0, 'increasing', 'decreasing'), 'no trend')
+    n_pairs = (n_obs * (n_obs - 1) / 2).sum(axis=0)
+    
+    # Pente de Sen saisonnière : médiane des pentes entre années d'une même saison
+    year_gaps = (years[:, np.newaxis] - years[np.newaxis, :])[upper.T]
+    differences = (cube[:, np.newaxis] - cube[np.newaxis, :])[upper.T]
+    slopes = differences / year_gaps[:, np.newaxis, np.newaxis]
+    flat_slopes = slopes.reshape(-1, cube.shape[2])
+    has_slopes = ~np.isnan(flat_slopes).all(axis=0)
+    slope = np.full(cube.shape[2], np.nan)
+    if has_slopes.any():
+        slope[has_slopes] = np.nanmedian(flat_slopes[:, has_slopes], axis=0)
+    
+    return {
+        's': s,
+        'var_s': var_s,
+        'z': z,
+        'p_value': p_value,
+        'trend': trend,
+        'tau': np.divide(s, n_pairs, out=np.full(s.shape, np.nan), where=n_pairs > 0),
+        'slope': slope,
+        'season_s': season_s,
+        'season_var': season_var,
+        'covariance': covariance
+    }
+
 
 class SeasonalAnalyzer:
     """
@@ -78,14 +164,11 @@ class SeasonalAnalyzer:
                 times = valid_data['decimal_year'].values
                 values = valid_data[col_name].values
                 
-                # Créer un analyseur temporaire pour cette sous-série
-                temp_analyzer = BasicTrendAnalyzer(self.data_loader)
-                
                 # Test Mann-Kendall
-                mk_result = temp_analyzer._perform_mann_kendall(values)
+                mk_result = perform_mann_kendall_test(values)
                 
                 # Pente de Sen
-                sen_result = temp_analyzer._calculate_sen_slope(times, values)
+                sen_result = calculate_sen_slope(times, values)
                 
                 month_results[fraction] = {
                     'fraction': fraction,
@@ -117,6 +200,126 @@ class SeasonalAnalyzer:
         self.results[f'monthly_trends_{variable}'] = results
         return results
     
+    def build_seasonal_cube(self, variable='mean', months=None):
+        """
+        Construit le cube (année × mois × fraction) des moyennes mensuelles
+        
+        Args:
+            variable (str): Variable ('mean' ou 'median')
+            months (list, optional): Mois retenus (défaut: saison de fonte)
+            
+        Returns:
+            tuple: (cube np.ndarray, années, mois, fractions)
+        """
+        months = list(months or MELT_SEASON_MONTHS)
+        fractions = [f for f in self.fraction_classes if f"{f}_{variable}" in self.data.columns]
+        columns = [f"{f}_{variable}" for f in fractions]
+        
+        data = self.data[self.data['month'].isin(months)]
+        years = data['year'] if 'year' in data.columns else pd.to_datetime(data['date']).dt.year
+        monthly = data.groupby([years.rename('year'), data['month']])[columns].mean()
+        
+        all_years = np.arange(int(years.min()), int(years.max()) + 1)
+        grid = pd.MultiIndex.from_product([all_years, months], names=['year', 'month'])
+        monthly = monthly.reindex(grid)
+        
+        cube = monthly.to_numpy(dtype=float).reshape(len(all_years), len(months), len(fractions))
+        return cube, all_years, months, fractions
+    
+    def analyze_seasonal_kendall(self, variables=('mean', 'median'), months=None, alpha=0.05):
+        """
+        Test de Mann-Kendall saisonnier (Hirsch-Slack) et pente de Sen saisonnière
+        
+        Toutes les fractions d'une variable sont traitées par un seul appel
+        vectorisé sur le cube (année × mois × fraction) des moyennes mensuelles.
+        
+        Args:
+            variables (tuple): Variables à analyser
+            months (list, optional): Mois (saisons) du test
+            alpha (float): Seuil de significativité
+            
+        Returns:
+            dict: {variable: {fraction: résultats}}
+        """
+        print_section_header("Mann-Kendall saisonnier (Hirsch-Slack)", level=2)
+        
+        results = {}
+        for variable in variables:
+            cube, years, months_used, fractions = self.build_seasonal_cube(variable, months)
+            if not fractions:
+                continue
+            
+            stats = seasonal_kendall(cube, years, alpha)
+            variable_results = {}
+            
+            for i, fraction in enumerate(fractions):
+                variable_results[fraction] = {
+                    'fraction': fraction,
+                    'label': self.class_labels[fraction],
+                    'variable': variable,
+                    'n_years': int((~np.isnan(cube[:, :, i])).any(axis=1).sum()),
+                    'mann_kendall': {
+                        'trend': str(stats['trend'][i]),
+                        'p_value': float(stats['p_value'][i]),
+                        'tau': float(stats['tau'][i]),
+                        's': float(stats['s'][i]),
+                        'z': float(stats['z'][i]),
+                        'var_s': float(stats['var_s'][i]),
+                        'method': 'seasonal_hirsch_slack'
+                    },
+                    'sen_slope': {
+                        'slope': float(stats['slope'][i]),
+                        'slope_per_decade': float(stats['slope'][i]) * 10,
+                        'method': 'seasonal_sen'
+                    },
+                    'seasons': {
+                        month: {
+                            's': float(stats['season_s'][m, i]),
+                            'var_s': float(stats['season_var'][m, i])
+                        }
+                        for m, month in enumerate(months_used)
+                    }
+                }
+                
+                mk = variable_results[fraction]['mann_kendall']
+                print(f"  {self.class_labels[fraction]} ({variable}): {mk['trend']} "
+                      f"{get_significance_marker(mk['p_value'])} "
+                      f"({variable_results[fraction]['sen_slope']['slope_per_decade']:.6f}/décennie)")
+            
+            results[variable] = variable_results
+            self.results[f'seasonal_kendall_{variable}'] = variable_results
+        
+        return results
+    
+    def get_seasonal_kendall_table(self, variable='mean'):
+        """
+        Tableau de résumé du test saisonnier
+        
+        Args:
+            variable (str): Variable analysée
+            
+        Returns:
+            pd.DataFrame: Une ligne par fraction
+        """
+        if f'seasonal_kendall_{variable}' not in self.results:
+            raise ValueError(f"Test saisonnier non effectué pour {variable}")
+        
+        summary_data = []
+        for fraction, result in self.results[f'seasonal_kendall_{variable}'].items():
+            mk = result['mann_kendall']
+            summary_data.append({
+                'Fraction': result['label'],
+                'N_annees': result['n_years'],
+                'Tendance': mk['trend'],
+                'P_value': mk['p_value'],
+                'Significativité': get_significance_marker(mk['p_value']),
+                'Tau': mk['tau'],
+                'S': mk['s'],
+                'Var_S': mk['var_s'],
+                'Pente_Sen_saisonniere_decade': result['sen_slope']['slope_per_decade']
+            })
+        return pd.DataFrame(summary_data)
+    
     def create_monthly_statistics_graphs(self, variable='mean', save_path=None):
         """
         Crée les graphiques de statistiques mensuelles demandés par l'utilisateur
@@ -474,4 +677,30 @@ class SeasonalAnalyzer:
             'low_month': monthly_stats['months'][monthly_means.index(min(monthly_means))] if monthly_means else None
         }
         
-        return result
\ No newline at end of file
+        return result
+
+
+def analyze_seasonal_kendall_datasets(data_loaders, variables=('mean', 'median'), alpha=0.05):
+    """
+    Test de Mann-Kendall saisonnier pour plusieurs produits en un appel
+    
+    Args:
+        data_loaders (dict): {nom du produit: gestionnaire avec données chargées}
+        variables (tuple): Variables à analyser
+        alpha (float): Seuil de significativité
+        
+    Returns:
+        pd.DataFrame: Tableau de résumé avec colonnes Dataset et Variable
+    """
+    tables = []
+    for dataset_name, data_loader in data_loaders.items():
+        print(f"\n📦 {dataset_name}")
+        analyzer = SeasonalAnalyzer(data_loader)
+        analyzer.analyze_seasonal_kendall(variables, alpha=alpha)
+        for variable in variables:
+            if f'seasonal_kendall_{variable}' in analyzer.results:
+                table = analyzer.get_seasonal_kendall_table(variable)
+                table.insert(0, 'Variable', variable)
+                table.insert(0, 'Dataset', dataset_name)
+                tables.append(table)
+    return pd.concat(tables, ignore_index=True) if tables else pd.DataFrame()
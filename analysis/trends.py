@@ -14,6 +14,11 @@ from config import (FRACTION_CLASSES, CLASS_LABELS, TREND_SYMBOLS,
 from utils.helpers import (perform_mann_kendall_test, calculate_sen_slope, 
                             calculate_autocorrelation, prewhiten_series, 
                             validate_data, print_section_header, format_pvalue)
+from analysis.incremental_trends import IncrementalTrendState
+from analysis.rolling_trends import RollingTrendScanner
+from analysis.change_points import ChangePointAnalyzer, change_point_summary
+from utils.jobs import report_progress
+from utils.instrumentation import span, count
 
 class TrendCalculator:
     """
@@ -32,6 +37,7 @@ class TrendCalculator:
         self.fraction_classes = FRACTION_CLASSES
         self.class_labels = CLASS_LABELS
         self.results = {}
+        self.trend_states = {}
         
     def calculate_basic_trends(self, variable='mean'):
         """
@@ -47,8 +53,9 @@ class TrendCalculator:
         
         results = {}
         
-        for fraction in self.fraction_classes:
+        for i, fraction in enumerate(self.fraction_classes):
             print(f"\n🔍 Analyse: {self.class_labels[fraction]}")
+            report_progress(i / len(self.fraction_classes), f"Tendances {fraction}")
             
             try:
                 # Extraire les données pour cette fraction
@@ -77,6 +84,7 @@ class TrendCalculator:
                 
                 # Synchroniser les temps avec les valeurs nettoyées
                 clean_times = times[~np.isnan(values)]
+                count('trend_rows_processed', len(clean_values))
                 
                 # Test de Mann-Kendall
                 mk_result = perform_mann_kendall_test(clean_values)
@@ -120,6 +128,178 @@ class TrendCalculator:
         self.results[f'basic_trends_{variable}'] = results
         return results
     
+    def get_trend_state(self, fraction, variable='mean'):
+        """
+        Retourne (ou construit) l'état incrémental d'une fraction
+        
+        L'état est construit une seule fois à partir des données déjà
+        analysées par calculate_basic_trends() ou, à défaut, du gestionnaire
+        de données.
+        
+        Args:
+            fraction (str): Nom de la fraction
+            variable (str): Variable ('mean' ou 'median')
+            
+        Returns:
+            IncrementalTrendState: État de la série
+        """
+        key = (variable, fraction)
+        if key not in self.trend_states:
+            basic = self.results.get(f'basic_trends_{variable}', {}).get(fraction, {})
+            if 'data' in basic:
+                times, values = basic['data']['times'], basic['data']['values']
+            else:
+                fraction_data = self.data_handler.get_fraction_data(fraction, variable, dropna=True)
+                times = fraction_data['decimal_year'].values
+                values = fraction_data['value'].values
+            self.trend_states[key] = IncrementalTrendState.from_series(times, values)
+        return self.trend_states[key]
+    
+    def update(self, new_times, new_values, fraction=None, variable='mean'):
+        """
+        Met à jour Mann-Kendall et la pente de Sen avec de nouvelles observations
+        
+        Seules les paires impliquant les nouveaux points sont calculées, au
+        lieu de tout recalculer comme calculate_basic_trends().
+        
+        Args:
+            new_times (array): Temps des nouvelles observations (années décimales)
+            new_values (array or dict): Nouvelles valeurs pour `fraction`, ou
+                dict {fraction: valeurs} partageant new_times
+            fraction (str, optional): Fraction visée si new_values est un array
+            variable (str): Variable ('mean' ou 'median')
+            
+        Returns:
+            dict: Résultats mis à jour par fraction (mann_kendall, sen_slope, n_obs)
+        """
+        if not isinstance(new_values, dict):
+            if fraction is None:
+                raise ValueError("fraction requise quand new_values n'est pas un dict")
+            new_values = {fraction: new_values}
+        
+        basic = self.results.setdefault(f'basic_trends_{variable}', {})
+        updated = {}
+        
+        for frac, values in new_values.items():
+            state = self.get_trend_state(frac, variable)
+            n_added = state.update(new_times, values)
+            
+            result = basic.get(frac)
+            if result is None or result.get('error'):
+                result = {
+                    'fraction': frac,
+                    'label': self.class_labels.get(frac, frac),
+                    'variable': variable,
+                    'n_removed': 0
+                }
+                basic[frac] = result
+            result.update({
+                'n_obs': state.n,
+                'mann_kendall': state.mann_kendall(),
+                'sen_slope': state.sen_slope(),
+                'data': {
+                    'times': state.times,
+                    'values': state.values
+                }
+            })
+            result.pop('error', None)
+            updated[frac] = result
+            
+            print(f"  🔄 {result['label']}: +{n_added} obs → {result['mann_kendall']['trend']} "
+                  f"({result['sen_slope']['slope_per_decade']:.6f}/décennie)")
+        
+        return updated
+    
+    def save_trend_states(self, directory):
+        """
+        Sauvegarde les états incrémentaux (un fichier .npz par fraction)
+        
+        Args:
+            directory (str): Répertoire de sortie
+        """
+        from pathlib import Path
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        for (variable, fraction), state in self.trend_states.items():
+            state.save(directory / f"trend_state_{fraction}_{variable}.npz")
+    
+    def load_trend_states(self, directory, variable='mean'):
+        """
+        Recharge les états incrémentaux sauvegardés par save_trend_states()
+        
+        Args:
+            directory (str): Répertoire des fichiers .npz
+            variable (str): Variable ('mean' ou 'median')
+            
+        Returns:
+            list: Fractions dont l'état a été chargé
+        """
+        from pathlib import Path
+        loaded = []
+        for fraction in self.fraction_classes:
+            path = Path(directory) / f"trend_state_{fraction}_{variable}.npz"
+            if path.exists():
+                self.trend_states[(variable, fraction)] = IncrementalTrendState.load(path)
+                loaded.append(fraction)
+        return loaded
+    
+    def calculate_rolling_trends(self, window_years=(5, 7, 10), variables=('mean', 'median'),
+                                 step=1):
+        """
+        Tendances sur fenêtres glissantes de plusieurs saisons pour chaque fraction
+        
+        Args:
+            window_years (tuple): Longueurs de fenêtre en saisons (années)
+            variables (tuple): Variables à analyser
+            step (int): Pas d'avancement en saisons
+            
+        Returns:
+            pd.DataFrame: Une ligne par (fenêtre, variable, fraction) avec
+                n_obs, s, tau, z, p_value, trend, slope, slope_per_decade
+        """
+        print_section_header(f"Tendances glissantes - fenêtres {list(window_years)} ans", level=2)
+        
+        scanner = RollingTrendScanner(self.data_handler, self.fraction_classes,
+                                      min_obs=ANALYSIS_CONFIG['min_observations'])
+        results = scanner.scan(window_years, variables, step)
+        
+        print(f"  ✅ {len(results)} fenêtres analysées "
+              f"({results['window'].nunique() if len(results) else 0} périodes distinctes)")
+        
+        self.results['rolling_trends'] = results
+        return results
+    
+    def calculate_change_points(self, variable='mean', model='mean', penalty=None, min_size=10):
+        """
+        Détecte les ruptures (PELT + test de Pettitt) pour chaque fraction
+        
+        Args:
+            variable (str): Variable à analyser ('mean' ou 'median')
+            model (str): Modèle PELT ('mean' ou 'meanvar')
+            penalty (float, optional): Pénalité PELT par rupture
+            min_size (int): Longueur minimale d'un segment PELT
+            
+        Returns:
+            dict: Résultats par fraction
+        """
+        print_section_header(f"Détection de ruptures - Variable: {variable}", level=2)
+        
+        analyzer = ChangePointAnalyzer(self.data_handler, self.fraction_classes,
+                                       model=model, penalty=penalty, min_size=min_size)
+        results = analyzer.analyze(variable)
+        
+        for fraction, result in results.items():
+            pettitt = result['pettitt']
+            significance = get_significance_marker(pettitt['p_value'])
+            change_date = pettitt.get('change_date')
+            date_text = change_date.strftime('%Y-%m-%d') if change_date is not None else 'n/a'
+            print(f"  {self.class_labels[fraction]}: Pettitt {date_text} {significance} "
+                  f"(saut {pettitt.get('shift', np.nan):+.4f}), "
+                  f"PELT {result['pelt']['n_change_points']} rupture(s)")
+        
+        self.results[f'change_points_{variable}'] = results
+        return results
+    
     def calculate_monthly_trends(self, variable='mean'):
         """
         Analyse les tendances par mois
@@ -220,7 +400,7 @@ class TrendCalculator:
         
         results = {}
         
-        for fraction in self.fraction_classes:
+        for k, fraction in enumerate(self.fraction_classes):
             print(f"\n🎯 Bootstrap: {self.class_labels[fraction]}")
             
             try:
@@ -241,23 +421,27 @@ class TrendCalculator:
                 bootstrap_slopes = []
                 bootstrap_pvalues = []
                 
-                for i in range(n_bootstrap):
-                    # Échantillon bootstrap
-                    indices = resample(range(len(values)), n_samples=len(values), random_state=i)
-                    boot_values = values[indices]
-                    boot_times = times[indices]
-                    
-                    # Test Mann-Kendall sur l'échantillon bootstrap
-                    try:
-                        mk_result = perform_mann_kendall_test(boot_values)
-                        bootstrap_pvalues.append(mk_result['p_value'])
+                with span('bootstrap', fraction=fraction, n_bootstrap=n_bootstrap):
+                    for i in range(n_bootstrap):
+                        report_progress((k + i / n_bootstrap) / len(self.fraction_classes),
+                                        f"Bootstrap {fraction} {i}/{n_bootstrap}")
                         
-                        # Calcul de la pente Sen
-                        if len(boot_values) > 5:
-                            sen_result = calculate_sen_slope(boot_times, boot_values)
-                            bootstrap_slopes.append(sen_result['slope_per_decade'])
-                    except:
-                        continue
+                        # Échantillon bootstrap
+                        indices = resample(range(len(values)), n_samples=len(values), random_state=i)
+                        boot_values = values[indices]
+                        boot_times = times[indices]
+                        
+                        # Test Mann-Kendall sur l'échantillon bootstrap
+                        try:
+                            mk_result = perform_mann_kendall_test(boot_values)
+                            bootstrap_pvalues.append(mk_result['p_value'])
+                        
+                            # Calcul de la pente Sen
+                            if len(boot_values) > 5:
+                                sen_result = calculate_sen_slope(boot_times, boot_values)
+                                bootstrap_slopes.append(sen_result['slope_per_decade'])
+                        except:
+                            continue
                 
                 # Analyse des résultats bootstrap
                 if len(bootstrap_slopes) > 0:
@@ -423,7 +607,15 @@ class TrendCalculator:
                 'Autocorr_lag1': result['autocorrelation']['lag1']
             })
         
-        return pd.DataFrame(summary_data)
+        summary = pd.DataFrame(summary_data)
+        
+        # Ruptures, si calculate_change_points() a été lancé
+        change_points = self.results.get(f'change_points_{variable}')
+        if change_points and len(summary):
+            cp_table = change_point_summary(change_points, self.class_labels)
+            summary = summary.merge(cp_table.drop(columns='N_obs'), on='Fraction', how='left')
+        
+        return summary
     
     def print_summary(self, variable='mean'):
         """
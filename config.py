@@ -29,9 +29,18 @@ os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
 # Choix du dataset par défaut ('MCD43A3', 'MOD10A1', ou 'COMPARISON')
 DEFAULT_DATASET = "MCD43A3"
 
-# Mode de données ('csv' ou 'database')
+# Mode de données ('csv', 'database' ou 'duckdb')
 DATA_MODE = "database"  # Change to 'csv' to use legacy CSV mode
 
+# Base DuckDB embarquée (fichier .duckdb ou répertoire Parquet) pour DATA_MODE = 'duckdb'
+# Construite par: python database/duckdb_backend.py
+DUCKDB_PATH = "data/albedo.duckdb"
+
+# Région de référence et répertoire des autres glaciers (un sous-répertoire
+# par région, mêmes noms de fichiers que data/csv) pour le mode batch régional
+DEFAULT_REGION = "saskatchewan"
+REGIONS_DIR = "data/regions"
+
 # Configuration pour MCD43A3 (Albédo général)
 MCD43A3_CONFIG = {
     'csv_path': "data/csv/MCD43A3_albedo_daily_stats_2010_2024.csv",
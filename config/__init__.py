@@ -2,17 +2,24 @@
 Configuration package for Saskatchewan Glacier Albedo Analysis.
 """
 
+import importlib.util
+from pathlib import Path
+
 from .settings import (
     config,
     ConfigManager,
     DatasetConfig,
     ElevationConfig,
     ComparisonConfig,
+    RegionConfig,
     VisualizationConfig,
     
     # Legacy exports for backward compatibility
     DEFAULT_DATASET,
     DATA_MODE,
+    DUCKDB_PATH,
+    DEFAULT_REGION,
+    REGIONS_DIR,
     OUTPUT_DIR,
     ANALYSIS_VARIABLE,
     FRACTION_CLASSES,
@@ -32,9 +39,13 @@ __all__ = [
     'DatasetConfig',
     'ElevationConfig', 
     'ComparisonConfig',
+    'RegionConfig',
     'VisualizationConfig',
     'DEFAULT_DATASET',
     'DATA_MODE',
+    'DUCKDB_PATH',
+    'DEFAULT_REGION',
+    'REGIONS_DIR',
     'OUTPUT_DIR',
     'ANALYSIS_VARIABLE',
     'FRACTION_CLASSES',
@@ -46,4 +57,27 @@ __all__ = [
     'CSV_PATH',
     'QA_CSV_PATH',
     'print_config_summary'
-]
\ No newline at end of file
+]
+
+_legacy_config = None
+
+
+def __getattr__(name):
+    """
+    Fall back to the legacy root-level config.py for names not defined here.
+
+    This package shadows config.py, which still holds constants such as
+    TREND_SYMBOLS and ANALYSIS_CONFIG; it is only loaded on first use.
+    """
+    global _legacy_config
+    if name.startswith('_'):
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    if _legacy_config is None:
+        path = Path(__file__).resolve().parent.parent / 'config.py'
+        spec = importlib.util.spec_from_file_location('_legacy_config', path)
+        _legacy_config = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(_legacy_config)
+    try:
+        return getattr(_legacy_config, name)
+    except AttributeError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
@@ -8,7 +8,7 @@ Centralized configuration with validation and environment support.
 import os
 from pathlib import Path
 from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, field
+from dataclasses import dataclass, field, replace
 import matplotlib.pyplot as plt
 import seaborn as sns
 
@@ -16,6 +16,28 @@ import seaborn as sns
 os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
 
 
+FRACTION_CLASS_NAMES = ['border', 'mixed_low', 'mixed_high', 'mostly_ice', 'pure_ice']
+
+# Columns of the Export.table.toDrive layout that are never used by the analyses
+GEE_SKIP_COLUMNS = ['system:index', '.geo']
+
+
+def gee_stats_dtypes(fraction_classes: Optional[List[str]] = None) -> Dict[str, str]:
+    """Column dtypes of the GEE daily statistics export (date is parsed separately)."""
+    dtypes = {
+        'year': 'int64',
+        'doy': 'int64',
+        'decimal_year': 'float64',
+        'system:time_start': 'int64',
+        'min_pixels_threshold': 'int64',
+        'total_valid_pixels': 'float64',
+    }
+    for fraction in fraction_classes or FRACTION_CLASS_NAMES:
+        for suffix in ('mean', 'median', 'data_quality', 'pixel_count'):
+            dtypes[f'{fraction}_{suffix}'] = 'float64'
+    return dtypes
+
+
 @dataclass
 class DatasetConfig:
     """Configuration for a single dataset."""
@@ -26,11 +48,46 @@ class DatasetConfig:
     quality_levels: List[str]
     temporal_resolution: str
     scaling_info: str
+    csv_dtypes: Dict[str, str] = field(default_factory=gee_stats_dtypes)
+    csv_skip_columns: List[str] = field(default_factory=lambda: list(GEE_SKIP_COLUMNS))
+    csv_date_format: str = '%Y-%m-%d'
+    required_columns: List[str] = field(default_factory=lambda: ['date'])
     
     def __post_init__(self):
         """Validate configuration after initialization."""
         if not self.csv_path:
             raise ValueError(f"csv_path required for dataset {self.name}")
+    
+    def for_region(self, region: 'RegionConfig') -> 'DatasetConfig':
+        """Copy of this configuration reading the region's CSV exports."""
+        return replace(
+            self,
+            csv_path=os.path.join(region.data_dir, os.path.basename(self.csv_path)),
+            qa_csv_path=os.path.join(region.data_dir, os.path.basename(self.qa_csv_path)),
+        )
+    
+    def csv_read_options(self) -> Dict[str, Any]:
+        """Keyword arguments for utils.helpers.load_and_validate_csv."""
+        return {
+            'dtypes': self.csv_dtypes,
+            'skip_columns': self.csv_skip_columns,
+            'date_format': self.csv_date_format,
+            'required_columns': self.required_columns,
+        }
+
+
+@dataclass
+class RegionConfig:
+    """Configuration for one glacier / region of the batch analyses.
+
+    A region directory holds the GEE exports of that region under the same
+    file names as data/csv (extracted CSVs or the Drive zip), and optionally
+    its mask as mask.geojson.
+    """
+    name: str
+    description: str
+    data_dir: str
+    mask_path: Optional[str] = None
 
 
 @dataclass
@@ -41,6 +98,8 @@ class ElevationConfig:
     description: str
     elevation_zones: List[str] = field(default_factory=lambda: ['above_median', 'at_median', 'below_median'])
     fraction_classes: List[str] = field(default_factory=lambda: ['mostly_ice', 'pure_ice'])
+    band_width_m: Optional[float] = None  # Regular elevation bands (e.g. 50 m) for band CSVs
+    median_buffer_m: float = 100.0  # Half-width of the at_median zone
     output_dir: str = 'results/elevation_analysis'
     methodology: str = 'Williamson_Menounos_2021_adapted_with_fractions'
     reference_paper: str = 'Williamson, S.N. & Menounos, B. (2021). Remote Sensing of Environment 267'
@@ -123,14 +182,25 @@ class ConfigManager:
         # Comparison configuration
         self.comparison = ComparisonConfig()
         
+        # Regions: the reference glacier, plus one sub-directory of regions_dir per glacier
+        self.default_region = "saskatchewan"
+        self.regions_dir = "data/regions"
+        self.saskatchewan = RegionConfig(
+            name='saskatchewan',
+            description='Glacier Saskatchewan',
+            data_dir='data/csv',
+            mask_path='data/modis/masks/saskatchewan_glacier_mask.geojson'
+        )
+        
         # Application settings
         self.default_dataset = "MCD43A3"
-        self.data_mode = "database"  # or "csv"
+        self.data_mode = "database"  # or "csv" / "duckdb"
+        self.duckdb_path = "data/albedo.duckdb"  # .duckdb file or Parquet directory
         self.output_dir = "results"
         self.analysis_variable = "mean"
         
         # Fraction classes
-        self.fraction_classes = ['border', 'mixed_low', 'mixed_high', 'mostly_ice', 'pure_ice']
+        self.fraction_classes = list(FRACTION_CLASS_NAMES)
         self.class_labels = {
             'border': '0-25% (Bordure)',
             'mixed_low': '25-50% (Mixte bas)',
@@ -139,13 +209,49 @@ class ConfigManager:
             'pure_ice': '95-100% (Glace pure)'
         }
     
-    def get_dataset_config(self, dataset_name: str) -> Optional[DatasetConfig]:
-        """Get configuration for a specific dataset."""
+    def get_dataset_config(self, dataset_name: str,
+                           region: Optional[str] = None) -> Optional[DatasetConfig]:
+        """Get configuration for a specific dataset (of a region, default: the reference glacier)."""
         configs = {
             'MCD43A3': self.mcd43a3,
             'MOD10A1': self.mod10a1
         }
-        return configs.get(dataset_name)
+        dataset_config = configs.get(dataset_name)
+        if dataset_config is None or region is None or region == self.default_region:
+            return dataset_config
+        return dataset_config.for_region(self.get_region(region))
+    
+    def find_dataset_by_path(self, csv_path: str) -> Optional[DatasetConfig]:
+        """Get the dataset configuration whose CSV is csv_path (in any region)."""
+        target = Path(csv_path).resolve()
+        for region in self.get_regions().values():
+            for name in self.get_all_datasets():
+                dataset_config = self.get_dataset_config(name, region.name)
+                if Path(dataset_config.csv_path).resolve() == target:
+                    return dataset_config
+        return None
+    
+    def get_regions(self) -> Dict[str, RegionConfig]:
+        """Reference glacier plus every region directory found in regions_dir."""
+        regions = {self.default_region: self.saskatchewan}
+        regions_dir = Path(self.regions_dir)
+        if regions_dir.is_dir():
+            for region_dir in sorted(p for p in regions_dir.iterdir() if p.is_dir()):
+                mask_path = region_dir / 'mask.geojson'
+                regions.setdefault(region_dir.name, RegionConfig(
+                    name=region_dir.name,
+                    description=region_dir.name.replace('_', ' ').title(),
+                    data_dir=str(region_dir),
+                    mask_path=str(mask_path) if mask_path.exists() else None
+                ))
+        return regions
+    
+    def get_region(self, region: str) -> RegionConfig:
+        """Get the configuration of a region."""
+        regions = self.get_regions()
+        if region not in regions:
+            raise ValueError(f"Unknown region: {region} (available: {', '.join(regions)})")
+        return regions[region]
     
     def get_all_datasets(self) -> Dict[str, DatasetConfig]:
         """Get all dataset configurations."""
@@ -178,6 +284,7 @@ class ConfigManager:
         print(f"Data mode: {self.data_mode}")
         print(f"Output directory: {self.output_dir}")
         print(f"Analysis variable: {self.analysis_variable}")
+        print(f"Regions: {', '.join(self.get_regions())}")
         
         print(f"\n📊 Available datasets:")
         for name, config in self.get_all_datasets().items():
@@ -194,6 +301,9 @@ config = ConfigManager()
 # Export commonly used configurations for backward compatibility
 DEFAULT_DATASET = config.default_dataset
 DATA_MODE = config.data_mode
+DUCKDB_PATH = config.duckdb_path
+DEFAULT_REGION = config.default_region
+REGIONS_DIR = config.regions_dir
 OUTPUT_DIR = config.output_dir
 ANALYSIS_VARIABLE = config.analysis_variable
 FRACTION_CLASSES = config.fraction_classes
@@ -227,6 +337,8 @@ ELEVATION_CONFIG = {
     'elevation_zones': config.elevation.elevation_zones,
     'fraction_classes': config.elevation.fraction_classes,
     'combinations': config.elevation.combinations,
+    'band_width_m': config.elevation.band_width_m,
+    'median_buffer_m': config.elevation.median_buffer_m,
     'methodology': config.elevation.methodology,
     'output_dir': config.elevation.output_dir,
     'reference_paper': config.elevation.reference_paper
@@ -20,12 +20,11 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 from config import (
-    MCD43A3_CONFIG, MOD10A1_CONFIG, ELEVATION_CONFIG,
-    FRACTION_CLASSES, CLASS_LABELS, FRACTION_COLORS,
+    ELEVATION_CONFIG, FRACTION_CLASSES, CLASS_LABELS, FRACTION_COLORS,
     ANALYSIS_CONFIG, get_dataset_config
 )
-from data.handler import AlbedoDataHandler
 from data.dataset_manager import DatasetManager
+from data.registry import load_concurrently, get_handler_registry
 from analysis.trends import TrendCalculator
 from analysis.seasonal import SeasonalAnalyzer
 from analysis.comparison import ComparisonAnalyzer
@@ -35,8 +34,11 @@ from visualization.charts import ChartGenerator
 from dashboard.components import (
     create_dataset_selector, create_filter_panel, create_analysis_options,
     create_summary_card, create_plot_card, create_data_table_card,
-    create_export_panel, create_info_panel, create_advanced_filters
+    create_export_panel, create_info_panel, create_advanced_filters,
+    create_jobs_panel
 )
+from scripts.background_tasks import submit_export, submit_bootstrap, format_job_status
+from utils.jobs import get_job_runner, FINISHED_STATUSES
 from dashboard.plots import (
     create_timeseries_plot, create_seasonal_plot, create_comparison_plot,
     create_trend_analysis_plot
@@ -57,23 +59,20 @@ def load_dataset_data():
     manager = get_data_manager()
     data = {}
     
-    # Load MCD43A3 data
-    try:
-        mcd43a3_handler = AlbedoDataHandler(MCD43A3_CONFIG['csv_path'])
-        mcd43a3_handler.load_data()
-        data['MCD43A3'] = mcd43a3_handler.data
-    except Exception as e:
-        print(f"Warning: Could not load MCD43A3 data: {e}")
-        data['MCD43A3'] = None
+    # Load both products concurrently (attached from the shared store when
+    # another dashboard worker already published them)
+    registry = get_handler_registry()
+    loads = load_concurrently({
+        'MCD43A3': lambda: registry.get_handler('MCD43A3'),
+        'MOD10A1': lambda: registry.get_handler('MOD10A1'),
+    })
     
-    # Load MOD10A1 data
-    try:
-        mod10a1_handler = AlbedoDataHandler(MOD10A1_CONFIG['csv_path'])
-        mod10a1_handler.load_data()
-        data['MOD10A1'] = mod10a1_handler.data
-    except Exception as e:
-        print(f"Warning: Could not load MOD10A1 data: {e}")
-        data['MOD10A1'] = None
+    for dataset_name, load in loads.items():
+        if load.error is not None:
+            print(f"Warning: Could not load {dataset_name} data: {load.error}")
+            data[dataset_name] = None
+        else:
+            data[dataset_name] = load.result.data
     
     return data
 
@@ -135,6 +134,7 @@ app_ui = ui.page_fluid(
             create_analysis_options(),
             create_advanced_filters(),
             create_export_panel(),
+            create_jobs_panel(),
             create_info_panel(),
             width=320
         ),
@@ -546,11 +546,58 @@ def server(input, output, session):
     def elevation_summary():
         return ui.div("Elevation summary coming soon...")
     
+    # Background jobs (export, bootstrap) - the session only polls their status
+    export_job = reactive.Value(None)
+    analysis_jobs = reactive.Value([])
+    
+    def _selected_datasets():
+        return ['MCD43A3', 'MOD10A1'] if input.dataset() == 'COMPARISON' else [input.dataset()]
+    
+    def _poll_status(job_ids):
+        runner = get_job_runner()
+        jobs = [runner.status(job_id) for job_id in job_ids]
+        if any(job and job['status'] not in FINISHED_STATUSES for job in jobs):
+            reactive.invalidate_later(1)
+        return "\n".join(format_job_status(job) for job in jobs)
+    
+    @reactive.Effect
+    @reactive.event(input.export_data)
+    def _submit_export():
+        formats = list(input.export_formats()) or ['csv']
+        job_ids = [submit_export(dataset, formats, input.export_filename(),
+                                 input.analysis_variable())
+                   for dataset in _selected_datasets()]
+        export_job.set(job_ids)
+    
+    @reactive.Effect
+    @reactive.event(input.run_bootstrap)
+    def _submit_bootstrap():
+        analysis_jobs.set([submit_bootstrap(dataset, input.analysis_variable())
+                           for dataset in _selected_datasets()])
+    
+    @reactive.Effect
+    @reactive.event(input.cancel_job)
+    def _cancel_jobs():
+        runner = get_job_runner()
+        for job_id in (export_job.get() or []) + analysis_jobs.get():
+            runner.cancel(job_id)
+    
     # Export functionality
     @output
     @render.text
     def export_status():
-        return "Export functionality coming soon..."
+        job_ids = export_job.get()
+        if not job_ids:
+            return "No export running"
+        return _poll_status(job_ids)
+    
+    @output
+    @render.text
+    def job_status():
+        job_ids = analysis_jobs.get()
+        if not job_ids:
+            return "No background job"
+        return _poll_status(job_ids)
 
 # ==========================================
 # APP CREATION
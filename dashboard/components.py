@@ -167,6 +167,24 @@ def create_export_panel():
         class_="sidebar-panel"
     )
 
+def create_jobs_panel():
+    """Create background job controls (long analyses run in a process pool)"""
+    return ui.div(
+        ui.h4("⚙️ Background Jobs"),
+        ui.input_action_button(
+            "run_bootstrap",
+            "🎯 Run Bootstrap CIs",
+            class_="btn-secondary"
+        ),
+        ui.input_action_button(
+            "cancel_job",
+            "🛑 Cancel",
+            class_="btn-outline-danger"
+        ),
+        ui.output_text("job_status"),
+        class_="sidebar-panel"
+    )
+
 def create_info_panel():
     """Create information panel with dataset details"""
     return ui.div(
@@ -4,17 +4,38 @@ Saskatchewan Glacier Albedo Analysis Dashboard Launcher
 ======================================================
 
 Simple launcher script for the interactive dashboard.
+
+Usage:
+    python dashboard/run_dashboard.py                 # development server (auto-reload)
+    python dashboard/run_dashboard.py --workers 4     # several worker processes
+
+With several workers, the launcher loads both products once and publishes
+them in the shared store; every worker attaches the same pages instead of
+loading its own copy.
 """
 
 import sys
 import os
+import argparse
 from pathlib import Path
 
 # Add parent directory to path
 parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
-def main():
+def publish_datasets():
+    """Load both products once and publish them for the worker processes"""
+    from data import shared_store
+    from data.registry import get_handler_registry
+
+    shared_store.enable()
+    try:
+        get_handler_registry().get_handlers(['MCD43A3', 'MOD10A1'])
+    except Exception as e:
+        print(f"⚠️  Datasets not published, each worker will load its own copy: {e}")
+
+
+def main(workers=1):
     """Launch the dashboard application"""
     print("🏔️ Saskatchewan Glacier Albedo Analysis Dashboard")
     print("=" * 50)
@@ -24,6 +45,13 @@ def main():
     print("=" * 50)
     
     try:
+        if workers > 1:
+            import uvicorn
+            publish_datasets()
+            # Workers import the app themselves (no auto-reload with several workers)
+            uvicorn.run("dashboard.app:app", host="127.0.0.1", port=8000, workers=workers)
+            return
+
         from dashboard.app import app
         # Run with auto-reload for development
         app.run(host="127.0.0.1", port=8000, debug=True, reload=True)
@@ -37,4 +65,8 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Launch the albedo dashboard")
+    parser.add_argument('--workers', type=int, default=1,
+                        help="Worker processes sharing the published datasets (default: 1)")
+    args = parser.parse_args()
+    main(args.workers)
\ No newline at end of file
@@ -9,7 +9,6 @@ des données pour les analyses comparatives.
 
 import pandas as pd
 import numpy as np
-import os
 from pathlib import Path
 import warnings
 
@@ -20,6 +19,9 @@ from config import (
 )
 from utils.helpers import print_section_header, validate_data
 from .loader import SaskatchewanDataLoader
+from .zip_source import read_csv_source, csv_source_exists
+from .registry import load_concurrently
+from utils.instrumentation import traced
 
 class DatasetManager:
     """
@@ -33,6 +35,7 @@ class DatasetManager:
         self.datasets = {}
         self.current_dataset = None
         self.comparison_data = None
+        self.load_timings = {}
         
     def load_dataset(self, dataset_name, force_reload=False):
         """
@@ -55,7 +58,7 @@ class DatasetManager:
         config = get_dataset_config(dataset_name)
         
         # Vérifier l'existence des fichiers
-        if not os.path.exists(config['csv_path']):
+        if not csv_source_exists(config['csv_path']):
             raise FileNotFoundError(f"Fichier CSV non trouvé: {config['csv_path']}")
         
         # Créer et charger les données
@@ -66,7 +69,7 @@ class DatasetManager:
         loader.dataset_info = {
             'name': dataset_name,
             'config': config,
-            'qa_available': os.path.exists(config['qa_csv_path']) if config['qa_csv_path'] else False
+            'qa_available': csv_source_exists(config['qa_csv_path'])
         }
         
         # Mettre en cache
@@ -78,6 +81,33 @@ class DatasetManager:
         
         return loader
     
+    def load_datasets(self, dataset_names, force_reload=False, max_workers=None):
+        """
+        Charge plusieurs datasets en parallèle (threads : lecture et parsing)
+        
+        Args:
+            dataset_names (list): Noms des datasets ('MCD43A3', 'MOD10A1')
+            force_reload (bool): Forcer le rechargement si déjà en cache
+            max_workers (int, optional): Nombre de threads (défaut : un par dataset)
+            
+        Returns:
+            dict: SaskatchewanDataLoader par dataset, quand tous sont prêts
+            
+        Raises:
+            Exception: Première erreur de chargement rencontrée
+        """
+        loads = load_concurrently(
+            {name: (lambda name=name: self.load_dataset(name, force_reload=force_reload))
+             for name in dict.fromkeys(dataset_names)},
+            max_workers=max_workers
+        )
+        self.load_timings.update({name: load.seconds for name, load in loads.items()})
+        
+        for load in loads.values():
+            if load.error is not None:
+                raise load.error
+        return {name: load.result for name, load in loads.items()}
+    
     def get_dataset(self, dataset_name):
         """
         Récupère un dataset (le charge si nécessaire)
@@ -104,11 +134,11 @@ class DatasetManager:
         """
         config = get_dataset_config(dataset_name)
         
-        if not config['qa_csv_path'] or not os.path.exists(config['qa_csv_path']):
+        if not csv_source_exists(config['qa_csv_path']):
             raise FileNotFoundError(f"Fichier QA non trouvé pour {dataset_name}")
         
         print(f"📊 Chargement des données QA pour {dataset_name}...")
-        qa_data = pd.read_csv(config['qa_csv_path'])
+        qa_data = read_csv_source(config['qa_csv_path'])
         
         # Convertir la date
         qa_data['date'] = pd.to_datetime(qa_data['date'])
@@ -128,9 +158,9 @@ class DatasetManager:
         """
         print_section_header("Préparation des données de comparaison", level=2)
         
-        # Charger les deux datasets
-        mcd43a3 = self.get_dataset('MCD43A3')
-        mod10a1 = self.get_dataset('MOD10A1')
+        # Charger les deux datasets en parallèle
+        loaders = self.load_datasets(['MCD43A3', 'MOD10A1'])
+        mcd43a3, mod10a1 = loaders['MCD43A3'], loaders['MOD10A1']
         
         if sync_dates:
             # Synchroniser les dates avec une tolérance
@@ -158,6 +188,7 @@ class DatasetManager:
         
         return self.comparison_data
     
+    @traced('sync')
     def _sync_datasets(self, data1, data2, tolerance_days=1):
         """
         Synchronise deux datasets avec une tolérance de dates
@@ -15,9 +15,9 @@ from typing import Optional, Dict, Any
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from database.connection import get_connection
-from config import FRACTION_CLASSES, CLASS_LABELS, ANALYSIS_CONFIG
+from config import FRACTION_CLASSES, CLASS_LABELS, DEFAULT_REGION
 from utils.helpers import print_section_header
+from utils.instrumentation import traced, count
 
 class AlbedoDataHandler:
     """
@@ -27,18 +27,23 @@ class AlbedoDataHandler:
     but loads data from PostgreSQL instead of CSV files.
     """
     
-    def __init__(self, dataset_type: str = "MCD43A3"):
+    def __init__(self, dataset_type: str = "MCD43A3", region: str = DEFAULT_REGION):
         """
         Initialize the database-based data handler
         
         Args:
             dataset_type (str): Type of dataset ("MCD43A3" or "MOD10A1")
+            region (str): Glacier / region whose rows are loaded
         """
         self.dataset_type = dataset_type.upper()
+        self.region = region
         self.data = None
         self.raw_data = None
         self.fraction_classes = FRACTION_CLASSES
         self.class_labels = CLASS_LABELS
+        # Imported here so that subclasses (data/duckdb_handler.py) do not pull
+        # in psycopg2/SQLAlchemy just by importing this module
+        from database.connection import get_connection
         self.db_connection = get_connection()
         
         # Map dataset types to table names
@@ -63,6 +68,7 @@ class AlbedoDataHandler:
             return len(self.data)
         return 0
         
+    @traced('load')
     def load_data(self):
         """
         Load and prepare data from PostgreSQL database
@@ -97,15 +103,17 @@ class AlbedoDataHandler:
                 pure_ice_median,
                 total_valid_pixels
             FROM albedo.{self.table_name}
+            WHERE region = %(region)s
             ORDER BY date
             """
             
-            self.raw_data = self.db_connection.execute_query(query)
+            self.raw_data = self.db_connection.execute_query(query, {'region': self.region})
             
             if len(self.raw_data) == 0:
-                raise ValueError(f"No data found in {self.table_name}")
+                raise ValueError(f"No data found in {self.table_name} for region {self.region}")
             
             self.data = self.raw_data.copy()
+            count('rows_loaded', len(self.raw_data))
             
             # Prepare the data
             self._prepare_temporal_data()
@@ -121,6 +129,42 @@ class AlbedoDataHandler:
         except Exception as e:
             raise ValueError(f"Failed to load data from database: {e}")
     
+    def probe(self):
+        """
+        Lightweight metadata probe, without loading the table
+        
+        One aggregate over the region's (region, date) index range gives the
+        row count, date range and last update of the region.
+        
+        Returns:
+            DatasetProbe: Row count, date range, columns and freshness stamp
+        """
+        from data.registry import DatasetProbe
+        
+        stats = self.db_connection.execute_query(f"""
+            SELECT
+                COUNT(*) AS row_count,
+                MIN(date) AS date_min,
+                MAX(date) AS date_max,
+                MAX(updated_at) AS last_update
+            FROM albedo.{self.table_name}
+            WHERE region = %(region)s
+        """, {'region': self.region}).iloc[0]
+        
+        columns = self.db_connection.execute_query(
+            "SELECT column_name FROM information_schema.columns "
+            "WHERE table_schema = 'albedo' AND table_name = %(table)s ORDER BY ordinal_position",
+            {'table': self.table_name})['column_name'].tolist()
+        return DatasetProbe(
+            dataset=self.dataset_type,
+            source=f"albedo.{self.table_name} (region {self.region})",
+            row_count=int(stats['row_count']),
+            date_min=str(stats['date_min']) if pd.notna(stats['date_min']) else None,
+            date_max=str(stats['date_max']) if pd.notna(stats['date_max']) else None,
+            columns=columns,
+            freshness=str(stats['last_update'])
+        )
+    
     def _prepare_temporal_data(self):
         """
         Prepare temporal variables (already in database, but ensure consistency)
@@ -133,6 +177,7 @@ class AlbedoDataHandler:
         if 'month' not in self.data.columns:
             self.data['month'] = self.data['date'].dt.month
     
+    @traced('filter')
     def _filter_quality_data(self):
         """
         Filter data according to quality criteria
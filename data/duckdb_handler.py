@@ -0,0 +1,183 @@
+"""
+DuckDB-based Data Handler for Saskatchewan Glacier Albedo Analysis
+=================================================================
+
+Same interface as the PostgreSQL handler (data/db_handler.py), reading from the
+embedded DuckDB file or Parquet directory built by database/duckdb_backend.py.
+Region, date range, month, fraction and quality filters are pushed down into
+the SQL query, so only the requested rows and columns are read.
+"""
+
+import sys
+import os
+from typing import Optional, Sequence
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import FRACTION_CLASSES, CLASS_LABELS, DUCKDB_PATH, DEFAULT_REGION
+from database.duckdb_backend import MEASUREMENT_TABLES, SCHEMA, connect
+from data.db_handler import AlbedoDataHandler as DatabaseAlbedoDataHandler
+from utils.helpers import print_section_header
+from utils.instrumentation import traced, span, count
+
+BASE_COLUMNS = ['date', 'year', 'decimal_year', 'doy', 'season',
+                'min_pixels_threshold', 'total_valid_pixels']
+
+
+class AlbedoDataHandler(DatabaseAlbedoDataHandler):
+    """
+    DuckDB-based data handler for Saskatchewan Glacier albedo analysis
+
+    Args:
+        dataset_type: "MCD43A3" or "MOD10A1"
+        source: DuckDB file or Parquet directory (default: DUCKDB_PATH)
+        start_date: First date to load (inclusive)
+        end_date: Last date to load (inclusive)
+        months: Months to load (e.g. [7, 8])
+        fractions: Fractions to load (default: all)
+        variables: Statistics to load per fraction
+        quality_filter: Keep only rows meeting the minimum pixel threshold
+        region: Glacier / region whose rows are loaded
+    """
+
+    def __init__(self, dataset_type: str = "MCD43A3", source: Optional[str] = None,
+                 start_date=None, end_date=None, months: Optional[Sequence[int]] = None,
+                 fractions: Optional[Sequence[str]] = None,
+                 variables: Sequence[str] = ('mean', 'median'),
+                 quality_filter: bool = True, region: str = DEFAULT_REGION):
+        self.dataset_type = dataset_type.upper()
+        self.region = region
+        self.data = None
+        self.raw_data = None
+        self.class_labels = CLASS_LABELS
+        self.table_mapping = MEASUREMENT_TABLES
+
+        if self.dataset_type not in self.table_mapping:
+            raise ValueError(f"Unsupported dataset type: {dataset_type}. Use 'MCD43A3' or 'MOD10A1'")
+
+        unknown = set(fractions or []) - set(FRACTION_CLASSES)
+        if unknown:
+            raise ValueError(f"Unknown fractions: {sorted(unknown)}")
+
+        self.table_name = self.table_mapping[self.dataset_type]
+        self.source = source or DUCKDB_PATH
+        self.start_date = start_date
+        self.end_date = end_date
+        self.months = list(months) if months else None
+        self.fraction_classes = list(fractions) if fractions else FRACTION_CLASSES
+        self.variables = list(variables)
+        self.quality_filter = quality_filter
+
+    def build_query(self):
+        """
+        SQL query and parameters for the configured filters
+
+        Returns:
+            tuple: (sql, params)
+        """
+        columns = BASE_COLUMNS + [f"{fraction}_{variable}"
+                                  for fraction in self.fraction_classes
+                                  for variable in self.variables]
+        conditions, params = ["region = ?"], [self.region]
+
+        if self.start_date is not None:
+            conditions.append("date >= ?")
+            params.append(pd.Timestamp(self.start_date).date())
+        if self.end_date is not None:
+            conditions.append("date <= ?")
+            params.append(pd.Timestamp(self.end_date).date())
+        if self.months:
+            conditions.append(f"month(date) IN ({', '.join('?' * len(self.months))})")
+            params.extend(int(m) for m in self.months)
+        if self.quality_filter:
+            conditions.append("min_pixels_threshold >= 1")
+
+        sql = (f"SELECT {', '.join(columns)} FROM {SCHEMA}.{self.table_name} "
+               f"WHERE {' AND '.join(conditions)}")
+        return sql + " ORDER BY date", params
+
+    def probe(self):
+        """
+        Lightweight metadata probe (counts and date bounds come from the
+        DuckDB / Parquet metadata, no row is materialized)
+
+        Returns:
+            DatasetProbe: Row count, date range, columns and freshness stamp
+        """
+        from data.registry import DatasetProbe
+
+        conn = connect(self.source)
+        try:
+            table = f"{SCHEMA}.{self.table_name}"
+            row_count, date_min, date_max = conn.execute(
+                f"SELECT COUNT(*), MIN(date), MAX(date) FROM {table} WHERE region = ?",
+                [self.region]).fetchone()
+            columns = [row[0] for row in conn.execute(f"DESCRIBE {table}").fetchall()]
+        finally:
+            conn.close()
+
+        # Parquet layout: only this table's (and region's) files stamp its freshness
+        if os.path.isfile(self.source):
+            paths = [self.source]
+        else:
+            data_dir = os.path.join(self.source, self.table_name)
+            region_dir = os.path.join(data_dir, f"region={self.region}")
+            if os.path.isdir(region_dir):
+                data_dir = region_dir
+            paths = [os.path.join(data_dir, name) for name in os.listdir(data_dir)]
+        stamp = max(os.path.getmtime(p) for p in paths)
+        return DatasetProbe(
+            dataset=self.dataset_type,
+            source=f"{self.source} (region {self.region})",
+            row_count=int(row_count),
+            date_min=str(date_min) if date_min is not None else None,
+            date_max=str(date_max) if date_max is not None else None,
+            columns=columns,
+            freshness=pd.Timestamp.fromtimestamp(stamp).isoformat()
+        )
+
+    @traced('load')
+    def load_data(self):
+        """
+        Load and prepare data from the DuckDB / Parquet store
+
+        Returns:
+            self: For method chaining
+
+        Raises:
+            ValueError: If required columns are missing or no data found
+        """
+        print_section_header(f"Loading {self.dataset_type} data from DuckDB", level=2)
+
+        try:
+            sql, params = self.build_query()
+            conn = connect(self.source)
+            try:
+                with span('db.query', table=self.table_name):
+                    self.raw_data = conn.execute(sql, params).df()
+            finally:
+                conn.close()
+            count('db_rows_read', len(self.raw_data))
+
+            if len(self.raw_data) == 0:
+                raise ValueError(f"No data found in {self.table_name} for region {self.region}")
+
+            self.data = self.raw_data.copy()
+            count('rows_loaded', len(self.raw_data))
+
+            # Prepare the data (same steps as the PostgreSQL handler)
+            self._prepare_temporal_data()
+            self._filter_quality_data()
+            self._add_seasonal_variables()
+            self._validate_required_columns()
+
+            print(f"✓ Data loaded: {len(self.data)} observations")
+            print(f"✓ Period: {self.data['date'].min()} to {self.data['date'].max()}")
+
+            return self
+
+        except Exception as e:
+            raise ValueError(f"Failed to load data from DuckDB: {e}")
@@ -14,7 +14,9 @@ from typing import Optional, Dict, Any
 from config.settings import config
 from data.base_handler import BaseDataHandler
 from utils.exceptions import DataLoadError, AnalysisError
-from utils.helpers import print_section_header, validate_data, load_and_validate_csv
+from utils.helpers import print_section_header, validate_data
+from data.zip_source import read_csv_source
+from utils.instrumentation import traced, count
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +59,7 @@ class AlbedoDataHandler(BaseDataHandler):
             return len(self.data)
         return 0
         
+    @traced('load')
     def load_data(self):
         """
         Charge et prépare les données CSV
@@ -70,9 +73,13 @@ class AlbedoDataHandler(BaseDataHandler):
         """
         print_section_header("Chargement des données", level=2)
         
-        # Charger et valider le CSV
-        self.raw_data = load_and_validate_csv(self.csv_path)
+        # Charger et valider le CSV, extrait ou dans l'archive Drive la plus récente
+        # (types déclarés par produit si le fichier est connu)
+        dataset_config = self.dataset_config or config.find_dataset_by_path(self.csv_path)
+        read_options = dataset_config.csv_read_options() if dataset_config else {}
+        self.raw_data = read_csv_source(self.csv_path, **read_options)
         self.data = self.raw_data.copy()
+        count('rows_loaded', len(self.raw_data))
         
         # Préparer les données
         self._prepare_temporal_data()
@@ -85,6 +92,20 @@ class AlbedoDataHandler(BaseDataHandler):
         
         return self
     
+    def probe(self):
+        """
+        Métadonnées du CSV (en-tête, nombre de lignes, dates extrêmes, fraîcheur)
+        sans charger ni nettoyer les données
+        
+        Returns:
+            DatasetProbe: Métadonnées de la source
+        """
+        from data.registry import DatasetProbe
+        from data.zip_source import get_zip_resolver
+        
+        info = get_zip_resolver().probe(self.csv_path)
+        return DatasetProbe(dataset=self.dataset_name, **info)
+    
     def _prepare_temporal_data(self):
         """
         Prépare les variables temporelles
@@ -108,6 +129,7 @@ class AlbedoDataHandler(BaseDataHandler):
         if 'decimal_year' not in self.data.columns:
             self.data['decimal_year'] = self.data['year'] + (self.data['doy'] - 1) / 365.25
     
+    @traced('filter')
     def _filter_quality_data(self):
         """
         Filtre les données selon les critères de qualité
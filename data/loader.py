@@ -13,6 +13,8 @@ import os
 # Import from package
 from config import FRACTION_CLASSES, CLASS_LABELS, ANALYSIS_CONFIG
 from utils.helpers import print_section_header, validate_data
+from utils.instrumentation import traced, count
+from .zip_source import read_csv_source, csv_source_exists
 
 class SaskatchewanDataLoader:
     """
@@ -32,6 +34,7 @@ class SaskatchewanDataLoader:
         self.fraction_classes = FRACTION_CLASSES
         self.class_labels = CLASS_LABELS
         
+    @traced('load')
     def load_data(self):
         """
         Charge et prépare les données CSV
@@ -45,14 +48,15 @@ class SaskatchewanDataLoader:
         """
         print_section_header("Chargement des données", level=2)
         
-        # Vérifier l'existence du fichier
-        if not os.path.exists(self.csv_path):
+        # Vérifier l'existence du fichier (extrait ou dans une archive Drive)
+        if not csv_source_exists(self.csv_path):
             raise FileNotFoundError(f"Fichier non trouvé: {self.csv_path}")
         
         # Charger le CSV
         try:
-            self.raw_data = pd.read_csv(self.csv_path)
+            self.raw_data = read_csv_source(self.csv_path)
             self.data = self.raw_data.copy()
+            count('rows_loaded', len(self.raw_data))
             print(f"✓ Fichier chargé: {len(self.data)} lignes, {len(self.data.columns)} colonnes")
         except Exception as e:
             raise ValueError(f"Erreur lors du chargement du CSV: {e}")
@@ -91,6 +95,7 @@ class SaskatchewanDataLoader:
         if 'decimal_year' not in self.data.columns:
             self.data['decimal_year'] = self.data['year'] + (self.data['doy'] - 1) / 365.25
     
+    @traced('filter')
     def _filter_quality_data(self):
         """
         Filtre les données selon les critères de qualité
@@ -0,0 +1,455 @@
+#!/usr/bin/env python3
+"""
+Concurrent, resumable granule download manager
+==============================================
+
+Downloads MODIS granules with a bounded thread pool instead of the serial
+``GranuleHandler.download_from_granules`` calls:
+
+- byte-range resume: partial files are kept as ``<name>.part`` and continued
+  with an HTTP ``Range`` request on the next attempt or the next run
+- a local SQLite manifest (granule id, url, path, size, SHA-256 checksum,
+  status) so reruns skip granules that are already complete
+- retries with exponential backoff on network errors, 5xx and 429 responses
+- an aggregate throughput report (files, bytes, MB/s)
+
+The transport is either a ``requests``-like session (``ModisSession().session``
+for Earthdata) or the standard library (``urllib``), which makes the manager
+testable against a local ``http.server`` stand-in.
+"""
+
+import os
+import time
+import random
+import sqlite3
+import hashlib
+import threading
+import urllib.request
+import urllib.error
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urlsplit
+
+# Manifest statuses
+STATUS_PENDING = 'pending'
+STATUS_PARTIAL = 'partial'
+STATUS_COMPLETE = 'complete'
+STATUS_FAILED = 'failed'
+
+# HTTP statuses worth retrying (throttling and server-side errors)
+RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+
+CHUNK_SIZE = 2 ** 20  # 1 MB, same as GranuleHandler
+PART_SUFFIX = '.part'
+
+MANIFEST_SCHEMA = """
+CREATE TABLE IF NOT EXISTS granules (
+    granule_id  TEXT PRIMARY KEY,
+    product     TEXT,
+    url         TEXT NOT NULL,
+    path        TEXT NOT NULL,
+    size        INTEGER,
+    bytes_done  INTEGER DEFAULT 0,
+    checksum    TEXT,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER DEFAULT 0,
+    error       TEXT,
+    updated_at  TEXT
+)
+"""
+
+
+class DownloadError(Exception):
+    """Erreur de téléchargement d'un granule (retryable indique si on peut réessayer)"""
+
+    def __init__(self, message, retryable=True):
+        super().__init__(message)
+        self.retryable = retryable
+
+
+@dataclass
+class DownloadTask:
+    """A single granule to fetch"""
+    granule_id: str
+    url: str
+    path: Path
+    product: str = None
+
+
+@dataclass
+class DownloadReport:
+    """Aggregate result of a download run"""
+    completed: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    failed: dict = field(default_factory=dict)
+    bytes_downloaded: int = 0
+    elapsed_seconds: float = 0.0
+
+    @property
+    def throughput_mbps(self):
+        """Mean throughput over the whole run in MB/s"""
+        if self.elapsed_seconds <= 0:
+            return 0.0
+        return self.bytes_downloaded / (1024 * 1024) / self.elapsed_seconds
+
+    @property
+    def files(self):
+        """Local paths of every granule available after the run"""
+        return [Path(p) for p in self.completed + self.skipped]
+
+    def print_summary(self):
+        """Print the throughput report"""
+        print(f"\n📊 Download report:")
+        print(f"   Completed: {len(self.completed)}")
+        print(f"   Skipped (already in manifest): {len(self.skipped)}")
+        print(f"   Failed: {len(self.failed)}")
+        print(f"   Downloaded: {self.bytes_downloaded / (1024 * 1024):.1f} MB "
+              f"in {self.elapsed_seconds:.1f} s ({self.throughput_mbps:.2f} MB/s)")
+        for granule_id, error in self.failed.items():
+            print(f"   ❌ {granule_id}: {error}")
+
+
+class DownloadManifest:
+    """SQLite manifest of granule downloads (thread-safe, one connection + lock)"""
+
+    def __init__(self, manifest_path):
+        self.manifest_path = Path(manifest_path)
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.manifest_path), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        with self._lock, self._conn:
+            self._conn.execute(MANIFEST_SCHEMA)
+
+    def get(self, granule_id):
+        """Return the manifest row of a granule as a dict, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT * FROM granules WHERE granule_id = ?", (granule_id,)
+            ).fetchone()
+        return dict(row) if row else None
+
+    def register(self, task):
+        """Insert a granule as pending (existing rows keep their status)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO granules (granule_id, product, url, path, status, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (task.granule_id, task.product, task.url, str(task.path),
+                 STATUS_PENDING, _now())
+            )
+
+    def update(self, granule_id, **values):
+        """Update columns of a granule row"""
+        values['updated_at'] = _now()
+        assignments = ', '.join(f"{column} = ?" for column in values)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"UPDATE granules SET {assignments} WHERE granule_id = ?",
+                (*values.values(), granule_id)
+            )
+
+    def status_counts(self, product=None):
+        """Number of granules per status, optionally for one product"""
+        query = "SELECT status, COUNT(*) FROM granules"
+        params = ()
+        if product:
+            query += " WHERE product = ?"
+            params = (product,)
+        with self._lock:
+            rows = self._conn.execute(query + " GROUP BY status", params).fetchall()
+        return {status: count for status, count in rows}
+
+    def close(self):
+        self._conn.close()
+
+
+class GranuleDownloadManager:
+    """
+    Concurrent, resumable downloader backed by a SQLite manifest
+
+    Args:
+        manifest_path: SQLite manifest file (created if missing)
+        session: requests-like session (e.g. ``ModisSession().session``);
+            None uses urllib from the standard library
+        max_workers: Size of the thread pool
+        max_retries: Attempts per granule before it is marked failed
+        backoff_base: First backoff delay in seconds (doubled at each retry)
+        timeout: Socket timeout per request in seconds
+        resolve_url: Optional callable mapping a granule URL to the actual
+            download location (Earthdata redirect handling)
+        verify_checksums: Re-hash completed files before skipping them
+    """
+
+    def __init__(self, manifest_path, session=None, max_workers=4, max_retries=5,
+                 backoff_base=1.0, timeout=60, resolve_url=None, verify_checksums=False):
+        self.manifest = DownloadManifest(manifest_path)
+        self.session = session
+        self.max_workers = max(1, int(max_workers))
+        self.max_retries = max(1, int(max_retries))
+        self.backoff_base = backoff_base
+        self.timeout = timeout
+        self.resolve_url = resolve_url
+        self.verify_checksums = verify_checksums
+        self._bytes_lock = threading.Lock()
+        self._bytes_downloaded = 0
+
+    # ------------------------------------------------------------------
+    # Public API
+    # ------------------------------------------------------------------
+
+    def download(self, tasks):
+        """
+        Download all tasks with the thread pool
+
+        Args:
+            tasks: Iterable of DownloadTask
+
+        Returns:
+            DownloadReport: completed/skipped/failed granules and throughput
+        """
+        tasks = list(tasks)
+        report = DownloadReport()
+        self._bytes_downloaded = 0
+        start = time.perf_counter()
+
+        pending = []
+        for task in tasks:
+            self.manifest.register(task)
+            if self.is_complete(task):
+                report.skipped.append(str(task.path))
+            else:
+                pending.append(task)
+
+        print(f"📥 {len(pending)} granule(s) to download, "
+              f"{len(report.skipped)} already complete "
+              f"({self.max_workers} worker(s))")
+
+        if pending:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {executor.submit(self._download_with_retry, task): task
+                           for task in pending}
+                for i, future in enumerate(as_completed(futures), 1):
+                    task = futures[future]
+                    try:
+                        future.result()
+                        report.completed.append(str(task.path))
+                        print(f"   ✅ {i}/{len(pending)} {task.path.name}")
+                    except Exception as e:
+                        report.failed[task.granule_id] = str(e)
+                        print(f"   ❌ {i}/{len(pending)} {task.granule_id}: {e}")
+
+        report.bytes_downloaded = self._bytes_downloaded
+        report.elapsed_seconds = time.perf_counter() - start
+        return report
+
+    def is_complete(self, task):
+        """True if the manifest marks the granule complete and the file is intact"""
+        row = self.manifest.get(task.granule_id)
+        if not row or row['status'] != STATUS_COMPLETE:
+            return False
+
+        path = Path(row['path'])
+        if not path.exists() or (row['size'] is not None and path.stat().st_size != row['size']):
+            self.manifest.update(task.granule_id, status=STATUS_PENDING)
+            return False
+
+        if self.verify_checksums and row['checksum'] and file_checksum(path) != row['checksum']:
+            self.manifest.update(task.granule_id, status=STATUS_PENDING, error='checksum mismatch')
+            return False
+
+        return True
+
+    def close(self):
+        self.manifest.close()
+
+    # ------------------------------------------------------------------
+    # Download internals
+    # ------------------------------------------------------------------
+
+    def _download_with_retry(self, task):
+        """Download one granule, retrying with exponential backoff"""
+        last_error = None
+        for attempt in range(self.max_retries):
+            row = self.manifest.get(task.granule_id)
+            self.manifest.update(task.granule_id, attempts=(row['attempts'] or 0) + 1)
+            try:
+                return self._download_one(task)
+            except DownloadError as e:
+                last_error = e
+                if not e.retryable:
+                    break
+            except (OSError, urllib.error.URLError) as e:
+                last_error = e
+            except Exception as e:
+                # requests exceptions (ConnectionError, ChunkedEncodingError, ...)
+                if type(e).__module__.startswith('requests'):
+                    last_error = e
+                else:
+                    raise
+
+            if attempt < self.max_retries - 1:
+                delay = self.backoff_base * (2 ** attempt)
+                time.sleep(delay + random.uniform(0, delay / 2))
+
+        self.manifest.update(task.granule_id, status=STATUS_FAILED, error=str(last_error))
+        raise DownloadError(f"failed after {attempt + 1} attempt(s): {last_error}", retryable=False)
+
+    def _download_one(self, task):
+        """Download (or resume) one granule into <path>.part, then finalize it"""
+        path = Path(task.path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        part_path = path.with_name(path.name + PART_SUFFIX)
+        offset = part_path.stat().st_size if part_path.exists() else 0
+
+        url = self.resolve_url(task.url) if self.resolve_url else task.url
+        headers = {'Range': f'bytes={offset}-'} if offset else {}
+        status, response_headers, chunks, close = self._open(url, headers)
+
+        try:
+            if status == 416 and offset:
+                # Range not satisfiable: complete only if the .part file has the
+                # remote size (Content-Range: bytes */<size>, else the manifest)
+                total_size = _unsatisfied_range_size(response_headers)
+                if total_size is None:
+                    total_size = (self.manifest.get(task.granule_id) or {}).get('size')
+                if total_size is None or offset != total_size:
+                    part_path.unlink(missing_ok=True)
+                    self.manifest.update(task.granule_id, status=STATUS_PENDING, bytes_done=0)
+                    raise DownloadError(f"partial file of {offset} bytes does not match the remote "
+                                        f"size ({total_size}), restarting")
+            elif status in (200, 206):
+                if status == 200 and offset:
+                    # Server ignored the Range header: restart from scratch
+                    offset = 0
+                total_size = _total_size(status, response_headers, offset)
+                mode = 'ab' if offset else 'wb'
+                self.manifest.update(task.granule_id, status=STATUS_PARTIAL, size=total_size)
+                with open(part_path, mode) as handle:
+                    for chunk in chunks:
+                        if not chunk:
+                            continue
+                        handle.write(chunk)
+                        offset += len(chunk)
+                        with self._bytes_lock:
+                            self._bytes_downloaded += len(chunk)
+                self.manifest.update(task.granule_id, bytes_done=offset)
+            else:
+                raise DownloadError(f"HTTP {status} for {url}",
+                                    retryable=status in RETRYABLE_STATUS)
+        finally:
+            close()
+
+        if total_size is not None and offset != total_size:
+            raise DownloadError(f"incomplete transfer ({offset}/{total_size} bytes)")
+        if offset <= 1:
+            raise DownloadError("No file content found", retryable=False)
+
+        os.replace(part_path, path)
+        self.manifest.update(task.granule_id, status=STATUS_COMPLETE, size=offset,
+                             bytes_done=offset, checksum=file_checksum(path), error=None)
+        return path
+
+    def _open(self, url, headers):
+        """Open a streaming GET; returns (status, headers, chunk iterator, close)"""
+        if self.session is not None:
+            response = self.session.get(url, headers=headers, stream=True, timeout=self.timeout)
+            return (response.status_code, response.headers,
+                    response.iter_content(chunk_size=CHUNK_SIZE), response.close)
+
+        request = urllib.request.Request(url, headers=headers)
+        try:
+            response = urllib.request.urlopen(request, timeout=self.timeout)
+        except urllib.error.HTTPError as e:
+            e.close()
+            return e.code, e.headers, iter(()), lambda: None
+        chunks = iter(lambda: response.read(CHUNK_SIZE), b'')
+        return response.status, response.headers, chunks, response.close
+
+
+# ----------------------------------------------------------------------
+# Helpers
+# ----------------------------------------------------------------------
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _total_size(status, headers, offset):
+    """Expected final file size from Content-Range / Content-Length (None if unknown)"""
+    if status == 206:
+        content_range = headers.get('Content-Range', '')
+        if '/' in content_range and not content_range.endswith('/*'):
+            return int(content_range.rsplit('/', 1)[1])
+    length = headers.get('Content-Length')
+    if length is None:
+        return None
+    return offset + int(length) if status == 206 else int(length)
+
+
+def _unsatisfied_range_size(headers):
+    """Remote file size from the Content-Range of a 416 response (None if absent)"""
+    content_range = headers.get('Content-Range', '') if headers else ''
+    if content_range.startswith('bytes */'):
+        try:
+            return int(content_range[len('bytes */'):])
+        except ValueError:
+            return None
+    return None
+
+
+def file_checksum(path, algorithm='sha256'):
+    """Hash a file by 1 MB blocks"""
+    digest = hashlib.new(algorithm)
+    with open(path, 'rb') as handle:
+        for block in iter(lambda: handle.read(CHUNK_SIZE), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def tasks_from_urls(urls, output_dir, product=None):
+    """Build DownloadTask objects from plain URLs (granule id = file name)"""
+    tasks = []
+    for url in urls:
+        filename = Path(urlsplit(str(url)).path).name
+        tasks.append(DownloadTask(granule_id=filename, url=str(url),
+                                  path=Path(output_dir) / filename, product=product))
+    return tasks
+
+
+def tasks_from_granules(granules, output_dir, product=None, ext=("hdf",)):
+    """
+    Build DownloadTask objects from modis_tools Granule objects
+
+    Uses the same link selection as ``GranuleHandler.download_from_granules``.
+    """
+    from modis_tools.granule_handler import GranuleHandler
+
+    urls = []
+    for granule in granules:
+        try:
+            urls.append(GranuleHandler.get_url_from_granule(granule, ext))
+        except Exception as e:
+            print(f"   ⚠️  No {ext} link for granule {getattr(granule, 'title', granule)}: {e}")
+    return tasks_from_urls(urls, output_dir, product)
+
+
+def earthdata_url_resolver(modis_session):
+    """
+    URL resolver reproducing the Earthdata redirect handling of modis_tools
+
+    Without download cookies the granule URL redirects to the Earthdata login;
+    modis_tools resolves the final location first, then downloads from it.
+    """
+    from pydantic import AnyUrl
+    from modis_tools.auth import has_download_cookies
+    from modis_tools.granule_handler import GranuleHandler
+
+    def resolve(url):
+        if has_download_cookies(modis_session.session):
+            return url
+        return GranuleHandler._get_location(AnyUrl(url), modis_session)
+
+    return resolve
@@ -5,12 +5,18 @@ Focus only on the working product
 """
 
 import os
+import sys
 import glob
 import subprocess
 from pathlib import Path
 from modis_tools.auth import ModisSession
 from modis_tools.resources import CollectionApi, GranuleApi
-from modis_tools.granule_handler import GranuleHandler
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.modis.downloaders.download_manager import (GranuleDownloadManager, tasks_from_granules,
+                                                     earthdata_url_resolver)
+from data.modis.processing.clip_pipeline import ClipPipeline
 
 # Optional spatial processing
 try:
@@ -22,7 +28,7 @@ except ImportError:
 class MCD43A3Downloader:
     """Simple downloader for MCD43A3 albedo data only"""
     
-    def __init__(self, username, password, glacier_mask_path=None):
+    def __init__(self, username, password, glacier_mask_path=None, max_workers=4):
         self.username = username
         self.password = password
         self.session = None
@@ -35,6 +41,10 @@ class MCD43A3Downloader:
         self.output_dir = Path("D:/Downloads/MCD43A3_downloads")
         self.output_dir.mkdir(exist_ok=True)
         
+        # Download manifest: reruns skip granules already fetched
+        self.max_workers = max_workers
+        self.manifest_path = self.output_dir / "download_manifest.sqlite"
+        
         # Load glacier mask if provided
         if glacier_mask_path:
             self._load_glacier_mask(glacier_mask_path)
@@ -113,50 +123,37 @@ class MCD43A3Downloader:
             print("❌ No granules found for your criteria")
             return []
         
-        # Download with very conservative settings
         print(f"📥 Starting download of {len(granules_list)} files...")
-        print(f"   Using single thread to avoid timeout")
         
+        tasks = tasks_from_granules(granules_list, self.output_dir, "MCD43A3", ext=("hdf",))
+        manager = GranuleDownloadManager(
+            self.manifest_path,
+            session=self.session.session,
+            max_workers=self.max_workers,
+            resolve_url=earthdata_url_resolver(self.session)
+        )
         try:
-            file_paths = GranuleHandler.download_from_granules(
-                granules_list,
-                modis_session=self.session,
-                path=str(self.output_dir),
-                threads=1,  # Single thread
-                ext=("hdf",)  # Only HDF files
-            )
-            
-            print(f"✅ Successfully downloaded {len(file_paths)} files!")
-            
-            # Show downloaded files
-            for i, path in enumerate(file_paths, 1):
-                if os.path.exists(path):
-                    size_mb = os.path.getsize(path) / (1024 * 1024)
-                    filename = os.path.basename(path)
-                    print(f"   {i}. {filename} ({size_mb:.1f} MB)")
-            
-            return file_paths
-            
-        except Exception as e:
-            print(f"❌ Download failed: {e}")
-            print(f"   Error type: {type(e).__name__}")
-            
-            # Try with just one file
-            if len(granules_list) > 1:
-                print(f"🔄 Retrying with just 1 file...")
-                try:
-                    file_paths = GranuleHandler.download_from_granules(
-                        granules_list[:1],
-                        modis_session=self.session,
-                        path=str(self.output_dir),
-                        threads=1
-                    )
-                    print(f"✅ Downloaded {len(file_paths)} file(s) on retry")
-                    return file_paths
-                except Exception as e2:
-                    print(f"❌ Retry also failed: {e2}")
-            
-            return []
+            report = manager.download(tasks)
+        finally:
+            manager.close()
+        report.print_summary()
+        
+        file_paths = report.files
+        if file_paths:
+            print(f"✅ {len(file_paths)} files available!")
+        
+        # Show downloaded files
+        for i, path in enumerate(file_paths, 1):
+            if os.path.exists(path):
+                size_mb = os.path.getsize(path) / (1024 * 1024)
+                filename = os.path.basename(path)
+                print(f"   {i}. {filename} ({size_mb:.1f} MB)")
+        
+        if report.failed:
+            print(f"💡 Rerun to retry the {len(report.failed)} failed granule(s); "
+                  f"partial files are resumed")
+        
+        return file_paths
     
     def check_gdal_availability(self):
         """Check if GDAL command line tools are available"""
@@ -173,60 +170,14 @@ class MCD43A3Downloader:
             print("⚠️  GDAL command line tools not found")
             return False
     
-    def list_hdf_subdatasets(self, hdf_file):
-        """List subdatasets in HDF file using gdalinfo"""
-        try:
-            result = subprocess.run(['gdalinfo', str(hdf_file)], 
-                                  capture_output=True, text=True, timeout=30)
-            
-            if result.returncode != 0:
-                return []
-            
-            # Parse subdatasets from gdalinfo output
-            subdatasets = []
-            lines = result.stdout.split('\n')
-            
-            for line in lines:
-                if 'SUBDATASET_' in line and '_NAME=' in line:
-                    if '=' in line:
-                        subdataset = line.split('=', 1)[1]
-                        subdatasets.append(subdataset)
-            
-            return subdatasets
-            
-        except Exception:
-            return []
-    
-    def clip_with_gdal_warp(self, input_dataset, output_file, glacier_geojson):
-        """Clip using gdal_warp command line tool"""
-        try:
-            cmd = [
-                'gdalwarp',
-                '-of', 'GTiff',
-                '-co', 'COMPRESS=LZW',
-                '-cutline', glacier_geojson,
-                '-crop_to_cutline',
-                '-dstnodata', '-9999',
-                input_dataset,
-                output_file
-            ]
-            
-            result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-            
-            if result.returncode == 0 and os.path.exists(output_file):
-                size_mb = os.path.getsize(output_file) / (1024 * 1024)
-                print(f"      ✅ Clipped: {os.path.basename(output_file)} ({size_mb:.2f} MB)")
-                return True
-            else:
-                print(f"      ❌ Clipping failed")
-                return False
-                
-        except Exception as e:
-            print(f"      ❌ Error in clipping: {e}")
-            return False
-    
-    def auto_clip_downloaded_files(self):
-        """Automatically clip downloaded HDF files to glacier geometry"""
+    def auto_clip_downloaded_files(self, workers=None, stack=None):
+        """
+        Automatically clip downloaded HDF files to glacier geometry
+        
+        Args:
+            workers: Concurrent gdalwarp jobs (default: all cores)
+            stack: None, 'vrt' or 'gtiff' for one multi-band stack per day
+        """
         print(f"\n✂️  Auto-clipping downloaded files to glacier geometry...")
         
         # Check if we have the required tools and files
@@ -268,43 +219,10 @@ class MCD43A3Downloader:
         
         print(f"📁 Clipped files will be saved to: {clipped_dir}")
         
-        success_count = 0
-        
-        for i, hdf_file in enumerate(hdf_files, 1):
-            filename = hdf_file.name
-            print(f"\n🔄 Clipping {i}/{len(hdf_files)}: {filename}")
-            
-            # Get subdatasets
-            subdatasets = self.list_hdf_subdatasets(hdf_file)
-            
-            if not subdatasets:
-                print("   ❌ No subdatasets found")
-                continue
-            
-            # Find albedo datasets
-            albedo_datasets = [s for s in subdatasets if 'Albedo' in s and ('shortwave' in s or 'WSA' in s)]
-            
-            if not albedo_datasets:
-                albedo_datasets = [s for s in subdatasets if 'Albedo' in s]
-            
-            if not albedo_datasets:
-                print("   ⚠️  No albedo datasets found")
-                continue
-            
-            print(f"   📊 Processing {len(albedo_datasets)} albedo dataset(s)")
-            
-            for j, dataset in enumerate(albedo_datasets):
-                dataset_name = dataset.split(':')[-1] if ':' in dataset else f"dataset_{j}"
-                print(f"   📈 Clipping: {dataset_name}")
-                
-                # Create output filename
-                base_name = filename.replace('.hdf', '')
-                output_filename = f"{base_name}_{dataset_name}_clipped.tif"
-                output_path = clipped_dir / output_filename
-                
-                # Clip using gdal_warp
-                if self.clip_with_gdal_warp(dataset, str(output_path), glacier_mask_path):
-                    success_count += 1
+        pipeline = ClipPipeline(glacier_mask_path, clipped_dir, workers=workers, stack=stack)
+        report = pipeline.run(hdf_files)
+        report.print_summary()
+        success_count = len(report.clipped) + len(report.skipped)
         
         print(f"\n🎉 Auto-clipping complete!")
         print(f"   Successfully clipped: {success_count} datasets")
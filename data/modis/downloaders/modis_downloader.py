@@ -12,7 +12,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from modis_tools.auth import ModisSession
 from modis_tools.resources import CollectionApi, GranuleApi
-from modis_tools.granule_handler import GranuleHandler
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.modis.downloaders.download_manager import (GranuleDownloadManager, tasks_from_granules,
+                                                     earthdata_url_resolver)
 
 # Optional spatial processing imports
 try:
@@ -133,7 +137,7 @@ def print_environment_info():
 class SaskatchewanGlacierModisDownloader:
     """Download MODIS data for Saskatchewan Glacier analysis"""
     
-    def __init__(self, username=None, password=None, glacier_mask_path=None):
+    def __init__(self, username=None, password=None, glacier_mask_path=None, max_workers=4):
         """
         Initialize downloader with NASA Earthdata credentials
         
@@ -141,6 +145,7 @@ class SaskatchewanGlacierModisDownloader:
             username: NASA Earthdata username (optional if using .netrc)
             password: NASA Earthdata password (optional if using .netrc)
             glacier_mask_path: Path to glacier mask file (GeoJSON, shapefile, etc.)
+            max_workers: Concurrent downloads (bounded thread pool)
         """
         self.username = username
         self.password = password
@@ -157,6 +162,10 @@ class SaskatchewanGlacierModisDownloader:
         self.snow_dir = self.data_dir / "MOD10A1_snow_cover"
         self.albedo_dir = self.data_dir / "MCD43A3_albedo"
         
+        # Resumable downloads: the manifest lets reruns skip completed granules
+        self.max_workers = max_workers
+        self.manifest_path = self.data_dir / "download_manifest.sqlite"
+        
         self._create_directories()
         self._load_glacier_mask()
     
@@ -316,14 +325,7 @@ class SaskatchewanGlacierModisDownloader:
         
         if granules_list:
             print("📥 Downloading MOD10A1 snow cover data...")
-            print(f"   Using conservative download settings to avoid timeout...")
-            file_paths = GranuleHandler.download_from_granules(
-                granules_list, 
-                modis_session=self.session, 
-                path=str(self.snow_dir),
-                threads=2,  # Reduced threads to avoid overwhelming server
-                ext=("hdf",)  # Only HDF files to reduce download size
-            )
+            file_paths = self.download_granules(granules_list, self.snow_dir, "MOD10A1")
             print(f"✅ Downloaded {len(file_paths)} MOD10A1 files to {self.snow_dir}")
             return file_paths
         
@@ -368,19 +370,41 @@ class SaskatchewanGlacierModisDownloader:
         
         if granules_list:
             print("📥 Downloading MCD43A3 albedo data...")
-            print(f"   Using conservative download settings to avoid timeout...")
-            file_paths = GranuleHandler.download_from_granules(
-                granules_list, 
-                modis_session=self.session, 
-                path=str(self.albedo_dir),
-                threads=2,  # Reduced threads to avoid overwhelming server
-                ext=("hdf",)  # Only HDF files to reduce download size
-            )
+            file_paths = self.download_granules(granules_list, self.albedo_dir, "MCD43A3")
             print(f"✅ Downloaded {len(file_paths)} MCD43A3 files to {self.albedo_dir}")
             return file_paths
         
         return []
     
+    def download_granules(self, granules_list, target_dir, product):
+        """
+        Download granules concurrently with byte-range resume
+        
+        Completed granules are recorded in the SQLite manifest and skipped on
+        reruns; interrupted files are resumed from their .part file.
+        
+        Args:
+            granules_list: modis_tools Granule objects
+            target_dir: Output directory
+            product: Product name stored in the manifest (MOD10A1, MCD43A3)
+            
+        Returns:
+            list: Paths of the available HDF files
+        """
+        tasks = tasks_from_granules(granules_list, target_dir, product, ext=("hdf",))
+        manager = GranuleDownloadManager(
+            self.manifest_path,
+            session=self.session.session,
+            max_workers=self.max_workers,
+            resolve_url=earthdata_url_resolver(self.session)
+        )
+        try:
+            report = manager.download(tasks)
+        finally:
+            manager.close()
+        report.print_summary()
+        return report.files
+    
     def download_glacier_data(self, start_date, end_date, limit_per_product=None):
         """
         Download both snow cover and albedo data for the glacier
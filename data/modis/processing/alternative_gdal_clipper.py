@@ -5,6 +5,7 @@ Avoids rasterio UTF-8 encoding issues
 """
 
 import os
+import sys
 import glob
 import geopandas as gpd
 import subprocess
@@ -12,6 +13,10 @@ import tempfile
 import numpy as np
 from pathlib import Path
 
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+from data.modis.processing.clip_pipeline import ClipPipeline
+
 def check_gdal_installation():
     """Check if GDAL command line tools are available"""
     try:
@@ -27,69 +32,14 @@ def check_gdal_installation():
         print("❌ GDAL command line tools not found")
         return False
 
-def list_hdf_subdatasets(hdf_file):
-    """List subdatasets in HDF file using gdalinfo"""
-    try:
-        result = subprocess.run(['gdalinfo', hdf_file], 
-                              capture_output=True, text=True, timeout=30)
-        
-        if result.returncode != 0:
-            print(f"   ❌ gdalinfo failed: {result.stderr}")
-            return []
-        
-        # Parse subdatasets from gdalinfo output
-        subdatasets = []
-        lines = result.stdout.split('\n')
-        
-        for line in lines:
-            if 'SUBDATASET_' in line and '_NAME=' in line:
-                # Extract the HDF4_EOS path
-                if '=' in line:
-                    subdataset = line.split('=', 1)[1]
-                    subdatasets.append(subdataset)
-        
-        return subdatasets
-        
-    except Exception as e:
-        print(f"   ❌ Error listing subdatasets: {e}")
-        return []
-
-def clip_with_gdal_warp(input_dataset, output_file, glacier_geojson):
-    """Clip using gdal_warp command line tool"""
-    try:
-        # Build gdal_warp command
-        cmd = [
-            'gdalwarp',
-            '-of', 'GTiff',
-            '-co', 'COMPRESS=LZW',
-            '-cutline', glacier_geojson,
-            '-crop_to_cutline',
-            '-dstnodata', '-9999',
-            input_dataset,
-            output_file
-        ]
-        
-        # Execute command
-        result = subprocess.run(cmd, capture_output=True, text=True, timeout=120)
-        
-        if result.returncode == 0:
-            if os.path.exists(output_file):
-                size_mb = os.path.getsize(output_file) / (1024 * 1024)
-                print(f"      ✅ Created: {os.path.basename(output_file)} ({size_mb:.2f} MB)")
-                return True
-            else:
-                print("      ❌ Output file not created")
-                return False
-        else:
-            print(f"      ❌ gdal_warp failed: {result.stderr}")
-            return False
-            
-    except Exception as e:
-        print(f"      ❌ Error in gdal_warp: {e}")
-        return False
-
-def process_with_gdal():
-    """Process MODIS files using pure GDAL command line tools"""
+def process_with_gdal(workers=None, stack=None):
+    """
+    Process MODIS files using pure GDAL command line tools
+    
+    Args:
+        workers: Concurrent gdalwarp jobs (default: all cores)
+        stack: None, 'vrt' or 'gtiff' for one multi-band stack per day
+    """
     print("🛠️  Alternative GDAL-based MODIS Clipper")
     print("=" * 45)
     
@@ -135,46 +85,12 @@ def process_with_gdal():
     os.makedirs(output_directory, exist_ok=True)
     print(f"📁 Output directory: {output_directory}")
     
-    success_count = 0
-    
-    for i, hdf_file in enumerate(hdf_files, 1):
-        filename = os.path.basename(hdf_file)
-        print(f"\n🔄 Processing {i}/{len(hdf_files)}: {filename}")
-        
-        # List subdatasets using gdalinfo
-        subdatasets = list_hdf_subdatasets(hdf_file)
-        
-        if not subdatasets:
-            print("   ❌ No subdatasets found")
-            continue
-        
-        print(f"   📊 Found {len(subdatasets)} subdatasets")
-        
-        # Find albedo datasets
-        albedo_datasets = [s for s in subdatasets if 'Albedo' in s and ('shortwave' in s or 'WSA' in s)]
-        
-        if not albedo_datasets:
-            # Try any albedo dataset
-            albedo_datasets = [s for s in subdatasets if 'Albedo' in s]
-        
-        if not albedo_datasets:
-            print("   ⚠️  No albedo datasets found")
-            continue
-        
-        print(f"   🎯 Processing {len(albedo_datasets)} albedo dataset(s)")
-        
-        for j, dataset in enumerate(albedo_datasets):
-            dataset_name = dataset.split(':')[-1] if ':' in dataset else f"dataset_{j}"
-            print(f"   📈 Processing: {dataset_name}")
-            
-            # Create output filename
-            base_name = os.path.splitext(filename)[0]
-            output_filename = f"{base_name}_{dataset_name}_clipped.tif"
-            output_path = os.path.join(output_directory, output_filename)
-            
-            # Clip using gdal_warp
-            if clip_with_gdal_warp(dataset, output_path, glacier_mask_path):
-                success_count += 1
+    # Subdatasets listed once per file, gdalwarp jobs run concurrently,
+    # outputs with unchanged inputs are skipped
+    pipeline = ClipPipeline(glacier_mask_path, output_directory, workers=workers, stack=stack)
+    report = pipeline.run(hdf_files)
+    report.print_summary()
+    success_count = len(report.clipped) + len(report.skipped)
     
     print(f"\n🎉 Processing complete!")
     print(f"   Successfully processed: {success_count} datasets")
@@ -0,0 +1,344 @@
+#!/usr/bin/env python3
+"""
+Parallel HDF subdataset extraction and clipping pipeline
+========================================================
+
+Replaces the one-file-at-a-time loops of ``auto_clip_downloaded_files`` and
+``alternative_gdal_clipper.process_with_gdal``:
+
+1. list: ``gdalinfo`` runs once per HDF file (concurrently) and its subdataset
+   list is parsed once
+2. warp: one ``gdalwarp`` job per selected subdataset, run on a pool of
+   workers (threads waiting on GDAL subprocesses, so every core is used)
+3. stack (optional): one multi-band VRT or GeoTIFF per acquisition day
+
+Outputs whose inputs are unchanged (same HDF size/mtime, same mask, same
+options) are skipped using a small JSON state file in the output directory.
+Each stage reports its wall time and the summed job time.
+"""
+
+import os
+import json
+import time
+import subprocess
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+
+STATE_FILENAME = '.clip_state.json'
+WARP_TIMEOUT = 120
+INFO_TIMEOUT = 30
+
+STACK_FORMATS = ('vrt', 'gtiff')
+
+# Keep every pixel touched by the glacier outline: the GEE reductions include
+# border pixels, and the zonal fractions are computed on that footprint
+CUTLINE_OPTIONS = ['-wo', 'CUTLINE_ALL_TOUCHED=TRUE']
+
+
+def check_gdal_tools():
+    """True if the GDAL command line tools are on the PATH"""
+    try:
+        result = subprocess.run(['gdalinfo', '--version'],
+                                capture_output=True, text=True, timeout=10)
+        return result.returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
+
+
+def parse_subdatasets(gdalinfo_output):
+    """
+    Extract subdataset names from gdalinfo output
+
+    Args:
+        gdalinfo_output (str): stdout of ``gdalinfo file.hdf``
+
+    Returns:
+        list: Subdataset names (HDF4_EOS:EOS_GRID:...)
+    """
+    subdatasets = []
+    for line in gdalinfo_output.splitlines():
+        if 'SUBDATASET_' in line and '_NAME=' in line:
+            subdatasets.append(line.split('=', 1)[1].strip())
+    return subdatasets
+
+
+def select_albedo_datasets(subdatasets):
+    """
+    Default subdataset selection (shortwave / WSA albedo, else any albedo)
+
+    Same rule as the original clipping loops.
+    """
+    selected = [s for s in subdatasets if 'Albedo' in s and ('shortwave' in s or 'WSA' in s)]
+    if not selected:
+        selected = [s for s in subdatasets if 'Albedo' in s]
+    return selected
+
+
+def subdataset_short_name(subdataset, index=0):
+    """Last component of a subdataset name (band name used in output files)"""
+    return subdataset.split(':')[-1] if ':' in subdataset else f"dataset_{index}"
+
+
+def file_signature(path):
+    """Size and modification time identifying a version of a file"""
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+@dataclass(eq=False)
+class WarpJob:
+    """One gdalwarp call: a subdataset of an HDF file to a clipped GeoTIFF"""
+    hdf_file: str
+    subdataset: str
+    output_path: str
+    signature: dict
+
+
+@dataclass
+class ClipReport:
+    """Result of a pipeline run with per-stage timing"""
+    clipped: list = field(default_factory=list)
+    skipped: list = field(default_factory=list)
+    failed: dict = field(default_factory=dict)
+    stacks: list = field(default_factory=list)
+    stage_wall: dict = field(default_factory=dict)
+    stage_busy: dict = field(default_factory=dict)
+
+    def print_summary(self):
+        """Print counts and the per-stage timing table"""
+        print(f"\n📊 Clipping report:")
+        print(f"   Clipped: {len(self.clipped)}")
+        print(f"   Skipped (unchanged): {len(self.skipped)}")
+        print(f"   Failed: {len(self.failed)}")
+        if self.stacks:
+            print(f"   Daily stacks: {len(self.stacks)}")
+        print(f"\n⏱️  Stage timing (wall / summed job time):")
+        for stage, wall in self.stage_wall.items():
+            busy = self.stage_busy.get(stage, 0.0)
+            print(f"   {stage:<6} {wall:8.2f} s / {busy:8.2f} s")
+        for output, error in self.failed.items():
+            print(f"   ❌ {os.path.basename(output)}: {error}")
+
+
+class ClipPipeline:
+    """
+    Clip HDF subdatasets to the glacier mask with a worker pool
+
+    Args:
+        mask_path: Glacier cutline (GeoJSON, shapefile, ...)
+        output_dir: Directory of the clipped GeoTIFFs
+        workers: Concurrent GDAL processes (default: all cores)
+        dataset_filter: Callable selecting subdatasets from the full list
+            (default: select_albedo_datasets)
+        stack: None, 'vrt' or 'gtiff' to also write one multi-band stack per day
+        warp_options: Extra gdalwarp arguments
+    """
+
+    def __init__(self, mask_path, output_dir, workers=None, dataset_filter=None,
+                 stack=None, warp_options=None):
+        if stack is not None and stack not in STACK_FORMATS:
+            raise ValueError(f"stack doit être None ou parmi {STACK_FORMATS}")
+
+        self.mask_path = str(mask_path)
+        self.output_dir = Path(output_dir)
+        self.workers = workers or os.cpu_count() or 1
+        self.dataset_filter = dataset_filter or select_albedo_datasets
+        self.stack = stack
+        self.warp_options = list(warp_options or [])
+        self.state_path = self.output_dir / STATE_FILENAME
+
+    # ------------------------------------------------------------------
+    # Stages
+    # ------------------------------------------------------------------
+
+    def run(self, hdf_files):
+        """
+        Run list → warp → (stack) on a set of HDF files
+
+        Args:
+            hdf_files: Paths of the HDF granules
+
+        Returns:
+            ClipReport: Outputs, failures and per-stage timing
+        """
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        hdf_files = [str(f) for f in hdf_files]
+        report = ClipReport()
+        state = self._load_state()
+
+        print(f"✂️  Clipping {len(hdf_files)} HDF file(s) with {self.workers} worker(s)")
+
+        subdatasets = self._run_stage('list', report, hdf_files, self._list_subdatasets)
+        jobs = self._plan_jobs(subdatasets)
+        print(f"   {len(jobs)} subdataset(s) selected")
+
+        pending = []
+        for job in jobs:
+            if state.get(job.output_path) == job.signature and os.path.exists(job.output_path):
+                report.skipped.append(job.output_path)
+            else:
+                pending.append(job)
+
+        results = self._run_stage('warp', report, pending, self._warp)
+        for job in pending:
+            error = results.get(job)
+            if error is None:
+                report.clipped.append(job.output_path)
+                state[job.output_path] = job.signature
+            else:
+                report.failed[job.output_path] = error
+                state.pop(job.output_path, None)
+        self._save_state(state)
+
+        if self.stack:
+            by_day = defaultdict(list)
+            changed_days = set()
+            clipped = set(report.clipped)
+            for job in jobs:
+                if job.output_path not in report.failed:
+                    day = self._day_key(job.hdf_file)
+                    by_day[day].append(job.output_path)
+                    if job.output_path in clipped:
+                        changed_days.add(day)
+            # Only rebuild stacks whose bands changed (or that do not exist yet)
+            days = [(day, tuple(sorted(paths))) for day, paths in sorted(by_day.items())
+                    if day in changed_days or not os.path.exists(self._stack_path(day))]
+            stacks = self._run_stage('stack', report, days, self._build_stack)
+            for (day, _), error in stacks.items():
+                if error is None:
+                    report.stacks.append(self._stack_path(day))
+                else:
+                    report.failed[self._stack_path(day)] = error
+
+        return report
+
+    def _run_stage(self, name, report, items, func):
+        """Run func over items on the pool; returns {item: result} and records timing"""
+        start = time.perf_counter()
+        busy = 0.0
+        results = {}
+
+        def timed(item):
+            t0 = time.perf_counter()
+            result = func(item)
+            return result, time.perf_counter() - t0
+
+        if items:
+            with ThreadPoolExecutor(max_workers=self.workers) as executor:
+                futures = {executor.submit(timed, item): item for item in items}
+                for future in as_completed(futures):
+                    results[futures[future]], elapsed = future.result()
+                    busy += elapsed
+
+        report.stage_wall[name] = time.perf_counter() - start
+        report.stage_busy[name] = busy
+        return results
+
+    def _list_subdatasets(self, hdf_file):
+        """gdalinfo once per file → parsed subdataset list"""
+        try:
+            result = subprocess.run(['gdalinfo', hdf_file],
+                                    capture_output=True, text=True, timeout=INFO_TIMEOUT)
+        except (OSError, subprocess.SubprocessError) as e:
+            print(f"   ❌ gdalinfo failed for {os.path.basename(hdf_file)}: {e}")
+            return []
+        if result.returncode != 0:
+            print(f"   ❌ gdalinfo failed for {os.path.basename(hdf_file)}: {result.stderr.strip()}")
+            return []
+        return parse_subdatasets(result.stdout)
+
+    def _plan_jobs(self, subdatasets_by_file):
+        """Build one WarpJob per selected subdataset"""
+        mask_signature = file_signature(self.mask_path) if os.path.exists(self.mask_path) else None
+        jobs = []
+        for hdf_file in sorted(subdatasets_by_file):
+            selected = self.dataset_filter(subdatasets_by_file[hdf_file])
+            if not selected:
+                print(f"   ⚠️  No matching subdataset in {os.path.basename(hdf_file)}")
+                continue
+            base_name = os.path.splitext(os.path.basename(hdf_file))[0]
+            signature = {
+                'input': file_signature(hdf_file),
+                'mask': mask_signature,
+                'options': [*CUTLINE_OPTIONS, *self.warp_options],
+            }
+            for j, subdataset in enumerate(selected):
+                output = self.output_dir / f"{base_name}_{subdataset_short_name(subdataset, j)}_clipped.tif"
+                jobs.append(WarpJob(hdf_file, subdataset, str(output), signature))
+        return jobs
+
+    def _warp(self, job):
+        """Run gdalwarp for one job; returns None on success, else the error"""
+        # Write to a temporary name so an interrupted job never looks complete
+        tmp_output = job.output_path + '.tmp.tif'
+        cmd = [
+            'gdalwarp', '-overwrite',
+            '-of', 'GTiff',
+            '-co', 'COMPRESS=LZW',
+            '-cutline', self.mask_path,
+            '-crop_to_cutline',
+            *CUTLINE_OPTIONS,
+            '-dstnodata', '-9999',
+            *self.warp_options,
+            job.subdataset,
+            tmp_output
+        ]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=WARP_TIMEOUT)
+        except (OSError, subprocess.SubprocessError) as e:
+            return str(e)
+        if result.returncode != 0 or not os.path.exists(tmp_output):
+            return result.stderr.strip() or "output not created"
+        os.replace(tmp_output, job.output_path)
+        return None
+
+    def _build_stack(self, day_item):
+        """One multi-band stack (VRT, optionally translated to GeoTIFF) per day"""
+        day, paths = day_item
+        vrt_path = str(self.output_dir / f"{day}_stack.vrt")
+        cmd = ['gdalbuildvrt', '-overwrite', '-separate', vrt_path, *paths]
+        try:
+            result = subprocess.run(cmd, capture_output=True, text=True, timeout=WARP_TIMEOUT)
+            if result.returncode != 0:
+                return result.stderr.strip() or "gdalbuildvrt failed"
+            if self.stack == 'gtiff':
+                cmd = ['gdal_translate', '-of', 'GTiff', '-co', 'COMPRESS=LZW',
+                       vrt_path, str(self._stack_path(day))]
+                result = subprocess.run(cmd, capture_output=True, text=True, timeout=WARP_TIMEOUT)
+                if result.returncode != 0:
+                    return result.stderr.strip() or "gdal_translate failed"
+                os.remove(vrt_path)
+        except (OSError, subprocess.SubprocessError) as e:
+            return str(e)
+        return None
+
+    # ------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _day_key(hdf_file):
+        """Product + acquisition day of a granule (e.g. MCD43A3.A2020153)"""
+        parts = os.path.basename(hdf_file).split('.')
+        return '.'.join(parts[:2]) if len(parts) >= 2 else parts[0]
+
+    def _stack_path(self, day):
+        suffix = 'vrt' if self.stack == 'vrt' else 'tif'
+        return str(self.output_dir / f"{day}_stack.{suffix}")
+
+    def _load_state(self):
+        if self.state_path.exists():
+            try:
+                with open(self.state_path) as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    def _save_state(self, state):
+        tmp_path = self.state_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f, indent=1)
+        os.replace(tmp_path, self.state_path)
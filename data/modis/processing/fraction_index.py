@@ -0,0 +1,480 @@
+#!/usr/bin/env python3
+"""
+Precomputed pixel-to-fraction index for repeated zonal reductions
+=================================================================
+
+Builds once, from ``data/modis/masks/saskatchewan_glacier_mask.geojson``, the
+glacier coverage fraction of every MODIS 500 m pixel (same supersampling idea
+as ``calculatePixelFraction`` in the GEE scripts: ~30 m samples averaged per
+500 m cell) and stores it as a compact .npy sidecar:
+
+- flat pixel offsets into the clipped raster window
+- fraction class label per pixel (config.FRACTION_CLASSES order)
+- elevation-zone label per pixel (above/at/below median, optional DEM)
+
+Pixels are stored sorted by (class, zone) so every class and every
+class × zone combination is a contiguous segment. Daily reductions then
+become ``np.add.reduceat`` / ``np.bincount`` over gathered pixels instead of
+one boolean mask per class, and one index serves every product and day.
+"""
+
+import sys
+import json
+import warnings
+from pathlib import Path
+
+import numpy as np
+from matplotlib.path import Path as PolygonPath
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+from data.modis.processing.zonal_stats import classify_fractions, FRACTION_CLASSES, FRACTION_THRESHOLDS
+
+# MODIS sinusoidal grid (500 m products, 2400 × 2400 pixels per tile)
+SPHERE_RADIUS = 6371007.181
+GRID_X_MIN = -20015109.354
+GRID_Y_MAX = 10007554.677
+PIXEL_SIZE = 1111950.5197665233 / 2400
+
+# Elevation zones as in MOD10A1_snow_fractions_elevation.js (±100 m around the median)
+ELEVATION_ZONES = ['above_median', 'at_median', 'below_median']
+ELEVATION_BUFFER_M = 100
+NO_ZONE = -1
+
+DEFAULT_MASK_PATH = Path(__file__).resolve().parents[1] / "masks" / "saskatchewan_glacier_mask.geojson"
+
+INDEX_DTYPE = np.dtype([
+    ('offset', '<i4'),
+    ('fraction', '<f4'),
+    ('fraction_class', 'i1'),
+    ('elevation_zone', 'i1'),
+])
+
+
+def lonlat_to_sinusoidal(lon, lat):
+    """
+    Projette des coordonnées géographiques dans la projection sinusoïdale MODIS
+
+    Args:
+        lon (np.ndarray): Longitudes (degrés)
+        lat (np.ndarray): Latitudes (degrés)
+
+    Returns:
+        tuple: (x, y) en mètres
+    """
+    lon_rad = np.radians(lon)
+    lat_rad = np.radians(lat)
+    return SPHERE_RADIUS * lon_rad * np.cos(lat_rad), SPHERE_RADIUS * lat_rad
+
+
+def load_polygons(geojson_path):
+    """
+    Charge les polygones (anneau extérieur + trous) d'un GeoJSON en projection sinusoïdale
+
+    Args:
+        geojson_path (str): Chemin du GeoJSON (EPSG:4326)
+
+    Returns:
+        list: Liste de polygones, chacun une liste d'anneaux (N × 2) [extérieur, trous...]
+    """
+    with open(geojson_path, 'r') as f:
+        collection = json.load(f)
+
+    features = collection.get('features', [collection])
+    polygons = []
+
+    for feature in features:
+        geometry = feature.get('geometry', feature)
+        if geometry['type'] == 'Polygon':
+            parts = [geometry['coordinates']]
+        elif geometry['type'] == 'MultiPolygon':
+            parts = geometry['coordinates']
+        else:
+            continue
+
+        for rings in parts:
+            projected = []
+            for ring in rings:
+                ring = np.asarray(ring, dtype=np.float64)
+                x, y = lonlat_to_sinusoidal(ring[:, 0], ring[:, 1])
+                projected.append(np.column_stack([x, y]))
+            polygons.append(projected)
+
+    return polygons
+
+
+def rasterize_fraction(polygons, oversample=16, margin=1):
+    """
+    Calcule la fraction de couverture glaciaire de chaque pixel MODIS 500 m
+
+    Args:
+        polygons (list): Polygones projetés (voir load_polygons)
+        oversample (int): Sous-échantillons par côté de pixel (16 → ~29 m)
+        margin (int): Pixels de marge autour de l'emprise
+
+    Returns:
+        tuple: (fraction 2-D, window dict avec row0/col0/nrows/ncols dans la grille MODIS globale)
+    """
+    all_points = np.vstack([ring for polygon in polygons for ring in polygon])
+    col0 = int(np.floor((all_points[:, 0].min() - GRID_X_MIN) / PIXEL_SIZE)) - margin
+    col1 = int(np.floor((all_points[:, 0].max() - GRID_X_MIN) / PIXEL_SIZE)) + margin
+    row0 = int(np.floor((GRID_Y_MAX - all_points[:, 1].max()) / PIXEL_SIZE)) - margin
+    row1 = int(np.floor((GRID_Y_MAX - all_points[:, 1].min()) / PIXEL_SIZE)) + margin
+    nrows, ncols = row1 - row0 + 1, col1 - col0 + 1
+
+    # Sample centres on a regular sub-grid aligned with the MODIS pixels
+    sub = (np.arange(oversample) + 0.5) / oversample
+    xs = GRID_X_MIN + (col0 + (np.arange(ncols)[:, None] + sub).ravel()) * PIXEL_SIZE
+    ys = GRID_Y_MAX - (row0 + (np.arange(nrows)[:, None] + sub).ravel()) * PIXEL_SIZE
+    grid_x, grid_y = np.meshgrid(xs, ys)
+    samples = np.column_stack([grid_x.ravel(), grid_y.ravel()])
+
+    inside = np.zeros(len(samples), dtype=bool)
+    for polygon in polygons:
+        in_polygon = PolygonPath(polygon[0]).contains_points(samples)
+        for hole in polygon[1:]:
+            in_polygon &= ~PolygonPath(hole).contains_points(samples)
+        inside |= in_polygon
+
+    inside = inside.reshape(nrows, oversample, ncols, oversample)
+    fraction = inside.mean(axis=(1, 3))
+
+    window = {'row0': row0, 'col0': col0, 'nrows': nrows, 'ncols': ncols}
+    return fraction, window
+
+
+def window_from_geotransform(geotransform, shape):
+    """
+    Fenêtre de la grille MODIS globale couverte par un raster sinusoïdal
+
+    Args:
+        geotransform (tuple): GeoTransform GDAL du raster
+        shape (tuple): (nrows, ncols) du raster
+
+    Returns:
+        dict: row0, col0, nrows, ncols
+    """
+    col0 = int(round((geotransform[0] - GRID_X_MIN) / PIXEL_SIZE))
+    row0 = int(round((GRID_Y_MAX - geotransform[3]) / PIXEL_SIZE))
+    return {'row0': row0, 'col0': col0, 'nrows': int(shape[0]), 'ncols': int(shape[1])}
+
+
+def elevation_zones(elevation, glacier, buffer_m=ELEVATION_BUFFER_M):
+    """
+    Zones d'élévation relatives à la médiane du glacier (Williamson & Menounos 2021)
+
+    Args:
+        elevation (np.ndarray): Élévation par pixel
+        glacier (np.ndarray): Masque booléen des pixels glaciaires
+        buffer_m (float): Demi-largeur de la zone 'at_median'
+
+    Returns:
+        tuple: (labels de zone par pixel, élévation médiane)
+    """
+    elevation = np.asarray(elevation, dtype=np.float64)
+    median = float(np.nanmedian(elevation[glacier]))
+
+    zones = np.full(elevation.shape, NO_ZONE, dtype=np.int8)
+    zones[elevation > median + buffer_m] = 0
+    zones[(elevation >= median - buffer_m) & (elevation <= median + buffer_m)] = 1
+    zones[elevation < median - buffer_m] = 2
+    zones[~glacier | ~np.isfinite(elevation)] = NO_ZONE
+
+    return zones, median
+
+
+class PixelFractionIndex:
+    """
+    Index persistant pixel → classe de fraction (et zone d'élévation)
+    """
+
+    def __init__(self, records, window, metadata=None):
+        """
+        Initialise l'index
+
+        Args:
+            records (np.ndarray): Tableau structuré INDEX_DTYPE
+            window (dict): Fenêtre de la grille (row0, col0, nrows, ncols)
+            metadata (dict, optional): Métadonnées (source, seuils, médiane...)
+        """
+        order = np.lexsort((records['elevation_zone'], records['fraction_class']))
+        self.records = records[order]
+        self.window = dict(window)
+        self.metadata = metadata or {}
+
+        self.n_classes = len(FRACTION_CLASSES)
+        self.n_zones = len(ELEVATION_ZONES)
+
+        self.offsets = self.records['offset'].astype(np.intp)
+        self.class_labels = self.records['fraction_class'].astype(np.intp)
+        self.zone_labels = self.records['elevation_zone'].astype(np.intp)
+
+        # Segment boundaries of the (sorted) classes
+        self.class_sizes = np.bincount(self.class_labels, minlength=self.n_classes)
+        self.class_starts = np.concatenate([[0], np.cumsum(self.class_sizes)[:-1]])
+
+    def __len__(self):
+        return len(self.records)
+
+    @classmethod
+    def from_fraction(cls, fraction, window=None, elevation=None, thresholds=FRACTION_THRESHOLDS,
+                      metadata=None):
+        """
+        Construit l'index à partir d'un raster de fraction
+
+        Args:
+            fraction (np.ndarray): Fraction de couverture (2-D)
+            window (dict, optional): Fenêtre de la grille MODIS globale
+            elevation (np.ndarray, optional): Élévation sur la même grille
+            thresholds (list): Seuils des classes de fraction
+            metadata (dict, optional): Métadonnées additionnelles
+
+        Returns:
+            PixelFractionIndex: Index construit
+        """
+        fraction = np.asarray(fraction, dtype=np.float64)
+        window = window or {'row0': 0, 'col0': 0, 'nrows': fraction.shape[0], 'ncols': fraction.shape[1]}
+        metadata = dict(metadata or {}, thresholds=list(thresholds))
+
+        labels = classify_fractions(fraction, thresholds)
+        glacier = labels >= 0
+
+        zones = np.full(fraction.shape, NO_ZONE, dtype=np.int8)
+        if elevation is not None:
+            zones, median = elevation_zones(elevation, glacier)
+            metadata['median_elevation'] = median
+
+        offsets = np.flatnonzero(glacier.ravel())
+        records = np.empty(len(offsets), dtype=INDEX_DTYPE)
+        records['offset'] = offsets
+        records['fraction'] = fraction.ravel()[offsets]
+        records['fraction_class'] = labels.ravel()[offsets]
+        records['elevation_zone'] = zones.ravel()[offsets]
+
+        return cls(records, window, metadata)
+
+    @classmethod
+    def from_geojson(cls, geojson_path=DEFAULT_MASK_PATH, elevation=None, oversample=16):
+        """
+        Construit l'index à 500 m à partir du masque GeoJSON du glacier
+
+        Args:
+            geojson_path (str): Masque du glacier (EPSG:4326)
+            elevation (np.ndarray, optional): DEM rééchantillonné sur la fenêtre de l'index
+            oversample (int): Sous-échantillons par côté de pixel
+
+        Returns:
+            PixelFractionIndex: Index construit
+        """
+        polygons = load_polygons(geojson_path)
+        fraction, window = rasterize_fraction(polygons, oversample=oversample)
+        return cls.from_fraction(fraction, window, elevation=elevation,
+                                 metadata={'source': str(geojson_path), 'oversample': oversample})
+
+    def save(self, path):
+        """
+        Sauvegarde l'index (.npy) et sa fenêtre/métadonnées (.json)
+
+        Args:
+            path (str): Chemin du fichier .npy
+        """
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        np.save(path, self.records)
+        with open(path.with_suffix('.json'), 'w') as f:
+            json.dump({'window': self.window, 'metadata': self.metadata}, f, indent=2)
+        print(f"✅ Index sauvegardé: {path} ({len(self)} pixels glaciaires)")
+
+    @classmethod
+    def load(cls, path):
+        """
+        Charge un index sauvegardé
+
+        Args:
+            path (str): Chemin du fichier .npy
+
+        Returns:
+            PixelFractionIndex: Index chargé
+        """
+        path = Path(path)
+        records = np.load(path)
+        with open(path.with_suffix('.json'), 'r') as f:
+            sidecar = json.load(f)
+        return cls(records, sidecar['window'], sidecar.get('metadata'))
+
+    def fraction_raster(self):
+        """
+        Reconstruit le raster 2-D de fraction (0 hors glacier)
+
+        Returns:
+            np.ndarray: Fraction (nrows × ncols)
+        """
+        fraction = np.zeros(self.window['nrows'] * self.window['ncols'], dtype=np.float32)
+        fraction[self.offsets] = self.records['fraction']
+        return fraction.reshape(self.window['nrows'], self.window['ncols'])
+
+    def remap_to_window(self, row0, col0, nrows, ncols):
+        """
+        Ré-exprime les offsets dans une autre fenêtre de la grille MODIS (ex. raster découpé)
+
+        Args:
+            row0 (int): Ligne globale de l'origine de la fenêtre cible
+            col0 (int): Colonne globale de l'origine de la fenêtre cible
+            nrows (int): Nombre de lignes de la fenêtre cible
+            ncols (int): Nombre de colonnes de la fenêtre cible
+
+        Returns:
+            PixelFractionIndex: Nouvel index (pixels hors fenêtre exclus)
+        """
+        rows = self.offsets // self.window['ncols'] + self.window['row0'] - row0
+        cols = self.offsets % self.window['ncols'] + self.window['col0'] - col0
+        keep = (rows >= 0) & (rows < nrows) & (cols >= 0) & (cols < ncols)
+
+        if not keep.all():
+            warnings.warn(f"{(~keep).sum()} pixels glaciaires hors de la fenêtre cible")
+
+        records = self.records[keep].copy()
+        records['offset'] = rows[keep] * ncols + cols[keep]
+        window = {'row0': row0, 'col0': col0, 'nrows': nrows, 'ncols': ncols}
+        return PixelFractionIndex(records, window, dict(self.metadata))
+
+    def remap_to_geotransform(self, geotransform, shape):
+        """
+        Ré-exprime les offsets pour un raster en projection sinusoïdale MODIS
+
+        Args:
+            geotransform (tuple): GeoTransform GDAL du raster cible
+            shape (tuple): (nrows, ncols) du raster cible
+
+        Returns:
+            PixelFractionIndex: Nouvel index aligné sur le raster
+        """
+        window = window_from_geotransform(geotransform, shape)
+        return self.remap_to_window(window['row0'], window['col0'],
+                                    window['nrows'], window['ncols'])
+
+    def gather(self, stack):
+        """
+        Extrait les pixels glaciaires d'un stack, triés par (classe, zone)
+
+        Args:
+            stack (np.ndarray): Valeurs (days × pixels de la fenêtre) ou (pixels,)
+
+        Returns:
+            np.ndarray: Valeurs (days × pixels glaciaires)
+        """
+        stack = np.asarray(stack)
+        return stack[..., self.offsets]
+
+    def class_reduce(self, values):
+        """
+        Sommes et comptes par classe de fraction via np.add.reduceat
+
+        Args:
+            values (np.ndarray): Valeurs rassemblées (days × pixels glaciaires), NaN = invalide
+
+        Returns:
+            tuple: (sommes, comptes) de forme (days × classes)
+        """
+        values = np.atleast_2d(values)
+        valid = ~np.isnan(values)
+        filled = np.where(valid, values, 0.0)
+
+        sums = np.zeros((len(values), self.n_classes))
+        counts = np.zeros((len(values), self.n_classes), dtype=np.int64)
+
+        present = self.class_sizes > 0
+        if present.any():
+            starts = self.class_starts[present]
+            sums[:, present] = np.add.reduceat(filled, starts, axis=1)
+            counts[:, present] = np.add.reduceat(valid, starts, axis=1)
+
+        return sums, counts
+
+    def class_means(self, values):
+        """
+        Moyennes par classe de fraction
+
+        Args:
+            values (np.ndarray): Valeurs rassemblées (days × pixels glaciaires)
+
+        Returns:
+            np.ndarray: Moyennes (days × classes), NaN si aucun pixel valide
+        """
+        sums, counts = self.class_reduce(values)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(counts > 0, sums / counts, np.nan)
+
+    def class_medians(self, values):
+        """
+        Médianes par classe, calculées sur les segments contigus (sans masque booléen)
+
+        Args:
+            values (np.ndarray): Valeurs rassemblées (days × pixels glaciaires)
+
+        Returns:
+            np.ndarray: Médianes (days × classes)
+        """
+        values = np.atleast_2d(values)
+        medians = np.full((len(values), self.n_classes), np.nan)
+
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', category=RuntimeWarning)
+            for k in range(self.n_classes):
+                start, size = self.class_starts[k], self.class_sizes[k]
+                if size:
+                    medians[:, k] = np.nanmedian(values[:, start:start + size], axis=1)
+
+        return medians
+
+    def zone_reduce(self, values):
+        """
+        Sommes et comptes par combinaison classe × zone d'élévation (np.bincount)
+
+        Args:
+            values (np.ndarray): Valeurs rassemblées (days × pixels glaciaires)
+
+        Returns:
+            tuple: (sommes, comptes) de forme (days × classes × zones)
+        """
+        values = np.atleast_2d(values)
+        in_zone = self.zone_labels >= 0
+        keys = self.class_labels[in_zone] * self.n_zones + self.zone_labels[in_zone]
+        n_keys = self.n_classes * self.n_zones
+        n_days = len(values)
+
+        zone_values = values[:, in_zone]
+        valid = ~np.isnan(zone_values)
+
+        # One bincount over (day, key) pairs covers every day at once
+        day_keys = (np.arange(n_days)[:, None] * n_keys + keys[None, :])
+        sums = np.bincount(day_keys[valid], weights=zone_values[valid], minlength=n_days * n_keys)
+        counts = np.bincount(day_keys[valid], minlength=n_days * n_keys)
+
+        shape = (n_days, self.n_classes, self.n_zones)
+        return sums.reshape(shape), counts.reshape(shape)
+
+    def summary(self):
+        """
+        Résumé du nombre de pixels par classe (et par zone si disponible)
+
+        Returns:
+            dict: Comptes de pixels
+        """
+        summary = {name: int(self.class_sizes[k]) for k, name in enumerate(FRACTION_CLASSES)}
+        if (self.zone_labels >= 0).any():
+            for z, zone in enumerate(ELEVATION_ZONES):
+                summary[zone] = int(np.sum(self.zone_labels == z))
+        return summary
+
+
+if __name__ == "__main__":
+    output = sys.argv[1] if len(sys.argv) > 1 else str(DEFAULT_MASK_PATH.with_name("saskatchewan_fraction_index.npy"))
+    mask_path = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_MASK_PATH
+
+    print(f"🧊 Construction de l'index de fractions depuis {mask_path}")
+    index = PixelFractionIndex.from_geojson(mask_path)
+    for name, count in index.summary().items():
+        print(f"   • {name}: {count} pixels")
+    index.save(output)
@@ -0,0 +1,553 @@
+#!/usr/bin/env python3
+"""
+Local zonal statistics engine reproducing the GEE fraction exports
+=================================================================
+
+Computes the daily per-fraction statistics exported by the Earth Engine scripts
+(``MCD43A3_albedo_coverage_fractions.js`` / ``MOD10A1_snow_albedo_fractions.js``)
+from locally clipped MODIS rasters, so the GEE round-trip is no longer needed.
+
+Inputs:
+- a stack of clipped daily albedo rasters and the matching QA rasters
+- a precomputed glacier-fraction raster (0-1) on the same 500 m grid
+
+All days of a chunk are reduced at once over a (days × pixels) array; stacks
+larger than memory are processed from memory-mapped .npy files chunk by chunk.
+The output CSVs use the same schema as the GEE exports consumed by the handlers.
+"""
+
+import os
+import re
+import sys
+import glob
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Optional raster I/O (GeoTIFF stacks); .npy stacks work without GDAL
+try:
+    from osgeo import gdal
+    GDAL_SUPPORT = True
+except ImportError:
+    GDAL_SUPPORT = False
+
+# Add project root to path
+sys.path.append(str(Path(__file__).resolve().parents[3]))
+
+# Same classes and thresholds as the GEE scripts (order matches config.FRACTION_CLASSES)
+FRACTION_CLASSES = ['border', 'mixed_low', 'mixed_high', 'mostly_ice', 'pure_ice']
+FRACTION_THRESHOLDS = [0.25, 0.50, 0.75, 0.90]
+
+# Minimum total valid pixels for a reliable day (min_pixels_threshold in GEE)
+MIN_VALID_PIXELS = 10
+
+# Null geometry written by Export.table.toDrive for ee.Feature(null, ...)
+NULL_GEO = '{"type":"MultiPoint","coordinates":[]}'
+
+# Product definitions mirroring the GEE masking and scaling
+PRODUCTS = {
+    'MCD43A3': {
+        'albedo_band': 'Albedo_WSA_shortwave',
+        'qa_band': 'BRDF_Albedo_Band_Mandatory_Quality_shortwave',
+        'scale': 0.001,
+        'valid_max': 32766,          # 32767 = fill value
+        'good_qa_max': 1,
+        'quality_levels': {
+            'quality_0_best': lambda qa: qa == 0,
+            'quality_1_good': lambda qa: qa == 1,
+            'quality_2_moderate': lambda qa: qa == 2,
+            'quality_3_poor': lambda qa: qa == 3,
+        }
+    },
+    'MOD10A1': {
+        'albedo_band': 'Snow_Albedo_Daily_Tile',
+        'qa_band': 'NDSI_Snow_Cover_Basic_QA',
+        'scale': 0.01,
+        'valid_max': 100,            # >100 = cloud, night, water, ...
+        'good_qa_max': 1,
+        'quality_levels': {
+            'quality_0_best': lambda qa: qa == 0,
+            'quality_1_good': lambda qa: qa == 1,
+            'quality_2_ok': lambda qa: qa == 2,
+            'quality_other_night_ocean': lambda qa: qa > 2,
+        }
+    }
+}
+
+# MODIS acquisition date embedded in granule names (e.g. MCD43A3.A2020153.h10v03...)
+MODIS_DATE_PATTERN = re.compile(r'\.A(\d{4})(\d{3})\.')
+
+
+def classify_fractions(fraction, thresholds=FRACTION_THRESHOLDS):
+    """
+    Assigne une classe de fraction à chaque pixel (mêmes règles que createFractionMasks)
+
+    Args:
+        fraction (np.ndarray): Fraction de couverture glaciaire (0-1)
+        thresholds (list): Seuils entre les classes
+
+    Returns:
+        np.ndarray: Index de classe (0-4) par pixel, -1 hors glacier
+    """
+    fraction = np.asarray(fraction, dtype=np.float64)
+    labels = np.full(fraction.shape, -1, dtype=np.int8)
+
+    inside = np.isfinite(fraction) & (fraction > 0)
+    labels[inside] = np.searchsorted(thresholds, fraction[inside], side='right')
+
+    return labels
+
+
+def season_from_month(months):
+    """
+    Saison utilisée par les exports GEE (juin-juillet / août / septembre)
+
+    Args:
+        months (array-like): Mois (1-12)
+
+    Returns:
+        np.ndarray: Labels de saison
+    """
+    months = np.asarray(months)
+    return np.where(months <= 7, 'early_summer',
+                    np.where(months == 8, 'mid_summer', 'late_summer'))
+
+
+def epoch_millis(dates):
+    """
+    Convertit des dates en millisecondes Unix (system:time_start de GEE)
+
+    Args:
+        dates (pd.DatetimeIndex): Dates
+
+    Returns:
+        np.ndarray: Millisecondes depuis 1970-01-01
+    """
+    return np.asarray((dates - pd.Timestamp('1970-01-01')) // pd.Timedelta(milliseconds=1), dtype=np.int64)
+
+
+def parse_modis_date(filename):
+    """
+    Extrait la date d'acquisition d'un nom de granule MODIS
+
+    Args:
+        filename (str): Nom de fichier (ex. MCD43A3.A2020153.h10v03.061...)
+
+    Returns:
+        pd.Timestamp or None: Date d'acquisition
+    """
+    match = MODIS_DATE_PATTERN.search(os.path.basename(filename))
+    if not match:
+        return None
+    year, doy = int(match.group(1)), int(match.group(2))
+    return pd.Timestamp(datetime.strptime(f"{year}{doy:03d}", "%Y%j"))
+
+
+def find_daily_rasters(directory, product):
+    """
+    Associe les rasters albédo/QA découpés par date d'acquisition
+
+    Args:
+        directory (str): Répertoire des GeoTIFF découpés
+        product (str): 'MCD43A3' ou 'MOD10A1'
+
+    Returns:
+        pd.DataFrame: Colonnes date, albedo_path, qa_path (triées par date)
+    """
+    spec = PRODUCTS[product]
+    records = {}
+
+    for path in glob.glob(os.path.join(directory, "*.tif")):
+        date = parse_modis_date(path)
+        if date is None:
+            continue
+        name = os.path.basename(path)
+        if spec['qa_band'] in name:
+            records.setdefault(date, {})['qa_path'] = path
+        elif spec['albedo_band'] in name:
+            records.setdefault(date, {})['albedo_path'] = path
+
+    rows = [
+        {'date': date, **paths} for date, paths in records.items()
+        if 'albedo_path' in paths and 'qa_path' in paths
+    ]
+    return pd.DataFrame(rows, columns=['date', 'albedo_path', 'qa_path']).sort_values('date').reset_index(drop=True)
+
+
+def read_raster(path):
+    """
+    Lit la première bande d'un raster
+
+    Args:
+        path (str): Chemin du GeoTIFF (ou .npy)
+
+    Returns:
+        np.ndarray: Tableau 2-D
+    """
+    if str(path).endswith('.npy'):
+        return np.load(path)
+
+    if not GDAL_SUPPORT:
+        raise ImportError("GDAL (osgeo) requis pour lire les GeoTIFF. Install: conda install -c conda-forge gdal")
+
+    dataset = gdal.Open(str(path))
+    if dataset is None:
+        raise IOError(f"Impossible d'ouvrir le raster: {path}")
+    return dataset.GetRasterBand(1).ReadAsArray()
+
+
+def read_raster_grid(path):
+    """
+    GeoTransform et forme d'un raster, sans lire ses valeurs
+
+    Args:
+        path (str): Chemin du GeoTIFF (ou .npy)
+
+    Returns:
+        tuple: (geotransform ou None pour un .npy, (nrows, ncols))
+    """
+    if str(path).endswith('.npy'):
+        return None, np.load(path, mmap_mode='r').shape
+
+    if not GDAL_SUPPORT:
+        raise ImportError("GDAL (osgeo) requis pour lire les GeoTIFF. Install: conda install -c conda-forge gdal")
+
+    dataset = gdal.Open(str(path))
+    if dataset is None:
+        raise IOError(f"Impossible d'ouvrir le raster: {path}")
+    return dataset.GetGeoTransform(), (dataset.RasterYSize, dataset.RasterXSize)
+
+
+def build_memmap_stack(paths, output_path, dtype=np.int16):
+    """
+    Empile des rasters journaliers dans un .npy memory-mappé (days × pixels)
+
+    Args:
+        paths (list): Rasters journaliers, dans l'ordre des dates
+        output_path (str): Fichier .npy de sortie
+        dtype: Type de stockage (valeurs brutes, avant mise à l'échelle)
+
+    Returns:
+        np.memmap: Stack ouvert en lecture
+    """
+    first = read_raster(paths[0])
+    stack = np.lib.format.open_memmap(output_path, mode='w+', dtype=dtype,
+                                      shape=(len(paths), first.size))
+    stack[0] = first.ravel()
+
+    for i, path in enumerate(paths[1:], start=1):
+        raster = read_raster(path)
+        if raster.size != first.size:
+            raise ValueError(f"Grille incohérente pour {path}: {raster.shape} vs {first.shape}")
+        stack[i] = raster.ravel()
+
+    stack.flush()
+    del stack
+    return np.load(output_path, mmap_mode='r')
+
+
+class FractionZonalStatsEngine:
+    """
+    Reproduit localement les statistiques quotidiennes par fraction des exports GEE
+    """
+
+    def __init__(self, fraction_raster, product='MCD43A3', thresholds=FRACTION_THRESHOLDS,
+                 min_valid_pixels=MIN_VALID_PIXELS):
+        """
+        Initialise le moteur de statistiques zonales
+
+        Args:
+            fraction_raster (np.ndarray, str or PixelFractionIndex): Fraction glaciaire (0-1),
+                chemin du raster, ou index de fractions précalculé
+            product (str): 'MCD43A3' ou 'MOD10A1'
+            thresholds (list): Seuils des classes de fraction
+            min_valid_pixels (int): Seuil de pixels valides par jour
+        """
+        from data.modis.processing.fraction_index import PixelFractionIndex
+
+        if product not in PRODUCTS:
+            raise ValueError(f"Produit inconnu: {product}. Utilisez 'MCD43A3' ou 'MOD10A1'")
+
+        if isinstance(fraction_raster, (str, Path)):
+            # A .npy with a .json sidecar is a saved PixelFractionIndex
+            if Path(fraction_raster).with_suffix('.json').exists():
+                fraction_raster = PixelFractionIndex.load(fraction_raster)
+            else:
+                fraction_raster = read_raster(fraction_raster)
+
+        if isinstance(fraction_raster, PixelFractionIndex):
+            index = fraction_raster
+        else:
+            index = PixelFractionIndex.from_fraction(fraction_raster, thresholds=thresholds)
+
+        self.product = product
+        self.spec = PRODUCTS[product]
+        self.min_valid_pixels = min_valid_pixels
+        self._set_index(index)
+
+    def _set_index(self, index):
+        self.index = index
+        self.grid_shape = (index.window['nrows'], index.window['ncols'])
+
+        # Only glacier pixels take part in the reductions
+        self.glacier_pixels = index.offsets
+        self.class_sizes = {name: int(index.class_sizes[k]) for k, name in enumerate(FRACTION_CLASSES)}
+
+    def align_to_raster(self, geotransform, shape):
+        """
+        Aligne l'index sur la grille des rasters découpés
+
+        L'index construit depuis le GeoJSON couvre l'emprise du masque ; un
+        raster découpé couvre en général une autre fenêtre de la grille MODIS.
+        Les offsets sont alors ré-exprimés dans la fenêtre du raster.
+
+        Args:
+            geotransform (tuple): GeoTransform GDAL du raster (None : forme seule vérifiée)
+            shape (tuple): (nrows, ncols) du raster
+
+        Raises:
+            ValueError: Forme différente de l'index sans géoréférencement
+        """
+        from data.modis.processing.fraction_index import window_from_geotransform
+
+        shape = tuple(int(v) for v in shape)
+        if geotransform is None:
+            if shape != self.grid_shape:
+                raise ValueError(f"Grille du raster {shape} différente de l'index {self.grid_shape} "
+                                 f"(géoréférencement requis pour l'aligner)")
+            return
+
+        window = window_from_geotransform(geotransform, shape)
+        if window != {key: self.index.window[key] for key in window}:
+            print(f"🔁 Index réaligné sur la fenêtre du raster "
+                  f"(lignes {window['row0']}+{window['nrows']}, colonnes {window['col0']}+{window['ncols']})")
+            self._set_index(self.index.remap_to_geotransform(geotransform, shape))
+
+    def _prepare_chunk(self, albedo_chunk, qa_chunk):
+        """Gather glacier pixels and apply QA/validity masks and scaling."""
+        albedo = self.index.gather(albedo_chunk).astype(np.float64)
+        qa = self.index.gather(qa_chunk)
+
+        # Clipped rasters use -9999 as nodata for both bands
+        valid = ((qa >= 0) & (qa <= self.spec['good_qa_max']) & (albedo >= 0) &
+                 (albedo <= self.spec['valid_max']))
+        albedo = np.where(valid, albedo * self.spec['scale'], np.nan)
+
+        return albedo, qa
+
+    def compute_chunk(self, albedo_chunk, qa_chunk):
+        """
+        Calcule les statistiques par fraction pour un bloc de jours
+
+        Args:
+            albedo_chunk (np.ndarray): Valeurs brutes (days × pixels de la grille)
+            qa_chunk (np.ndarray): Flags QA (days × pixels de la grille)
+
+        Returns:
+            tuple: (stats par fraction, distribution QA) sous forme de dicts de colonnes
+        """
+        albedo, qa = self._prepare_chunk(albedo_chunk, qa_chunk)
+
+        # Segment reductions over the class-sorted pixels of the index
+        sums, counts = self.index.class_reduce(albedo)
+        medians = self.index.class_medians(albedo)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            means = np.where(counts > 0, sums / counts, np.nan)
+
+        stats = {}
+        for k, name in enumerate(FRACTION_CLASSES):
+            size = self.class_sizes[name]
+            stats[f'{name}_mean'] = means[:, k]
+            stats[f'{name}_median'] = medians[:, k]
+            stats[f'{name}_pixel_count'] = counts[:, k]
+            stats[f'{name}_data_quality'] = counts[:, k] / size * 100 if size else np.zeros(len(albedo))
+
+        quality = {
+            level: rule(qa).sum(axis=1) for level, rule in self.spec['quality_levels'].items()
+        }
+
+        return stats, quality
+
+    def compute(self, albedo_stack, qa_stack, dates, chunk_days=365, geotransform=None,
+                raster_shape=None):
+        """
+        Calcule les statistiques quotidiennes pour tout le stack, bloc par bloc
+
+        Args:
+            albedo_stack (np.ndarray): Stack albédo (days × pixels), ndarray ou memmap
+            qa_stack (np.ndarray): Stack QA (days × pixels)
+            dates (array-like): Dates d'acquisition (une par jour du stack)
+            chunk_days (int): Nombre de jours par bloc
+            geotransform (tuple, optional): GeoTransform GDAL des rasters du stack
+            raster_shape (tuple, optional): (nrows, ncols) des rasters du stack ;
+                l'index est réaligné si la fenêtre diffère (voir align_to_raster)
+
+        Returns:
+            tuple: (DataFrame statistiques, DataFrame distribution QA) au format GEE
+        """
+        if raster_shape is not None:
+            self.align_to_raster(geotransform, raster_shape)
+
+        dates = pd.DatetimeIndex(pd.to_datetime(dates))
+        n_days = len(dates)
+
+        albedo_stack = albedo_stack.reshape(n_days, -1)
+        qa_stack = qa_stack.reshape(n_days, -1)
+        if albedo_stack.shape[1] != int(np.prod(self.grid_shape)):
+            raise ValueError(f"Grille du stack ({albedo_stack.shape[1]} pixels) différente du raster de fraction")
+
+        stats_parts, quality_parts = [], []
+        for start in range(0, n_days, chunk_days):
+            stop = min(start + chunk_days, n_days)
+            stats, quality = self.compute_chunk(albedo_stack[start:stop], qa_stack[start:stop])
+            stats_parts.append(pd.DataFrame(stats))
+            quality_parts.append(pd.DataFrame(quality))
+
+        stats_df = pd.concat(stats_parts, ignore_index=True)
+        quality_df = pd.concat(quality_parts, ignore_index=True)
+
+        return self._format_stats(stats_df, dates), self._format_quality(quality_df, dates)
+
+    def compute_from_memmap(self, albedo_npy, qa_npy, dates, chunk_days=365, geotransform=None,
+                            raster_shape=None):
+        """
+        Calcule les statistiques à partir de stacks .npy ouverts en memory-map
+
+        Args:
+            albedo_npy (str): Stack albédo .npy (days × pixels)
+            qa_npy (str): Stack QA .npy (days × pixels)
+            dates (array-like): Dates d'acquisition
+            chunk_days (int): Nombre de jours par bloc
+            geotransform (tuple, optional): GeoTransform GDAL des rasters du stack
+            raster_shape (tuple, optional): (nrows, ncols) des rasters du stack
+
+        Returns:
+            tuple: (DataFrame statistiques, DataFrame distribution QA)
+        """
+        albedo_stack = np.load(albedo_npy, mmap_mode='r')
+        qa_stack = np.load(qa_npy, mmap_mode='r')
+        return self.compute(albedo_stack, qa_stack, dates, chunk_days=chunk_days,
+                            geotransform=geotransform, raster_shape=raster_shape)
+
+    def _temporal_columns(self, dates):
+        """Temporal columns computed exactly as in the GEE scripts."""
+        doy = dates.dayofyear.values
+        return {
+            'date': dates.strftime('%Y-%m-%d'),
+            'year': dates.year.values,
+            'doy': doy,
+            'decimal_year': dates.year.values + doy / 365.25,
+            'season': season_from_month(dates.month.values),
+            'system:time_start': epoch_millis(dates)
+        }
+
+    @staticmethod
+    def _gee_layout(df, dates):
+        """Order columns like Export.table.toDrive: system:index, sorted properties, .geo."""
+        df = df[sorted(df.columns)]
+        df.insert(0, 'system:index', dates.strftime('%Y_%m_%d'))
+        df['.geo'] = NULL_GEO
+        return df
+
+    def _format_stats(self, stats_df, dates):
+        """Add temporal and quality-threshold columns to the fraction statistics."""
+        count_cols = [f'{name}_pixel_count' for name in FRACTION_CLASSES]
+        total_valid = stats_df[count_cols].sum(axis=1)
+
+        df = stats_df.assign(**self._temporal_columns(dates))
+        df['total_valid_pixels'] = total_valid.values
+        df['min_pixels_threshold'] = (total_valid >= self.min_valid_pixels).astype(int).values
+        return self._gee_layout(df, dates)
+
+    def _format_quality(self, quality_df, dates):
+        """Add date and total columns to the QA distribution."""
+        df = quality_df.copy()
+        df['total_pixels'] = quality_df.sum(axis=1)
+        df['date'] = dates.strftime('%Y-%m-%d')
+        df['system:time_start'] = epoch_millis(dates)
+        return self._gee_layout(df, dates)
+
+    def run_directory(self, clipped_dir, output_dir, work_dir=None, chunk_days=365,
+                      start_year=2010, end_year=2024):
+        """
+        Traite un répertoire de GeoTIFF découpés et écrit les CSV au format GEE
+
+        Args:
+            clipped_dir (str): Répertoire des rasters découpés
+            output_dir (str): Répertoire des CSV de sortie
+            work_dir (str, optional): Répertoire des stacks .npy (défaut: output_dir)
+            chunk_days (int): Nombre de jours par bloc
+            start_year (int): Première année (nom du fichier)
+            end_year (int): Dernière année (nom du fichier)
+
+        Returns:
+            dict: Chemins des CSV écrits
+        """
+        pairs = find_daily_rasters(clipped_dir, self.product)
+        if pairs.empty:
+            raise FileNotFoundError(f"Aucune paire albédo/QA {self.product} dans {clipped_dir}")
+
+        work_dir = work_dir or output_dir
+        os.makedirs(work_dir, exist_ok=True)
+        os.makedirs(output_dir, exist_ok=True)
+
+        print(f"📂 {len(pairs)} jours {self.product} trouvés")
+        albedo_npy = os.path.join(work_dir, f"{self.product}_albedo_stack.npy")
+        qa_npy = os.path.join(work_dir, f"{self.product}_qa_stack.npy")
+        build_memmap_stack(pairs['albedo_path'].tolist(), albedo_npy)
+        build_memmap_stack(pairs['qa_path'].tolist(), qa_npy)
+
+        geotransform, raster_shape = read_raster_grid(pairs['albedo_path'].iloc[0])
+        stats_df, quality_df = self.compute_from_memmap(albedo_npy, qa_npy, pairs['date'],
+                                                        chunk_days=chunk_days,
+                                                        geotransform=geotransform,
+                                                        raster_shape=raster_shape)
+
+        return write_gee_csvs(stats_df, quality_df, output_dir, self.product, start_year, end_year)
+
+
+def write_gee_csvs(stats_df, quality_df, output_dir, product, start_year=2010, end_year=2024):
+    """
+    Écrit les CSV avec les noms utilisés par config/settings.py
+
+    Args:
+        stats_df (pd.DataFrame): Statistiques par fraction
+        quality_df (pd.DataFrame): Distribution QA
+        output_dir (str): Répertoire de sortie
+        product (str): 'MCD43A3' ou 'MOD10A1'
+        start_year (int): Première année
+        end_year (int): Dernière année
+
+    Returns:
+        dict: Chemins des fichiers écrits
+    """
+    stats_name = {
+        'MCD43A3': f"MCD43A3_albedo_daily_stats_{start_year}_{end_year}.csv",
+        'MOD10A1': f"MOD10A1_snow_daily_stats_{start_year}_{end_year}.csv"
+    }[product]
+    quality_name = f"{product}_quality_distribution_daily_{start_year}_{end_year}.csv"
+
+    stats_path = os.path.join(output_dir, stats_name)
+    quality_path = os.path.join(output_dir, quality_name)
+    stats_df.to_csv(stats_path, index=False)
+    quality_df.to_csv(quality_path, index=False)
+
+    print(f"✅ Statistiques: {stats_path} ({len(stats_df)} jours)")
+    print(f"✅ Qualité: {quality_path}")
+    return {'stats': stats_path, 'quality': quality_path}
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 5:
+        print("Usage: python zonal_stats.py <MCD43A3|MOD10A1> <clipped_dir> <fraction_raster> <output_dir>")
+        sys.exit(1)
+
+    product, clipped_dir, fraction_path, output_dir = sys.argv[1:5]
+    engine = FractionZonalStatsEngine(fraction_path, product=product)
+    print(f"🧊 Pixels glacier: {len(engine.glacier_pixels)} "
+          f"({', '.join(f'{k}={v}' for k, v in engine.class_sizes.items())})")
+    engine.run_directory(clipped_dir, output_dir)
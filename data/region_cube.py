@@ -0,0 +1,227 @@
+"""
+CUBE RÉGIONAL - Albédo (région × jour × fraction)
+=================================================
+
+Représentation en mémoire d'un produit (MCD43A3 ou MOD10A1) pour plusieurs
+glaciers : un tableau (région × jour × fraction) de l'albédo journalier d'une
+variable ('mean' ou 'median'), sur un axe des jours commun à toutes les
+régions (NaN les jours sans observation).
+
+Les régions sont chargées par les handlers habituels (nettoyage et filtre
+qualité compris), en parallèle, via le registre de session. Une tranche
+régionale se présente comme un handler chargé (RegionSliceHandler), de sorte
+que TrendCalculator et les analyses de comparaison s'appliquent sans
+modification à chaque région.
+"""
+
+import numpy as np
+import pandas as pd
+
+from config import FRACTION_CLASSES, CLASS_LABELS
+
+
+class RegionSliceHandler:
+    """
+    Tranche d'une région du cube, avec l'interface de lecture des handlers
+    (data, get_fraction_data, get_available_fractions)
+    """
+
+    def __init__(self, data, dataset_type, region, fraction_classes=None):
+        """
+        Args:
+            data (pd.DataFrame): Colonnes date, decimal_year et {fraction}_{variable}
+            dataset_type (str): Produit ('MCD43A3' ou 'MOD10A1')
+            region (str): Nom de la région
+            fraction_classes (list, optional): Classes de fraction
+        """
+        self.data = data
+        self.raw_data = data
+        self.dataset_type = dataset_type
+        self.region = region
+        self.fraction_classes = list(fraction_classes or FRACTION_CLASSES)
+        self.class_labels = CLASS_LABELS
+
+    def __len__(self):
+        return len(self.data)
+
+    def get_fraction_data(self, fraction, variable='mean', dropna=True):
+        """
+        Données d'une fraction (colonnes 'date', 'decimal_year', 'value')
+        """
+        col_name = f"{fraction}_{variable}"
+        if col_name not in self.data.columns:
+            raise ValueError(f"Colonne {col_name} non trouvée")
+
+        result = self.data[['date', 'decimal_year', col_name]].rename(columns={col_name: 'value'})
+        if dropna:
+            result = result.dropna(subset=['value'])
+        return result
+
+    def get_available_fractions(self, variable='mean'):
+        return [f for f in self.fraction_classes
+                if self.data[f"{f}_{variable}"].notna().any()]
+
+
+class RegionCube:
+    """
+    Albédo journalier (région × jour × fraction) d'un produit pour une variable
+    """
+
+    def __init__(self, dataset, variable, regions, dates, values,
+                 fraction_classes=None, decimal_years=None):
+        """
+        Initialise le cube
+
+        Args:
+            dataset (str): Produit ('MCD43A3' ou 'MOD10A1')
+            variable (str): Variable ('mean' ou 'median')
+            regions (list): Noms des régions (axe 0)
+            dates (array-like): Jours (axe 1)
+            values (np.ndarray): Albédo (région × jour × fraction), NaN = pas d'observation
+            fraction_classes (list, optional): Classes de fraction (axe 2)
+            decimal_years (array-like, optional): Année décimale de chaque jour
+        """
+        self.dataset = dataset
+        self.variable = variable
+        self.regions = list(regions)
+        self.dates = pd.DatetimeIndex(pd.to_datetime(dates))
+        self.values = np.asarray(values, dtype=float)
+        self.fraction_classes = list(fraction_classes or FRACTION_CLASSES)
+        if decimal_years is None:
+            decimal_years = self.dates.year + self.dates.dayofyear / 365.25
+        self.decimal_years = np.asarray(decimal_years, dtype=float)
+
+        expected = (len(self.regions), len(self.dates), len(self.fraction_classes))
+        if self.values.shape != expected:
+            raise ValueError(f"Tableau de forme {self.values.shape}, attendu {expected}")
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __repr__(self):
+        return (f"RegionCube({self.dataset}, {self.variable}, "
+                f"{len(self.regions)} régions × {len(self.dates)} jours × "
+                f"{len(self.fraction_classes)} fractions)")
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_handlers(cls, handlers, dataset, variable='mean', fraction_classes=None):
+        """
+        Construit le cube à partir de handlers chargés
+
+        Args:
+            handlers (dict): Région -> handler chargé (attribut data)
+            dataset (str): Produit
+            variable (str): Variable ('mean' ou 'median')
+            fraction_classes (list, optional): Classes de fraction
+
+        Returns:
+            RegionCube: Cube sur l'union des jours des régions
+        """
+        fraction_classes = list(fraction_classes or FRACTION_CLASSES)
+        columns = [f"{fraction}_{variable}" for fraction in fraction_classes]
+        frames = {region: handler.data for region, handler in handlers.items()}
+
+        # Axe des jours commun (l'année décimale vient des exports quand elle existe)
+        days = pd.concat([frame[['date', 'decimal_year']] if 'decimal_year' in frame.columns
+                          else frame[['date']] for frame in frames.values()])
+        days = days.drop_duplicates('date').sort_values('date')
+        dates = pd.DatetimeIndex(pd.to_datetime(days['date']))
+        decimal_years = (days['decimal_year'].to_numpy() if 'decimal_year' in days.columns
+                         else None)
+
+        values = np.full((len(frames), len(dates), len(fraction_classes)), np.nan)
+        for i, frame in enumerate(frames.values()):
+            rows = dates.get_indexer(pd.to_datetime(frame['date']))
+            present = [j for j, column in enumerate(columns) if column in frame.columns]
+            values[i, rows[:, None], present] = frame[[columns[j] for j in present]].to_numpy(float)
+
+        return cls(dataset, variable, list(frames), dates, values, fraction_classes, decimal_years)
+
+    @classmethod
+    def load(cls, dataset, regions=None, variable='mean', max_workers=None):
+        """
+        Charge les régions en parallèle (registre de session) et construit le cube
+
+        Les régions dont le chargement échoue sont signalées et omises.
+
+        Args:
+            dataset (str): Produit
+            regions (list, optional): Régions (défaut: toutes les régions configurées)
+            variable (str): Variable ('mean' ou 'median')
+            max_workers (int, optional): Threads de chargement
+
+        Returns:
+            RegionCube: Cube des régions chargées
+        """
+        from config.settings import config
+        from data.registry import get_handler_registry, load_concurrently
+
+        registry = get_handler_registry()
+        regions = list(regions or config.get_regions())
+        loads = load_concurrently(
+            {region: (lambda region=region: registry.get_handler(dataset, region=region))
+             for region in regions},
+            max_workers or min(8, len(regions)))
+
+        handlers = {}
+        for region in regions:
+            if loads[region].error is not None:
+                print(f"⚠️  {dataset} {region}: {loads[region].error}")
+            else:
+                handlers[region] = loads[region].result
+        if not handlers:
+            raise ValueError(f"Aucune région chargée pour {dataset}")
+
+        cube = cls.from_handlers(handlers, dataset, variable)
+        print(f"🧊 {cube}")
+        return cube
+
+    # ------------------------------------------------------------------
+    # Accès
+    # ------------------------------------------------------------------
+
+    def region_index(self, region):
+        try:
+            return self.regions.index(region)
+        except ValueError:
+            raise ValueError(f"Région absente du cube: {region}")
+
+    def region_frame(self, region, dropna=True):
+        """
+        Tranche d'une région sous forme de tableau (date, decimal_year, {fraction}_{variable})
+
+        Args:
+            region (str): Nom de la région
+            dropna (bool): Supprimer les jours sans aucune observation
+
+        Returns:
+            pd.DataFrame: Données journalières de la région
+        """
+        values = self.values[self.region_index(region)]
+        frame = pd.DataFrame(values, columns=[f"{fraction}_{self.variable}"
+                                              for fraction in self.fraction_classes])
+        frame.insert(0, 'date', self.dates)
+        frame.insert(1, 'decimal_year', self.decimal_years)
+        if dropna:
+            frame = frame[np.isfinite(values).any(axis=1)].reset_index(drop=True)
+        return frame
+
+    def region_handler(self, region):
+        """Tranche d'une région présentée comme un handler chargé"""
+        return RegionSliceHandler(self.region_frame(region), self.dataset, region,
+                                  self.fraction_classes)
+
+    def observation_counts(self):
+        """
+        Nombre de jours observés par région et fraction
+
+        Returns:
+            pd.DataFrame: Régions en lignes, fractions en colonnes
+        """
+        return pd.DataFrame(np.isfinite(self.values).sum(axis=1),
+                            index=self.regions, columns=self.fraction_classes)
@@ -0,0 +1,262 @@
+"""
+Session-wide dataset handler registry
+=====================================
+
+Availability checks use cheap metadata probes (row count, date range, columns,
+freshness stamp) instead of loading and cleaning whole tables. Handlers that
+are actually loaded are kept in a registry shared by the menu actions, the
+orchestrator and the background tasks, so each dataset is loaded at most once
+per session (or again after its source changed).
+
+Several datasets are loaded concurrently with load_concurrently(): CSV
+parsing, zip inflation and database drivers release the GIL for most of
+their work, so threads overlap the loads of both products.
+
+With the shared store enabled (data.shared_store), a cleaned dataset is
+published once for all processes: pool workers and dashboard workers attach
+its columns by name instead of loading and cleaning their own copy.
+"""
+
+import sys
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from config import DATA_MODE, DEFAULT_REGION
+
+
+@dataclass
+class DatasetProbe:
+    """Metadata of a dataset source, obtained without loading it."""
+    dataset: str
+    source: str
+    row_count: int
+    date_min: Optional[str] = None
+    date_max: Optional[str] = None
+    columns: List[str] = field(default_factory=list)
+    freshness: Optional[str] = None  # Last update / file stamp, compared between probes
+
+    @property
+    def available(self) -> bool:
+        return self.row_count > 0
+
+    def summary(self) -> str:
+        """One-line description for menus."""
+        return (f"{self.dataset}: {self.row_count} rows, {self.date_min} → {self.date_max} "
+                f"({len(self.columns)} columns, source {self.source})")
+
+
+@dataclass
+class DatasetLoad:
+    """Outcome of one dataset load in load_concurrently()."""
+    dataset: str
+    result: object = None
+    seconds: float = 0.0
+    error: Optional[Exception] = None
+
+
+def load_concurrently(loaders: Dict[str, Callable[[], object]],
+                      max_workers: Optional[int] = None) -> Dict[str, DatasetLoad]:
+    """
+    Run several dataset loaders in threads and wait for all of them
+
+    Args:
+        loaders: Mapping dataset name -> zero-argument load function
+        max_workers: Thread count (default: one per dataset)
+
+    Returns:
+        dict: DatasetLoad per dataset (errors are captured, not raised)
+    """
+    def timed(name, loader):
+        start = time.perf_counter()
+        try:
+            return DatasetLoad(name, loader(), time.perf_counter() - start)
+        except Exception as e:
+            return DatasetLoad(name, None, time.perf_counter() - start, e)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers or max(1, len(loaders))) as executor:
+        futures = {name: executor.submit(timed, name, loader) for name, loader in loaders.items()}
+        loads = {name: future.result() for name, future in futures.items()}
+    elapsed = time.perf_counter() - start
+
+    for load in loads.values():
+        status = "✅" if load.error is None else f"❌ {load.error}"
+        print(f"⏱️  {load.dataset}: {load.seconds:.2f} s {status}")
+    print(f"⏱️  {len(loads)} datasets ready in {elapsed:.2f} s "
+          f"(sequential: {sum(load.seconds for load in loads.values()):.2f} s)")
+    return loads
+
+
+def create_handler(dataset_name: str, region: Optional[str] = None):
+    """
+    Unloaded data handler for a dataset, following DATA_MODE
+
+    Args:
+        dataset_name: 'MCD43A3' or 'MOD10A1'
+        region: Glacier / region (default: the reference glacier)
+    """
+    from data.unified_loader import get_albedo_handler
+    from config.settings import config
+
+    if DATA_MODE.lower() in ("database", "duckdb"):
+        if region is None:
+            return get_albedo_handler(dataset_name)
+        return get_albedo_handler(dataset_name, region=region)
+
+    dataset_config = config.get_dataset_config(dataset_name, region)
+    if dataset_config is None:
+        raise ValueError(f"Unknown dataset: {dataset_name}")
+    return get_albedo_handler(dataset_config.csv_path)
+
+
+def _key(dataset_name: str, region: Optional[str]) -> str:
+    """Registry key: the dataset name, qualified by non-default regions"""
+    if region is None or region == DEFAULT_REGION:
+        return dataset_name
+    return f"{dataset_name}@{region}"
+
+
+class HandlerRegistry:
+    """Loaded handlers and probes of the current session (per dataset and region)."""
+
+    def __init__(self):
+        self._handlers: Dict[str, object] = {}
+        self._probes: Dict[str, DatasetProbe] = {}
+        self._loaded_freshness: Dict[str, Optional[str]] = {}
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+
+    def probe(self, dataset_name: str, refresh: bool = False,
+              region: Optional[str] = None) -> DatasetProbe:
+        """
+        Metadata probe of a dataset (cached unless refresh)
+
+        A refreshed probe with a new freshness stamp drops the loaded handler.
+        """
+        key = _key(dataset_name, region)
+        if refresh or key not in self._probes:
+            probe = create_handler(dataset_name, region).probe()
+            previous = self._probes.get(key)
+            if previous is not None and previous.freshness != probe.freshness:
+                self._handlers.pop(key, None)
+            self._probes[key] = probe
+        return self._probes[key]
+
+    def get_handler(self, dataset_name: str, region: Optional[str] = None):
+        """
+        Loaded handler of a dataset
+
+        The source is re-probed on every call; the handler is loaded on first
+        use and again only when the freshness stamp changed since that load.
+        """
+        key = _key(dataset_name, region)
+        with self._lock:
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+        # One load per dataset even when several threads ask for it
+        with load_lock:
+            freshness = self._current_freshness(dataset_name, region)
+            if (key in self._handlers and freshness is not None
+                    and freshness != self._loaded_freshness.get(key)):
+                print(f"🔄 {key}: source changed, reloading")
+                self._handlers.pop(key, None)
+            if key not in self._handlers:
+                handler = create_handler(dataset_name, region)
+                if not self._attach_shared(handler, key, dataset_name, region):
+                    handler.load_data()
+                    self._publish_shared(handler, key, dataset_name, region)
+                self._handlers[key] = handler
+                self._loaded_freshness[key] = freshness
+            return self._handlers[key]
+
+    def _current_freshness(self, dataset_name: str, region: Optional[str]) -> Optional[str]:
+        """Freshness stamp of a new probe, or None when the source cannot be probed."""
+        try:
+            return self.probe(dataset_name, refresh=True, region=region).freshness
+        except Exception:
+            return None
+
+    def _shared_freshness(self, dataset_name: str, region: Optional[str]) -> Optional[str]:
+        try:
+            return self.probe(dataset_name, region=region).freshness
+        except Exception:
+            return None
+
+    def _attach_shared(self, handler, key: str, dataset_name: str,
+                       region: Optional[str]) -> bool:
+        """Give the handler the published cleaned data; True if attached."""
+        from data import shared_store
+
+        if not shared_store.is_enabled():
+            return False
+        shared = shared_store.get_shared_store().attach(
+            key, self._shared_freshness(dataset_name, region))
+        if shared is None:
+            return False
+        # Only the cleaned table is published: raw_data points to it as well
+        handler.data = handler.raw_data = shared.frame
+        handler.shared = shared
+        print(f"📥 Shared store: {key} attached ({shared.manifest.rows} rows, no parse)")
+        return True
+
+    def _publish_shared(self, handler, key: str, dataset_name: str, region: Optional[str]):
+        """Publish a freshly loaded handler's cleaned data for the other processes."""
+        from data import shared_store
+
+        if not shared_store.is_enabled():
+            return
+        try:
+            shared = shared_store.get_shared_store().publish(
+                key, handler.data, self._shared_freshness(dataset_name, region))
+        except (OSError, TypeError, ValueError) as e:
+            print(f"⚠️  Shared store: {key} not published ({e})")
+            return
+        # The publisher serves from the shared pages too, and keeps them alive
+        handler.data = shared.frame
+        handler.shared = shared
+
+    def get_handlers(self, dataset_names: Sequence[str],
+                     max_workers: Optional[int] = None) -> Dict[str, object]:
+        """
+        Loaded handlers of several datasets, loading the missing ones concurrently
+
+        Raises:
+            Exception: The first load error, once every load has finished
+        """
+        loads = load_concurrently({name: (lambda name=name: self.get_handler(name))
+                                   for name in dict.fromkeys(dataset_names)}, max_workers)
+        for load in loads.values():
+            if load.error is not None:
+                raise load.error
+        return {name: load.result for name, load in loads.items()}
+
+    def is_loaded(self, dataset_name: str, region: Optional[str] = None) -> bool:
+        return _key(dataset_name, region) in self._handlers
+
+    def invalidate(self, dataset_name: Optional[str] = None, region: Optional[str] = None):
+        """Forget one dataset, or everything."""
+        if dataset_name is None:
+            self._handlers.clear()
+            self._probes.clear()
+            self._loaded_freshness.clear()
+        else:
+            self._handlers.pop(_key(dataset_name, region), None)
+            self._probes.pop(_key(dataset_name, region), None)
+            self._loaded_freshness.pop(_key(dataset_name, region), None)
+
+
+_registry: Optional[HandlerRegistry] = None
+
+
+def get_handler_registry() -> HandlerRegistry:
+    """Session-wide HandlerRegistry."""
+    global _registry
+    if _registry is None:
+        _registry = HandlerRegistry()
+    return _registry
@@ -0,0 +1,529 @@
+"""
+Shared dataset store for multi-process workers
+==============================================
+
+Process pools (regional batch, background jobs) and multi-worker dashboards
+used to load and clean their own copy of every table. With the shared store,
+the first process that loads a dataset publishes its cleaned columns once, as
+one .npy file per column plus a small JSON manifest (columns, dtypes, index,
+freshness stamp); the other processes attach memory-mapped views by name
+instead of parsing anything. Pages are shared by the OS, so memory stays flat
+as workers are added.
+
+The store lives in RAM-backed /dev/shm when available (the temporary
+directory otherwise, or ALBEDO_SHARED_DIR). Unlike
+multiprocessing.shared_memory segments, named files can be attached by
+independently started processes (uvicorn workers, a second batch run) and are
+not unlinked behind their back by a resource tracker.
+
+Layout::
+
+    <store>/<name>/current                    # version being served
+    <store>/<name>/<version>/manifest.json
+    <store>/<name>/<version>/<i>.npy          # one array per column
+    <store>/<name>/<version>/leases/<pid>-<token>
+
+Every attached view holds a lease file. A version is deleted when its last
+lease is released and it is no longer current (or was unpublished), and when
+the last holder of the current version goes away: the files are
+reference-counted by their leases. Leases of dead processes are pruned.
+
+Disabled by default. Enable with ``enable()`` (inherited by child processes)
+or ``ALBEDO_SHARED_DATA=1``.
+
+Usage::
+
+    from data.shared_store import get_shared_store
+
+    store = get_shared_store()
+    store.publish('MCD43A3', handler.data, freshness=probe.freshness)
+
+    # In a worker
+    shared = store.attach('MCD43A3', freshness=probe.freshness)
+    if shared is not None:
+        data = shared.frame          # zero-copy, copy-on-write views
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import uuid
+import atexit
+import shutil
+import hashlib
+import tempfile
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.instrumentation import span, count
+
+try:
+    import fcntl
+except ImportError:  # Windows: publish / attach / release are not serialized
+    fcntl = None
+
+ENABLE_ENV = 'ALBEDO_SHARED_DATA'
+DIR_ENV = 'ALBEDO_SHARED_DIR'
+MANIFEST_NAME = 'manifest.json'
+CURRENT_NAME = 'current'
+INDEX_COLUMN = '__index__'
+
+
+def default_store_dir() -> Path:
+    """RAM-backed /dev/shm when available, the temporary directory otherwise."""
+    if os.environ.get(DIR_ENV):
+        return Path(os.environ[DIR_ENV])
+    shm = Path('/dev/shm')
+    base = shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+    return base / 'albedo_shared'
+
+
+def enable(directory=None):
+    """
+    Turn the shared store on for this process and the processes it starts
+
+    Args:
+        directory: Store directory (default: default_store_dir())
+    """
+    os.environ[ENABLE_ENV] = '1'
+    if directory is not None:
+        os.environ[DIR_ENV] = str(directory)
+
+
+def disable():
+    """Turn the shared store off (already attached views stay valid)."""
+    os.environ.pop(ENABLE_ENV, None)
+
+
+def is_enabled() -> bool:
+    return os.environ.get(ENABLE_ENV) == '1'
+
+
+@dataclass
+class SharedColumn:
+    """One stored column: how its array is encoded and how to restore it."""
+    name: str
+    dtype: str                                  # dtype of the original column
+    storage: str                                # 'array', 'codes' or 'float'
+    tz: Optional[str] = None                    # tz-aware datetimes are stored as UTC
+    categories: Optional[list] = None           # storage == 'codes'
+    categories_dtype: Optional[str] = None
+    ordered: bool = False
+
+
+@dataclass
+class SharedManifest:
+    """Description of a published frame."""
+    name: str
+    version: str
+    rows: int
+    columns: List[SharedColumn] = field(default_factory=list)
+    index: Optional[dict] = None                # RangeIndex start/stop/step, None if stored
+    index_name: Optional[str] = None
+    freshness: Optional[str] = None
+    published_at: float = 0.0
+    publisher_pid: int = 0
+    nbytes: int = 0
+
+    def to_json(self) -> str:
+        return json.dumps(asdict(self))
+
+    @classmethod
+    def from_json(cls, text: str) -> 'SharedManifest':
+        raw = json.loads(text)
+        raw['columns'] = [SharedColumn(**column) for column in raw['columns']]
+        return cls(**raw)
+
+
+class SharedDataset:
+    """
+    Attached view of a published frame; holds a lease until released
+
+    Can be used as a context manager. Leases still held at exit are released.
+    """
+
+    def __init__(self, store: 'SharedDatasetStore', manifest: SharedManifest,
+                 frame: pd.DataFrame, lease: Path):
+        self.store = store
+        self.manifest = manifest
+        self.frame = frame
+        self.lease = lease
+
+    @property
+    def released(self) -> bool:
+        return self.lease is None
+
+    def release(self):
+        """Drop the lease (the frame stays readable in this process)."""
+        if self.lease is not None:
+            self.store._release(self.manifest.name, self.lease)
+            self.lease = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+        return False
+
+    def __repr__(self):
+        state = 'released' if self.released else 'attached'
+        return (f"SharedDataset({self.manifest.name}, {self.manifest.rows} rows, "
+                f"{len(self.manifest.columns)} columns, {state})")
+
+
+# ----------------------------------------------------------------------
+# Column encoding
+# ----------------------------------------------------------------------
+
+def _encode_column(name: str, series: pd.Series):
+    """(SharedColumn, array) for one column."""
+    dtype = series.dtype
+    if isinstance(dtype, pd.DatetimeTZDtype):
+        values = series.dt.tz_convert('UTC').dt.tz_localize(None).to_numpy()
+        return SharedColumn(name, str(dtype), 'array', tz=str(dtype.tz)), values
+    if isinstance(dtype, np.dtype) and dtype.kind in 'biufcmM':
+        return SharedColumn(name, str(dtype), 'array'), series.to_numpy()
+    if pd.api.types.is_numeric_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        # Nullable extension dtypes (Int64, Float64, boolean): NA -> NaN
+        return (SharedColumn(name, str(dtype), 'float'),
+                series.to_numpy(dtype=float, na_value=np.nan))
+
+    # Strings, objects and categoricals: integer codes + category list
+    categorical = pd.Categorical(series)
+    categories = categorical.categories.tolist()
+    json.dumps(categories)  # TypeError for categories that cannot go in the manifest
+    return (SharedColumn(name, str(dtype), 'codes', categories=categories,
+                         categories_dtype=str(categorical.categories.dtype),
+                         ordered=bool(categorical.ordered)),
+            categorical.codes.astype(np.int32))
+
+
+def _decode_column(column: SharedColumn, values: np.ndarray):
+    """Column restored to its original dtype (zero-copy for 'array' storage)."""
+    if column.storage == 'codes':
+        categories = pd.Index(column.categories, dtype=column.categories_dtype)
+        restored = pd.Categorical.from_codes(values, categories, ordered=column.ordered)
+        if column.dtype == 'category':
+            return restored
+        return pd.Series(restored).astype(column.dtype).array
+    if column.storage == 'float':
+        return pd.array(values, dtype='Float64').astype(column.dtype)
+    if column.tz is not None:
+        return pd.DatetimeIndex(values).tz_localize('UTC').tz_convert(column.tz)
+    return values
+
+
+def _safe_name(name: str) -> str:
+    """Directory name of a dataset name (hash suffix when characters are replaced)."""
+    safe = re.sub(r'[^A-Za-z0-9_.@-]', '_', name)
+    if safe != name:
+        safe = f"{safe[-60:]}-{hashlib.sha1(name.encode()).hexdigest()[:8]}"
+    return safe
+
+
+def _pid_alive(pid: int) -> bool:
+    if os.name != 'posix':
+        return True  # Cannot probe cheaply: keep the lease
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+# ----------------------------------------------------------------------
+# Store
+# ----------------------------------------------------------------------
+
+class SharedDatasetStore:
+    """Named frames published as memory-mapped column files."""
+
+    def __init__(self, directory=None):
+        self.directory = Path(directory) if directory else default_store_dir()
+        self._held: Dict[str, SharedDataset] = {}
+        self._lock = threading.Lock()
+        atexit.register(self.release_all)
+
+    # -- paths and locking ---------------------------------------------
+
+    def _dataset_dir(self, name: str) -> Path:
+        return self.directory / _safe_name(name)
+
+    @contextmanager
+    def _locked(self, name: str):
+        """Inter-process lock of one dataset (publish / attach / release)."""
+        dataset_dir = self._dataset_dir(name)
+        dataset_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock, open(dataset_dir / '.lock', 'w') as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield dataset_dir
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    @staticmethod
+    def _current_version(dataset_dir: Path) -> Optional[str]:
+        try:
+            return (dataset_dir / CURRENT_NAME).read_text().strip() or None
+        except FileNotFoundError:
+            return None
+
+    @staticmethod
+    def _live_leases(version_dir: Path) -> List[Path]:
+        """Leases of running processes (the others are deleted)."""
+        leases = []
+        for lease in (version_dir / 'leases').glob('*'):
+            try:
+                pid = int(lease.name.split('-', 1)[0])
+            except ValueError:
+                continue
+            if _pid_alive(pid):
+                leases.append(lease)
+            else:
+                lease.unlink(missing_ok=True)
+        return leases
+
+    def _new_lease(self, version_dir: Path) -> Path:
+        lease = version_dir / 'leases' / f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        lease.parent.mkdir(exist_ok=True)
+        lease.touch()
+        return lease
+
+    def _collect(self, dataset_dir: Path):
+        """Delete the versions nobody holds (the current one too if unheld)."""
+        current = self._current_version(dataset_dir)
+        for version_dir in dataset_dir.iterdir():
+            if (not version_dir.is_dir() or version_dir.name.startswith('.')
+                    or self._live_leases(version_dir)):
+                continue
+            if version_dir.name == current:
+                (dataset_dir / CURRENT_NAME).unlink(missing_ok=True)
+            shutil.rmtree(version_dir, ignore_errors=True)
+
+    # -- public API ------------------------------------------------------
+
+    def names(self) -> List[str]:
+        """Published dataset names."""
+        if not self.directory.exists():
+            return []
+        names = []
+        for dataset_dir in sorted(p for p in self.directory.iterdir() if p.is_dir()):
+            manifest = self._read_manifest(dataset_dir)
+            if manifest is not None:
+                names.append(manifest.name)
+        return names
+
+    def _read_manifest(self, dataset_dir: Path) -> Optional[SharedManifest]:
+        version = self._current_version(dataset_dir)
+        if version is None:
+            return None
+        try:
+            return SharedManifest.from_json((dataset_dir / version / MANIFEST_NAME).read_text())
+        except FileNotFoundError:
+            return None
+
+    def manifest(self, name: str) -> Optional[SharedManifest]:
+        """Manifest of the current version of a dataset (None if not published)."""
+        return self._read_manifest(self._dataset_dir(name))
+
+    def publish(self, name: str, frame: pd.DataFrame,
+                freshness: Optional[str] = None) -> SharedDataset:
+        """
+        Publish a frame under a name (replaces the previous version)
+
+        The previous version stays on disk until its last holder releases it.
+
+        Args:
+            name: Dataset name (e.g. 'MCD43A3', 'MOD10A1@athabasca')
+            frame: Cleaned frame to share
+            freshness: Source freshness stamp, checked by attach()
+
+        Returns:
+            SharedDataset: The publisher's own attached view; holding it keeps
+                the dataset alive for the processes that attach later
+
+        Raises:
+            TypeError: If a column cannot be encoded
+        """
+        with span('shared.publish', dataset=name):
+            version = f"{int(time.time() * 1000):x}-{uuid.uuid4().hex[:6]}"
+            manifest = SharedManifest(name, version, len(frame), index_name=frame.index.name,
+                                      freshness=freshness, published_at=time.time(),
+                                      publisher_pid=os.getpid())
+
+            arrays = []
+            for column_name, series in frame.items():
+                column, values = _encode_column(str(column_name), series)
+                manifest.columns.append(column)
+                arrays.append(values)
+            if isinstance(frame.index, pd.RangeIndex):
+                manifest.index = {'start': frame.index.start, 'stop': frame.index.stop,
+                                  'step': frame.index.step}
+            else:
+                column, values = _encode_column(INDEX_COLUMN, frame.index.to_series())
+                manifest.columns.append(column)
+                arrays.append(values)
+            manifest.nbytes = int(sum(values.nbytes for values in arrays))
+
+            dataset_dir = self._dataset_dir(name)
+            dataset_dir.mkdir(parents=True, exist_ok=True)
+            staging = Path(tempfile.mkdtemp(prefix='.staging-', dir=dataset_dir))
+            for i, values in enumerate(arrays):
+                np.save(staging / f"{i}.npy", np.ascontiguousarray(values), allow_pickle=False)
+            (staging / MANIFEST_NAME).write_text(manifest.to_json())
+
+            with self._locked(name):
+                version_dir = dataset_dir / version
+                staging.rename(version_dir)
+                lease = self._new_lease(version_dir)
+                pointer = dataset_dir / f".{CURRENT_NAME}-{uuid.uuid4().hex[:6]}"
+                pointer.write_text(version)
+                os.replace(pointer, dataset_dir / CURRENT_NAME)
+                self._collect(dataset_dir)
+
+            count('shared_bytes_published', manifest.nbytes)
+            print(f"📤 Shared store: {name} published ({manifest.rows} rows, "
+                  f"{manifest.nbytes / 1e6:.1f} MB)")
+        return self._hold(SharedDataset(self, manifest, self._map(version_dir, manifest), lease))
+
+    def attach(self, name: str, freshness: Optional[str] = None) -> Optional[SharedDataset]:
+        """
+        Attach the current version of a dataset (zero-copy, no parse)
+
+        Args:
+            name: Dataset name
+            freshness: Expected source freshness stamp (None: accept any version)
+
+        Returns:
+            SharedDataset: Attached view, or None if the dataset is not
+                published or was published from an older source
+        """
+        with span('shared.attach', dataset=name):
+            with self._locked(name) as dataset_dir:
+                manifest = self._read_manifest(dataset_dir)
+                if manifest is None:
+                    return None
+                if freshness is not None and manifest.freshness != freshness:
+                    print(f"⚠️  Shared store: {name} is stale ({manifest.freshness} ≠ {freshness})")
+                    return None
+                version_dir = dataset_dir / manifest.version
+                lease = self._new_lease(version_dir)
+
+            frame = self._map(version_dir, manifest)
+            count('shared_attaches')
+        return self._hold(SharedDataset(self, manifest, frame, lease))
+
+    @staticmethod
+    def _map(version_dir: Path, manifest: SharedManifest) -> pd.DataFrame:
+        """Frame over memory-mapped, copy-on-write column files."""
+        columns = {}
+        index = None
+        for i, column in enumerate(manifest.columns):
+            mapped = np.load(version_dir / f"{i}.npy", mmap_mode='c').view(np.ndarray)
+            values = _decode_column(column, mapped)
+            if column.name == INDEX_COLUMN:
+                index = pd.Index(values, name=manifest.index_name)
+            else:
+                columns[column.name] = values
+        if index is None:
+            index = (pd.RangeIndex(**manifest.index, name=manifest.index_name)
+                     if manifest.index else None)
+        return pd.DataFrame(columns, index=index, copy=False)
+
+    def _hold(self, shared: SharedDataset) -> SharedDataset:
+        with self._lock:
+            self._held[shared.lease.name] = shared
+        return shared
+
+    def _release(self, name: str, lease: Path):
+        with self._locked(name) as dataset_dir:
+            lease.unlink(missing_ok=True)
+            self._collect(dataset_dir)
+        with self._lock:
+            self._held.pop(lease.name, None)
+
+    def release_all(self):
+        """Release every lease held by this process."""
+        # A forked child inherits the parent's leases but must not release them
+        owner = f"{os.getpid()}-"
+        with self._lock:
+            held = [shared for lease, shared in self._held.items() if lease.startswith(owner)]
+        for shared in held:
+            try:
+                shared.release()
+            except OSError:
+                pass
+
+    def unpublish(self, name: str):
+        """Stop serving a dataset; its files go when the last holder releases them."""
+        with self._locked(name) as dataset_dir:
+            (dataset_dir / CURRENT_NAME).unlink(missing_ok=True)
+            self._collect(dataset_dir)
+
+    def cleanup(self):
+        """Prune dead leases and delete every unheld version (all datasets)."""
+        if not self.directory.exists():
+            return
+        for dataset_dir in [p for p in self.directory.iterdir() if p.is_dir()]:
+            with self._lock:
+                self._collect(dataset_dir)
+
+
+_store: Optional[SharedDatasetStore] = None
+
+
+def get_shared_store() -> SharedDatasetStore:
+    """Process-wide SharedDatasetStore."""
+    global _store
+    if _store is None:
+        _store = SharedDatasetStore()
+    return _store
+
+
+def load_shared_frame(name: str, loader: Callable[[], pd.DataFrame],
+                      freshness: Optional[str] = None) -> pd.DataFrame:
+    """
+    Frame attached from the shared store, or loaded and published
+
+    Calls loader() directly when the store is disabled or the frame cannot be
+    shared.
+
+    Args:
+        name: Dataset name in the store
+        loader: Zero-argument function returning the frame
+        freshness: Source freshness stamp
+
+    Returns:
+        pd.DataFrame: Loaded or attached frame
+    """
+    if not is_enabled():
+        return loader()
+
+    # Shallow copies: callers may add or replace columns without touching the held frame
+    store = get_shared_store()
+    shared = store.attach(name, freshness)
+    if shared is not None:
+        return shared.frame.copy(deep=False)
+
+    frame = loader()
+    try:
+        return store.publish(name, frame, freshness).frame.copy(deep=False)
+    except (OSError, TypeError, ValueError) as e:
+        print(f"⚠️  Shared store: {name} not published ({e})")
+        return frame
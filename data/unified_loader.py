@@ -2,8 +2,9 @@
 Unified Data Loader for Saskatchewan Glacier Albedo Analysis
 ==========================================================
 
-This module provides a unified interface that can load data from either
-CSV files (legacy mode) or PostgreSQL database (new mode) based on configuration.
+This module provides a unified interface that can load data from CSV files
+(legacy mode), the PostgreSQL database or an embedded DuckDB / Parquet store
+based on configuration.
 """
 
 import sys
@@ -19,9 +20,13 @@ def get_albedo_handler(*args, **kwargs):
     Get appropriate AlbedoDataHandler based on configuration
     
     Returns:
-        AlbedoDataHandler: Either CSV-based or database-based handler
+        AlbedoDataHandler: CSV-based, database-based or DuckDB-based handler
     """
-    if DATA_MODE.lower() == "database":
+    if DATA_MODE.lower() == "duckdb":
+        from data.duckdb_handler import AlbedoDataHandler
+        print("🦆 Using embedded DuckDB mode")
+        return AlbedoDataHandler(*args, **kwargs)
+    elif DATA_MODE.lower() == "database":
         from data.db_handler import AlbedoDataHandler
         print("🗄️  Using PostgreSQL database mode")
         return AlbedoDataHandler(*args, **kwargs)
@@ -37,9 +42,9 @@ if __name__ == "__main__":
     print(f"Data mode configured: {DATA_MODE}")
     
     # Test the loader
-    if DATA_MODE.lower() == "database":
+    if DATA_MODE.lower() in ("database", "duckdb"):
         handler = get_albedo_handler("MCD43A3")
         handler.load_data()
-        print(f"✅ Database mode test: {len(handler)} observations loaded")
+        print(f"✅ {DATA_MODE} mode test: {len(handler)} observations loaded")
     else:
         print("📄 CSV mode configured - would need CSV path for testing")
\ No newline at end of file
@@ -0,0 +1,263 @@
+"""
+Lecture directe des archives d'export Google Drive
+=================================================
+
+Les exports GEE arrivent sous forme d'archives ``data/csv/drive-download-*.zip``
+alors que la configuration pointe vers les CSV extraits (ex.
+``data/csv/MCD43A3_albedo_daily_stats_2010_2024.csv``). Ce module résout chaque
+chemin configuré vers le membre correspondant de l'archive la plus récente et
+le décompresse en flux directement dans le parseur CSV, sans fichier
+temporaire. Le résultat est mis en cache par CRC32 du membre : une nouvelle
+archive contenant un fichier identique ne le relit pas.
+"""
+
+import os
+import re
+import pickle
+import zipfile
+import hashlib
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass
+
+from utils.helpers import load_and_validate_csv
+from utils.instrumentation import count
+
+ARCHIVE_PATTERN = 'drive-download-*.zip'
+_ARCHIVE_TIMESTAMP = re.compile(r'drive-download-(\d{8}T\d{6})Z')
+
+
+@dataclass(frozen=True)
+class ArchiveMember:
+    """Membre CSV d'une archive d'export"""
+    archive: str
+    name: str
+    crc: int
+    size: int
+
+    @property
+    def label(self):
+        return f"{self.archive}!{self.name}"
+
+
+def archive_timestamp(path):
+    """
+    Date d'une archive : horodatage du nom Drive, sinon date de modification
+
+    (les membres des zips Drive sont tous datés de 1980)
+    """
+    match = _ARCHIVE_TIMESTAMP.search(Path(path).name)
+    if match:
+        return datetime.strptime(match.group(1), '%Y%m%dT%H%M%S').timestamp()
+    return os.path.getmtime(path)
+
+
+class ZipSourceResolver:
+    """
+    Résout les chemins CSV configurés vers les archives d'export
+
+    Args:
+        search_dirs (list, optional): Répertoires des archives (défaut : le
+            répertoire de chaque chemin demandé)
+        pattern (str): Motif des noms d'archives
+        cache_dir (str, optional): Répertoire du cache disque des DataFrames
+            (défaut : cache en mémoire seulement)
+    """
+
+    def __init__(self, search_dirs=None, pattern=ARCHIVE_PATTERN, cache_dir=None):
+        self.search_dirs = [Path(d) for d in search_dirs] if search_dirs else None
+        self.pattern = pattern
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory_cache = {}
+
+    def archives(self, directory):
+        """Archives d'un répertoire, de la plus récente à la plus ancienne"""
+        directories = self.search_dirs or [Path(directory)]
+        paths = [p for d in directories if d.exists() for p in d.glob(self.pattern)]
+        return sorted(paths, key=archive_timestamp, reverse=True)
+
+    def find_member(self, csv_path):
+        """
+        Membre de l'archive la plus récente portant le nom du CSV
+
+        Returns:
+            ArchiveMember: Membre trouvé, ou None
+        """
+        name = Path(csv_path).name
+        for archive in self.archives(Path(csv_path).parent):
+            with zipfile.ZipFile(archive) as zf:
+                for info in zf.infolist():
+                    if Path(info.filename).name == name:
+                        return ArchiveMember(str(archive), info.filename, info.CRC, info.file_size)
+        return None
+
+    def resolve(self, csv_path):
+        """
+        Source à lire pour un chemin CSV configuré
+
+        Le fichier extrait est utilisé s'il est plus récent que toute archive
+        qui contient le même nom.
+
+        Returns:
+            str or ArchiveMember: Chemin du fichier extrait ou membre d'archive
+
+        Raises:
+            FileNotFoundError: Si le CSV n'est ni extrait ni dans une archive
+        """
+        member = self.find_member(csv_path)
+        if os.path.exists(csv_path):
+            if member is None or os.path.getmtime(csv_path) >= archive_timestamp(member.archive):
+                return str(csv_path)
+        if member is None:
+            raise FileNotFoundError(f"Fichier non trouvé (ni extrait ni dans une archive): {csv_path}")
+        return member
+
+    def exists(self, csv_path):
+        """True si le CSV est extrait ou disponible dans une archive"""
+        return os.path.exists(csv_path) or self.find_member(csv_path) is not None
+
+    def open_member(self, member):
+        """Flux binaire décompressé à la volée d'un membre d'archive"""
+        # Le fichier de l'archive reste ouvert tant que le flux du membre l'est
+        with zipfile.ZipFile(member.archive) as zf:
+            return zf.open(member.name)
+
+    def read_csv(self, csv_path, **read_options):
+        """
+        Charge un CSV configuré, depuis le disque ou depuis une archive
+
+        Args:
+            csv_path (str): Chemin configuré du CSV
+            **read_options: Options de load_and_validate_csv (dtypes, ...)
+
+        Returns:
+            pd.DataFrame: Données chargées
+        """
+        source = self.resolve(csv_path)
+        if isinstance(source, str):
+            return load_and_validate_csv(source, **read_options)
+
+        key = self._cache_key(source, read_options)
+        if key in self._memory_cache:
+            print(f"✓ Cache CRC32 {source.crc:08x}: {source.name}")
+            return self._memory_cache[key].copy()
+
+        cache_file = self.cache_dir / f"{key}.pkl" if self.cache_dir else None
+        if cache_file is not None and cache_file.exists():
+            with open(cache_file, 'rb') as f:
+                data = pickle.load(f)
+            print(f"✓ Cache disque CRC32 {source.crc:08x}: {source.name}")
+        else:
+            print(f"📦 Lecture depuis l'archive: {source.label}")
+            data = load_and_validate_csv(source.label, open_stream=lambda: self.open_member(source),
+                                         **read_options)
+            count('bytes_read', source.size)
+            if cache_file is not None:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                with open(cache_file, 'wb') as f:
+                    pickle.dump(data, f)
+
+        # Une seule version en mémoire par membre (les archives arrivent chaque jour)
+        stem = Path(source.name).stem
+        self._memory_cache = {k: v for k, v in self._memory_cache.items()
+                              if not k.startswith(f"{stem}_")}
+        self._memory_cache[key] = data
+        return data.copy()
+
+    def probe(self, csv_path, date_column='date'):
+        """
+        Métadonnées d'un CSV sans le parser : en-tête, nombre de lignes,
+        premières et dernières dates, empreinte de fraîcheur
+
+        Sur disque, la dernière ligne est lue en fin de fichier ; un membre
+        d'archive est parcouru en flux (sans décodage CSV).
+
+        Returns:
+            dict: source, row_count, date_min, date_max, columns, freshness
+        """
+        import csv
+
+        source = self.resolve(csv_path)
+        if isinstance(source, str):
+            with open(source, 'rb') as f:
+                header = f.readline()
+                first = f.readline()
+                # Comptage des fins de ligne par blocs, puis dernière ligne lue en fin de fichier
+                row_count = 1 if first.strip() else 0
+                end = b'\n'
+                for chunk in iter(lambda: f.read(1 << 20), b''):
+                    row_count += chunk.count(b'\n')
+                    end = chunk[-1:]
+                if end != b'\n':
+                    row_count += 1  # Dernière ligne sans fin de ligne
+                f.seek(max(0, os.path.getsize(source) - 65536))
+                lines = [line for line in f.read().splitlines() if line.strip()]
+            last = lines[-1] if lines else first
+            label = source
+        else:
+            with self.open_member(source) as f:
+                header = f.readline()
+                first = last = f.readline()
+                row_count = 1 if first else 0
+                for line in f:
+                    if line.strip():
+                        last = line
+                        row_count += 1
+            label = source.label
+
+        columns = next(csv.reader([header.decode('utf-8')]), [])
+        date_min = date_max = None
+        if date_column in columns and row_count:
+            index = columns.index(date_column)
+            date_min = next(csv.reader([first.decode('utf-8')]))[index]
+            date_max = next(csv.reader([last.decode('utf-8')]))[index]
+
+        return {'source': label, 'row_count': row_count, 'date_min': date_min,
+                'date_max': date_max, 'columns': columns, 'freshness': self.freshness(source)}
+
+    def freshness(self, source):
+        """
+        Empreinte de fraîcheur d'une source, sans la lire : date de modification
+        du fichier extrait, ou nom de l'archive et CRC32 du membre
+
+        Args:
+            source (str or ArchiveMember): Source résolue (voir resolve)
+
+        Returns:
+            str: Empreinte comparable entre deux appels
+        """
+        if isinstance(source, str):
+            return datetime.fromtimestamp(os.path.getmtime(source)).isoformat()
+        return f"{Path(source.archive).name}:{source.crc:08x}"
+
+    @staticmethod
+    def _cache_key(member, read_options):
+        options = hashlib.sha1(repr(sorted(read_options.items())).encode()).hexdigest()[:8]
+        return f"{Path(member.name).stem}_{member.crc:08x}_{options}"
+
+
+_resolver = None
+
+
+def get_zip_resolver():
+    """Instance partagée de ZipSourceResolver (cache mémoire commun)"""
+    global _resolver
+    if _resolver is None:
+        _resolver = ZipSourceResolver()
+    return _resolver
+
+
+def read_csv_source(csv_path, **read_options):
+    """Charge un CSV configuré via le résolveur partagé"""
+    return get_zip_resolver().read_csv(csv_path, **read_options)
+
+
+def csv_source_freshness(csv_path):
+    """Empreinte de fraîcheur d'un CSV configuré (voir ZipSourceResolver.freshness)"""
+    resolver = get_zip_resolver()
+    return resolver.freshness(resolver.resolve(csv_path))
+
+
+def csv_source_exists(csv_path):
+    """True si le CSV configuré est lisible (extrait ou dans une archive)"""
+    return bool(csv_path) and get_zip_resolver().exists(csv_path)
@@ -14,6 +14,8 @@ from sqlalchemy.engine import Engine
 from typing import Optional, Dict, Any, List
 import logging
 
+from utils.instrumentation import span, count
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -85,7 +87,10 @@ class DatabaseConnection:
             pandas.DataFrame: Query results
         """
         try:
-            return pd.read_sql(query, self.engine, params=params)
+            with span('db.query'):
+                result = pd.read_sql(query, self.engine, params=params)
+            count('db_rows_read', len(result))
+            return result
         except Exception as e:
             logger.error(f"Query execution failed: {e}")
             raise
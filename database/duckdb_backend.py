@@ -0,0 +1,247 @@
+"""
+Embedded DuckDB backend for Saskatchewan Glacier Albedo Analysis
+================================================================
+
+Builds a local columnar copy of the PostgreSQL schema (database/schema.sql)
+from the GEE CSV exports, either as a single DuckDB file or as a directory of
+Parquet files (one sub-directory per table), and opens it for querying.
+
+No server is required: DATA_MODE = 'duckdb' reads through
+data.duckdb_handler.AlbedoDataHandler. Rows are written sorted by region and
+date so DuckDB's per-row-group min/max statistics prune region and date-range
+queries; the Parquet layout is also partitioned by region
+(``<table>/region=<name>/``), so a region query only opens that region's files.
+
+Usage:
+    python database/duckdb_backend.py                       # data/albedo.duckdb
+    python database/duckdb_backend.py --parquet data/albedo_parquet
+    python database/duckdb_backend.py --regions saskatchewan athabasca
+"""
+
+import os
+import re
+import sys
+import shutil
+import argparse
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.helpers import print_section_header
+
+SCHEMA_PATH = Path(__file__).with_name('schema.sql')
+SCHEMA = 'albedo'
+
+# Source CSV (as configured / named in the Drive export) -> table
+CSV_TABLES = {
+    'mcd43a3_measurements': 'data/csv/MCD43A3_albedo_daily_stats_2010_2024.csv',
+    'mod10a1_measurements': 'data/csv/MOD10A1_snow_daily_stats_2010_2024.csv',
+    'mcd43a3_quality': 'data/csv/MCD43A3_quality_distribution_daily_2010_2024.csv',
+    'mod10a1_quality': 'data/csv/MOD10A1_quality_daily_2010_2024.csv',
+}
+
+MEASUREMENT_TABLES = {
+    'MCD43A3': 'mcd43a3_measurements',
+    'MOD10A1': 'mod10a1_measurements',
+}
+
+
+def check_duckdb():
+    """True if the duckdb package is available"""
+    try:
+        import duckdb  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def duckdb_schema_sql(schema_path=SCHEMA_PATH):
+    """
+    DuckDB version of the PostgreSQL schema
+
+    SERIAL ids and B-tree indexes are dropped: DuckDB prunes with row-group
+    min/max statistics instead, and indexes only slow the bulk load. The
+    ALTER TABLE upgrades of existing PostgreSQL tables are dropped too (the
+    store is always built from scratch).
+    """
+    sql = Path(schema_path).read_text()
+    sql = re.sub(r'^\s*id SERIAL PRIMARY KEY,\s*$\n', '', sql, flags=re.MULTILINE)
+    sql = re.sub(r'^CREATE INDEX .*?;\s*$\n', '', sql, flags=re.MULTILINE)
+    sql = re.sub(r'^ALTER TABLE .*?;\s*$\n', '', sql, flags=re.MULTILINE)
+    return sql
+
+
+def connect(path, read_only=True):
+    """
+    Open a DuckDB file or a Parquet directory built by build_duckdb()
+
+    A Parquet directory is exposed through views named like the tables, so the
+    same SQL works on both layouts (filters are pushed into the Parquet scan,
+    and region filters prune the region=<name> partitions).
+
+    Args:
+        path: .duckdb file or Parquet directory
+        read_only: Open the DuckDB file read-only
+
+    Returns:
+        duckdb.DuckDBPyConnection
+    """
+    import duckdb
+
+    path = Path(path)
+    if path.is_dir():
+        conn = duckdb.connect()
+        conn.execute(f"CREATE SCHEMA IF NOT EXISTS {SCHEMA}")
+        for table_dir in sorted(p for p in path.iterdir() if p.is_dir()):
+            if any(table_dir.glob('region=*')):
+                source = (f"read_parquet('{(table_dir / '*' / '*.parquet').as_posix()}', "
+                          f"hive_partitioning = true)")
+            else:
+                source = f"read_parquet('{(table_dir / '*.parquet').as_posix()}')"
+            conn.execute(f"CREATE VIEW {SCHEMA}.{table_dir.name} AS SELECT * FROM {source}")
+        return conn
+
+    if not path.exists():
+        raise FileNotFoundError(f"DuckDB store not found: {path} "
+                                f"(build it with python database/duckdb_backend.py)")
+    return duckdb.connect(str(path), read_only=read_only)
+
+
+def prepare_csv_frame(df):
+    """
+    Align a GEE CSV frame with the SQL schema
+
+    Renames system:* columns, drops .geo and fills the temporal columns
+    (year, doy, decimal_year, season) that the QA exports do not carry.
+    """
+    df = df.rename(columns={'system:index': 'system_index',
+                            'system:time_start': 'system_time_start'})
+    df = df.drop(columns=['.geo'], errors='ignore')
+    df['date'] = pd.to_datetime(df['date'])
+
+    doy = df['date'].dt.dayofyear
+    if 'year' not in df.columns:
+        df['year'] = df['date'].dt.year
+    if 'doy' not in df.columns:
+        df['doy'] = doy
+    if 'decimal_year' not in df.columns:
+        df['decimal_year'] = df['year'] + df['doy'] / 365.25
+    if 'season' not in df.columns:
+        month = df['date'].dt.month
+        df['season'] = np.where(month <= 7, 'early_summer',
+                                np.where(month == 8, 'mid_summer', 'late_summer'))
+    return df.sort_values('date').reset_index(drop=True)
+
+
+def _table_columns(conn, table):
+    rows = conn.execute(
+        "SELECT column_name FROM information_schema.columns "
+        "WHERE table_schema = ? AND table_name = ? ORDER BY ordinal_position",
+        [SCHEMA, table]).fetchall()
+    return [row[0] for row in rows]
+
+
+def region_csv_tables(region, csv_tables=None):
+    """
+    Mapping table -> CSV path of a region (same file names as CSV_TABLES,
+    in the region's data directory)
+    """
+    from config.settings import config
+
+    csv_tables = csv_tables or CSV_TABLES
+    if region == config.default_region:
+        return dict(csv_tables)
+    data_dir = config.get_region(region).data_dir
+    return {table: os.path.join(data_dir, os.path.basename(csv_path))
+            for table, csv_path in csv_tables.items()}
+
+
+def build_duckdb(db_path=None, parquet_dir=None, csv_tables=None, regions=None):
+    """
+    Build the embedded store from the CSV exports (extracted or in Drive zips)
+
+    Args:
+        db_path: Target .duckdb file (rebuilt from scratch)
+        parquet_dir: Target Parquet directory instead of a DuckDB file
+        csv_tables: Mapping table -> CSV path of the reference glacier
+            (default: CSV_TABLES)
+        regions: Regions to import (default: every configured region)
+
+    Returns:
+        dict: Row count per imported table (all regions)
+    """
+    import duckdb
+    from config.settings import config
+    from data.zip_source import read_csv_source, csv_source_exists
+
+    if (db_path is None) == (parquet_dir is None):
+        raise ValueError("Give exactly one of db_path or parquet_dir")
+
+    print_section_header("CSV to DuckDB Import", level=1)
+
+    if db_path is not None:
+        db_path = Path(db_path)
+        db_path.parent.mkdir(parents=True, exist_ok=True)
+        if db_path.exists():
+            db_path.unlink()
+        conn = duckdb.connect(str(db_path))
+    else:
+        conn = duckdb.connect()
+
+    conn.execute(duckdb_schema_sql())
+    counts = {}
+
+    for region in regions or list(config.get_regions()):
+        for table, csv_path in region_csv_tables(region, csv_tables).items():
+            if not csv_source_exists(csv_path):
+                print(f"⚠️  File not found: {csv_path}")
+                continue
+
+            frame = prepare_csv_frame(read_csv_source(csv_path, skip_columns=('.geo',)))
+            frame['region'] = region
+            columns = [c for c in _table_columns(conn, table) if c in frame.columns]
+            conn.register('csv_frame', frame[columns])
+            conn.execute(f"INSERT INTO {SCHEMA}.{table} ({', '.join(columns)}) "
+                         f"SELECT {', '.join(columns)} FROM csv_frame ORDER BY date")
+            conn.unregister('csv_frame')
+            counts[table] = counts.get(table, 0) + len(frame)
+            print(f"✅ {table} ({region}): {len(frame)} rows")
+
+    if parquet_dir is not None:
+        for table in counts:
+            table_dir = Path(parquet_dir) / table
+            if table_dir.exists():
+                shutil.rmtree(table_dir)
+            table_dir.parent.mkdir(parents=True, exist_ok=True)
+            conn.execute(f"COPY (SELECT * FROM {SCHEMA}.{table} ORDER BY region, date) "
+                         f"TO '{table_dir.as_posix()}' "
+                         f"(FORMAT PARQUET, PARTITION_BY (region), ROW_GROUP_SIZE 100000)")
+        print(f"📁 Parquet store written: {parquet_dir}")
+    else:
+        conn.execute("CHECKPOINT")
+        print(f"🦆 DuckDB store written: {db_path}")
+
+    conn.close()
+    return counts
+
+
+if __name__ == "__main__":
+    from config import DUCKDB_PATH
+
+    parser = argparse.ArgumentParser(description="Build the embedded DuckDB / Parquet store")
+    parser.add_argument('--db', default=None, help=f"DuckDB file (default: {DUCKDB_PATH})")
+    parser.add_argument('--parquet', default=None, help="Write a Parquet directory instead")
+    parser.add_argument('--regions', nargs='+', default=None,
+                        help="Regions to import (default: every configured region)")
+    args = parser.parse_args()
+
+    if not check_duckdb():
+        print("❌ duckdb is not installed: pip install duckdb")
+        sys.exit(1)
+
+    build_duckdb(db_path=None if args.parquet else (args.db or DUCKDB_PATH),
+                 parquet_dir=args.parquet, regions=args.regions)
@@ -3,6 +3,10 @@ CSV to PostgreSQL Import Script
 ==============================
 
 This script imports the existing CSV files into PostgreSQL database tables.
+
+Usage:
+    python database/import_csv.py                        # reference glacier
+    python database/import_csv.py saskatchewan athabasca # one or more regions
 """
 
 import pandas as pd
@@ -15,6 +19,7 @@ import os
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from config import DEFAULT_REGION
 from database.connection import get_connection
 from utils.helpers import print_section_header
 
@@ -66,7 +71,8 @@ def clean_csv_data(df: pd.DataFrame) -> pd.DataFrame:
     
     return df_clean
 
-def import_csv_file(csv_path: str, table_name: str, schema: str = "albedo") -> bool:
+def import_csv_file(csv_path: str, table_name: str, schema: str = "albedo",
+                    region: str = DEFAULT_REGION) -> bool:
     """
     Import a single CSV file into PostgreSQL
     
@@ -74,6 +80,7 @@ def import_csv_file(csv_path: str, table_name: str, schema: str = "albedo") -> b
         csv_path: Path to CSV file
         table_name: Target table name
         schema: Database schema
+        region: Glacier / region the CSV belongs to
         
     Returns:
         bool: Success status
@@ -88,15 +95,16 @@ def import_csv_file(csv_path: str, table_name: str, schema: str = "albedo") -> b
         
         # Clean data
         df_clean = clean_csv_data(df)
+        df_clean['region'] = region
         logger.info(f"Cleaned data: {len(df_clean)} rows ready for import")
         
         # Import to database
         conn = get_connection()
-        # First clear the table (since we can't drop due to views)
+        # First clear the region's rows (since we can't drop due to views)
         if table_name in ['mcd43a3_measurements', 'mod10a1_measurements']:
-            clear_query = f"DELETE FROM {schema}.{table_name}"
-            conn.execute_statement(clear_query)
-            logger.info(f"Cleared existing data from {schema}.{table_name}")
+            clear_query = f"DELETE FROM {schema}.{table_name} WHERE region = :region"
+            conn.execute_statement(clear_query, {'region': region})
+            logger.info(f"Cleared existing {region} data from {schema}.{table_name}")
         
         conn.insert_dataframe(df_clean, table_name, schema=schema, if_exists='append')
         
@@ -110,8 +118,16 @@ def import_csv_file(csv_path: str, table_name: str, schema: str = "albedo") -> b
         logger.error(f"Failed to import {csv_path}: {e}")
         return False
 
-def import_all_csv_files():
-    """Import all CSV files to PostgreSQL"""
+def import_all_csv_files(regions=None):
+    """
+    Import all CSV files to PostgreSQL
+    
+    Args:
+        regions: Region names (default: the reference glacier); the CSVs of a
+            region are read from its data directory (config.get_region)
+    """
+    from config.settings import config
+    
     print_section_header("CSV to PostgreSQL Import", level=1)
     
     # Define file mappings
@@ -138,18 +154,24 @@ def import_all_csv_files():
         }
     ]
     
+    imports = [
+        (region, os.path.join(config.get_region(region).data_dir, os.path.basename(file_info['path'])),
+         file_info)
+        for region in regions or [DEFAULT_REGION]
+        for file_info in csv_files
+    ]
+    
     success_count = 0
-    total_count = len(csv_files)
+    total_count = len(imports)
     
-    for file_info in csv_files:
-        csv_path = file_info['path']
+    for region, csv_path, file_info in imports:
         table_name = file_info['table']
-        description = file_info['description']
+        description = f"{file_info['description']} ({region})"
         
         print(f"\n📁 Processing: {description}")
         
         if Path(csv_path).exists():
-            success = import_csv_file(csv_path, table_name)
+            success = import_csv_file(csv_path, table_name, region=region)
             if success:
                 success_count += 1
                 print(f"✅ {description} imported successfully")
@@ -201,8 +223,8 @@ if __name__ == "__main__":
         print("❌ Database connection failed. Please check your PostgreSQL setup.")
         exit(1)
     
-    # Import all files
-    success = import_all_csv_files()
+    # Import all files of the requested regions
+    success = import_all_csv_files(sys.argv[1:] or None)
     
     if success:
         print("\n🔍 Verifying import...")
@@ -0,0 +1,485 @@
+#!/usr/bin/env python3
+"""
+Year-Partitioned Measurement Tables Migration
+============================================
+
+Optional migration that converts the single heap tables
+``albedo.mcd43a3_measurements`` and ``albedo.mod10a1_measurements`` into
+declaratively partitioned tables (RANGE on ``year``, one partition per year).
+
+Changes applied per product:
+- BRIN index on ``date`` (tiny, ideal for append-only, date-ordered data)
+- Composite B-tree index on ``(year, month)`` with a generated ``month`` column
+- ``geo`` TEXT column moved to a side table ``<product>_geometry``
+- Data copied from the legacy table, which is kept as ``<table>_heap``
+- ``albedo.<product>_view`` recreated on top of the partitioned table
+
+Usage:
+    python database/partition_migration.py --sql        # Print SQL only
+    python database/partition_migration.py --benchmark  # Benchmark, migrate, benchmark
+    python database/partition_migration.py --rollback   # Restore heap tables
+"""
+
+import sys
+import os
+import time
+import logging
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import text
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database.connection import get_connection
+from utils.helpers import print_section_header
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SCHEMA = "albedo"
+
+# Products handled by the migration (prefix -> measurements table)
+MEASUREMENT_TABLES = {
+    'mcd43a3': 'mcd43a3_measurements',
+    'mod10a1': 'mod10a1_measurements'
+}
+
+# Default year span covered by partitions (extended by years found in the data)
+DEFAULT_YEAR_RANGE = (2010, 2024)
+
+FRACTIONS = ['border', 'mixed_low', 'mixed_high', 'mostly_ice', 'pure_ice']
+
+# Column definitions shared by both measurement tables (geo excluded)
+BASE_COLUMNS = [
+    ('system_index', 'TEXT'),
+    ('region', "VARCHAR(64) NOT NULL DEFAULT 'saskatchewan'"),
+    ('date', 'DATE NOT NULL'),
+    ('year', 'INTEGER NOT NULL'),
+    ('decimal_year', 'DOUBLE PRECISION NOT NULL'),
+    ('doy', 'INTEGER NOT NULL'),
+    ('season', 'VARCHAR(20)'),
+    ('system_time_start', 'BIGINT'),
+    ('min_pixels_threshold', 'INTEGER'),
+    ('total_valid_pixels', 'INTEGER'),
+]
+
+FRACTION_COLUMNS = [
+    (f'{fraction}_{suffix}', sql_type)
+    for fraction in FRACTIONS
+    for suffix, sql_type in [
+        ('data_quality', 'DOUBLE PRECISION'),
+        ('mean', 'DOUBLE PRECISION'),
+        ('median', 'DOUBLE PRECISION'),
+        ('pixel_count', 'INTEGER'),
+    ]
+]
+
+METADATA_COLUMNS = [
+    ('created_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+    ('updated_at', 'TIMESTAMP DEFAULT CURRENT_TIMESTAMP'),
+]
+
+# Columns exposed by the compatibility views (same as schema.sql)
+VIEW_COLUMNS = [
+    'date', 'year', 'decimal_year', 'doy', 'season', 'min_pixels_threshold',
+    'border_mean', 'border_median', 'mixed_low_mean', 'mixed_low_median',
+    'mixed_high_mean', 'mixed_high_median', 'mostly_ice_mean', 'mostly_ice_median',
+    'pure_ice_mean', 'pure_ice_median', 'total_valid_pixels', 'region'
+]
+
+# Range-scan queries used for the before/after benchmark
+BENCHMARK_QUERIES = {
+    'melt_season_single_year': """
+        SELECT date, pure_ice_mean, mostly_ice_mean
+        FROM {schema}.{table}
+        WHERE year = 2020 AND date BETWEEN '2020-06-01' AND '2020-09-30'
+    """,
+    'year_range_aggregate': """
+        SELECT year, AVG(pure_ice_mean) AS pure_ice_avg, COUNT(*) AS n
+        FROM {schema}.{table}
+        WHERE year BETWEEN 2015 AND 2019
+        GROUP BY year
+    """,
+    'august_all_years': """
+        SELECT year, AVG(mostly_ice_mean) AS mostly_ice_avg
+        FROM {schema}.{table}
+        WHERE {month_expr} = 8
+        GROUP BY year
+    """,
+    'date_window': """
+        SELECT date, border_mean, pure_ice_mean
+        FROM {schema}.{table}
+        WHERE date >= '2018-07-15' AND date < '2018-08-15'
+    """
+}
+
+
+def _column_list(columns) -> str:
+    """Format a list of (name, type) tuples as a comma-separated SQL list."""
+    return ",\n    ".join(f"{name} {sql_type}" for name, sql_type in columns)
+
+
+def _data_columns() -> List[str]:
+    """Names of the columns copied from the legacy heap table."""
+    return [name for name, _ in BASE_COLUMNS + FRACTION_COLUMNS + METADATA_COLUMNS]
+
+
+def build_migration_sql(prefix: str, years: List[int]) -> List[str]:
+    """
+    Build the SQL statements migrating one product to a partitioned table
+
+    Args:
+        prefix: Product prefix ('mcd43a3' or 'mod10a1')
+        years: Years for which a partition is created
+
+    Returns:
+        list: SQL statements, in execution order
+    """
+    table = MEASUREMENT_TABLES[prefix]
+    heap = f"{table}_heap"
+    geometry = f"{prefix}_geometry"
+    copy_cols = ", ".join(['id'] + _data_columns())
+    view_cols = ",\n    ".join(VIEW_COLUMNS)
+
+    statements = [
+        # The view is bound to the legacy table OID and must be dropped first
+        f"DROP VIEW IF EXISTS {SCHEMA}.{prefix}_view",
+        f"ALTER TABLE {SCHEMA}.{table} RENAME TO {heap}",
+        f"""
+        CREATE TABLE {SCHEMA}.{table} (
+            id SERIAL,
+            {_column_list(BASE_COLUMNS)},
+            month SMALLINT GENERATED ALWAYS AS (CAST(EXTRACT(MONTH FROM date) AS SMALLINT)) STORED,
+            {_column_list(FRACTION_COLUMNS)},
+            {_column_list(METADATA_COLUMNS)},
+            PRIMARY KEY (id, year)
+        ) PARTITION BY RANGE (year)
+        """,
+    ]
+
+    for year in years:
+        statements.append(
+            f"CREATE TABLE IF NOT EXISTS {SCHEMA}.{table}_y{year} "
+            f"PARTITION OF {SCHEMA}.{table} FOR VALUES FROM ({year}) TO ({year + 1})"
+        )
+    statements.append(
+        f"CREATE TABLE IF NOT EXISTS {SCHEMA}.{table}_default "
+        f"PARTITION OF {SCHEMA}.{table} DEFAULT"
+    )
+
+    statements += [
+        # Indexes on the parent cascade to every partition
+        f"CREATE INDEX IF NOT EXISTS idx_{prefix}_date_brin ON {SCHEMA}.{table} USING BRIN (date)",
+        f"CREATE INDEX IF NOT EXISTS idx_{prefix}_year_month ON {SCHEMA}.{table} (year, month)",
+        f"CREATE INDEX IF NOT EXISTS idx_{prefix}_season_part ON {SCHEMA}.{table} (season)",
+        f"CREATE INDEX IF NOT EXISTS idx_{prefix}_region_date_part ON {SCHEMA}.{table} (region, date)",
+
+        # Geometry side table so GeoJSON strings do not bloat range scans
+        f"""
+        CREATE TABLE IF NOT EXISTS {SCHEMA}.{geometry} (
+            measurement_id INTEGER NOT NULL,
+            year INTEGER NOT NULL,
+            date DATE NOT NULL,
+            geo TEXT,
+            PRIMARY KEY (measurement_id, year)
+        )
+        """,
+
+        # Data copy, ordered by date so BRIN ranges stay tight
+        f"""
+        INSERT INTO {SCHEMA}.{table} ({copy_cols})
+        SELECT {copy_cols} FROM {SCHEMA}.{heap}
+        ORDER BY date
+        """,
+        f"""
+        INSERT INTO {SCHEMA}.{geometry} (measurement_id, year, date, geo)
+        SELECT id, year, date, geo FROM {SCHEMA}.{heap}
+        WHERE geo IS NOT NULL
+        """,
+        f"""
+        SELECT setval(pg_get_serial_sequence('{SCHEMA}.{table}', 'id'),
+                      COALESCE((SELECT MAX(id) FROM {SCHEMA}.{table}), 1))
+        """,
+
+        # Compatibility view recreated on the partitioned table
+        f"""
+        CREATE OR REPLACE VIEW {SCHEMA}.{prefix}_view AS
+        SELECT
+            {view_cols}
+        FROM {SCHEMA}.{table}
+        ORDER BY region, date
+        """,
+        f"ANALYZE {SCHEMA}.{table}",
+    ]
+
+    return statements
+
+
+def build_rollback_sql(prefix: str) -> List[str]:
+    """
+    Build the SQL statements restoring the legacy heap table
+
+    Args:
+        prefix: Product prefix ('mcd43a3' or 'mod10a1')
+
+    Returns:
+        list: SQL statements, in execution order
+    """
+    table = MEASUREMENT_TABLES[prefix]
+    view_cols = ",\n    ".join(VIEW_COLUMNS)
+
+    return [
+        f"DROP VIEW IF EXISTS {SCHEMA}.{prefix}_view",
+        f"DROP TABLE IF EXISTS {SCHEMA}.{prefix}_geometry",
+        f"DROP TABLE IF EXISTS {SCHEMA}.{table} CASCADE",
+        f"ALTER TABLE {SCHEMA}.{table}_heap RENAME TO {table}",
+        f"""
+        CREATE OR REPLACE VIEW {SCHEMA}.{prefix}_view AS
+        SELECT
+            {view_cols}
+        FROM {SCHEMA}.{table}
+        ORDER BY region, date
+        """,
+    ]
+
+
+def is_partitioned(prefix: str, conn=None) -> bool:
+    """
+    Check whether a product's measurements table is already partitioned
+
+    Args:
+        prefix: Product prefix ('mcd43a3' or 'mod10a1')
+        conn: DatabaseConnection (defaults to the global connection)
+
+    Returns:
+        bool: True if the table is a partitioned table
+    """
+    conn = conn or get_connection()
+    query = """
+    SELECT c.relkind
+    FROM pg_class c
+    JOIN pg_namespace n ON n.oid = c.relnamespace
+    WHERE n.nspname = %(schema)s AND c.relname = %(table)s
+    """
+    result = conn.execute_query(query, {'schema': SCHEMA, 'table': MEASUREMENT_TABLES[prefix]})
+    return len(result) > 0 and result.iloc[0]['relkind'] == 'p'
+
+
+def _partition_years(prefix: str, conn) -> List[int]:
+    """Years needing a partition: configured span plus any year found in the data."""
+    table = MEASUREMENT_TABLES[prefix]
+    years = set(range(DEFAULT_YEAR_RANGE[0], DEFAULT_YEAR_RANGE[1] + 1))
+    existing = conn.execute_query(f"SELECT DISTINCT year FROM {SCHEMA}.{table}")
+    years.update(int(y) for y in existing['year'].dropna())
+    return sorted(years)
+
+
+def _execute_in_transaction(conn, statements: List[str], check=None):
+    """
+    Execute statements atomically so a failed migration leaves the schema untouched
+
+    Args:
+        conn: DatabaseConnection
+        statements: SQL statements run in order
+        check: Optional callable receiving the open transaction after the
+            statements; raising inside it rolls the whole transaction back
+
+    Returns:
+        Value returned by check (None without check)
+    """
+    with conn.engine.begin() as tx:
+        for statement in statements:
+            tx.execute(text(statement))
+        return check(tx) if check is not None else None
+
+
+def _check_row_counts(table: str):
+    """Transaction check: the partitioned table must hold every row of the heap table"""
+    def check(tx):
+        new_rows, old_rows = tx.execute(text(
+            f"SELECT (SELECT COUNT(*) FROM {SCHEMA}.{table}) AS new_rows, "
+            f"(SELECT COUNT(*) FROM {SCHEMA}.{table}_heap) AS old_rows"
+        )).one()
+        if new_rows != old_rows:
+            raise RuntimeError(f"Row count mismatch: {new_rows} vs {old_rows}")
+        return new_rows
+    return check
+
+
+def migrate(prefixes: Optional[List[str]] = None, conn=None) -> bool:
+    """
+    Migrate measurement tables to year-partitioned tables
+
+    Each table is swapped in its own transaction, which also verifies the row
+    counts: a failing table is left unchanged, but tables already swapped
+    earlier in the run stay partitioned (they are reported, and
+    ``--rollback`` restores them).
+
+    Args:
+        prefixes: Products to migrate (default: both)
+        conn: DatabaseConnection (defaults to the global connection)
+
+    Returns:
+        bool: Success status
+    """
+    conn = conn or get_connection()
+    prefixes = prefixes or list(MEASUREMENT_TABLES)
+    print_section_header("Partitioning measurement tables", level=2)
+
+    swapped = []
+    for prefix in prefixes:
+        table = MEASUREMENT_TABLES[prefix]
+        try:
+            if is_partitioned(prefix, conn):
+                print(f"✓ {SCHEMA}.{table} already partitioned, skipped")
+                continue
+
+            years = _partition_years(prefix, conn)
+            rows = _execute_in_transaction(conn, build_migration_sql(prefix, years),
+                                           check=_check_row_counts(table))
+            swapped.append(prefix)
+
+            print(f"✅ {SCHEMA}.{table}: {rows:,} rows in {len(years)} yearly partitions")
+
+        except Exception as e:
+            logger.error(f"Migration failed for {table}: {e}")
+            print(f"❌ {SCHEMA}.{table}: migration rolled back, table unchanged")
+            if swapped:
+                print(f"⚠️ Already partitioned in this run: "
+                      f"{', '.join(MEASUREMENT_TABLES[p] for p in swapped)} "
+                      f"(restore with --rollback)")
+            return False
+
+    return True
+
+
+def rollback(prefixes: Optional[List[str]] = None, conn=None) -> bool:
+    """
+    Restore the legacy heap tables kept by the migration
+
+    Args:
+        prefixes: Products to restore (default: both)
+        conn: DatabaseConnection (defaults to the global connection)
+
+    Returns:
+        bool: Success status
+    """
+    conn = conn or get_connection()
+    prefixes = prefixes or list(MEASUREMENT_TABLES)
+    print_section_header("Restoring heap measurement tables", level=2)
+
+    for prefix in prefixes:
+        table = MEASUREMENT_TABLES[prefix]
+        try:
+            if not is_partitioned(prefix, conn):
+                print(f"✓ {SCHEMA}.{table} is not partitioned, nothing to restore")
+                continue
+
+            _execute_in_transaction(conn, build_rollback_sql(prefix))
+            print(f"✅ {SCHEMA}.{table} restored from {table}_heap")
+
+        except Exception as e:
+            logger.error(f"Rollback failed for {table}: {e}")
+            return False
+
+    return True
+
+
+def benchmark_range_scans(prefixes: Optional[List[str]] = None, repeats: int = 5,
+                          conn=None) -> pd.DataFrame:
+    """
+    Measure range-scan latency for the benchmark queries
+
+    Each query is executed once to warm the cache, then ``repeats`` times.
+
+    Args:
+        prefixes: Products to benchmark (default: both)
+        repeats: Number of timed executions per query
+        conn: DatabaseConnection (defaults to the global connection)
+
+    Returns:
+        pd.DataFrame: One row per (table, query) with median/min latency in ms
+    """
+    conn = conn or get_connection()
+    prefixes = prefixes or list(MEASUREMENT_TABLES)
+    rows = []
+
+    for prefix in prefixes:
+        table = MEASUREMENT_TABLES[prefix]
+        layout = 'partitioned' if is_partitioned(prefix, conn) else 'heap'
+
+        for name, template in BENCHMARK_QUERIES.items():
+            # Partitioned tables expose the indexed generated month column
+            month_expr = 'month' if layout == 'partitioned' else 'EXTRACT(MONTH FROM date)'
+            query = template.format(schema=SCHEMA, table=table, month_expr=month_expr)
+            conn.execute_query(query)
+
+            timings = []
+            for _ in range(repeats):
+                start = time.perf_counter()
+                result = conn.execute_query(query)
+                timings.append((time.perf_counter() - start) * 1000)
+
+            rows.append({
+                'table': table,
+                'layout': layout,
+                'query': name,
+                'rows': len(result),
+                'median_ms': float(np.median(timings)),
+                'min_ms': float(np.min(timings))
+            })
+
+    return pd.DataFrame(rows)
+
+
+def compare_benchmarks(before: pd.DataFrame, after: pd.DataFrame) -> pd.DataFrame:
+    """
+    Join before/after benchmark tables and compute the speedup
+
+    Args:
+        before: Result of benchmark_range_scans on heap tables
+        after: Result of benchmark_range_scans on partitioned tables
+
+    Returns:
+        pd.DataFrame: Latencies side by side with a ``speedup`` column
+    """
+    merged = before.merge(after, on=['table', 'query'], suffixes=('_before', '_after'))
+    merged['speedup'] = merged['median_ms_before'] / merged['median_ms_after']
+    return merged[['table', 'query', 'rows_before', 'median_ms_before',
+                   'median_ms_after', 'speedup']]
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+
+    if '--sql' in args:
+        for prefix in MEASUREMENT_TABLES:
+            years = list(range(DEFAULT_YEAR_RANGE[0], DEFAULT_YEAR_RANGE[1] + 1))
+            for statement in build_migration_sql(prefix, years):
+                print(statement.strip() + ";\n")
+        sys.exit(0)
+
+    conn = get_connection()
+    if not conn.test_connection():
+        print("❌ Database connection failed. Please check your PostgreSQL setup.")
+        sys.exit(1)
+
+    if '--rollback' in args:
+        sys.exit(0 if rollback(conn=conn) else 1)
+
+    before = benchmark_range_scans(conn=conn) if '--benchmark' in args else None
+
+    if not migrate(conn=conn):
+        print("❌ Migration failed (see above for the tables left partitioned).")
+        sys.exit(1)
+
+    if before is not None:
+        after = benchmark_range_scans(conn=conn)
+        print_section_header("Range-scan benchmark (median latency)", level=2)
+        print(compare_benchmarks(before, after).to_string(index=False, float_format='%.2f'))
+
+    print("\n✅ Partitioning migration completed!")
@@ -8,6 +8,7 @@ CREATE SCHEMA IF NOT EXISTS albedo;
 CREATE TABLE IF NOT EXISTS albedo.mcd43a3_measurements (
     id SERIAL PRIMARY KEY,
     system_index TEXT,
+    region VARCHAR(64) NOT NULL DEFAULT 'saskatchewan',
     date DATE NOT NULL,
     year INTEGER NOT NULL,
     decimal_year DOUBLE PRECISION NOT NULL,
@@ -59,6 +60,7 @@ CREATE TABLE IF NOT EXISTS albedo.mcd43a3_measurements (
 CREATE TABLE IF NOT EXISTS albedo.mod10a1_measurements (
     id SERIAL PRIMARY KEY,
     system_index TEXT,
+    region VARCHAR(64) NOT NULL DEFAULT 'saskatchewan',
     date DATE NOT NULL,
     year INTEGER NOT NULL,
     decimal_year DOUBLE PRECISION NOT NULL,
@@ -110,6 +112,7 @@ CREATE TABLE IF NOT EXISTS albedo.mod10a1_measurements (
 CREATE TABLE IF NOT EXISTS albedo.mcd43a3_quality (
     id SERIAL PRIMARY KEY,
     system_index TEXT,
+    region VARCHAR(64) NOT NULL DEFAULT 'saskatchewan',
     date DATE NOT NULL,
     year INTEGER NOT NULL,
     decimal_year DOUBLE PRECISION NOT NULL,
@@ -134,6 +137,7 @@ CREATE TABLE IF NOT EXISTS albedo.mcd43a3_quality (
 CREATE TABLE IF NOT EXISTS albedo.mod10a1_quality (
     id SERIAL PRIMARY KEY,
     system_index TEXT,
+    region VARCHAR(64) NOT NULL DEFAULT 'saskatchewan',
     date DATE NOT NULL,
     year INTEGER NOT NULL,
     decimal_year DOUBLE PRECISION NOT NULL,
@@ -154,6 +158,12 @@ CREATE TABLE IF NOT EXISTS albedo.mod10a1_quality (
     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
 );
 
+-- Region dimension for databases created before the multi-glacier batch mode
+ALTER TABLE albedo.mcd43a3_measurements ADD COLUMN IF NOT EXISTS region VARCHAR(64) NOT NULL DEFAULT 'saskatchewan';
+ALTER TABLE albedo.mod10a1_measurements ADD COLUMN IF NOT EXISTS region VARCHAR(64) NOT NULL DEFAULT 'saskatchewan';
+ALTER TABLE albedo.mcd43a3_quality ADD COLUMN IF NOT EXISTS region VARCHAR(64) NOT NULL DEFAULT 'saskatchewan';
+ALTER TABLE albedo.mod10a1_quality ADD COLUMN IF NOT EXISTS region VARCHAR(64) NOT NULL DEFAULT 'saskatchewan';
+
 -- Create indexes for efficient querying
 CREATE INDEX IF NOT EXISTS idx_mcd43a3_date ON albedo.mcd43a3_measurements(date);
 CREATE INDEX IF NOT EXISTS idx_mcd43a3_year ON albedo.mcd43a3_measurements(year);
@@ -168,6 +178,9 @@ CREATE INDEX IF NOT EXISTS idx_mod10a1_decimal_year ON albedo.mod10a1_measuremen
 CREATE INDEX IF NOT EXISTS idx_mcd43a3_quality_date ON albedo.mcd43a3_quality(date);
 CREATE INDEX IF NOT EXISTS idx_mod10a1_quality_date ON albedo.mod10a1_quality(date);
 
+CREATE INDEX IF NOT EXISTS idx_mcd43a3_region_date ON albedo.mcd43a3_measurements(region, date);
+CREATE INDEX IF NOT EXISTS idx_mod10a1_region_date ON albedo.mod10a1_measurements(region, date);
+
 -- Create views for easy access (maintaining compatibility with existing code)
 CREATE OR REPLACE VIEW albedo.mcd43a3_view AS 
 SELECT 
@@ -187,9 +200,10 @@ SELECT
     mostly_ice_median,
     pure_ice_mean,
     pure_ice_median,
-    total_valid_pixels
+    total_valid_pixels,
+    region
 FROM albedo.mcd43a3_measurements
-ORDER BY date;
+ORDER BY region, date;
 
 CREATE OR REPLACE VIEW albedo.mod10a1_view AS 
 SELECT 
@@ -209,6 +223,7 @@ SELECT
     mostly_ice_median,
     pure_ice_mean,
     pure_ice_median,
-    total_valid_pixels
+    total_valid_pixels,
+    region
 FROM albedo.mod10a1_measurements
-ORDER BY date;
\ No newline at end of file
+ORDER BY region, date;
\ No newline at end of file
@@ -8,6 +8,7 @@ This module now imports from specialized modules for better separation of concer
 """
 
 import logging
+from pathlib import Path
 from typing import Optional
 
 # Import refactored modules
@@ -153,6 +154,11 @@ def run_custom_analysis(dataset_name, analysis_type):
             # Graphiques quotidiens seulement
             print("📅 Graphiques quotidiens...")
             _run_daily_plots(data, dataset_name)
+            
+        elif analysis_type == 6:
+            # Détection de ruptures seulement
+            print("🔀 Détection de ruptures...")
+            _run_change_point_analysis(data, dataset_name)
         
         print(f"✅ Analyse personnalisée de {dataset_name} terminée")
         
@@ -190,9 +196,8 @@ def run_correlation_analysis():
     try:
         from analysis.comparison import analyze_correlation
         
-        # Charger les deux datasets
-        mcd43a3_data = _load_dataset('MCD43A3')
-        mod10a1_data = _load_dataset('MOD10A1')
+        # Charger les deux datasets en parallèle
+        mcd43a3_data, mod10a1_data = _load_datasets('MCD43A3', 'MOD10A1')
         
         # Analyser les corrélations
         correlations = analyze_correlation(mcd43a3_data, mod10a1_data)
@@ -214,9 +219,8 @@ def run_comparative_visualizations():
     try:
         from visualization.comparison_plots import create_comparison_plots
         
-        # Charger les deux datasets
-        mcd43a3_data = _load_dataset('MCD43A3')
-        mod10a1_data = _load_dataset('MOD10A1')
+        # Charger les deux datasets en parallèle
+        mcd43a3_data, mod10a1_data = _load_datasets('MCD43A3', 'MOD10A1')
         
         # Créer les visualisations comparatives
         create_comparison_plots(mcd43a3_data, mod10a1_data)
@@ -234,9 +238,8 @@ def run_daily_melt_season_comparison(fraction_choice='pure_ice'):
     try:
         from visualization.comparison_plots import create_daily_melt_season_comparison
         
-        # Charger les deux datasets
-        mcd43a3_data = _load_dataset('MCD43A3')
-        mod10a1_data = _load_dataset('MOD10A1')
+        # Charger les deux datasets en parallèle
+        mcd43a3_data, mod10a1_data = _load_datasets('MCD43A3', 'MOD10A1')
         
         # Créer les graphiques par année
         create_daily_melt_season_comparison(mcd43a3_data, mod10a1_data, fraction_choice)
@@ -246,6 +249,34 @@ def run_daily_melt_season_comparison(fraction_choice='pure_ice'):
     except Exception as e:
         print(f"❌ Erreur lors de la génération des graphiques quotidiens: {e}")
 
+def run_change_point_comparison():
+    """Lance la détection de ruptures (PELT + Pettitt) sur les deux produits"""
+    print("\n🔀 DÉTECTION DE RUPTURES MCD43A3 + MOD10A1")
+    print("="*50)
+    
+    try:
+        import pandas as pd
+        
+        tables = []
+        datasets = _load_datasets('MCD43A3', 'MOD10A1')
+        for dataset_name, data in zip(['MCD43A3', 'MOD10A1'], datasets):
+            summary = _run_change_point_analysis(data, dataset_name)
+            if summary is not None:
+                tables.append(summary.assign(Dataset=dataset_name))
+        
+        if tables:
+            results_dir = Path("results/comparison")
+            results_dir.mkdir(parents=True, exist_ok=True)
+            pd.concat(tables, ignore_index=True).to_csv(
+                results_dir / "change_points_summary.csv", index=False
+            )
+            print(f"📊 Ruptures sauvegardées dans {results_dir}/change_points_summary.csv")
+        
+        print("✅ Détection de ruptures terminée")
+        
+    except Exception as e:
+        print(f"❌ Erreur lors de la détection de ruptures: {e}")
+
 # ===========================================
 # FONCTIONS SPÉCIALES MOD10A1
 # ===========================================
@@ -292,25 +323,13 @@ def run_elevation_analysis_menu():
 def _load_dataset(dataset_name):
     """Charge un dataset spécifique"""
     try:
-        from data.unified_loader import get_albedo_handler
-        from config import DATA_MODE, MCD43A3_CONFIG, MOD10A1_CONFIG
-        
-        if dataset_name == 'MCD43A3':
-            config = MCD43A3_CONFIG
-        elif dataset_name == 'MOD10A1':
-            config = MOD10A1_CONFIG
-        else:
+        from data.registry import get_handler_registry
+        
+        if dataset_name not in ('MCD43A3', 'MOD10A1'):
             raise ValueError(f"Dataset inconnu: {dataset_name}")
         
-        # Use unified loader that respects DATA_MODE setting
-        if DATA_MODE.lower() == "database":
-            # Database mode: pass dataset name to db_handler
-            handler = get_albedo_handler(dataset_name)
-        else:
-            # CSV mode: pass CSV path to csv_handler  
-            handler = get_albedo_handler(config['csv_path'])
-            
-        data = handler.load_data()
+        # Handler partagé de la session (chargé une seule fois, selon DATA_MODE)
+        data = get_handler_registry().get_handler(dataset_name)
         
         print(f"✅ Dataset {dataset_name} chargé: {len(data)} lignes")
         return data
@@ -319,6 +338,24 @@ def _load_dataset(dataset_name):
         print(f"❌ Erreur lors du chargement de {dataset_name}: {e}")
         raise
 
+def _load_datasets(*dataset_names):
+    """Charge plusieurs datasets en parallèle (dans l'ordre demandé)"""
+    try:
+        from data.registry import get_handler_registry
+        
+        unknown = set(dataset_names) - {'MCD43A3', 'MOD10A1'}
+        if unknown:
+            raise ValueError(f"Dataset inconnu: {', '.join(sorted(unknown))}")
+        
+        handlers = get_handler_registry().get_handlers(dataset_names)
+        for dataset_name in dataset_names:
+            print(f"✅ Dataset {dataset_name} chargé: {len(handlers[dataset_name])} lignes")
+        return tuple(handlers[dataset_name] for dataset_name in dataset_names)
+        
+    except Exception as e:
+        print(f"❌ Erreur lors du chargement de {', '.join(dataset_names)}: {e}")
+        raise
+
 def _run_trend_analysis(data, dataset_name):
     """Lance l'analyse des tendances"""
     try:
@@ -339,6 +376,27 @@ def _run_trend_analysis(data, dataset_name):
     except Exception as e:
         print(f"❌ Erreur lors de l'analyse des tendances: {e}")
 
+def _run_change_point_analysis(data, dataset_name):
+    """Lance la détection de ruptures et sauvegarde le tableau de résumé"""
+    try:
+        from analysis.trends import TrendCalculator
+        
+        calculator = TrendCalculator(data)
+        calculator.calculate_basic_trends()
+        calculator.calculate_change_points()
+        summary_table = calculator.get_summary_table()
+        
+        results_dir = Path(f"results/{dataset_name.lower()}")
+        results_dir.mkdir(parents=True, exist_ok=True)
+        summary_table.to_csv(results_dir / "summary_trends_change_points_mean.csv", index=False)
+        print(f"📊 Tendances et ruptures sauvegardées dans "
+              f"{results_dir}/summary_trends_change_points_mean.csv")
+        return summary_table
+        
+    except Exception as e:
+        print(f"❌ Erreur lors de la détection de ruptures: {e}")
+        return None
+
 def _run_visualizations(data, dataset_name):
     """Lance les visualisations"""
     try:
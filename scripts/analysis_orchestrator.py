@@ -20,6 +20,7 @@ class AnalysisType:
     VISUALIZATIONS = 3
     PIXELS_QA = 4
     DAILY_PLOTS = 5
+    CHANGE_POINTS = 6
 
 
 class AnalysisOrchestrator:
@@ -29,6 +30,17 @@ class AnalysisOrchestrator:
         """Initialize orchestrator."""
         self.validator = DatasetValidator()
         self.results: Dict[str, Any] = {}
+        self.run_id: Optional[str] = None
+        self.run_label = 'orchestrator'
+    
+    def _start_run(self, label: str) -> None:
+        """Start a new results-store run for a top-level analysis.
+        
+        The run itself is registered on the first write, so analyses that
+        store nothing leave no empty run behind.
+        """
+        self.run_id = None
+        self.run_label = label
     
     def run_dataset_analysis(self, dataset_name: str) -> bool:
         """Run complete analysis for a specific dataset.
@@ -39,6 +51,7 @@ class AnalysisOrchestrator:
         Returns:
             bool: True if analysis completed successfully
         """
+        self._start_run(f'complete {dataset_name}')
         try:
             print(f"\n🔍 Starting complete analysis for {dataset_name}")
             print("=" * 60)
@@ -47,11 +60,17 @@ class AnalysisOrchestrator:
             if not self._validate_dataset(dataset_name):
                 return False
             
-            # Run all analysis components
-            success = True
-            success &= self._run_trends_analysis(dataset_name)
-            success &= self._run_visualizations(dataset_name)
-            success &= self._run_pixel_analysis(dataset_name)
+            # Stage graph: independent stages run concurrently, unchanged ones are cached
+            from scripts.run_pipeline import run_pipeline
+            
+            report = run_pipeline([dataset_name])
+            self.results[f'{dataset_name}_pipeline'] = report
+            trends = report.runs.get(f'{dataset_name}:trends')
+            if trends is not None and trends.status == 'ran':
+                basic_trends = report.outputs[f'{dataset_name}:trends']['basic_trends']
+                self._store_results(dataset_name, {'basic_trends_mean': basic_trends})
+            
+            success = report.ok
             success &= self._run_daily_plots(dataset_name)
             
             if success:
@@ -84,7 +103,8 @@ class AnalysisOrchestrator:
             AnalysisType.TRENDS: self._run_trends_analysis,
             AnalysisType.VISUALIZATIONS: self._run_visualizations,
             AnalysisType.PIXELS_QA: self._run_pixel_analysis,
-            AnalysisType.DAILY_PLOTS: self._run_daily_plots
+            AnalysisType.DAILY_PLOTS: self._run_daily_plots,
+            AnalysisType.CHANGE_POINTS: self._run_change_point_analysis
         }
         
         analysis_func = analysis_map.get(analysis_type)
@@ -92,6 +112,8 @@ class AnalysisOrchestrator:
             print(f"❌ Unknown analysis type: {analysis_type}")
             return False
         
+        self._start_run(f'{analysis_func.__name__.strip("_")} {dataset_name}')
+        
         try:
             if analysis_type == AnalysisType.COMPLETE:
                 return analysis_func(dataset_name)
@@ -133,15 +155,15 @@ class AnalysisOrchestrator:
             
             # Import and run trends analysis
             from analysis.trends import TrendCalculator
-            from data.unified_loader import get_albedo_handler
+            from data.registry import get_handler_registry
             
-            handler = get_albedo_handler(dataset_name)
-            handler.load_data()
+            handler = get_handler_registry().get_handler(dataset_name)
             
             calculator = TrendCalculator(handler)
             results = calculator.calculate_basic_trends()
             
             self.results[f'{dataset_name}_trends'] = results
+            self._store_results(dataset_name, calculator.results)
             print(f"✅ Trends analysis completed for {dataset_name}")
             return True
             
@@ -150,6 +172,67 @@ class AnalysisOrchestrator:
             print(f"❌ Trends analysis failed for {dataset_name}: {e}")
             return False
     
+    def _store_results(self, dataset_name: str, results: Dict[str, Any]) -> None:
+        """Append trend results to the columnar results store (if Parquet is available)."""
+        from utils.results_store import check_parquet_engine, get_results_store, record_trend_results
+        
+        if not check_parquet_engine():
+            return
+        try:
+            store = get_results_store()
+            if self.run_id is None:
+                self.run_id = store.new_run(label=self.run_label)
+            written = record_trend_results(store, self.run_id, dataset_name, results)
+            print(f"🗄️  Results stored (run {self.run_id}): {written}")
+        except Exception as e:
+            logger.warning(f"Could not store results for {dataset_name}: {e}")
+    
+    def _run_change_point_analysis(self, dataset_name: str) -> bool:
+        """Run change-point detection (PELT + Pettitt) for dataset."""
+        try:
+            print(f"\n🔀 Running change-point detection for {dataset_name}...")
+            
+            from analysis.trends import TrendCalculator
+            from data.registry import get_handler_registry
+            
+            handler = get_handler_registry().get_handler(dataset_name)
+            
+            calculator = TrendCalculator(handler)
+            calculator.calculate_basic_trends()
+            calculator.calculate_change_points()
+            
+            change_points = calculator.results['change_points_mean']
+            self.results[f'{dataset_name}_change_points'] = change_points
+            self.results[f'{dataset_name}_summary'] = calculator.get_summary_table()
+            # Basic trends are only recomputed for the summary table: storing them
+            # again would duplicate the trend rows of the trends analysis
+            self._store_results(dataset_name, {'change_points_mean': change_points})
+            print(f"✅ Change-point detection completed for {dataset_name}")
+            return True
+            
+        except Exception as e:
+            logger.error(f"Change-point detection failed for {dataset_name}: {e}")
+            print(f"❌ Change-point detection failed for {dataset_name}: {e}")
+            return False
+    
+    def run_change_points_all(self, datasets=('MCD43A3', 'MOD10A1')) -> bool:
+        """Run change-point detection on every fraction of several products.
+        
+        Args:
+            datasets: Dataset names to process
+            
+        Returns:
+            bool: True if every dataset was processed
+        """
+        self._start_run('change_points ' + ' '.join(datasets))
+        success = True
+        for dataset_name in datasets:
+            if not self._validate_dataset(dataset_name):
+                success = False
+                continue
+            success &= self._run_change_point_analysis(dataset_name)
+        return success
+    
     def _run_visualizations(self, dataset_name: str) -> bool:
         """Run visualizations for dataset."""
         try:
@@ -157,10 +240,9 @@ class AnalysisOrchestrator:
             
             # Import and run visualizations
             from visualization.charts import ChartGenerator
-            from data.unified_loader import get_albedo_handler
+            from data.registry import get_handler_registry
             
-            handler = get_albedo_handler(dataset_name)
-            handler.load_data()
+            handler = get_handler_registry().get_handler(dataset_name)
             
             chart_gen = ChartGenerator(handler, dataset_name)
             chart_gen.generate_all_charts()
@@ -180,10 +262,9 @@ class AnalysisOrchestrator:
             
             # Import and run pixel analysis
             from analysis.pixel_analysis import PixelAnalyzer
-            from data.unified_loader import get_albedo_handler
+            from data.registry import get_handler_registry
             
-            handler = get_albedo_handler(dataset_name)
-            handler.load_data()
+            handler = get_handler_registry().get_handler(dataset_name)
             
             analyzer = PixelAnalyzer(handler, dataset_name)
             results = analyzer.analyze_quality_distribution()
@@ -204,10 +285,9 @@ class AnalysisOrchestrator:
             
             # Import and run daily plots
             from visualization.daily_plots import DailyPlotGenerator
-            from data.unified_loader import get_albedo_handler
+            from data.registry import get_handler_registry
             
-            handler = get_albedo_handler(dataset_name)
-            handler.load_data()
+            handler = get_handler_registry().get_handler(dataset_name)
             
             plot_gen = DailyPlotGenerator(handler, dataset_name)
             plot_gen.generate_all_years()
@@ -251,4 +331,8 @@ def run_pixels_only() -> bool:
 
 def run_daily_only() -> bool:
     """Legacy wrapper for daily plots."""
-    return orchestrator.run_custom_analysis(config.default_dataset, AnalysisType.DAILY_PLOTS)
\ No newline at end of file
+    return orchestrator.run_custom_analysis(config.default_dataset, AnalysisType.DAILY_PLOTS)
+
+def run_change_points_only() -> bool:
+    """Change-point detection on both products."""
+    return orchestrator.run_change_points_all()
\ No newline at end of file
@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+"""
+Background Tasks for Saskatchewan Glacier Albedo Analysis
+=========================================================
+
+Top-level (picklable) job functions run by ``utils.jobs.JobRunner`` for the
+menu and the dashboards, plus small helpers to submit them. Each task loads
+its own data handler in the worker process and reports progress through the
+analyzers' ``report_progress`` calls.
+"""
+
+import os
+from pathlib import Path
+
+import pandas as pd
+
+from utils.jobs import get_job_runner, report_progress
+
+
+def _load_handler(dataset_name):
+    """Loaded data handler for a dataset (shared by the jobs of a worker process)"""
+    from data.registry import get_handler_registry
+
+    # Re-probed on every call: a new freshness stamp reloads the dataset
+    return get_handler_registry().get_handler(dataset_name)
+
+
+def dataset_input_files(dataset_name):
+    """Files whose changes must invalidate cached results for a dataset"""
+    from config import DATA_MODE, DUCKDB_PATH, get_dataset_config
+
+    if DATA_MODE.lower() == "duckdb":
+        return [DUCKDB_PATH] if os.path.isfile(DUCKDB_PATH) else []
+    if DATA_MODE.lower() == "database":
+        return []
+    return [get_dataset_config(dataset_name)['csv_path']]
+
+
+def dataset_freshness(dataset_name):
+    """
+    Freshness stamp of a dataset's source, part of the job cache key
+
+    In database mode there are no input files to stat, so this stamp is what
+    invalidates cached results after new data is ingested.
+    """
+    from data.registry import get_handler_registry
+
+    try:
+        return get_handler_registry().probe(dataset_name, refresh=True).freshness
+    except Exception as e:
+        print(f"⚠️  {dataset_name}: freshness probe failed ({e})")
+        return None
+
+
+def _cache_inputs(dataset_name):
+    """input_files / input_token arguments of JobRunner.submit for a dataset"""
+    return {'input_files': dataset_input_files(dataset_name),
+            'input_token': dataset_freshness(dataset_name)}
+
+
+def _strip_arrays(results):
+    """Drop the per-series arrays kept in analyzer results (not needed by callers)"""
+    return {
+        fraction: {k: v for k, v in result.items()
+                   if k not in ('data', 'bootstrap_slopes', 'bootstrap_pvalues')}
+        for fraction, result in results.items()
+    }
+
+
+# ===========================================
+# JOB FUNCTIONS (run in worker processes)
+# ===========================================
+
+def trends_task(dataset_name, variable='mean'):
+    """Basic trends + summary table for one dataset"""
+    from analysis.trends import TrendCalculator
+
+    report_progress(0.0, f"Chargement {dataset_name}")
+    calculator = TrendCalculator(_load_handler(dataset_name))
+    results = calculator.calculate_basic_trends(variable)
+    return {
+        'dataset': dataset_name,
+        'variable': variable,
+        'basic_trends': _strip_arrays(results),
+        'summary_table': calculator.get_summary_table(variable)
+    }
+
+
+def bootstrap_task(dataset_name, variable='mean', n_bootstrap=None):
+    """Bootstrap confidence intervals of the Sen slopes for one dataset"""
+    from analysis.trends import TrendCalculator
+
+    report_progress(0.0, f"Chargement {dataset_name}")
+    calculator = TrendCalculator(_load_handler(dataset_name))
+    results = calculator.calculate_bootstrap_confidence_intervals(variable, n_bootstrap)
+    return {
+        'dataset': dataset_name,
+        'variable': variable,
+        'bootstrap': _strip_arrays(results)
+    }
+
+
+def complete_analysis_task(dataset_name, variable='mean', output_dir=None):
+    """Trends, monthly trends and charts for one dataset"""
+    from analysis.trends import TrendCalculator
+    from visualization.charts import create_charts
+
+    output_dir = output_dir or f"output/{dataset_name.lower()}"
+    report_progress(0.0, f"Chargement {dataset_name}")
+    handler = _load_handler(dataset_name)
+
+    calculator = TrendCalculator(handler)
+    basic = calculator.calculate_basic_trends(variable)
+    report_progress(0.6, "Tendances mensuelles")
+    calculator.calculate_monthly_trends(variable)
+    report_progress(0.8, "Graphiques")
+    charts = create_charts(handler, {'basic_trends': basic}, variable, output_dir)
+
+    return {
+        'dataset': dataset_name,
+        'variable': variable,
+        'basic_trends': _strip_arrays(basic),
+        'summary_table': calculator.get_summary_table(variable),
+        'charts': charts
+    }
+
+
+def export_task(dataset_name, formats=('csv',), prefix='saskatchewan_albedo_export',
+                variable='mean', output_dir='exports'):
+    """
+    Dashboard export (CSV / Excel / PNG / PDF) for one dataset
+
+    Returns:
+        list: Paths of the written files
+    """
+    from analysis.trends import TrendCalculator
+    from visualization.charts import ChartGenerator
+
+    os.makedirs(output_dir, exist_ok=True)
+    base = Path(output_dir) / f"{prefix}_{dataset_name.lower()}_{variable}"
+    written = []
+
+    report_progress(0.0, f"Chargement {dataset_name}")
+    handler = _load_handler(dataset_name)
+    calculator = TrendCalculator(handler)
+    calculator.calculate_basic_trends(variable)
+    summary = calculator.get_summary_table(variable)
+    steps = max(len(formats), 1)
+
+    for i, export_format in enumerate(formats):
+        report_progress(0.5 + 0.5 * i / steps, f"Export {export_format}")
+        if export_format == 'csv':
+            handler.data.to_csv(f"{base}_data.csv", index=False)
+            summary.to_csv(f"{base}_trends.csv", index=False)
+            written += [f"{base}_data.csv", f"{base}_trends.csv"]
+        elif export_format == 'excel':
+            with pd.ExcelWriter(f"{base}.xlsx") as writer:
+                handler.data.to_excel(writer, sheet_name='Data', index=False)
+                summary.to_excel(writer, sheet_name='Trends', index=False)
+            written.append(f"{base}.xlsx")
+        elif export_format in ('png', 'pdf'):
+            chart_generator = ChartGenerator(handler)
+            path = chart_generator.create_trend_overview_graph(
+                calculator.results[f'basic_trends_{variable}'], variable,
+                f"{base}_trend_overview.{export_format}"
+            )
+            written.append(path)
+
+    return written
+
+
+# ===========================================
+# SUBMISSION HELPERS
+# ===========================================
+
+def submit_trends(dataset_name, variable='mean'):
+    """Queue trends_task; returns the job id"""
+    return get_job_runner().submit(trends_task, dataset_name, variable, kind='trends',
+                                   **_cache_inputs(dataset_name))
+
+
+def submit_bootstrap(dataset_name, variable='mean', n_bootstrap=None):
+    """Queue bootstrap_task; returns the job id"""
+    return get_job_runner().submit(bootstrap_task, dataset_name, variable, n_bootstrap,
+                                   kind='bootstrap', **_cache_inputs(dataset_name))
+
+
+def submit_complete_analysis(dataset_name, variable='mean'):
+    """Queue complete_analysis_task; returns the job id"""
+    return get_job_runner().submit(complete_analysis_task, dataset_name, variable,
+                                   kind='complete_analysis', **_cache_inputs(dataset_name))
+
+
+def submit_export(dataset_name, formats, prefix, variable='mean'):
+    """Queue export_task; returns the job id"""
+    # Never reuse a cached export: its result is only a list of paths, and the
+    # files may have been moved, deleted or overwritten since
+    return get_job_runner().submit(export_task, dataset_name, tuple(formats), prefix, variable,
+                                   kind='export', use_cache=False)
+
+
+def format_job_status(job):
+    """One-line status text for menus and dashboards"""
+    if job is None:
+        return "Aucune tâche"
+    icons = {'queued': '⏳', 'running': '🔄', 'cancelling': '🛑', 'cancelled': '⛔',
+             'completed': '✅', 'failed': '❌'}
+    text = (f"{icons.get(job['status'], '❓')} {job['kind']} [{job['job_id']}] "
+            f"{job['status']} {job['progress'] * 100:.0f}%")
+    if job.get('message') and job['status'] in ('running', 'cancelling'):
+        text += f" - {job['message']}"
+    if job.get('error'):
+        text += f" - {job['error']}"
+    return text
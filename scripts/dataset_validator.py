@@ -2,12 +2,12 @@
 Dataset validation and availability checking.
 """
 
-import os
 from typing import List, Dict, Tuple
 import logging
 
 from config.settings import config
 from utils.exceptions import DataLoadError, DatabaseConnectionError
+from data.zip_source import csv_source_exists
 
 logger = logging.getLogger(__name__)
 
@@ -27,7 +27,7 @@ class DatasetValidator:
             bool: True if at least one dataset is available
         """
         try:
-            if self.config.data_mode.lower() == "database":
+            if self.config.data_mode.lower() in ("database", "duckdb"):
                 return self._check_database_datasets()
             else:
                 return self._check_csv_datasets()
@@ -45,7 +45,7 @@ class DatasetValidator:
         print("🔍 Database mode enabled - checking connectivity...")
         
         try:
-            from data.unified_loader import get_albedo_handler
+            from data.registry import get_handler_registry
         except ImportError as e:
             raise DatabaseConnectionError(f"Cannot import database handler: {e}")
         
@@ -57,12 +57,13 @@ class DatasetValidator:
                 if not dataset_config:
                     continue
                 
-                handler = get_albedo_handler(dataset_name)
-                test_data = handler.load_data()
+                # Metadata probe only: the data is loaded when an analysis needs it
+                probe = get_handler_registry().probe(dataset_name, refresh=True)
                 
-                if len(test_data) > 0:
+                if probe.available:
                     self.available_datasets.append(dataset_name)
-                    print(f"✅ Dataset {dataset_name} available in database ({len(test_data)} rows)")
+                    print(f"✅ Dataset {dataset_name} available in database "
+                          f"({probe.row_count} rows, {probe.date_min} → {probe.date_max})")
                 else:
                     print(f"❌ Dataset {dataset_name} empty in database")
                     
@@ -83,7 +84,7 @@ class DatasetValidator:
         self.available_datasets = []
         
         for dataset_name, dataset_config in self.config.get_all_datasets().items():
-            if os.path.exists(dataset_config.csv_path):
+            if csv_source_exists(dataset_config.csv_path):
                 self.available_datasets.append(dataset_name)
                 print(f"✅ Dataset {dataset_name} found: {dataset_config.csv_path}")
             else:
@@ -65,7 +65,8 @@ class MainMenu(BaseMenu):
             MenuOption("1", "MCD43A3 - Albédo général (MODIS Combined)"),
             MenuOption("2", "MOD10A1 - Albédo de neige (Terra Snow Cover)"),
             MenuOption("3", "Comparaison MCD43A3 vs MOD10A1"),
-            MenuOption("4", "Quitter")
+            MenuOption("4", "Tâches en arrière-plan (analyses longues, bootstrap) 🆕"),
+            MenuOption("5", "Quitter")
         ]
         super().__init__("🚀 MENU D'ANALYSE - SASKATCHEWAN GLACIER ALBEDO", options)
 
@@ -115,11 +116,27 @@ class ComparisonMenu(BaseMenu):
             MenuOption("2", "Corrélations seulement"),
             MenuOption("3", "Visualisations comparatives seulement"),
             MenuOption("4", "Graphiques quotidiens par saison de fonte"),
-            MenuOption("5", "Retour au menu principal")
+            MenuOption("5", "Détection de ruptures (PELT + Pettitt) sur les deux produits 🆕"),
+            MenuOption("6", "Retour au menu principal")
         ]
         super().__init__("🔄 COMPARAISON MCD43A3 vs MOD10A1", options)
 
 
+class JobsMenu(BaseMenu):
+    """Menu for background jobs (process pool, the menu stays responsive)."""
+    
+    def __init__(self):
+        options = [
+            MenuOption("1", "Lancer l'analyse complète MCD43A3 en arrière-plan"),
+            MenuOption("2", "Lancer l'analyse complète MOD10A1 en arrière-plan"),
+            MenuOption("3", "Lancer le bootstrap des pentes de Sen (MCD43A3 + MOD10A1)"),
+            MenuOption("4", "État des tâches"),
+            MenuOption("5", "Annuler une tâche"),
+            MenuOption("6", "Retour au menu principal")
+        ]
+        super().__init__("⚙️ TÂCHES EN ARRIÈRE-PLAN", options)
+
+
 class FractionSelector(BaseMenu):
     """Menu for selecting fraction classes."""
     
@@ -166,6 +183,8 @@ class MenuController:
             elif choice == "3":
                 self._handle_comparison_menu()
             elif choice == "4":
+                self._handle_jobs_menu()
+            elif choice == "5":
                 print("\n👋 Au revoir!")
                 self.should_continue = False
     
@@ -195,7 +214,7 @@ class MenuController:
             comparison_menu.display()
             choice = comparison_menu.get_choice()
             
-            if choice == "5":  # Return to main menu
+            if choice == "6":  # Return to main menu
                 break
             
             # Execute the chosen comparison
@@ -240,7 +259,8 @@ class MenuController:
         """Execute comparison analysis based on choice."""
         from scripts.analysis_functions import (
             run_comparison_analysis, run_correlation_analysis, 
-            run_comparative_visualizations, run_daily_melt_season_comparison
+            run_comparative_visualizations, run_daily_melt_season_comparison,
+            run_change_point_comparison
         )
         
         try:
@@ -259,9 +279,54 @@ class MenuController:
                 fraction_selector.display()
                 fraction_choice = fraction_selector.get_fraction_choice()
                 run_daily_melt_season_comparison(fraction_choice)
+            elif choice == "5":
+                print("\n🔀 Détection de ruptures sur les deux produits...")
+                run_change_point_comparison()
         except Exception as e:
             print(f"\n❌ Erreur lors de la comparaison: {e}")
     
+    def _handle_jobs_menu(self) -> None:
+        """Handle background job submission and monitoring."""
+        from scripts.background_tasks import (
+            submit_complete_analysis, submit_bootstrap, format_job_status
+        )
+        from utils.jobs import get_job_runner
+        
+        jobs_menu = JobsMenu()
+        
+        while True:
+            jobs_menu.display()
+            choice = jobs_menu.get_choice()
+            
+            if choice == "6":
+                break
+            
+            try:
+                runner = get_job_runner()
+                if choice in ("1", "2"):
+                    dataset_name = 'MCD43A3' if choice == "1" else 'MOD10A1'
+                    job_id = submit_complete_analysis(dataset_name)
+                    print(f"\n🚀 Tâche soumise: {job_id}")
+                elif choice == "3":
+                    for dataset_name in ('MCD43A3', 'MOD10A1'):
+                        job_id = submit_bootstrap(dataset_name)
+                        print(f"\n🚀 Bootstrap {dataset_name} soumis: {job_id}")
+                elif choice == "4":
+                    jobs = runner.list_jobs(limit=20)
+                    print()
+                    for job in jobs:
+                        print(f"  {format_job_status(job)}")
+                    if not jobs:
+                        print("  Aucune tâche")
+                elif choice == "5":
+                    job_id = input("➤ Identifiant de la tâche: ").strip()
+                    if runner.cancel(job_id):
+                        print(f"🛑 Annulation demandée pour {job_id}")
+                    else:
+                        print(f"❌ Impossible d'annuler {job_id} (terminée ou inconnue)")
+            except Exception as e:
+                print(f"\n❌ Erreur tâche en arrière-plan: {e}")
+    
     def _ask_continue(self, prompt: str) -> bool:
         """Ask user if they want to continue."""
         print("\n" + "=" * 50)
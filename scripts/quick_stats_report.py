@@ -3,136 +3,381 @@
 Quick Statistics Report Generator
 ================================
 
-Extracts basic statistics from PostgreSQL database using MCP and exports
-them to a Word document using MCP office-word tools.
+Builds the statistics report (dataset overview, albedo by fraction, seasonal
+distribution, data quality, pixel coverage) headlessly and writes it as DOCX,
+HTML and Markdown in one pass.
+
+Sources:
+- database: the report queries run concurrently over the pooled engine
+- store: latest trend and change-point results from the columnar results store
+
+Query results and outputs are cached by an input fingerprint (row counts and
+last update per table, or the stored run ids), so re-running on an unchanged
+data drop returns the existing report immediately.
+
+Usage:
+    python scripts/quick_stats_report.py --source database --formats docx html markdown
 """
 
 import sys
 import os
+import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def generate_stats_report():
-    """Generate a Word document with basic database statistics"""
-    print("🚀 Starting Quick Statistics Report Generation...")
-    
-    # Import MCP tools (these will be called via the MCP interface)
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    doc_filename = f"saskatchewan_albedo_stats_{timestamp}.docx"
+from config import DEFAULT_REGION
+from utils.reports import (REPORT_FORMATS, ReportAssets, ReportCache, fingerprint,
+                           render_report)
+
+DEFAULT_REPORT_DIR = os.path.join("results", "reports")
+FRACTIONS = ['border', 'mixed_low', 'mixed_high', 'mostly_ice', 'pure_ice']
+
+REPORT_QUERIES = {
+    "dataset_overview": """
+    SELECT 
+        'MCD43A3 Measurements' as dataset,
+        COUNT(*) as total_records,
+        MIN(date) as start_date,
+        MAX(date) as end_date,
+        COUNT(DISTINCT year) as years_covered
+    FROM albedo.mcd43a3_measurements
+    WHERE region = %(region)s
+    UNION ALL
+    SELECT 
+        'MOD10A1 Measurements' as dataset,
+        COUNT(*) as total_records,
+        MIN(date) as start_date,
+        MAX(date) as end_date,
+        COUNT(DISTINCT year) as years_covered
+    FROM albedo.mod10a1_measurements
+    WHERE region = %(region)s
+    """,
     
-    print(f"📊 Generating statistics report: {doc_filename}")
+    "mcd43a3_albedo_stats": """
+    SELECT 
+        ROUND(AVG(border_mean)::numeric, 4) as avg_border,
+        ROUND(AVG(mixed_low_mean)::numeric, 4) as avg_mixed_low,
+        ROUND(AVG(mixed_high_mean)::numeric, 4) as avg_mixed_high,
+        ROUND(AVG(mostly_ice_mean)::numeric, 4) as avg_mostly_ice,
+        ROUND(AVG(pure_ice_mean)::numeric, 4) as avg_pure_ice
+    FROM albedo.mcd43a3_measurements
+    WHERE region = %(region)s AND border_mean IS NOT NULL
+    """,
     
-    # This script serves as a template - the actual MCP calls will be made
-    # through the Claude interface when this script is run
+    "mod10a1_albedo_stats": """
+    SELECT 
+        ROUND(AVG(border_mean)::numeric, 4) as avg_border,
+        ROUND(AVG(mixed_low_mean)::numeric, 4) as avg_mixed_low,
+        ROUND(AVG(mixed_high_mean)::numeric, 4) as avg_mixed_high,
+        ROUND(AVG(mostly_ice_mean)::numeric, 4) as avg_mostly_ice,
+        ROUND(AVG(pure_ice_mean)::numeric, 4) as avg_pure_ice
+    FROM albedo.mod10a1_measurements
+    WHERE region = %(region)s AND border_mean IS NOT NULL
+    """,
     
-    queries = {
-        "dataset_overview": """
-        SELECT 
-            'MCD43A3 Measurements' as dataset,
-            COUNT(*) as total_records,
-            MIN(date) as start_date,
-            MAX(date) as end_date,
-            COUNT(DISTINCT year) as years_covered
-        FROM albedo.mcd43a3_measurements
+    "seasonal_distribution": """
+    SELECT 
+        season,
+        COUNT(*) as observations
+    FROM (
+        SELECT season FROM albedo.mcd43a3_measurements WHERE region = %(region)s
         UNION ALL
-        SELECT 
-            'MOD10A1 Measurements' as dataset,
-            COUNT(*) as total_records,
-            MIN(date) as start_date,
-            MAX(date) as end_date,
-            COUNT(DISTINCT year) as years_covered
-        FROM albedo.mod10a1_measurements
-        """,
-        
-        "mcd43a3_albedo_stats": """
-        SELECT 
-            ROUND(AVG(border_mean)::numeric, 4) as avg_border,
-            ROUND(AVG(mixed_low_mean)::numeric, 4) as avg_mixed_low,
-            ROUND(AVG(mixed_high_mean)::numeric, 4) as avg_mixed_high,
-            ROUND(AVG(mostly_ice_mean)::numeric, 4) as avg_mostly_ice,
-            ROUND(AVG(pure_ice_mean)::numeric, 4) as avg_pure_ice
-        FROM albedo.mcd43a3_measurements
-        WHERE border_mean IS NOT NULL
-        """,
-        
-        "mod10a1_albedo_stats": """
-        SELECT 
-            ROUND(AVG(border_mean)::numeric, 4) as avg_border,
-            ROUND(AVG(mixed_low_mean)::numeric, 4) as avg_mixed_low,
-            ROUND(AVG(mixed_high_mean)::numeric, 4) as avg_mixed_high,
-            ROUND(AVG(mostly_ice_mean)::numeric, 4) as avg_mostly_ice,
-            ROUND(AVG(pure_ice_mean)::numeric, 4) as avg_pure_ice
-        FROM albedo.mod10a1_measurements
-        WHERE border_mean IS NOT NULL
-        """,
-        
-        "seasonal_distribution": """
-        SELECT 
-            season,
-            COUNT(*) as observations
-        FROM (
-            SELECT season FROM albedo.mcd43a3_measurements
-            UNION ALL
-            SELECT season FROM albedo.mod10a1_measurements
-        ) combined
-        WHERE season IS NOT NULL
-        GROUP BY season
-        ORDER BY 
-            CASE season
-                WHEN 'early_summer' THEN 1
-                WHEN 'mid_summer' THEN 2
-                WHEN 'late_summer' THEN 3
-                ELSE 4
-            END
-        """,
-        
-        "data_quality_mcd43a3": """
-        SELECT 
-            ROUND(AVG(quality_0_best)::numeric, 2) as avg_best_quality,
-            ROUND(AVG(quality_1_good)::numeric, 2) as avg_good_quality,
-            ROUND(AVG(quality_2_moderate)::numeric, 2) as avg_moderate_quality,
-            ROUND(AVG(quality_3_poor)::numeric, 2) as avg_poor_quality
-        FROM albedo.mcd43a3_quality
-        """,
-        
-        "pixel_coverage": """
-        SELECT 
-            'MCD43A3' as dataset,
-            ROUND(AVG(total_valid_pixels)::numeric, 0) as avg_valid_pixels,
-            MIN(total_valid_pixels) as min_pixels,
-            MAX(total_valid_pixels) as max_pixels
-        FROM albedo.mcd43a3_measurements
-        WHERE total_valid_pixels IS NOT NULL
-        UNION ALL
-        SELECT 
-            'MOD10A1' as dataset,
-            ROUND(AVG(total_valid_pixels)::numeric, 0) as avg_valid_pixels,
-            MIN(total_valid_pixels) as min_pixels,
-            MAX(total_valid_pixels) as max_pixels
-        FROM albedo.mod10a1_measurements
-        WHERE total_valid_pixels IS NOT NULL
-        """
-    }
+        SELECT season FROM albedo.mod10a1_measurements WHERE region = %(region)s
+    ) combined
+    WHERE season IS NOT NULL
+    GROUP BY season
+    ORDER BY 
+        CASE season
+            WHEN 'early_summer' THEN 1
+            WHEN 'mid_summer' THEN 2
+            WHEN 'late_summer' THEN 3
+            ELSE 4
+        END
+    """,
     
-    print("📋 Prepared the following statistical queries:")
-    for query_name in queries.keys():
-        print(f"  • {query_name}")
-    
-    print(f"\n📄 Ready to generate Word document: {doc_filename}")
-    print("\n🔧 This script will be executed through Claude's MCP interface to:")
-    print("  1. Run PostgreSQL queries using mcp__postgres__query")
-    print("  2. Create Word document using mcp__office-word__create_document")
-    print("  3. Add structured content using mcp__office-word__add_heading and add_paragraph")
+    "data_quality_mcd43a3": """
+    SELECT 
+        ROUND(AVG(quality_0_best)::numeric, 2) as avg_best_quality,
+        ROUND(AVG(quality_1_good)::numeric, 2) as avg_good_quality,
+        ROUND(AVG(quality_2_moderate)::numeric, 2) as avg_moderate_quality,
+        ROUND(AVG(quality_3_poor)::numeric, 2) as avg_poor_quality
+    FROM albedo.mcd43a3_quality
+    WHERE region = %(region)s
+    """,
     
+    "pixel_coverage": """
+    SELECT 
+        'MCD43A3' as dataset,
+        ROUND(AVG(total_valid_pixels)::numeric, 0) as avg_valid_pixels,
+        MIN(total_valid_pixels) as min_pixels,
+        MAX(total_valid_pixels) as max_pixels
+    FROM albedo.mcd43a3_measurements
+    WHERE region = %(region)s AND total_valid_pixels IS NOT NULL
+    UNION ALL
+    SELECT 
+        'MOD10A1' as dataset,
+        ROUND(AVG(total_valid_pixels)::numeric, 0) as avg_valid_pixels,
+        MIN(total_valid_pixels) as min_pixels,
+        MAX(total_valid_pixels) as max_pixels
+    FROM albedo.mod10a1_measurements
+    WHERE region = %(region)s AND total_valid_pixels IS NOT NULL
+    """
+}
+
+# Every query is limited to one region (parameter 'region'): the tables hold
+# all glaciers since the multi-region import
+FINGERPRINT_QUERY = """
+SELECT 'mcd43a3_measurements' AS source, COUNT(*) AS n_rows, MAX(updated_at) AS last_update
+FROM albedo.mcd43a3_measurements WHERE region = %(region)s
+UNION ALL
+SELECT 'mod10a1_measurements', COUNT(*), MAX(updated_at)
+FROM albedo.mod10a1_measurements WHERE region = %(region)s
+UNION ALL
+SELECT 'mcd43a3_quality', COUNT(*), MAX(updated_at)
+FROM albedo.mcd43a3_quality WHERE region = %(region)s
+UNION ALL
+SELECT 'mod10a1_quality', COUNT(*), MAX(updated_at)
+FROM albedo.mod10a1_quality WHERE region = %(region)s
+"""
+
+
+# ===========================================
+# DATA COLLECTION
+# ===========================================
+
+def run_queries(queries, max_workers=4, region=DEFAULT_REGION):
+    """
+    Run the report queries of one region concurrently over the pooled database engine
+
+    Returns:
+        dict: DataFrame per query name
+    """
+    from database.connection import get_connection
+
+    conn = get_connection()
+    params = {'region': region}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {name: executor.submit(conn.execute_query, sql, params)
+                   for name, sql in queries.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def database_fingerprint(region=DEFAULT_REGION):
+    """Row counts and last update of the region's rows in the source tables"""
+    from database.connection import get_connection
+
+    state = get_connection().execute_query(FINGERPRINT_QUERY, {'region': region})
+    return fingerprint('database', region, REPORT_QUERIES, state.to_dict('records'))
+
+
+def store_tables(store, variable='mean'):
+    """
+    Latest stored trend and change-point results per dataset
+
+    Returns:
+        dict: 'trends' and 'change_points' DataFrames (possibly empty)
+    """
+    trends = store.query('trends', latest=False, variable=variable, month=0,
+                         method='mann_kendall_sen')
+    if len(trends):
+        trends = store.latest_rows(trends, by=['dataset'])
+        trends = trends[['dataset', 'fraction', 'n_obs', 'trend', 'p_value', 'tau',
+                         'slope_per_decade', 'ci_low_per_decade', 'ci_high_per_decade']]
+
+    change_points = store.query('change_points', latest=False, variable=variable)
+    if len(change_points):
+        change_points = store.latest_rows(change_points, by=['dataset'])
+        change_points = change_points.drop(columns=['run_id', 'variable', 'month', 'method'])
+
+    return {'trends': trends.reset_index(drop=True),
+            'change_points': change_points.reset_index(drop=True)}
+
+
+def store_fingerprint(store):
+    """Run ids present in the store tables used by the report"""
+    runs = {table: sorted(p.name for p in (store.root / table).glob('run_id=*'))
+            for table in ('trends', 'change_points')}
+    return fingerprint('store', runs)
+
+
+# ===========================================
+# REPORT CONTENT
+# ===========================================
+
+def _draw_fraction_bars(ax, stats):
+    """Average albedo per fraction, one bar group per dataset"""
+    width = 0.8 / max(len(stats), 1)
+    for i, (dataset, row) in enumerate(stats.iterrows()):
+        positions = [j + i * width for j in range(len(FRACTIONS))]
+        ax.bar(positions, [row.get(f'avg_{f}') for f in FRACTIONS], width, label=dataset)
+    ax.set_xticks([j + width * (len(stats) - 1) / 2 for j in range(len(FRACTIONS))])
+    ax.set_xticklabels(FRACTIONS)
+    ax.set_ylabel('Albedo moyen')
+    ax.legend()
+    ax.grid(True, alpha=0.3, axis='y')
+
+
+def _draw_seasonal(ax, seasonal):
+    ax.bar(seasonal['season'].astype(str), seasonal['observations'], color='steelblue')
+    ax.set_ylabel('Observations')
+    ax.grid(True, alpha=0.3, axis='y')
+
+
+def _draw_slopes(ax, trends):
+    pivot = trends.pivot(index='fraction', columns='dataset', values='slope_per_decade')
+    pivot.reindex([f for f in FRACTIONS if f in pivot.index]).plot.bar(ax=ax, rot=0)
+    ax.axhline(0, color='black', linewidth=0.8)
+    ax.set_ylabel('Pente de Sen (par décennie)')
+    ax.grid(True, alpha=0.3, axis='y')
+
+
+def build_database_report(tables):
+    """Assets and blocks of the database statistics report"""
+    import pandas as pd
+
+    assets = ReportAssets()
+    stats = pd.concat({'MCD43A3': tables['mcd43a3_albedo_stats'],
+                       'MOD10A1': tables['mod10a1_albedo_stats']}).droplevel(1)
+
+    assets.add_table('dataset_overview', tables['dataset_overview'])
+    assets.add_table('albedo_stats', stats.rename_axis('dataset').reset_index())
+    assets.add_figure('albedo_by_fraction', _draw_fraction_bars, stats)
+    assets.add_table('seasonal_distribution', tables['seasonal_distribution'])
+    assets.add_figure('seasonal_distribution', _draw_seasonal, tables['seasonal_distribution'])
+    assets.add_table('data_quality_mcd43a3', tables['data_quality_mcd43a3'], '{:.2f}')
+    assets.add_table('pixel_coverage', tables['pixel_coverage'], '{:.0f}')
+
+    blocks = [
+        ('heading', "Vue d'ensemble des données", 2),
+        ('table', 'dataset_overview'),
+        ('heading', "Albédo moyen par fraction", 2),
+        ('table', 'albedo_stats'),
+        ('figure', 'albedo_by_fraction', "Albédo moyen par fraction de couverture"),
+        ('heading', "Distribution saisonnière", 2),
+        ('table', 'seasonal_distribution'),
+        ('figure', 'seasonal_distribution', "Observations par période de la saison"),
+        ('heading', "Qualité des données MCD43A3", 2),
+        ('table', 'data_quality_mcd43a3'),
+        ('heading', "Couverture en pixels", 2),
+        ('table', 'pixel_coverage'),
+    ]
+    return assets, blocks
+
+
+def build_store_report(tables):
+    """Assets and blocks of the stored trend results report"""
+    assets = ReportAssets()
+    blocks = []
+    if len(tables['trends']):
+        assets.add_table('trends', tables['trends'], '{:.6f}')
+        assets.add_figure('slopes', _draw_slopes, tables['trends'])
+        blocks += [
+            ('heading', "Tendances Mann-Kendall / Sen", 2),
+            ('table', 'trends'),
+            ('figure', 'slopes', "Pentes de Sen par fraction et par produit"),
+        ]
+    if len(tables['change_points']):
+        assets.add_table('change_points', tables['change_points'])
+        blocks += [
+            ('heading', "Ruptures (Pettitt / PELT)", 2),
+            ('table', 'change_points'),
+        ]
+    if not blocks:
+        blocks.append(('paragraph', "Aucun résultat dans le store."))
+    return assets, blocks
+
+
+# ===========================================
+# ENTRY POINT
+# ===========================================
+
+def generate_stats_report(source='database', formats=REPORT_FORMATS,
+                          output_dir=DEFAULT_REPORT_DIR, use_cache=True, max_workers=4,
+                          store=None, region=DEFAULT_REGION):
+    """
+    Generate the statistics report in several formats
+
+    Args:
+        source: 'database' (SQL queries) or 'store' (cached analysis results)
+        formats: Any of 'markdown', 'html', 'docx'
+        output_dir: Output directory
+        use_cache: Reuse query results and outputs for unchanged inputs
+        max_workers: Concurrent queries (database source)
+        store: ResultsStore for the 'store' source (default: shared store)
+        region: Glacier / region of the database report
+
+    Returns:
+        dict: filename, outputs (path per format), timestamp, cached flag
+    """
+    print("🚀 Starting Quick Statistics Report Generation...")
+    formats = tuple(formats)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    cache = ReportCache(os.path.join(output_dir, '.cache'))
+
+    if source == 'database':
+        key = database_fingerprint(region)
+    elif source == 'store':
+        from utils.results_store import get_results_store
+        store = store or get_results_store()
+        key = store_fingerprint(store)
+    else:
+        raise ValueError(f"Unknown report source: {source}")
+
+    if use_cache:
+        outputs = cache.get_outputs(key, formats)
+        if outputs:
+            print(f"⚡ Inputs unchanged ({key}), reusing existing report")
+            return {"filename": outputs.get('docx', next(iter(outputs.values()))),
+                    "outputs": outputs, "timestamp": timestamp, "cached": True}
+
+    tables = cache.get_tables(key) if use_cache else None
+    if tables is None:
+        print(f"📊 Collecting report data from {source}...")
+        if source == 'database':
+            tables = run_queries(REPORT_QUERIES, max_workers, region)
+        else:
+            tables = store_tables(store)
+        cache.put_tables(key, tables)
+
+    if source == 'database':
+        assets, blocks = build_database_report(tables)
+    else:
+        assets, blocks = build_store_report(tables)
+
+    title = "Saskatchewan Glacier Albedo - Statistiques"
+    described = f"source: {source}, région: {region}" if source == 'database' else f"source: {source}"
+    blocks = [('heading', title, 1),
+              ('paragraph', f"Généré le {datetime.now():%Y-%m-%d %H:%M} ({described})"),
+              *blocks]
+    prefix = region if source == 'database' else DEFAULT_REGION
+    output_base = os.path.join(output_dir, f"{prefix}_albedo_stats_{timestamp}")
+    outputs = render_report(title, blocks, assets, output_base, formats)
+    cache.put_outputs(key, outputs)
+
+    for report_format, path in outputs.items():
+        print(f"📄 {report_format}: {path}")
+
     return {
-        "filename": doc_filename,
-        "queries": queries,
-        "timestamp": timestamp
+        "filename": outputs.get('docx', next(iter(outputs.values()), None)),
+        "outputs": outputs,
+        "timestamp": timestamp,
+        "cached": False
     }
 
+
 if __name__ == "__main__":
-    result = generate_stats_report()
-    print(f"\n✅ Script prepared. Document filename: {result['filename']}")
-    print("🚀 Run this script through Claude to execute MCP calls!")
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Generate the albedo statistics report")
+    parser.add_argument('--source', choices=['database', 'store'], default='database')
+    parser.add_argument('--formats', nargs='+', choices=REPORT_FORMATS, default=list(REPORT_FORMATS))
+    parser.add_argument('--output-dir', default=DEFAULT_REPORT_DIR)
+    parser.add_argument('--region', default=DEFAULT_REGION,
+                        help="Glacier / region of the database report")
+    parser.add_argument('--no-cache', action='store_true', help="Ignore cached results")
+    args = parser.parse_args()
+
+    result = generate_stats_report(args.source, args.formats, args.output_dir,
+                                   use_cache=not args.no_cache, region=args.region)
+    print(f"\n✅ Report ready: {result['filename']}")
@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+"""
+Analysis Pipeline
+=================
+
+Stage graph of the per-dataset analysis, for scheduled batch runs::
+
+    load ─┬─ trends ───┬─ figures
+          ├─ bootstrap ┤
+          ├─ seasonal ─┤
+          ├─ pixels ───┼─ exports
+          └─ qa ───────┘
+
+Loading goes through the session handler registry (the handlers clean the
+data while loading). Independent stages run concurrently, figures one at a
+time (matplotlib). Every stage output is cached under a hash of its inputs;
+the load stage is keyed on the dataset's freshness stamp, so a nightly run on
+an unchanged data drop does nothing, and a new drop only recomputes the
+stages of the datasets that changed.
+
+Usage:
+    python scripts/run_pipeline.py                          # both products
+    python scripts/run_pipeline.py --datasets MOD10A1 --stages trends figures
+    python scripts/run_pipeline.py --force                  # ignore the cache
+    python scripts/run_pipeline.py --trace                  # timeline + summary
+"""
+
+import sys
+import os
+import argparse
+
+import pandas as pd
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import instrumentation
+from utils.pipeline import DEFAULT_PIPELINE_DIR, Pipeline, Stage
+
+DATASETS = ('MCD43A3', 'MOD10A1')
+STAGE_NAMES = ('load', 'trends', 'bootstrap', 'seasonal', 'pixels', 'qa', 'figures', 'exports')
+DEFAULT_OUTPUT_DIR = os.path.join('output', 'pipeline_results')
+
+
+def _strip_arrays(results):
+    """Drop the per-series arrays of analyzer results"""
+    return {
+        fraction: {k: v for k, v in result.items()
+                   if k not in ('data', 'bootstrap_slopes', 'bootstrap_pvalues')}
+        for fraction, result in results.items()
+    }
+
+
+def _qa_csv_path(dataset):
+    from config.settings import config
+    return config.get_dataset_config(dataset).qa_csv_path
+
+
+# ===========================================
+# STAGE FUNCTIONS
+# ===========================================
+
+def load_stage(inputs, dataset):
+    """Loaded (and cleaned) handler, shared with the rest of the session"""
+    from data.registry import get_handler_registry
+    return get_handler_registry().get_handler(dataset)
+
+
+def trends_stage(inputs, dataset, variable):
+    from analysis.trends import TrendCalculator
+
+    calculator = TrendCalculator(inputs[f'{dataset}:load'])
+    results = calculator.calculate_basic_trends(variable)
+    return {'basic_trends': results, 'summary_table': calculator.get_summary_table(variable)}
+
+
+def bootstrap_stage(inputs, dataset, variable, n_bootstrap):
+    from analysis.trends import TrendCalculator
+
+    calculator = TrendCalculator(inputs[f'{dataset}:load'])
+    return _strip_arrays(calculator.calculate_bootstrap_confidence_intervals(variable, n_bootstrap))
+
+
+def seasonal_stage(inputs, dataset, variable):
+    from analysis.seasonal import SeasonalAnalyzer
+
+    analyzer = SeasonalAnalyzer(inputs[f'{dataset}:load'])
+    analyzer.analyze_monthly_trends(variable)
+    return {'summary_table': analyzer.get_monthly_summary_table(variable)}
+
+
+def pixels_stage(inputs, dataset):
+    from analysis.pixel_analysis import PixelCountAnalyzer
+
+    analyzer = PixelCountAnalyzer(inputs[f'{dataset}:load'])
+    return {'summary_table': analyzer.analyze_monthly_pixel_counts().get('summary_dataframe')}
+
+
+def qa_stage(inputs, dataset):
+    from analysis.pixel_analysis import PixelCountAnalyzer
+    from data.zip_source import csv_source_exists
+
+    qa_csv_path = _qa_csv_path(dataset)
+    if not csv_source_exists(qa_csv_path):
+        print(f"⚠️  No QA file for {dataset}: {qa_csv_path}")
+        return {'summary_table': None}
+
+    analyzer = PixelCountAnalyzer(inputs[f'{dataset}:load'], qa_csv_path)
+    return {'summary_table': analyzer.analyze_true_qa_statistics().get('qa_dataframe')}
+
+
+def figures_stage(inputs, dataset, variable, output_dir):
+    from visualization.charts import create_charts
+
+    trends = inputs[f'{dataset}:trends']
+    return create_charts(inputs[f'{dataset}:load'], {'basic_trends': trends['basic_trends']},
+                         variable, os.path.join(output_dir, dataset.lower(), 'figures'))
+
+
+def exports_stage(inputs, dataset, variable, output_dir):
+    """Summary tables of every analysis stage as CSV"""
+    export_dir = os.path.join(output_dir, dataset.lower())
+    os.makedirs(export_dir, exist_ok=True)
+
+    bootstrap = pd.json_normalize(list(inputs[f'{dataset}:bootstrap'].values()))
+    tables = {
+        'trends': inputs[f'{dataset}:trends']['summary_table'],
+        'bootstrap': bootstrap,
+        'seasonal': inputs[f'{dataset}:seasonal']['summary_table'],
+        'pixels': inputs[f'{dataset}:pixels']['summary_table'],
+        'qa': inputs[f'{dataset}:qa']['summary_table'],
+    }
+
+    written = {}
+    for name, table in tables.items():
+        if table is None or len(table) == 0:
+            continue
+        path = os.path.join(export_dir, f"{dataset.lower()}_{name}_{variable}.csv")
+        table.to_csv(path, index=False)
+        written[name] = path
+    print(f"📁 {dataset}: {len(written)} tables exported to {export_dir}")
+    return written
+
+
+# ===========================================
+# GRAPH
+# ===========================================
+
+def _source_freshness(dataset):
+    from data.registry import get_handler_registry
+    return get_handler_registry().probe(dataset, refresh=True).freshness
+
+
+def _qa_freshness(dataset):
+    from data.zip_source import get_zip_resolver, csv_source_exists
+
+    qa_csv_path = _qa_csv_path(dataset)
+    if not csv_source_exists(qa_csv_path):
+        return None
+    return get_zip_resolver().probe(qa_csv_path)['freshness']
+
+
+def build_pipeline(datasets=DATASETS, variable='mean', n_bootstrap=None,
+                   output_dir=DEFAULT_OUTPUT_DIR, cache_dir=DEFAULT_PIPELINE_DIR,
+                   max_workers=None):
+    """
+    Stage graph for the requested datasets
+
+    Args:
+        datasets: Dataset names
+        variable: 'mean' or 'median'
+        n_bootstrap: Bootstrap iterations (default: analysis configuration)
+        output_dir: Directory of the figures and exported tables
+        cache_dir: Directory of the cached stage outputs
+        max_workers: Worker threads
+
+    Returns:
+        Pipeline: Stage graph
+    """
+    pipeline = Pipeline(cache_dir, max_workers)
+
+    for dataset in datasets:
+        load = f'{dataset}:load'
+        pipeline.add(Stage(load, load_stage, params={'dataset': dataset}, cache=False,
+                           fingerprint=lambda dataset=dataset: _source_freshness(dataset)))
+        pipeline.add(Stage(f'{dataset}:trends', trends_stage, (load,),
+                           {'dataset': dataset, 'variable': variable}))
+        pipeline.add(Stage(f'{dataset}:bootstrap', bootstrap_stage, (load,),
+                           {'dataset': dataset, 'variable': variable, 'n_bootstrap': n_bootstrap}))
+        pipeline.add(Stage(f'{dataset}:seasonal', seasonal_stage, (load,),
+                           {'dataset': dataset, 'variable': variable}))
+        pipeline.add(Stage(f'{dataset}:pixels', pixels_stage, (load,), {'dataset': dataset}))
+        pipeline.add(Stage(f'{dataset}:qa', qa_stage, (load,), {'dataset': dataset},
+                           fingerprint=lambda dataset=dataset: _qa_freshness(dataset)))
+        pipeline.add(Stage(f'{dataset}:figures', figures_stage, (load, f'{dataset}:trends'),
+                           {'dataset': dataset, 'variable': variable, 'output_dir': output_dir},
+                           lock='matplotlib', produces_files=True))
+        pipeline.add(Stage(f'{dataset}:exports', exports_stage,
+                           tuple(f'{dataset}:{name}' for name in
+                                 ('trends', 'bootstrap', 'seasonal', 'pixels', 'qa')),
+                           {'dataset': dataset, 'variable': variable, 'output_dir': output_dir},
+                           produces_files=True))
+
+    return pipeline
+
+
+def run_pipeline(datasets=DATASETS, stages=None, force=False, **options):
+    """
+    Bring the requested stages up to date
+
+    Args:
+        datasets: Dataset names
+        stages: Stage names ('trends', 'figures', ...); default: all
+        force: Recompute every stage
+        **options: build_pipeline options
+
+    Returns:
+        PipelineReport: Per-stage status, timings and outputs
+    """
+    pipeline = build_pipeline(datasets, **options)
+    targets = [f'{dataset}:{stage}' for dataset in datasets for stage in stages] if stages else None
+    return pipeline.run(targets, force=force)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the albedo analysis stage graph")
+    parser.add_argument('--datasets', nargs='+', choices=DATASETS, default=list(DATASETS))
+    parser.add_argument('--stages', nargs='+', choices=STAGE_NAMES, default=None,
+                        help="Stages to bring up to date (default: all)")
+    parser.add_argument('--variable', choices=['mean', 'median'], default='mean')
+    parser.add_argument('--n-bootstrap', type=int, default=None)
+    parser.add_argument('--output-dir', default=DEFAULT_OUTPUT_DIR)
+    parser.add_argument('--cache-dir', default=str(DEFAULT_PIPELINE_DIR))
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help="Ignore cached stage outputs")
+    parser.add_argument('--trace', action='store_true',
+                        help="Record timing spans and write a Chrome trace + summary")
+    parser.add_argument('--trace-memory', action='store_true',
+                        help="Like --trace, with tracemalloc allocation deltas (slower)")
+    args = parser.parse_args()
+
+    if args.trace or args.trace_memory:
+        instrumentation.enable(memory=args.trace_memory)
+
+    report = run_pipeline(args.datasets, args.stages, args.force, variable=args.variable,
+                          n_bootstrap=args.n_bootstrap, output_dir=args.output_dir,
+                          cache_dir=args.cache_dir, max_workers=args.workers)
+    instrumentation.finish_run(label='pipeline')
+    sys.exit(0 if report.ok else 1)
@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Regional Batch Analysis
+=======================
+
+Trend and MCD43A3 / MOD10A1 comparison runs over many glaciers. Regions are
+the reference glacier plus one sub-directory of data/regions per glacier
+(same CSV file names as data/csv), or the rows of the ``region`` column in
+database / DuckDB mode.
+
+Each product is loaded once as a (region × day × fraction) cube; the per-region
+analyses then fan out on a process pool and the results are written
+partitioned by region (output/regions/<region>/).
+
+Usage:
+    python scripts/run_regions.py                           # every region
+    python scripts/run_regions.py --regions saskatchewan athabasca --workers 8
+    python scripts/run_regions.py --list                    # configured regions
+"""
+
+import sys
+import os
+import argparse
+
+# Add project root to path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import instrumentation
+from analysis.regional import DATASETS, DEFAULT_REGIONAL_DIR, run_regional_batch
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run the albedo analyses over many glaciers")
+    parser.add_argument('--regions', nargs='+', default=None,
+                        help="Regions to analyze (default: every configured region)")
+    parser.add_argument('--datasets', nargs='+', choices=DATASETS, default=list(DATASETS))
+    parser.add_argument('--variable', choices=['mean', 'median'], default='mean')
+    parser.add_argument('--no-comparison', action='store_true',
+                        help="Skip the MCD43A3 / MOD10A1 comparison")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Worker processes (default: CPU count)")
+    parser.add_argument('--output-dir', default=DEFAULT_REGIONAL_DIR)
+    parser.add_argument('--list', action='store_true', help="List the configured regions and exit")
+    parser.add_argument('--trace', action='store_true',
+                        help="Record timing spans and write a Chrome trace + summary")
+    args = parser.parse_args()
+
+    if args.list:
+        from config.settings import config
+        for name, region in config.get_regions().items():
+            print(f"  {name}: {region.description} ({region.data_dir})")
+        sys.exit(0)
+
+    if args.trace:
+        instrumentation.enable()
+
+    results = run_regional_batch(args.regions, tuple(args.datasets), args.variable,
+                                 comparison=not args.no_comparison,
+                                 max_workers=args.workers, output_dir=args.output_dir)
+    instrumentation.finish_run(label='regions')
+    sys.exit(0 if not results['errors'] else 1)
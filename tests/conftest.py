@@ -0,0 +1,17 @@
+"""
+Configuration pytest
+====================
+
+Les modules s'importent depuis la racine du projet (``from utils.helpers
+import ...``), comme dans les scripts. La racine contient un __init__.py
+mais n'est pas importée comme paquet (voir pytest.ini).
+"""
+
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+# Add project root to path
+sys.path.insert(0, str(ROOT))
+
@@ -0,0 +1,82 @@
+"""
+Clés de cache des tâches de fond : fraîcheur des données et exports
+"""
+
+from types import SimpleNamespace
+
+import pytest
+
+from data import registry
+from scripts import background_tasks
+from utils.jobs import input_hash
+
+
+class StampRegistry:
+    """Registre dont les sondes ne renvoient que le tampon de fraîcheur"""
+
+    def __init__(self):
+        self.stamps = {}
+        self.refreshed = []
+
+    def probe(self, dataset_name, refresh=False, region=None):
+        self.refreshed.append((dataset_name, refresh))
+        return SimpleNamespace(freshness=self.stamps[dataset_name])
+
+
+class RecordingRunner:
+    def __init__(self):
+        self.calls = []
+
+    def submit(self, func, *args, kind=None, input_files=(), input_token=None, use_cache=True):
+        self.calls.append({'kind': kind, 'use_cache': use_cache,
+                           'hash': input_hash(func, args, None, input_files, input_token)})
+        return f'job{len(self.calls)}'
+
+
+@pytest.fixture
+def stamps(monkeypatch):
+    fake = StampRegistry()
+    monkeypatch.setattr(registry, '_registry', fake)
+    return fake
+
+
+@pytest.fixture
+def runner(monkeypatch):
+    recorder = RecordingRunner()
+    monkeypatch.setattr(background_tasks, 'get_job_runner', lambda: recorder)
+    return recorder
+
+
+def test_freshness_invalidates_database_mode_cache(stamps, runner, monkeypatch):
+    # Mode base de données : aucun fichier d'entrée à surveiller
+    monkeypatch.setattr(background_tasks, 'dataset_input_files', lambda name: [])
+    stamps.stamps['MCD43A3'] = '2024-09-01T00:00:00'
+
+    background_tasks.submit_trends('MCD43A3')
+    background_tasks.submit_trends('MCD43A3')
+    stamps.stamps['MCD43A3'] = '2024-09-08T00:00:00'
+    background_tasks.submit_trends('MCD43A3')
+
+    first, same, after_ingest = (call['hash'] for call in runner.calls)
+    assert first == same
+    assert after_ingest != first
+    # La sonde est relue à chaque soumission, pas prise dans le cache du registre
+    assert stamps.refreshed == [('MCD43A3', True)] * 3
+
+
+def test_failed_probe_still_submits(runner, monkeypatch):
+    class BrokenRegistry:
+        def probe(self, dataset_name, refresh=False, region=None):
+            raise ConnectionError('database unreachable')
+
+    monkeypatch.setattr(registry, '_registry', BrokenRegistry())
+    monkeypatch.setattr(background_tasks, 'dataset_input_files', lambda name: [])
+    assert background_tasks.submit_bootstrap('MOD10A1') == 'job1'
+    assert runner.calls[0]['hash'] == input_hash(background_tasks.bootstrap_task,
+                                                 ('MOD10A1', 'mean', None))
+
+
+def test_exports_never_reuse_cache(runner):
+    background_tasks.submit_export('MCD43A3', ['csv', 'excel'], 'export')
+    assert runner.calls[0]['kind'] == 'export'
+    assert runner.calls[0]['use_cache'] is False
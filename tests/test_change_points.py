@@ -0,0 +1,109 @@
+"""
+Ruptures : PELT et test de Pettitt sur des séries à saut connu et constantes
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.change_points import (_noise_scale, change_point_summary, detect_change_points,
+                                    pelt, pettitt_test)
+
+
+def _steps(lengths, levels, sigma=0.1, seed=0):
+    rng = np.random.default_rng(seed)
+    values = np.concatenate([np.full(n, level) for n, level in zip(lengths, levels)])
+    return values + rng.normal(0, sigma, len(values))
+
+
+def _naive_pettitt_u(values):
+    """U_t = Σ_{i≤t} Σ_{j>t} sign(x_i - x_j), définition de Pettitt (1979)"""
+    n = len(values)
+    return np.array([sum(np.sign(values[i] - values[j]) for i in range(t) for j in range(t, n))
+                     for t in range(1, n)])
+
+
+def _naive_optimal_partitioning(values, penalty, min_size):
+    """Partitionnement optimal sans élagage (coût = SSE, série normalisée comme pelt)"""
+    x = (values - values.mean()) / _noise_scale(values)
+    n = len(x)
+    best = np.full(n + 1, np.inf)
+    best[0] = -penalty
+    previous = np.zeros(n + 1, dtype=int)
+    for end in range(min_size, n + 1):
+        for start in [0, *range(min_size, end - min_size + 1)]:
+            segment = x[start:end]
+            total = best[start] + np.sum((segment - segment.mean()) ** 2) + penalty
+            if total < best[end]:
+                best[end], previous[end] = total, start
+    breaks, position = [], n
+    while position > 0:
+        position = previous[position]
+        if position > 0:
+            breaks.append(int(position))
+    return sorted(breaks)
+
+
+def test_pettitt_statistic_matches_definition():
+    values = np.round(_steps([25, 35], [0.6, 0.5], sigma=0.05, seed=2), 2)  # avec ex-aequo
+    result = pettitt_test(values)
+
+    u = _naive_pettitt_u(values)
+    t = int(np.argmax(np.abs(u)))
+    assert result['change_index'] == t + 1
+    assert result['U'] == u[t]
+    assert result['K'] == np.abs(u).max()
+
+
+def test_pettitt_finds_known_step():
+    values = _steps([40, 60], [0.7, 0.5], sigma=0.03)
+    result = pettitt_test(values)
+    assert result['change_index'] == 40
+    assert result['significant']
+    assert result['p_value'] < 1e-6
+
+
+def test_pettitt_constant_series_has_no_change_point():
+    result = pettitt_test(np.full(30, 0.42))
+    assert result['change_index'] is None
+    assert result['K'] == 0
+    assert result['p_value'] == 1.0
+    assert not result['significant']
+
+
+def test_pelt_finds_known_steps():
+    values = _steps([40, 50, 60], [0.7, 0.5, 0.6], sigma=0.03)
+    assert pelt(values, min_size=10) == [40, 90]
+    assert pelt(values, model='meanvar', min_size=10) == [40, 90]
+
+
+def test_pelt_meanvar_finds_variance_change():
+    rng = np.random.default_rng(0)
+    values = np.concatenate([rng.normal(0.5, 0.01, 80), rng.normal(0.5, 0.05, 80)])
+    breaks = pelt(values, model='meanvar')
+    assert len(breaks) == 1 and abs(breaks[0] - 80) <= 3
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_pelt_matches_optimal_partitioning(seed):
+    values = _steps([30, 25, 45], [0.5, 0.8, 0.6], sigma=0.2, seed=seed)
+    for penalty in (2.0, 2 * np.log(len(values)), 20.0):
+        expected = _naive_optimal_partitioning(values, penalty, min_size=5)
+        assert pelt(values, penalty=penalty, min_size=5) == expected
+
+
+def test_constant_series_end_to_end():
+    values = np.full(40, 0.42)
+    times = 2010 + np.arange(40) / 10
+    dates = pd.date_range('2010-06-01', periods=40, freq='D')
+    assert pelt(values) == []
+
+    result = detect_change_points(times, values, dates)
+    assert result['pettitt']['change_index'] is None
+    assert 'change_date' not in result['pettitt']
+    assert result['pelt']['segment_means'] == [pytest.approx(0.42)]
+
+    summary = change_point_summary({'pure_ice': result})
+    assert summary.loc[0, 'Pettitt_date'] is None
+    assert summary.loc[0, 'PELT_n_ruptures'] == 0
+    assert np.isnan(summary.loc[0, 'Pettitt_saut'])
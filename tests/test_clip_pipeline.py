@@ -0,0 +1,188 @@
+"""
+ClipPipeline sur un petit raster synthétique
+
+Les outils GDAL (gdalinfo, gdalwarp, gdalbuildvrt) sont remplacés par de petits
+scripts Python placés en tête du PATH : le granule est un JSON contenant les
+bandes, et gdalwarp découpe la bande sur l'emprise (en pixels) du masque GeoJSON.
+"""
+
+import json
+import os
+import sys
+
+import numpy as np
+import pytest
+
+from data.modis.processing.clip_pipeline import CUTLINE_OPTIONS, ClipPipeline
+
+BANDS = ['Albedo_WSA_shortwave', 'Albedo_BSA_shortwave', 'Albedo_BSA_vis', 'Nadir_Reflectance']
+SELECTED = ['Albedo_WSA_shortwave', 'Albedo_BSA_shortwave']
+# Emprise du masque en pixels : lignes 2 à 5, colonnes 3 à 7 (bornes incluses)
+ROWS, COLS = (2, 5), (3, 7)
+
+GDALINFO = '''
+import json, sys
+path = sys.argv[1]
+if path == '--version':
+    print('GDAL 3.0.0 (stand-in)')
+    sys.exit(0)
+with open(path) as f:
+    granule = json.load(f)
+print('Driver: HDF4/Hierarchical Data Format Release 4')
+print('Subdatasets:')
+for i, band in enumerate(granule, 1):
+    print(f'  SUBDATASET_{i}_NAME=HDF4_EOS:EOS_GRID:"{path}":MOD_Grid_BRDF:{band}')
+    print(f'  SUBDATASET_{i}_DESC=[2400x2400] {band} (16-bit integer)')
+'''
+
+GDALWARP = '''
+import json, os, sys
+args = sys.argv[1:]
+with open(os.environ['CLIP_TEST_LOG'], 'a') as f:
+    f.write(json.dumps(['gdalwarp', *args]) + '\\n')
+subdataset, output = args[-2], args[-1]
+path, band = subdataset.split('"')[1], subdataset.split(':')[-1]
+with open(args[args.index('-cutline') + 1]) as f:
+    ring = json.load(f)['features'][0]['geometry']['coordinates'][0]
+with open(path) as f:
+    values = json.load(f)[band]
+cols = [int(x) for x, _ in ring]
+rows = [int(y) for _, y in ring]
+clipped = [row[min(cols):max(cols) + 1] for row in values[min(rows):max(rows) + 1]]
+with open(output, 'w') as f:
+    json.dump(clipped, f)
+'''
+
+GDALBUILDVRT = '''
+import json, os, sys
+args = sys.argv[1:]
+with open(os.environ['CLIP_TEST_LOG'], 'a') as f:
+    f.write(json.dumps(['gdalbuildvrt', *args]) + '\\n')
+with open(args[args.index('-separate') + 1], 'w') as f:
+    json.dump(args[args.index('-separate') + 2:], f)
+'''
+
+
+@pytest.fixture
+def gdal_stand_in(tmp_path, monkeypatch):
+    bin_dir = tmp_path / 'bin'
+    bin_dir.mkdir()
+    for name, source in [('gdalinfo', GDALINFO), ('gdalwarp', GDALWARP),
+                         ('gdalbuildvrt', GDALBUILDVRT)]:
+        script = bin_dir / name
+        script.write_text(f'#!{sys.executable}\n{source}')
+        script.chmod(0o755)
+    log = tmp_path / 'calls.jsonl'
+    monkeypatch.setenv('PATH', f"{bin_dir}{os.pathsep}{os.environ['PATH']}")
+    monkeypatch.setenv('CLIP_TEST_LOG', str(log))
+    return log
+
+
+def _calls(log, tool):
+    if not log.exists():
+        return []
+    calls = [json.loads(line) for line in log.read_text().splitlines()]
+    return [call[1:] for call in calls if call[0] == tool]
+
+
+def _write_granule(path, seed):
+    rng = np.random.default_rng(seed)
+    bands = {band: rng.integers(0, 1000, (10, 12)) for band in BANDS}
+    path.write_text(json.dumps({band: values.tolist() for band, values in bands.items()}))
+    return bands
+
+
+def _write_mask(path):
+    (r0, r1), (c0, c1) = ROWS, COLS
+    ring = [[c0, r0], [c1, r0], [c1, r1], [c0, r1], [c0, r0]]
+    path.write_text(json.dumps({
+        'type': 'FeatureCollection',
+        'features': [{'type': 'Feature', 'properties': {},
+                      'geometry': {'type': 'Polygon', 'coordinates': [ring]}}],
+    }))
+
+
+@pytest.fixture
+def granules(tmp_path):
+    hdf_dir = tmp_path / 'hdf'
+    hdf_dir.mkdir()
+    _write_mask(tmp_path / 'mask.geojson')
+    names = ['MCD43A3.A2020153.h11v03.061.hdf', 'MCD43A3.A2020154.h11v03.061.hdf']
+    return {hdf_dir / name: _write_granule(hdf_dir / name, seed) for seed, name in enumerate(names)}
+
+
+def _pipeline(tmp_path, **kwargs):
+    return ClipPipeline(tmp_path / 'mask.geojson', tmp_path / 'clipped', workers=2, **kwargs)
+
+
+def test_clips_selected_subdatasets(tmp_path, gdal_stand_in, granules):
+    report = _pipeline(tmp_path).run(list(granules))
+
+    assert not report.failed
+    assert len(report.clipped) == len(granules) * len(SELECTED)
+    (r0, r1), (c0, c1) = ROWS, COLS
+    for hdf_file, bands in granules.items():
+        base = hdf_file.stem
+        for band in SELECTED:
+            output = tmp_path / 'clipped' / f'{base}_{band}_clipped.tif'
+            assert str(output) in report.clipped
+            clipped = np.array(json.loads(output.read_text()))
+            np.testing.assert_array_equal(clipped, bands[band][r0:r1 + 1, c0:c1 + 1])
+    # Aucun fichier temporaire laissé derrière
+    assert not list((tmp_path / 'clipped').glob('*.tmp.tif'))
+
+    warps = _calls(gdal_stand_in, 'gdalwarp')
+    assert len(warps) == len(report.clipped)
+    for args in warps:
+        assert args[args.index('-cutline') + 1] == str(tmp_path / 'mask.geojson')
+        assert '-crop_to_cutline' in args
+        position = args.index(CUTLINE_OPTIONS[0])
+        assert args[position:position + len(CUTLINE_OPTIONS)] == CUTLINE_OPTIONS
+
+
+def test_rerun_only_warps_changed_granules(tmp_path, gdal_stand_in, granules):
+    hdf_files = list(granules)
+    _pipeline(tmp_path, stack='vrt').run(hdf_files)
+    assert len(_calls(gdal_stand_in, 'gdalbuildvrt')) == 2
+    gdal_stand_in.unlink()
+
+    # Rien n'a changé : aucun appel à gdalwarp, aucune pile reconstruite
+    report = _pipeline(tmp_path, stack='vrt').run(hdf_files)
+    assert not report.clipped
+    assert len(report.skipped) == len(hdf_files) * len(SELECTED)
+    assert not _calls(gdal_stand_in, 'gdalwarp')
+    assert not _calls(gdal_stand_in, 'gdalbuildvrt')
+
+    # Granule réécrit : seules ses bandes et sa pile journalière sont refaites
+    changed = hdf_files[1]
+    bands = _write_granule(changed, seed=42)
+    os.utime(changed, ns=(os.stat(changed).st_atime_ns, os.stat(changed).st_mtime_ns + 10 ** 9))
+    report = _pipeline(tmp_path, stack='vrt').run(hdf_files)
+
+    assert sorted(report.clipped) == sorted(
+        str(tmp_path / 'clipped' / f'{changed.stem}_{band}_clipped.tif') for band in SELECTED)
+    assert len(report.skipped) == len(SELECTED)
+    assert report.stacks == [str(tmp_path / 'clipped' / 'MCD43A3.A2020154_stack.vrt')]
+    (r0, r1), (c0, c1) = ROWS, COLS
+    output = tmp_path / 'clipped' / f'{changed.stem}_{SELECTED[0]}_clipped.tif'
+    np.testing.assert_array_equal(np.array(json.loads(output.read_text())),
+                                  bands[SELECTED[0]][r0:r1 + 1, c0:c1 + 1])
+
+
+def test_failed_warp_reported_and_retried(tmp_path, gdal_stand_in, granules):
+    hdf_files = list(granules)
+    empty = hdf_files[0].with_name('MCD43A3.A2020155.h11v03.061.hdf')
+    empty.write_text('{}')
+
+    # Masque illisible : chaque gdalwarp échoue et aucune sortie n'est enregistrée
+    (tmp_path / 'mask.geojson').write_text('not json')
+    report = _pipeline(tmp_path).run([*hdf_files, empty])
+    assert not report.clipped
+    assert len(report.failed) == len(hdf_files) * len(SELECTED)
+    assert not list((tmp_path / 'clipped').glob('*.tif'))
+
+    # Masque corrigé : tout est refait, le granule sans sous-jeu de données est ignoré
+    _write_mask(tmp_path / 'mask.geojson')
+    report = _pipeline(tmp_path).run([*hdf_files, empty])
+    assert not report.failed
+    assert len(report.clipped) == len(hdf_files) * len(SELECTED)
@@ -0,0 +1,196 @@
+"""
+Reprise des téléchargements (HTTP Range) contre un http.server local
+"""
+
+import hashlib
+import threading
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pytest
+
+from data.modis.downloaders.download_manager import (GranuleDownloadManager, PART_SUFFIX,
+                                                     STATUS_COMPLETE, tasks_from_urls)
+
+GRANULE = 'MCD43A3.A2020183.h11v03.061.hdf'
+SIZE = 3 * 2 ** 20 + 12345
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """Sert des fichiers statiques avec support de l'en-tête Range"""
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        server.ranges.append(self.headers.get('Range'))
+        body = (server.root / self.path.lstrip('/')).read_bytes()
+
+        offset = 0
+        requested = self.headers.get('Range')
+        if requested and server.honour_range:
+            offset = int(requested.split('=')[1].split('-')[0])
+            if offset >= len(body) or server.refuse_next_range:
+                # refuse_next_range : serveur qui refuse la reprise d'un fichier tronqué
+                server.refuse_next_range = False
+                self.send_response(416)
+                if server.send_unsatisfied_range:
+                    self.send_header('Content-Range', f'bytes */{len(body)}')
+                self.send_header('Content-Length', '0')
+                self.end_headers()
+                return
+            self.send_response(206)
+            self.send_header('Content-Range', f'bytes {offset}-{len(body) - 1}/{len(body)}')
+        else:
+            self.send_response(200)
+        payload = body[offset:]
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+
+        if server.truncate_next:
+            # Coupure réseau simulée : la moitié des octets puis fermeture
+            server.truncate_next = False
+            self.wfile.write(payload[:len(payload) // 2])
+            self.close_connection = True
+            return
+        self.wfile.write(payload)
+
+
+@pytest.fixture
+def server(tmp_path):
+    root = tmp_path / 'www'
+    root.mkdir()
+    content = np.random.default_rng(0).integers(0, 256, SIZE, dtype=np.uint8).tobytes()
+    (root / GRANULE).write_bytes(content)
+
+    httpd = ThreadingHTTPServer(('127.0.0.1', 0), partial(RangeRequestHandler, directory=str(root)))
+    httpd.root = root
+    httpd.content = content
+    httpd.ranges = []
+    httpd.honour_range = True
+    httpd.truncate_next = False
+    httpd.refuse_next_range = False
+    httpd.send_unsatisfied_range = True
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def _manager(tmp_path, **kwargs):
+    kwargs.setdefault('max_retries', 3)
+    return GranuleDownloadManager(tmp_path / 'manifest.sqlite', max_workers=2,
+                                  backoff_base=0.01, timeout=10, **kwargs)
+
+
+def _run(server, tmp_path, **kwargs):
+    url = f'http://127.0.0.1:{server.server_address[1]}/{GRANULE}'
+    tasks = tasks_from_urls([url], tmp_path / 'out', product='MCD43A3')
+    manager = _manager(tmp_path, **kwargs)
+    try:
+        report = manager.download(tasks)
+        row = manager.manifest.get(GRANULE)
+    finally:
+        manager.close()
+    return tasks[0].path, report, row
+
+
+def _assert_intact(server, path, row):
+    expected = hashlib.sha256(server.content).hexdigest()
+    assert path.stat().st_size == SIZE
+    assert hashlib.sha256(path.read_bytes()).hexdigest() == expected
+    assert row['status'] == STATUS_COMPLETE
+    assert row['size'] == SIZE
+    assert row['checksum'] == expected
+    assert not path.with_name(path.name + PART_SUFFIX).exists()
+
+
+def test_resume_partial_file(server, tmp_path):
+    partial_bytes = 1_000_003
+    out = tmp_path / 'out'
+    out.mkdir()
+    (out / (GRANULE + PART_SUFFIX)).write_bytes(server.content[:partial_bytes])
+
+    path, report, row = _run(server, tmp_path)
+
+    assert server.ranges == [f'bytes={partial_bytes}-']
+    assert report.bytes_downloaded == SIZE - partial_bytes
+    assert not report.failed
+    _assert_intact(server, path, row)
+
+    # Une seconde exécution s'appuie sur le manifeste sans refaire de requête
+    _, report, _ = _run(server, tmp_path)
+    assert report.skipped == [str(path)]
+    assert len(server.ranges) == 1
+
+
+def test_resume_after_interrupted_transfer(server, tmp_path):
+    server.truncate_next = True
+
+    path, report, row = _run(server, tmp_path)
+
+    assert server.ranges[0] is None
+    assert len(server.ranges) == 2
+    first_half = SIZE // 2
+    assert server.ranges[1] == f'bytes={first_half}-'
+    assert row['attempts'] == 2
+    assert not report.failed
+    _assert_intact(server, path, row)
+
+
+def test_server_ignoring_range_restarts(server, tmp_path):
+    server.honour_range = False
+    out = tmp_path / 'out'
+    out.mkdir()
+    # Octets partiels corrompus : sans reprise possible, ils doivent être écrasés
+    (out / (GRANULE + PART_SUFFIX)).write_bytes(b'\xff' * 4096)
+
+    path, report, row = _run(server, tmp_path)
+
+    assert server.ranges == ['bytes=4096-']
+    assert report.bytes_downloaded == SIZE
+    _assert_intact(server, path, row)
+
+
+def test_part_file_already_complete(server, tmp_path):
+    out = tmp_path / 'out'
+    out.mkdir()
+    (out / (GRANULE + PART_SUFFIX)).write_bytes(server.content)
+
+    path, report, row = _run(server, tmp_path)
+
+    assert server.ranges == [f'bytes={SIZE}-']
+    assert report.bytes_downloaded == 0
+    _assert_intact(server, path, row)
+
+
+@pytest.mark.parametrize('send_unsatisfied_range', [True, False])
+def test_truncated_part_file_refused_by_server_restarts(server, tmp_path, send_unsatisfied_range):
+    server.refuse_next_range = True
+    server.send_unsatisfied_range = send_unsatisfied_range
+    partial_bytes = 700_001
+    out = tmp_path / 'out'
+    out.mkdir()
+    (out / (GRANULE + PART_SUFFIX)).write_bytes(server.content[:partial_bytes])
+
+    path, report, row = _run(server, tmp_path)
+
+    # 416 sur un fichier partiel tronqué : suppression du .part puis téléchargement complet
+    assert server.ranges == [f'bytes={partial_bytes}-', None]
+    assert report.bytes_downloaded == SIZE
+    assert row['attempts'] == 2
+    _assert_intact(server, path, row)
+
+
+def test_oversized_part_file_restarts(server, tmp_path):
+    out = tmp_path / 'out'
+    out.mkdir()
+    (out / (GRANULE + PART_SUFFIX)).write_bytes(server.content + b'stale tail')
+
+    path, report, row = _run(server, tmp_path)
+
+    assert server.ranges == [f'bytes={SIZE + 10}-', None]
+    _assert_intact(server, path, row)
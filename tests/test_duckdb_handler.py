@@ -0,0 +1,23 @@
+"""
+Le gestionnaire DuckDB ne dépend pas de la pile PostgreSQL
+"""
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+pytest.importorskip('duckdb')
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def test_import_without_postgres_drivers():
+    code = ("import sys, data.duckdb_handler; "
+            "print(','.join(m for m in ('psycopg2', 'sqlalchemy', 'database.connection') "
+            "if m in sys.modules))")
+    result = subprocess.run([sys.executable, '-c', code], cwd=ROOT,
+                            capture_output=True, text=True)
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == ''
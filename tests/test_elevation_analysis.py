@@ -0,0 +1,95 @@
+"""
+Tendances par lot (batch_trend_estimates) contre les appels série par série
+"""
+
+import numpy as np
+import pymannkendall as mk
+import pytest
+from scipy import stats
+
+from analysis.elevation_analysis import batch_trend_estimates
+
+YEARS = np.arange(2003, 2025, dtype=float)
+
+
+@pytest.fixture
+def series():
+    rng = np.random.default_rng(7)
+    n = len(YEARS)
+    columns = [
+        0.8 - 0.004 * (YEARS - YEARS[0]) + rng.normal(0, 0.02, n),
+        0.5 + 0.002 * (YEARS - YEARS[0]) + rng.normal(0, 0.01, n),
+        rng.normal(0.6, 0.05, n),
+        np.round(rng.normal(0.6, 0.05, n), 2),  # ex-aequo
+    ]
+    values = np.column_stack(columns)
+    # Trous différents selon la série, y compris en début et en fin
+    values[[0, 5, 6], 0] = np.nan
+    values[[n - 1, 10], 1] = np.nan
+    values[::3, 3] = np.nan
+    return values
+
+
+def test_matches_per_series_estimators(series):
+    batch = batch_trend_estimates(YEARS, series)
+    assert len(batch) == series.shape[1]
+
+    for k, row in batch.iterrows():
+        ok = np.isfinite(series[:, k])
+        t, y = YEARS[ok], series[ok, k]
+        assert row['n'] == ok.sum()
+
+        reference = mk.original_test(y)
+        assert row['mk_s'] == reference.s
+        assert row['mk_var_s'] == pytest.approx(reference.var_s)
+        assert row['mk_z'] == pytest.approx(reference.z)
+        assert row['mk_p'] == pytest.approx(reference.p)
+        assert row['mk_tau'] == pytest.approx(reference.Tau)
+        assert row['mk_trend'] == reference.trend
+
+        # Pente de Sen sur l'axe temporel réel (les trous changent l'espacement)
+        sen = stats.theilslopes(y, t)
+        assert row['sens_slope'] == pytest.approx(sen.slope)
+        assert row['sens_intercept'] == pytest.approx(sen.intercept)
+
+        linear = stats.linregress(t, y)
+        assert row['linear_slope'] == pytest.approx(linear.slope)
+        assert row['linear_intercept'] == pytest.approx(linear.intercept)
+        assert row['linear_r'] == pytest.approx(linear.rvalue)
+        assert row['linear_p'] == pytest.approx(linear.pvalue)
+        assert row['linear_stderr'] == pytest.approx(linear.stderr)
+
+        assert row['mean'] == pytest.approx(y.mean())
+        assert row['std'] == pytest.approx(y.std())
+        assert (row['min'], row['max']) == (y.min(), y.max())
+        assert (row['first'], row['last']) == (y[0], y[-1])
+        assert (row['first_year'], row['last_year']) == (t[0], t[-1])
+
+
+def test_theilsen_matches_sklearn(series):
+    linear_model = pytest.importorskip('sklearn.linear_model')
+    batch = batch_trend_estimates(YEARS, series)
+
+    for k, row in batch.iterrows():
+        ok = np.isfinite(series[:, k])
+        model = linear_model.TheilSenRegressor(max_subpopulation=10 ** 6, random_state=0)
+        model.fit(YEARS[ok, None], series[ok, k])
+        assert row['theilsen_slope'] == pytest.approx(model.coef_[0], rel=1e-4, abs=1e-8)
+        assert row['theilsen_intercept'] == pytest.approx(model.intercept_, rel=1e-4, abs=1e-6)
+
+
+def test_single_series_and_empty_column():
+    values = np.column_stack([np.linspace(0.9, 0.7, len(YEARS)), np.full(len(YEARS), np.nan)])
+    batch = batch_trend_estimates(YEARS, values)
+
+    single = batch_trend_estimates(YEARS, values[:, 0])
+    assert len(single) == 1
+    assert single.iloc[0]['sens_slope'] == pytest.approx(batch.iloc[0]['sens_slope'])
+    assert batch.iloc[0]['mk_trend'] == 'decreasing'
+
+    empty = batch.iloc[1]
+    assert empty['n'] == 0
+    assert empty['mk_s'] == 0
+    assert empty['mk_trend'] == 'no trend'
+    assert np.isnan(empty['sens_slope'])
+    assert np.isnan(empty['first']) and np.isnan(empty['first_year'])
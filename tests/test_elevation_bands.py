@@ -0,0 +1,140 @@
+"""
+Cube d'élévation : attribution des bandes aux bornes et agrégation par bande
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.elevation_bands import (ElevationBandCube, LEGACY_ZONES, band_edges_for,
+                                      band_label)
+
+FRACTIONS = ['mostly_ice', 'pure_ice']
+EDGES = np.array([2400.0, 2450.0, 2500.0, 2550.0])
+
+
+@pytest.fixture
+def pixels():
+    rng = np.random.default_rng(3)
+    n_days, n_pixels = 6, 400
+    # Une partie des pixels exactement sur les bornes, et quelques-uns hors bornes
+    elevation = rng.uniform(2380, 2570, n_pixels)
+    elevation[:40] = rng.choice([*EDGES, 2399.99, 2549.99], 40)
+    fraction_class = rng.integers(-1, len(FRACTIONS), n_pixels)
+    elevation[rng.random(n_pixels) < 0.05] = np.nan
+    values = rng.uniform(0.1, 0.9, (n_days, n_pixels))
+    values[rng.random(values.shape) < 0.2] = np.nan
+    dates = pd.date_range('2020-07-01', periods=n_days, freq='D')
+    return dates, values, elevation, fraction_class
+
+
+def _naive_counts_sums(values, elevation, fraction_class, edges):
+    """Boucle pixel par pixel : bande [bas, haut[ contenant l'élévation"""
+    n_bands = len(edges) - 1
+    counts = np.zeros((values.shape[0], n_bands, len(FRACTIONS)))
+    sums = np.zeros_like(counts)
+    for p, z in enumerate(elevation):
+        if fraction_class[p] < 0 or not np.isfinite(z):
+            continue
+        for b in range(n_bands):
+            if edges[b] <= z < edges[b + 1]:
+                for d in range(values.shape[0]):
+                    if np.isfinite(values[d, p]):
+                        counts[d, b, fraction_class[p]] += 1
+                        sums[d, b, fraction_class[p]] += values[d, p]
+    return counts, sums
+
+
+def test_band_edges_are_lower_inclusive():
+    elevation = np.array([2400.0, 2449.99, 2450.0, 2500.0, 2549.99, 2550.0, 2399.0])
+    fraction_class = np.zeros(len(elevation), dtype=int)
+    values = np.ones((1, len(elevation)))
+    cube = ElevationBandCube.from_pixels(['2020-07-01'], values, elevation, fraction_class,
+                                         FRACTIONS, band_edges=EDGES)
+
+    assert cube.band_labels == ['band_2400_2450', 'band_2450_2500', 'band_2500_2550']
+    # 2550 (borne supérieure) et 2399 (sous la première borne) sont hors cube
+    np.testing.assert_array_equal(cube.counts[0, :, 0], [2, 1, 2])
+
+
+def test_default_edges_cover_maximum():
+    edges = band_edges_for([2412.0, 2450.0, 2500.0, np.nan], 50.0)
+    np.testing.assert_array_equal(edges, [2400.0, 2450.0, 2500.0, 2550.0])
+    cube = ElevationBandCube.from_pixels(['2020-07-01'], np.ones((1, 3)), [2412.0, 2450.0, 2500.0],
+                                         np.zeros(3, dtype=int), FRACTIONS, band_width=50.0)
+    assert cube.counts.sum() == 3
+    assert cube.median_elevation == 2450.0
+
+
+def test_from_pixels_matches_naive_loop(pixels):
+    dates, values, elevation, fraction_class = pixels
+    cube = ElevationBandCube.from_pixels(dates, values, elevation, fraction_class,
+                                         FRACTIONS, band_edges=EDGES)
+
+    counts, sums = _naive_counts_sums(values, elevation, fraction_class, EDGES)
+    np.testing.assert_array_equal(cube.counts, counts)
+    np.testing.assert_allclose(cube.sums, sums)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        expected = np.where(counts >= 3, sums / counts, np.nan)
+    np.testing.assert_allclose(cube.daily_means(), expected)
+
+
+def test_regroup_sums_member_bands(pixels):
+    dates, values, elevation, fraction_class = pixels
+    cube = ElevationBandCube.from_pixels(dates, values, elevation, fraction_class,
+                                         FRACTIONS, band_edges=EDGES)
+
+    coarse = cube.regroup([2400.0, 2500.0, 2550.0])
+    assert coarse.band_labels == [band_label(2400, 2500), band_label(2500, 2550)]
+    np.testing.assert_array_equal(coarse.counts[:, 0], cube.counts[:, 0] + cube.counts[:, 1])
+    np.testing.assert_array_equal(coarse.counts[:, 1], cube.counts[:, 2])
+    np.testing.assert_allclose(coarse.sums[:, 0], cube.sums[:, 0] + cube.sums[:, 1])
+
+    # Regrouper les bandes revient à découper directement les pixels en zones larges
+    direct = ElevationBandCube.from_pixels(dates, values, elevation, fraction_class,
+                                           FRACTIONS, band_edges=[2400.0, 2500.0, 2550.0])
+    np.testing.assert_array_equal(coarse.counts, direct.counts)
+    np.testing.assert_allclose(coarse.sums, direct.sums)
+
+
+def test_median_zones_assign_bands_by_center(pixels):
+    dates, values, elevation, fraction_class = pixels
+    cube = ElevationBandCube.from_pixels(dates, values, elevation, fraction_class,
+                                         FRACTIONS, band_edges=EDGES)
+    cube.median_elevation = 2475.0
+
+    # ±25 m : seule la bande centrée sur 2475 est 'at_median'
+    zones = cube.median_zones(buffer_m=25.0)
+    assert zones.band_labels == LEGACY_ZONES
+    np.testing.assert_array_equal(zones.counts[:, 0], cube.counts[:, 0])
+    np.testing.assert_array_equal(zones.counts[:, 1], cube.counts[:, 1])
+    np.testing.assert_array_equal(zones.counts[:, 2], cube.counts[:, 2])
+    assert zones.counts.sum() == cube.counts.sum()
+
+
+def test_annual_means_average_valid_days():
+    dates = pd.to_datetime(['2020-07-01', '2020-07-02', '2020-07-03', '2021-07-01'])
+    counts = np.array([5.0, 2.0, 4.0, 3.0]).reshape(4, 1, 1)
+    means = np.array([0.5, 0.9, 0.3, 0.6]).reshape(4, 1, 1)
+    cube = ElevationBandCube(dates, counts, means * counts, ['pure_ice'], ['band_2400_2450'],
+                             [2400.0, 2450.0])
+
+    years, annual, n_valid = cube.annual_means()
+    np.testing.assert_array_equal(years, [2020, 2021])
+    # Le 2 juillet (2 pixels < 3) est exclu
+    np.testing.assert_allclose(annual[:, 0, 0], [0.4, 0.6])
+    np.testing.assert_array_equal(n_valid[:, 0, 0], [2, 1])
+
+
+def test_wide_frame_round_trip(pixels):
+    dates, values, elevation, fraction_class = pixels
+    cube = ElevationBandCube.from_pixels(dates, values, elevation, fraction_class,
+                                         FRACTIONS, band_edges=EDGES)
+
+    loaded = ElevationBandCube.from_frame(cube.to_wide_frame(), FRACTIONS)
+    assert loaded.band_labels == cube.band_labels
+    np.testing.assert_array_equal(loaded.band_edges, EDGES)
+    np.testing.assert_array_equal(loaded.counts, cube.counts)
+    np.testing.assert_allclose(loaded.sums, cube.sums)
+    assert loaded.median_elevation == cube.median_elevation
@@ -0,0 +1,123 @@
+"""
+Mann-Kendall modifié (Hamed & Rao) et TFPW contre des implémentations naïves
+"""
+
+import numpy as np
+import pymannkendall as mk
+import pytest
+from scipy.stats import norm, rankdata
+
+from utils.helpers import hamed_rao_mann_kendall, trend_free_prewhiten
+
+
+def _ar1(n, phi, trend=0.0, seed=0):
+    rng = np.random.default_rng(seed)
+    noise = np.empty(n)
+    noise[0] = rng.normal()
+    for t in range(1, n):
+        noise[t] = phi * noise[t - 1] + rng.normal()
+    return noise + trend * np.arange(n)
+
+
+def _naive_sen(times, values):
+    slopes = [(values[j] - values[i]) / (times[j] - times[i])
+              for i in range(len(values)) for j in range(i + 1, len(values))
+              if times[j] != times[i]]
+    return float(np.median(slopes))
+
+
+def _naive_s_var(values):
+    n = len(values)
+    s = sum(np.sign(values[j] - values[i]) for i in range(n) for j in range(i + 1, n))
+    ties = [np.sum(values == v) for v in np.unique(values)]
+    var_s = (n * (n - 1) * (2 * n + 5) - sum(t * (t - 1) * (2 * t + 5) for t in ties)) / 18
+    return s, var_s
+
+
+def _naive_acf(x, lag):
+    x = x - x.mean()
+    return np.sum(x[:-lag] * x[lag:]) / np.sum(x * x)
+
+
+def _naive_correction(values, alpha=0.05):
+    """n/n* de Hamed & Rao (1998), éq. 18, sur les rangs de la série sans tendance"""
+    n = len(values)
+    slope = _naive_sen(np.arange(n), values)
+    ranks = rankdata(values - slope * np.arange(1, n + 1))
+    interval = norm.ppf(1 - alpha / 2) / np.sqrt(n)
+    total = 0.0
+    for k in range(1, n - 1):
+        r = _naive_acf(ranks, k)
+        if abs(r) > interval:
+            total += (n - k) * (n - k - 1) * (n - k - 2) * r
+    return 1 + 2 * total / (n * (n - 1) * (n - 2))
+
+
+@pytest.mark.parametrize('n, phi', [(40, 0.0), (60, 0.6), (300, 0.7)])
+def test_hamed_rao_matches_naive_reference(n, phi):
+    values = _ar1(n, phi, trend=0.01, seed=n)
+    result = hamed_rao_mann_kendall(values)
+
+    s, var_s = _naive_s_var(values)
+    correction = _naive_correction(values)
+    assert result['s'] == s
+    # Variance d'origine (ex-aequo compris) × correction par l'autocorrélation
+    assert result['var_s'] / result['correction_factor'] == pytest.approx(var_s)
+    assert result['correction_factor'] == pytest.approx(correction)
+    assert result['var_s'] == pytest.approx(var_s * correction)
+
+    z = (s - np.sign(s)) / np.sqrt(var_s * correction)
+    assert result['z'] == pytest.approx(z)
+    assert result['p_value'] == pytest.approx(2 * norm.sf(abs(z)))
+
+    reference = mk.hamed_rao_modification_test(values)
+    assert result['var_s'] == pytest.approx(reference.var_s)
+    assert result['trend'] == reference.trend
+
+
+def test_hamed_rao_inflates_variance_of_ar1_series():
+    values = _ar1(200, 0.8, seed=1)
+    # Décalages courts seulement : les grands décalages des rangs sont bruités
+    result = hamed_rao_mann_kendall(values, max_lag=10)
+    _, var_s = _naive_s_var(values)
+    assert result['correction_factor'] > 1.5
+    assert result['var_s'] > var_s
+    assert result['significant_lags'][:3] == [1, 2, 3]
+    assert max(result['significant_lags']) <= 10
+
+
+def test_hamed_rao_with_ties():
+    values = np.round(_ar1(80, 0.4, trend=0.02, seed=3), 0)
+    result = hamed_rao_mann_kendall(values)
+    s, var_s = _naive_s_var(values)
+    assert result['s'] == s
+    assert result['var_s'] == pytest.approx(var_s * _naive_correction(values))
+
+
+@pytest.mark.parametrize('n', [25, 250])
+def test_tfpw_matches_naive_reference(n):
+    rng = np.random.default_rng(n)
+    times = np.sort(rng.choice(np.arange(3 * n), n, replace=False)).astype(float)
+    times[5] = times[4]  # Deux observations au même instant : paire sans pente
+    values = _ar1(n, 0.5, seed=n) + 0.02 * times
+
+    series, rho, slope = trend_free_prewhiten(values, times)
+
+    expected_slope = _naive_sen(times, values)
+    detrended = values - expected_slope * times
+    expected_rho = _naive_acf(detrended, 1)
+    expected = detrended[1:] - expected_rho * detrended[:-1] + expected_slope * times[1:]
+
+    assert slope == pytest.approx(expected_slope)
+    assert rho == pytest.approx(expected_rho)
+    np.testing.assert_allclose(series, expected)
+
+
+def test_tfpw_default_times_are_indices():
+    values = _ar1(50, 0.3, trend=0.05, seed=4)
+    series, rho, slope = trend_free_prewhiten(values)
+    assert slope == pytest.approx(_naive_sen(np.arange(50), values))
+    assert len(series) == 49
+    # Séries trop courtes renvoyées telles quelles
+    short = np.array([1.0, 2.0])
+    np.testing.assert_array_equal(trend_free_prewhiten(short)[0], short)
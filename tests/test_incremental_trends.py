@@ -0,0 +1,81 @@
+"""
+État incrémental : S, variance et pente de Sen égaux à un recalcul complet
+"""
+
+import numpy as np
+import pymannkendall as mk
+import pytest
+from scipy.stats import theilslopes
+
+from analysis.incremental_trends import IncrementalTrendState
+
+
+def _series(n, seed, decimals=3):
+    rng = np.random.default_rng(seed)
+    times = np.sort(np.round(rng.uniform(2010, 2024, n), 1))  # Temps répétés
+    values = np.round(rng.normal(0.5, 0.1, n) + 0.002 * (times - 2010), decimals)
+    return times, values
+
+
+def _naive_s_var(values):
+    n = len(values)
+    s = sum(np.sign(values[j] - values[i]) for i in range(n) for j in range(i + 1, n))
+    _, ties = np.unique(values, return_counts=True)
+    return s, (n * (n - 1) * (2 * n + 5) - np.sum(ties * (ties - 1) * (2 * ties + 5))) / 18
+
+
+def _assert_matches_full(state, times, values):
+    s, var_s = _naive_s_var(values)
+    assert state.n == len(values)
+    assert state.s == s
+    assert state.variance_s() == pytest.approx(var_s)
+
+    reference = mk.original_test(values)
+    result = state.mann_kendall()
+    assert result['z'] == pytest.approx(reference.z)
+    assert result['p_value'] == pytest.approx(reference.p)
+    assert result['trend'] == reference.trend
+
+    slope, intercept, low, high = theilslopes(values, times, 0.95)
+    sen = state.sen_slope()
+    assert sen['slope'] == pytest.approx(slope)
+    assert sen['intercept'] == pytest.approx(intercept)
+    assert sen['confidence_interval']['low'] == pytest.approx(low)
+    assert sen['confidence_interval']['high'] == pytest.approx(high)
+
+
+@pytest.mark.parametrize('decimals', [2, 4])
+def test_each_appended_point_matches_recompute(decimals):
+    times, values = _series(60, seed=decimals, decimals=decimals)
+    state = IncrementalTrendState.from_series(times[:3], values[:3])
+
+    for k in range(3, len(values)):
+        state.update(times[k], values[k])
+        _assert_matches_full(state, times[:k + 1], values[:k + 1])
+
+
+def test_batches_and_save_load(tmp_path):
+    times, values = _series(400, seed=9)
+    state = IncrementalTrendState.from_series(times[:50], values[:50])
+
+    k = 50
+    for size in (1, 7, 30, 2, 110, 200):
+        state.update(times[k:k + size], values[k:k + size])
+        k += size
+        # Recharger l'état entre deux lots ne change rien
+        state.save(tmp_path / 'state.npz')
+        state = IncrementalTrendState.load(tmp_path / 'state.npz')
+        _assert_matches_full(state, times[:k], values[:k])
+
+
+def test_nan_ignored_and_older_points_rejected():
+    times, values = _series(30, seed=1)
+    state = IncrementalTrendState.from_series(times[:20], values[:20])
+
+    assert state.update([times[20], times[21]], [np.nan, values[21]]) == 1
+    kept = np.r_[np.arange(20), 21]
+    _assert_matches_full(state, times[kept], values[kept])
+
+    with pytest.raises(ValueError):
+        state.update(times[0] - 1, 0.5)
+    assert state.n == 21
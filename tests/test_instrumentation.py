@@ -0,0 +1,103 @@
+"""
+Instrumentation : spans, compteurs et trace Chrome écrite en fin d'exécution
+"""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from utils import instrumentation
+from utils.instrumentation import count, span, traced
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+@pytest.fixture
+def recording():
+    instrumentation.enable()
+    yield
+    instrumentation.disable()
+    instrumentation.reset()
+
+
+@traced('sen')
+def _slope(values):
+    return values[-1] - values[0]
+
+
+def test_disabled_records_nothing():
+    assert not instrumentation.is_enabled()
+    with span('load'):
+        count('rows_loaded', 10)
+    assert _slope([1, 3]) == 2
+    assert instrumentation.counters() == {}
+    assert instrumentation.summary_table().empty
+
+
+def test_span_written_as_chrome_trace(recording, tmp_path):
+    with span('load', dataset='MOD10A1'):
+        count('rows_loaded', 120)
+        count('rows_loaded', 30)
+    for _ in range(3):
+        _slope([0.5, 0.7])
+
+    path = instrumentation.write_trace(tmp_path / 'traces' / 'run.trace.json')
+    payload = json.loads(Path(path).read_text())
+    assert payload['displayTimeUnit'] == 'ms'
+    assert payload['otherData'] == {'counters': {'rows_loaded': 150}, 'truncated': False}
+
+    events = payload['traceEvents']
+    spans = [e for e in events if e['ph'] == 'X']
+    assert [e['name'] for e in spans] == ['load', 'sen', 'sen', 'sen']
+    load = spans[0]
+    assert load['args'] == {'dataset': 'MOD10A1'}
+    assert load['pid'] == os.getpid()
+    assert load['ts'] >= 0 and load['dur'] >= 0
+    # Compteurs : valeur cumulée à chaque incrément, à l'intérieur du span
+    counter_events = [e for e in events if e['ph'] == 'C']
+    assert [e['args'] for e in counter_events] == [{'rows_loaded': 120}, {'rows_loaded': 150}]
+    assert all(load['ts'] <= e['ts'] <= load['ts'] + load['dur'] for e in counter_events)
+
+    table = instrumentation.summary_table().set_index('span')
+    assert table.loc['sen', 'calls'] == 3 and table.loc['load', 'calls'] == 1
+    assert 'max_memory_kb' not in table.columns
+
+
+def test_finish_run_writes_trace_and_summary(recording, tmp_path):
+    with span('figure'):
+        pass
+    outputs = instrumentation.finish_run(tmp_path, label='unit')
+    trace = json.loads(Path(outputs['trace']).read_text())
+    assert [e['name'] for e in trace['traceEvents']] == ['figure']
+    assert Path(outputs['summary']).read_text().startswith('span,calls,total_s')
+
+
+def _run_traced(code, tmp_path):
+    env = dict(os.environ, ALBEDO_TRACE='1', PYTHONPATH=str(ROOT))
+    return subprocess.run([sys.executable, '-c', code], cwd=tmp_path, env=env,
+                          capture_output=True, text=True, check=True).stdout
+
+
+def test_environment_enabled_run_written_at_exit(tmp_path):
+    stdout = _run_traced("from utils.instrumentation import span\n"
+                         "with span('sync', dataset='MCD43A3'):\n"
+                         "    pass\n", tmp_path)
+    traces = list((tmp_path / 'output' / 'traces').glob('run_*.trace.json'))
+    assert len(traces) == 1
+    events = json.loads(traces[0].read_text())['traceEvents']
+    assert [(e['name'], e['args']) for e in events] == [('sync', {'dataset': 'MCD43A3'})]
+    assert stdout.count('Instrumentation summary') == 1
+
+
+def test_explicit_finish_not_repeated_at_exit(tmp_path):
+    stdout = _run_traced("from utils import instrumentation\n"
+                         "with instrumentation.span('sync'):\n"
+                         "    pass\n"
+                         "instrumentation.finish_run(label='script')\n", tmp_path)
+    assert stdout.count('Instrumentation summary') == 1
+    assert not list((tmp_path / 'output' / 'traces').glob('run_*'))
+    assert len(list((tmp_path / 'output' / 'traces').glob('script_*.trace.json'))) == 1
@@ -0,0 +1,95 @@
+"""
+File de jobs : lignes orphelines et réutilisation du cache
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+from data import shared_store
+from utils.jobs import (JobRunner, JobStore, STATUS_COMPLETED, STATUS_FAILED, STATUS_QUEUED,
+                        STATUS_RUNNING, input_hash)
+
+FUNC = 'math:factorial'
+
+
+@pytest.fixture
+def job_dir(tmp_path, monkeypatch):
+    # JobRunner active le store partagé via l'environnement : restauré après le test
+    monkeypatch.delenv(shared_store.ENABLE_ENV, raising=False)
+    return tmp_path / 'jobs'
+
+
+def _dead_pid():
+    process = subprocess.Popen([sys.executable, '-c', 'pass'])
+    process.wait()
+    return process.pid
+
+
+def _stale_job(job_dir, job_id, status, pid):
+    """Ligne laissée par un processus arrêté pendant le job"""
+    store = JobStore(job_dir / 'jobs.db')
+    store.insert(job_id, 'factorial', FUNC, input_hash(FUNC, (5,)))
+    store.update(job_id, status=status, owner_pid=pid)
+    store.close()
+
+
+def test_orphaned_rows_failed_on_startup(job_dir):
+    _stale_job(job_dir, 'crashed', STATUS_RUNNING, _dead_pid())
+    _stale_job(job_dir, 'legacy', STATUS_QUEUED, None)
+
+    runner = JobRunner(job_dir, max_workers=1)
+    try:
+        for job_id in ('crashed', 'legacy'):
+            job = runner.status(job_id)
+            assert job['status'] == STATUS_FAILED
+            assert 'owner process exited' in job['error']
+
+        job_id = runner.submit(FUNC, 5)
+        assert job_id not in ('crashed', 'legacy')
+        assert runner.result(job_id, timeout=60) == 120
+    finally:
+        runner.shutdown()
+
+
+def test_live_owner_rows_kept_but_not_reused(job_dir):
+    # Job d'un autre processus vivant (ici le nôtre) : pas touché, pas réutilisé
+    _stale_job(job_dir, 'elsewhere', STATUS_RUNNING, os.getpid())
+
+    runner = JobRunner(job_dir, max_workers=1)
+    try:
+        assert runner.status('elsewhere')['status'] == STATUS_RUNNING
+        job_id = runner.submit(FUNC, 5)
+        assert job_id != 'elsewhere'
+        assert runner.result(job_id, timeout=60) == 120
+    finally:
+        runner.shutdown()
+
+
+def test_completed_job_reused(job_dir):
+    runner = JobRunner(job_dir, max_workers=1)
+    try:
+        first = runner.submit(FUNC, 6)
+        assert runner.result(first, timeout=60) == 720
+        assert runner.status(first)['status'] == STATUS_COMPLETED
+        assert runner.submit(FUNC, 6) == first
+        assert runner.submit(FUNC, 6, use_cache=False) != first
+    finally:
+        runner.shutdown()
+
+
+def test_input_token_part_of_cache_key(job_dir):
+    assert input_hash(FUNC, (6,)) == input_hash(FUNC, (6,), input_token=None)
+    assert input_hash(FUNC, (6,), input_token='v1') != input_hash(FUNC, (6,), input_token='v2')
+
+    runner = JobRunner(job_dir, max_workers=1)
+    try:
+        first = runner.submit(FUNC, 6, input_token='v1')
+        assert runner.result(first, timeout=60) == 720
+        assert runner.submit(FUNC, 6, input_token='v1') == first
+        # Nouvelles données en base : le résultat en cache n'est plus réutilisé
+        assert runner.submit(FUNC, 6, input_token='v2') != first
+    finally:
+        runner.shutdown()
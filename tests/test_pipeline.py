@@ -0,0 +1,166 @@
+"""
+Pipeline d'étapes : clés de cache, étapes en cache sautées, échecs propagés
+"""
+
+import pandas as pd
+import pytest
+
+from utils.pipeline import (STAGE_CACHED, STAGE_FAILED, STAGE_RAN, STAGE_SKIPPED, Pipeline,
+                            Stage)
+
+CALLS = []
+STAMP = {'MCD43A3': 'v1'}
+
+
+def load(inputs, dataset):
+    CALLS.append('load')
+    return [1.0, 2.0, 3.0]
+
+
+def trends(inputs, scale=1):
+    CALLS.append('trends')
+    return sum(inputs['load']) * scale
+
+
+def bootstrap(inputs):
+    CALLS.append('bootstrap')
+    return len(inputs['load'])
+
+
+def report(inputs):
+    CALLS.append('report')
+    return {'trends': inputs['trends'], 'bootstrap': inputs['bootstrap']}
+
+
+def broken(inputs):
+    CALLS.append('broken')
+    raise RuntimeError('no data')
+
+
+def _pipeline(cache_dir, scale=1, version=1, failing_bootstrap=False):
+    pipeline = Pipeline(cache_dir, max_workers=2)
+    pipeline.add(Stage('load', load, params={'dataset': 'MCD43A3'},
+                       fingerprint=lambda: STAMP['MCD43A3']))
+    pipeline.add(Stage('trends', trends, ('load',), params={'scale': scale}, version=version))
+    pipeline.add(Stage('bootstrap', broken if failing_bootstrap else bootstrap, ('load',)))
+    pipeline.add(Stage('report', report, ('trends', 'bootstrap')))
+    return pipeline
+
+
+@pytest.fixture(autouse=True)
+def reset():
+    CALLS.clear()
+    STAMP['MCD43A3'] = 'v1'
+
+
+def test_second_run_uses_cache(tmp_path):
+    first = _pipeline(tmp_path).run()
+    assert first.ok and first.count(STAGE_RAN) == 4
+    assert first.outputs['report'] == {'trends': 6.0, 'bootstrap': 3}
+
+    CALLS.clear()
+    second = _pipeline(tmp_path).run()
+    # Cible en cache : rien ne tourne, même pas les étapes amont
+    assert CALLS == []
+    assert second.runs['report'].status == STAGE_CACHED
+    assert set(second.runs) == {'report'}
+    assert second.outputs['report'] == first.outputs['report']
+
+
+def test_keys_change_with_inputs(tmp_path):
+    base = _pipeline(tmp_path).stage_keys()
+    assert _pipeline(tmp_path).stage_keys() == base
+
+    changed = _pipeline(tmp_path, scale=2).stage_keys()
+    assert changed['load'] == base['load'] and changed['bootstrap'] == base['bootstrap']
+    assert changed['trends'] != base['trends'] and changed['report'] != base['report']
+
+    assert _pipeline(tmp_path, version=2).stage_keys()['trends'] != base['trends']
+
+    STAMP['MCD43A3'] = 'v2'
+    # Nouvelle fraîcheur des données : toute la chaîne est invalidée
+    assert all(key != base[name] for name, key in _pipeline(tmp_path).stage_keys().items())
+
+
+def test_only_invalidated_stages_rerun(tmp_path):
+    _pipeline(tmp_path).run()
+
+    CALLS.clear()
+    report = _pipeline(tmp_path, scale=2).run()
+    # trends recalculé à partir de load en cache ; bootstrap réutilisé
+    assert sorted(CALLS) == ['report', 'trends']
+    assert report.runs['load'].status == STAGE_CACHED
+    assert report.runs['bootstrap'].status == STAGE_CACHED
+    assert report.outputs['report'] == {'trends': 12.0, 'bootstrap': 3}
+
+    CALLS.clear()
+    STAMP['MCD43A3'] = 'v2'
+    assert _pipeline(tmp_path, scale=2).run().count(STAGE_RAN) == 4
+    assert sorted(CALLS) == ['bootstrap', 'load', 'report', 'trends']
+
+
+def test_failed_stage_skips_dependents(tmp_path):
+    result = _pipeline(tmp_path, failing_bootstrap=True).run()
+    assert not result.ok
+    assert result.runs['bootstrap'].status == STAGE_FAILED
+    assert 'RuntimeError: no data' in result.runs['bootstrap'].error
+    assert result.runs['trends'].status == STAGE_RAN
+    assert result.runs['report'].status == STAGE_SKIPPED
+    assert 'report' not in CALLS and 'report' not in result.outputs
+
+    # L'échec n'est pas mis en cache : la réparation relance l'étape
+    CALLS.clear()
+    fixed = _pipeline(tmp_path).run()
+    assert fixed.ok
+    assert sorted(CALLS) == ['bootstrap', 'report']
+
+
+def test_produced_files_must_exist(tmp_path):
+    figure = tmp_path / 'figure.png'
+
+    def draw(inputs):
+        CALLS.append('draw')
+        figure.write_bytes(b'png')
+        return [str(figure)]
+
+    def pipeline():
+        graph = Pipeline(tmp_path / 'cache')
+        graph.add(Stage('figures', draw, produces_files=True))
+        return graph
+
+    pipeline().run()
+    pipeline().run()
+    assert CALLS == ['draw']
+    figure.unlink()
+    assert pipeline().run().runs['figures'].status == STAGE_RAN
+    assert CALLS == ['draw', 'draw']
+
+
+def test_graph_validation(tmp_path):
+    pipeline = Pipeline(tmp_path)
+    pipeline.add(Stage('load', load))
+    with pytest.raises(ValueError):
+        pipeline.add(Stage('load', load))
+    with pytest.raises(ValueError):
+        pipeline.add(Stage('trends', trends, ('missing',)))
+
+
+def test_qa_stage_returns_qa_table(monkeypatch):
+    from analysis import pixel_analysis
+    from data import zip_source
+    from scripts import run_pipeline
+
+    table = pd.DataFrame({'year': [2020], 'quality_0_best': [10.0]})
+
+    class QAAnalyzer:
+        def __init__(self, data, qa_csv_path):
+            self.qa_csv_path = qa_csv_path
+
+        def analyze_true_qa_statistics(self):
+            return {'qa_dataframe': table, 'seasonal_summary': {}}
+
+    monkeypatch.setattr(pixel_analysis, 'PixelCountAnalyzer', QAAnalyzer)
+    monkeypatch.setattr(zip_source, 'csv_source_exists', lambda path: True)
+    monkeypatch.setattr(run_pipeline, '_qa_csv_path', lambda dataset: 'qa.csv')
+    result = run_pipeline.qa_stage({'MCD43A3:load': object()}, 'MCD43A3')
+    assert result['summary_table'] is table
@@ -0,0 +1,60 @@
+"""
+Rapport statistique : chaque requête et l'empreinte sont limitées à une région
+"""
+
+import re
+import sys
+import types
+
+import pandas as pd
+import pytest
+
+from config import DEFAULT_REGION
+from scripts import quick_stats_report as report
+
+
+class RecordingConnection:
+    """Connexion qui renvoie un tableau vide et note les paramètres de chaque requête"""
+
+    def __init__(self):
+        self.calls = []
+
+    def execute_query(self, query, params=None):
+        self.calls.append((query, params))
+        return pd.DataFrame({'source': ['mcd43a3_measurements'], 'n_rows': [len(self.calls)]})
+
+
+@pytest.fixture
+def connection(monkeypatch):
+    conn = RecordingConnection()
+    module = types.ModuleType('database.connection')
+    module.get_connection = lambda: conn
+    monkeypatch.setitem(sys.modules, 'database.connection', module)
+    return conn
+
+
+@pytest.mark.parametrize('name', [*report.REPORT_QUERIES, 'fingerprint'])
+def test_every_table_read_is_region_filtered(name):
+    sql = report.FINGERPRINT_QUERY if name == 'fingerprint' else report.REPORT_QUERIES[name]
+    # Chaque lecture d'une table albedo.* est suivie de son filtre de région
+    reads = re.findall(r'FROM albedo\.\w+\s+WHERE region = %\(region\)s', sql)
+    assert len(reads) == sql.count('FROM albedo.') > 0
+
+
+def test_queries_run_with_region_parameter(connection):
+    tables = report.run_queries(report.REPORT_QUERIES, max_workers=2, region='athabasca')
+    assert set(tables) == set(report.REPORT_QUERIES)
+    assert [params for _, params in connection.calls] == \
+        [{'region': 'athabasca'}] * len(report.REPORT_QUERIES)
+
+    report.run_queries({'overview': report.REPORT_QUERIES['dataset_overview']})
+    assert connection.calls[-1][1] == {'region': DEFAULT_REGION}
+
+
+def test_fingerprint_differs_between_regions(connection):
+    # Même état des tables pour les deux régions : la région fait partie de la clé
+    connection.execute_query = lambda query, params=None: pd.DataFrame(
+        {'source': ['mcd43a3_measurements'], 'n_rows': [100]})
+    saskatchewan = report.database_fingerprint()
+    assert saskatchewan == report.database_fingerprint(DEFAULT_REGION)
+    assert report.database_fingerprint('athabasca') != saskatchewan
@@ -0,0 +1,115 @@
+"""
+Cube régional : deux glaciers synthétiques, aucune donnée mélangée entre régions
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from analysis.regional import run_regional_batch
+from config import FRACTION_CLASSES
+from data.region_cube import RegionCube
+
+# Tendances opposées : une région mélangée à l'autre n'aurait plus de tendance nette
+REGIONS = {'north': 0.004, 'south': -0.004}
+
+
+class LoadedHandler:
+    def __init__(self, data):
+        self.data = data
+
+
+def _frame(region, dataset, seed):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('2012-06-01', '2021-09-30', freq='3D')
+    dates = dates[dates.month.isin([6, 7, 8, 9])]
+    # Jours propres à chaque région et produit : l'axe commun est une union
+    dates = dates[rng.random(len(dates)) < 0.8]
+    decimal_year = (dates.year + (dates.dayofyear - 1) / 365.25).to_numpy()
+    frame = pd.DataFrame({'date': dates, 'decimal_year': decimal_year})
+    for k, fraction in enumerate(FRACTION_CLASSES):
+        values = (0.4 + 0.05 * k + REGIONS[region] * (decimal_year - 2012)
+                  + rng.normal(0, 0.01, len(dates)))
+        values[rng.random(len(dates)) < 0.1] = np.nan
+        frame[f'{fraction}_mean'] = values
+    frame['pure_ice_median'] = -1.0  # Autre variable : hors du cube
+    return frame
+
+
+@pytest.fixture(scope='module')
+def frames():
+    return {dataset: {region: _frame(region, dataset, seed=10 * i + j)
+                      for j, region in enumerate(REGIONS)}
+            for i, dataset in enumerate(('MCD43A3', 'MOD10A1'))}
+
+
+@pytest.fixture(scope='module')
+def cubes(frames):
+    return {dataset: RegionCube.from_handlers({r: LoadedHandler(f) for r, f in by_region.items()},
+                                              dataset)
+            for dataset, by_region in frames.items()}
+
+
+def test_from_handlers_keeps_each_region_on_its_own_days(frames, cubes):
+    cube, by_region = cubes['MCD43A3'], frames['MCD43A3']
+    union = pd.DatetimeIndex(sorted(set(by_region['north']['date']) | set(by_region['south']['date'])))
+    assert cube.regions == ['north', 'south']
+    assert cube.shape == (2, len(union), len(FRACTION_CLASSES))
+    assert cube.dates.equals(union)
+
+    for i, (region, frame) in enumerate(by_region.items()):
+        rows = cube.dates.get_indexer(frame['date'])
+        expected = frame[[f'{f}_mean' for f in FRACTION_CLASSES]].to_numpy()
+        np.testing.assert_array_equal(cube.values[i, rows], expected)
+        # Jours de l'autre région seulement : aucune valeur
+        others = np.setdiff1d(np.arange(len(union)), rows)
+        assert len(others) and np.isnan(cube.values[i, others]).all()
+
+    counts = cube.observation_counts()
+    for region, frame in by_region.items():
+        assert counts.loc[region].tolist() == [frame[f'{f}_mean'].notna().sum()
+                                               for f in FRACTION_CLASSES]
+
+
+def test_region_frame_round_trip(frames, cubes):
+    for region, frame in frames['MOD10A1'].items():
+        sliced = cubes['MOD10A1'].region_frame(region)
+        columns = ['date', 'decimal_year'] + [f'{f}_mean' for f in FRACTION_CLASSES]
+        expected = frame[columns]
+        expected = expected[expected.iloc[:, 2:].notna().any(axis=1)].reset_index(drop=True)
+        pd.testing.assert_frame_equal(sliced, expected, check_freq=False)
+
+        handler = cubes['MOD10A1'].region_handler(region)
+        assert handler.region == region and handler.dataset_type == 'MOD10A1'
+        pure_ice = handler.get_fraction_data('pure_ice')
+        assert len(pure_ice) == frame['pure_ice_mean'].notna().sum()
+
+    with pytest.raises(ValueError):
+        cubes['MOD10A1'].region_frame('athabasca')
+
+
+def test_regional_batch_partitions_results(frames, cubes, tmp_path):
+    output = run_regional_batch(['north', 'south'], variable='mean', max_workers=2,
+                                output_dir=tmp_path, cubes=cubes)
+    assert output['errors'] == {}
+
+    trends = output['trends']
+    assert len(trends) == 2 * 2 * len(FRACTION_CLASSES)
+    for (region, dataset), table in trends.groupby(['region', 'dataset']):
+        frame = frames[dataset][region]
+        assert table['N_obs'].tolist() == [frame[f'{f}_mean'].notna().sum()
+                                           for f in FRACTION_CLASSES]
+        expected = 'increasing' if REGIONS[region] > 0 else 'decreasing'
+        assert (table['Tendance'] == expected).all()
+        assert (np.sign(table['Pente_Sen_decade']) == np.sign(REGIONS[region])).all()
+
+    comparison = output['comparison']
+    for region, table in comparison.groupby('region'):
+        common = set(frames['MCD43A3'][region]['date']) & set(frames['MOD10A1'][region]['date'])
+        assert (table['merged_observations'] == len(common)).all()
+    assert sorted(comparison['region'].unique()) == ['north', 'south']
+
+    north = pd.read_csv(tmp_path / 'north' / 'mcd43a3_trends_mean.csv')
+    assert (north['region'] == 'north').all()
+    assert (tmp_path / 'south' / 'comparison_mean.csv').exists()
+    assert len(pd.read_csv(tmp_path / 'regional_trends_mean.csv')) == len(trends)
@@ -0,0 +1,123 @@
+"""
+Registre des handlers : sondes, chargement unique et rechargement si la source change
+"""
+
+import threading
+import time
+
+import pytest
+
+from data import registry
+from data.registry import DatasetProbe, HandlerRegistry, load_concurrently
+
+
+class Source:
+    """Source simulée : tampon de fraîcheur modifiable, compteurs d'accès"""
+
+    def __init__(self, stamp='v1'):
+        self.stamp = stamp
+        self.probes = 0
+        self.loads = 0
+        self.fail_probe = False
+
+
+class FakeHandler:
+    def __init__(self, name, source):
+        self.name = name
+        self.source = source
+
+    def probe(self):
+        self.source.probes += 1
+        if self.source.fail_probe:
+            raise ConnectionError('source unreachable')
+        return DatasetProbe(self.name, 'test', 10, '2010-06-01', '2024-09-30',
+                            ['date', 'pure_ice_mean'], self.source.stamp)
+
+    def load_data(self):
+        time.sleep(0.01)  # Laisse les autres threads arriver pendant le chargement
+        self.source.loads += 1
+        self.data = f'{self.name}@{self.source.stamp}'
+        return self
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    monkeypatch.delenv('ALBEDO_SHARED_DATA', raising=False)
+    sources = {'MCD43A3': Source(), 'MOD10A1': Source()}
+    monkeypatch.setattr(registry, 'create_handler',
+                        lambda name, region=None: FakeHandler(name, sources[name]))
+    return sources
+
+
+def test_probe_cached_unless_refreshed(sources):
+    handlers = HandlerRegistry()
+    probe = handlers.probe('MCD43A3')
+    assert probe.available and probe.freshness == 'v1'
+    assert handlers.probe('MCD43A3') is probe
+    assert sources['MCD43A3'].probes == 1
+    assert sources['MCD43A3'].loads == 0  # Sonder ne charge pas
+
+    sources['MCD43A3'].stamp = 'v2'
+    assert handlers.probe('MCD43A3').freshness == 'v1'
+    assert handlers.probe('MCD43A3', refresh=True).freshness == 'v2'
+
+
+def test_get_handler_loads_once(sources):
+    handlers = HandlerRegistry()
+    first = handlers.get_handler('MCD43A3')
+    assert handlers.get_handler('MCD43A3') is first
+    assert handlers.is_loaded('MCD43A3') and not handlers.is_loaded('MOD10A1')
+    assert sources['MCD43A3'].loads == 1
+
+    # Plusieurs threads : un seul chargement
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(handlers.get_handler('MOD10A1')))
+               for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert sources['MOD10A1'].loads == 1
+    assert all(result is results[0] for result in results)
+
+
+def test_get_handler_reloads_when_freshness_changes(sources):
+    handlers = HandlerRegistry()
+    first = handlers.get_handler('MCD43A3')
+    assert first.data == 'MCD43A3@v1'
+
+    sources['MCD43A3'].stamp = 'v2'
+    second = handlers.get_handler('MCD43A3')
+    assert second is not first
+    assert second.data == 'MCD43A3@v2'
+    assert sources['MCD43A3'].loads == 2
+    assert handlers.get_handler('MCD43A3') is second
+
+
+def test_unprobeable_source_keeps_loaded_handler(sources):
+    handlers = HandlerRegistry()
+    first = handlers.get_handler('MCD43A3')
+    sources['MCD43A3'].fail_probe = True
+    assert handlers.get_handler('MCD43A3') is first
+    assert sources['MCD43A3'].loads == 1
+
+
+def test_invalidate_and_get_handlers(sources):
+    handlers = HandlerRegistry()
+    loaded = handlers.get_handlers(['MCD43A3', 'MOD10A1', 'MCD43A3'])
+    assert set(loaded) == {'MCD43A3', 'MOD10A1'}
+    assert [s.loads for s in sources.values()] == [1, 1]
+
+    handlers.invalidate('MCD43A3')
+    assert not handlers.is_loaded('MCD43A3') and handlers.is_loaded('MOD10A1')
+    handlers.invalidate()
+    assert not handlers.is_loaded('MOD10A1')
+
+
+def test_load_concurrently_captures_errors():
+    def broken():
+        raise ValueError('bad csv')
+
+    loads = load_concurrently({'ok': lambda: 42, 'broken': broken})
+    assert loads['ok'].result == 42 and loads['ok'].error is None
+    assert isinstance(loads['broken'].error, ValueError)
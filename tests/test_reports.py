@@ -0,0 +1,99 @@
+"""
+Rapports : rendu Markdown/HTML d'un petit tableau et cache des entrées
+"""
+
+import base64
+import re
+
+import pandas as pd
+import pytest
+
+from utils.reports import ReportAssets, ReportCache, check_docx, fingerprint, render_report
+
+
+@pytest.fixture
+def assets():
+    frame = pd.DataFrame({'fraction': ['pure_ice', 'mostly_ice'],
+                          'n': [120, 95],
+                          'mean': [0.51234567, None],
+                          'note': ['a|b', '<ok>']})
+    assets = ReportAssets()
+    assets.add_table('summary', frame)
+    assets.add_figure('series', lambda ax, y: ax.plot(y), [0.5, 0.6, 0.55], figsize=(3, 2), dpi=50)
+    return assets
+
+
+def _blocks():
+    return [('heading', 'Albédo & tendances', 1),
+            ('paragraph', 'Saison 2010-2024'),
+            ('table', 'summary'),
+            ('figure', 'series', 'Série quotidienne')]
+
+
+def test_table_formatted_once(assets):
+    table = assets.tables['summary']
+    assert table['columns'] == ['fraction', 'n', 'mean', 'note']
+    assert table['rows'] == [['pure_ice', '120', '0.5123', 'a|b'],
+                             ['mostly_ice', '95', '', '<ok>']]
+    assert assets.figures['series'].startswith(b'\x89PNG')
+
+
+def test_markdown_and_html_content(assets, tmp_path):
+    outputs = render_report('Rapport test', _blocks(), assets, tmp_path / 'out' / 'report',
+                            formats=('markdown', 'html'))
+    assert set(outputs) == {'markdown', 'html'}
+
+    markdown = (tmp_path / 'out' / 'report.md').read_text(encoding='utf-8')
+    assert markdown.startswith('# Albédo & tendances\n\nSaison 2010-2024\n\n')
+    assert '| fraction | n | mean | note |\n|---|---|---|---|\n' in markdown
+    assert '| pure_ice | 120 | 0.5123 | a\\|b |' in markdown
+    assert '| mostly_ice | 95 |  | <ok> |' in markdown
+    assert '![Série quotidienne](report_files/series.png)' in markdown
+    png = (tmp_path / 'out' / 'report_files' / 'series.png').read_bytes()
+    assert png == assets.figures['series']
+
+    page = (tmp_path / 'out' / 'report.html').read_text(encoding='utf-8')
+    assert '<title>Rapport test</title>' in page
+    assert '<h1>Albédo &amp; tendances</h1>' in page
+    assert '<th>fraction</th><th>n</th><th>mean</th><th>note</th>' in page
+    assert '<td>mostly_ice</td><td>95</td><td></td><td>&lt;ok&gt;</td>' in page
+    assert '<figcaption>Série quotidienne</figcaption>' in page
+    # Figure embarquée : mêmes octets que l'asset
+    encoded = re.search(r"base64,([A-Za-z0-9+/=]+)'", page).group(1)
+    assert base64.b64decode(encoded) == assets.figures['series']
+    assert page.rstrip().endswith('</body></html>')
+
+
+def test_docx_skipped_without_python_docx(assets, tmp_path):
+    if check_docx():
+        pytest.skip('python-docx installé')
+    outputs = render_report('Rapport', _blocks(), assets, tmp_path / 'report', formats=('docx', 'html'))
+    assert list(outputs) == ['html']
+    assert not (tmp_path / 'report.docx').exists()
+
+
+def test_unknown_format_rejected(assets, tmp_path):
+    with pytest.raises(ValueError):
+        render_report('Rapport', _blocks(), assets, tmp_path / 'report', formats=('markdown', 'pdf'))
+    # Validé avant toute écriture
+    assert not (tmp_path / 'report.md').exists()
+
+
+def test_report_cache(tmp_path):
+    key = fingerprint('MCD43A3', {'start': '2010-06-01'}, 42)
+    assert key == fingerprint('MCD43A3', {'start': '2010-06-01'}, 42)
+    assert key != fingerprint('MCD43A3', {'start': '2011-06-01'}, 42)
+
+    cache = ReportCache(tmp_path / 'cache')
+    assert cache.get_tables(key) is None
+    cache.put_tables(key, {'summary': pd.DataFrame({'n': [1, 2]})})
+    assert cache.get_tables(key)['summary']['n'].tolist() == [1, 2]
+
+    report = tmp_path / 'report.md'
+    report.write_text('# ok')
+    cache.put_outputs(key, {'markdown': str(report)})
+    assert cache.get_outputs(key, ('markdown',)) == {'markdown': str(report)}
+    # Format jamais produit ou fichier supprimé : pas de réutilisation
+    assert cache.get_outputs(key, ('markdown', 'html')) is None
+    report.unlink()
+    assert cache.get_outputs(key, ('markdown',)) is None
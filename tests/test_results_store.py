@@ -0,0 +1,56 @@
+"""
+Ordre des exécutions du store de résultats
+"""
+
+import pandas as pd
+import pytest
+
+pytest.importorskip('pyarrow')
+
+from utils import results_store
+from utils.results_store import ResultsStore
+
+
+def _trend(fraction, slope):
+    return {'fraction': fraction, 'variable': 'mean', 'month': 0,
+            'method': 'mann_kendall_sen', 'n_obs': 10, 'slope_per_decade': slope}
+
+
+def test_run_ids_increase_within_a_second():
+    ids = [results_store._new_run_id()[0] for _ in range(200)]
+    assert ids == sorted(ids)
+    assert len(set(ids)) == len(ids)
+
+
+def test_latest_follows_creation_time(tmp_path, monkeypatch):
+    store = ResultsStore(tmp_path / 'store')
+
+    # Identifiants dont l'ordre alphabétique contredit l'ordre de création
+    ids = iter(['20250101T000000-ffffff', '20250101T000000-000000'])
+    times = iter([pd.Timestamp('2025-01-01 00:00:00.1'), pd.Timestamp('2025-01-01 00:00:00.2')])
+    monkeypatch.setattr(results_store, '_new_run_id', lambda: (next(ids), next(times)))
+
+    first = store.new_run('first')
+    store.write('trends', [_trend('pure_ice', -0.1)], first, dataset='MOD10A1')
+    second = store.new_run('second')
+    store.write('trends', [_trend('pure_ice', -0.2)], second, dataset='MOD10A1')
+    assert first > second
+
+    assert store.latest_run_id() == second
+    assert store.latest_run_id('trends', dataset='MOD10A1') == second
+    latest = store.query('trends', dataset='MOD10A1')
+    assert latest['run_id'].tolist() == [second]
+    assert latest['slope_per_decade'].tolist() == [-0.2]
+
+
+def test_latest_rows_per_group(tmp_path):
+    store = ResultsStore(tmp_path / 'store')
+    first = store.new_run()
+    store.write('trends', [_trend('pure_ice', -0.1)], first, dataset='MOD10A1')
+    store.write('trends', [_trend('pure_ice', -0.3)], first, dataset='MCD43A3')
+    second = store.new_run()
+    store.write('trends', [_trend('pure_ice', -0.2)], second, dataset='MOD10A1')
+
+    rows = store.latest_rows(store.query('trends', latest=False), by=['dataset'])
+    by_dataset = dict(zip(rows['dataset'], rows['run_id']))
+    assert by_dataset == {'MOD10A1': second, 'MCD43A3': first}
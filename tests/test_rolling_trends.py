@@ -0,0 +1,111 @@
+"""
+Fenêtres glissantes : chaque fenêtre égale un appel Sen/MK direct
+"""
+
+import numpy as np
+import pandas as pd
+import pymannkendall as mk
+import pytest
+from scipy.stats import theilslopes
+
+from analysis.rolling_trends import RollingTrendScanner, SeasonBlocks
+
+FRACTIONS = ['mostly_ice', 'pure_ice']
+
+
+class FrameHandler:
+    """Interface minimale d'AlbedoDataHandler utilisée par le scanner"""
+
+    def __init__(self, data):
+        self.data = data
+
+    def get_fraction_data(self, fraction, variable='mean', dropna=True):
+        col_name = f"{fraction}_{variable}"
+        if col_name not in self.data.columns:
+            raise ValueError(f"Colonne {col_name} non trouvée")
+        result = self.data[['date', 'decimal_year', col_name]].rename(columns={col_name: 'value'})
+        return result.dropna(subset=['value']) if dropna else result
+
+
+@pytest.fixture
+def data():
+    rng = np.random.default_rng(5)
+    dates = pd.date_range('2010-06-01', '2021-09-30', freq='4D')
+    dates = dates[dates.month.isin([6, 7, 8, 9])]
+    decimal_year = dates.year + (dates.dayofyear - 1) / 365.25
+    frame = pd.DataFrame({'date': dates, 'decimal_year': decimal_year})
+    trend = -0.004 * (decimal_year.to_numpy() - 2010)
+    for fraction in FRACTIONS:
+        for variable in ('mean', 'median'):
+            values = np.round(0.6 + trend + rng.normal(0, 0.03, len(dates)), 3)
+            values[rng.random(len(dates)) < 0.1] = np.nan
+            frame[f'{fraction}_{variable}'] = values
+    return frame
+
+
+def _direct(window):
+    t = window['decimal_year'].to_numpy(dtype=float)
+    v = window['value'].to_numpy(dtype=float)
+    return mk.original_test(v), theilslopes(v, t)[0]
+
+
+def _assert_window(result, window):
+    reference, slope = _direct(window)
+    assert result['n_obs'] == len(window)
+    assert result['s'] == reference.s
+    assert result['tau'] == pytest.approx(reference.Tau)
+    assert result['z'] == pytest.approx(reference.z)
+    assert result['p_value'] == pytest.approx(reference.p)
+    assert result['trend'] == reference.trend
+    assert result['slope'] == pytest.approx(slope)
+    assert result['slope_per_decade'] == pytest.approx(slope * 10)
+
+
+def test_season_blocks_match_direct_calls(data):
+    series = FrameHandler(data).get_fraction_data('pure_ice')
+    years = series['date'].dt.year.to_numpy()
+    blocks = SeasonBlocks(series['decimal_year'].to_numpy(dtype=float),
+                          series['value'].to_numpy(dtype=float), years)
+
+    n_seasons = len(blocks.seasons)
+    for first in range(n_seasons):
+        for last in range(first, n_seasons):
+            window = series[(years >= blocks.seasons[first]) & (years <= blocks.seasons[last])]
+            _assert_window(blocks.window_trend(first, last), window)
+
+
+def test_scanner_windows_match_direct_calls(data):
+    scanner = RollingTrendScanner(FrameHandler(data), FRACTIONS, min_obs=10)
+    results = scanner.scan(window_years=(3, 5), variables=('mean', 'median'))
+
+    # 12 saisons : 10 fenêtres de 3 ans et 8 de 5 ans par fraction et variable
+    assert len(results) == (10 + 8) * len(FRACTIONS) * 2
+    for _, row in results.iterrows():
+        series = FrameHandler(data).get_fraction_data(row['fraction'], row['variable'])
+        years = series['date'].dt.year
+        window = series[(years >= row['start_year']) & (years <= row['end_year'])]
+        assert row['end_year'] - row['start_year'] + 1 == row['window_years']
+        _assert_window(row, window)
+
+    matrix = scanner.to_matrix(results, variable='mean', window_years=5)
+    assert list(matrix.columns) == FRACTIONS
+    assert list(matrix.index) == [f'{y}-{y + 4}' for y in range(2010, 2018)]
+
+
+def test_windows_span_seasons_with_data(data):
+    sparse = data.copy()
+    sparse.loc[sparse['date'].dt.year < 2016, 'pure_ice_mean'] = np.nan
+    sparse.loc[(sparse['date'].dt.year == 2019) & (sparse['date'].dt.month > 6), 'pure_ice_mean'] = np.nan
+    counts = sparse.dropna(subset=['pure_ice_mean'])['date'].dt.year.value_counts().sort_index()
+    min_obs = 70
+    scanner = RollingTrendScanner(FrameHandler(sparse), ['pure_ice'], min_obs=min_obs)
+    results = scanner.scan(window_years=(3,), variables=('mean',))
+
+    # Les saisons sans données ne comptent pas ; fenêtres trop creuses ignorées
+    years = counts.index.tolist()
+    expected = [(years[i], years[i + 2]) for i in range(len(years) - 2)
+                if counts.iloc[i:i + 3].sum() >= min_obs]
+    assert years[0] == 2016
+    assert len(expected) < len(years) - 2
+    assert list(zip(results['start_year'], results['end_year'])) == expected
+    assert (results['n_obs'] >= min_obs).all()
@@ -0,0 +1,111 @@
+"""
+Mann-Kendall saisonnier contre la référence de Hirsch & Slack (1984)
+"""
+
+import numpy as np
+import pymannkendall as mk
+import pytest
+
+from analysis.seasonal import seasonal_kendall
+
+
+def _cube(n_years=14, n_seasons=4, n_series=3, seed=0):
+    rng = np.random.default_rng(seed)
+    trend = np.linspace(0, 1, n_series)[None, None, :] * 0.01 * np.arange(n_years)[:, None, None]
+    seasonal = rng.normal(0.5, 0.05, (1, n_seasons, 1))
+    # Bruit partagé entre saisons d'une même année : covariance non nulle
+    shared = rng.normal(0, 0.03, (n_years, 1, n_series))
+    return np.round(seasonal + trend + shared + rng.normal(0, 0.02, (n_years, n_seasons, n_series)), 3)
+
+
+def _naive_hirsch_slack(x, years):
+    """Boucles directes sur une série (années × saisons), NaN = manquant (signe nul)"""
+    n, n_seasons = x.shape
+
+    def sgn(value):
+        return 0.0 if np.isnan(value) else float(np.sign(value))
+
+    season_s = np.array([sum(sgn(x[j, g] - x[i, g]) for i in range(n) for j in range(i + 1, n))
+                         for g in range(n_seasons)])
+    season_var = np.zeros(n_seasons)
+    for g in range(n_seasons):
+        column = x[~np.isnan(x[:, g]), g]
+        m = len(column)
+        _, ties = np.unique(column, return_counts=True)
+        season_var[g] = (m * (m - 1) * (2 * m + 5) - np.sum(ties * (ties - 1) * (2 * ties + 5))) / 18
+
+    # Éq. 4 : σ_gh = [K_gh + 4 Σ_j R_jg R_jh − n(n+1)²] / 3
+    ranks = np.array([[(n + 1 + sum(sgn(x[j, g] - x[i, g]) for i in range(n))) / 2
+                       for g in range(n_seasons)] for j in range(n)])
+    covariance = np.zeros((n_seasons, n_seasons))
+    for g in range(n_seasons):
+        for h in range(n_seasons):
+            if g == h:
+                covariance[g, h] = season_var[g]
+                continue
+            k = sum(sgn(x[j, g] - x[i, g]) * sgn(x[j, h] - x[i, h])
+                    for i in range(n) for j in range(i + 1, n))
+            covariance[g, h] = (k + 4 * np.sum(ranks[:, g] * ranks[:, h]) - n * (n + 1) ** 2) / 3
+
+    slopes = [(x[j, g] - x[i, g]) / (years[j] - years[i])
+              for g in range(n_seasons) for i in range(n) for j in range(i + 1, n)
+              if not (np.isnan(x[i, g]) or np.isnan(x[j, g]))]
+    return season_s, season_var, covariance, float(np.median(slopes))
+
+
+def _assert_matches_naive(result, cube, years):
+    for k in range(cube.shape[2]):
+        season_s, season_var, covariance, slope = _naive_hirsch_slack(cube[:, :, k], years)
+        np.testing.assert_array_equal(result['season_s'][:, k], season_s)
+        np.testing.assert_allclose(result['season_var'][:, k], season_var)
+        np.testing.assert_allclose(result['covariance'][:, :, k], covariance)
+
+        s, var_s = season_s.sum(), covariance.sum()
+        assert result['s'][k] == s
+        assert result['var_s'][k] == pytest.approx(var_s)
+        z = (s - np.sign(s)) / np.sqrt(var_s) if var_s > 0 else 0.0
+        assert result['z'][k] == pytest.approx(z)
+        assert result['slope'][k] == pytest.approx(slope)
+
+
+def test_complete_cube_matches_reference():
+    cube = _cube()
+    years = np.arange(2008, 2008 + cube.shape[0])
+    result = seasonal_kendall(cube, years)
+    _assert_matches_naive(result, cube, years)
+
+    for k in range(cube.shape[2]):
+        # pymannkendall ne corrige pas z pour la continuité : S et var(S) seulement
+        reference = mk.correlated_seasonal_test(cube[:, :, k].ravel(), period=cube.shape[1])
+        assert result['s'][k] == reference.s
+        assert result['var_s'][k] == pytest.approx(reference.var_s)
+        sen = mk.seasonal_sens_slope(cube[:, :, k].ravel(), period=cube.shape[1])
+        assert result['slope'][k] == pytest.approx(sen.slope)
+
+
+def test_missing_values_and_seasons():
+    cube = _cube(seed=1)
+    rng = np.random.default_rng(1)
+    cube[rng.random(cube.shape) < 0.15] = np.nan
+    cube[3:6, 2, 0] = np.nan              # Saison absente plusieurs années
+    cube[:, 1, 1] = np.nan                # Saison jamais observée pour une série
+    years = np.array([2003, 2004, 2005, 2007, 2008, 2009, 2010, 2012,
+                      2013, 2014, 2015, 2016, 2018, 2019], dtype=float)  # Années manquantes
+
+    result = seasonal_kendall(cube, years)
+    _assert_matches_naive(result, cube, years)
+    assert result['season_s'][1, 1] == 0
+    assert result['season_var'][1, 1] == 0
+
+    # Tau : S rapporté aux paires observées uniquement
+    n_obs = (~np.isnan(cube)).sum(axis=0)
+    np.testing.assert_allclose(result['tau'], result['s'] / (n_obs * (n_obs - 1) / 2).sum(axis=0))
+
+
+def test_strong_trend_detected_in_every_series():
+    years = np.arange(2005, 2025)
+    cube = 0.7 - 0.01 * (years - 2005)[:, None, None] + np.zeros((1, 4, 2))
+    cube += np.random.default_rng(2).normal(0, 0.002, cube.shape)
+    result = seasonal_kendall(cube, years)
+    assert list(result['trend']) == ['decreasing', 'decreasing']
+    np.testing.assert_allclose(result['slope'], -0.01, atol=1e-3)
@@ -0,0 +1,81 @@
+"""
+Parité de utils.sen_slope avec scipy.stats.theilslopes
+"""
+
+import numpy as np
+import pytest
+from scipy.stats import theilslopes
+
+from utils.sen_slope import PairwiseSlopes, count_inversions, sen_slope
+
+
+def _assert_theilslopes_parity(x, y, confidence=0.95):
+    slope, intercept, low, high = sen_slope(x, y, confidence)
+    ref = theilslopes(y, x, confidence)
+    np.testing.assert_allclose([slope, intercept, low, high],
+                               [ref.slope, ref.intercept, ref.low_slope, ref.high_slope],
+                               rtol=1e-12, atol=1e-15)
+
+
+def test_count_inversions_matches_brute_force():
+    rng = np.random.default_rng(0)
+    for n in (1, 2, 7, 64, 129):
+        perm = rng.permutation(n)
+        brute = sum(perm[a] > perm[b] for a in range(n) for b in range(a + 1, n))
+        assert count_inversions(perm) == brute
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_random_series(seed):
+    rng = np.random.default_rng(seed)
+    n = int(rng.integers(3, 400))
+    x = np.sort(rng.uniform(2010, 2025, n))
+    y = 0.6 - 0.002 * (x - 2010) + rng.normal(0, 0.05, n)
+    _assert_theilslopes_parity(x, y, confidence=[0.9, 0.95, 0.99][seed % 3])
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_quantized_values(seed):
+    # Albédo arrondi à 0.1 : grands blocs de pentes nulles autour des rangs cherchés
+    rng = np.random.default_rng(seed)
+    n = 600
+    x = np.arange(n) / 10 + 2010 if seed % 2 else np.arange(n, dtype=float)
+    y = np.round(0.6 + 0.001 * np.arange(n) * (seed % 3 - 1) + rng.normal(0, 0.05, n), 1)
+    _assert_theilslopes_parity(x, y)
+
+
+@pytest.mark.parametrize('seed', range(4))
+def test_duplicate_times(seed):
+    # Plusieurs observations par date (et rééchantillonnage bootstrap)
+    rng = np.random.default_rng(seed)
+    x = np.repeat(np.arange(150, dtype=float), 4)
+    y = np.round(rng.normal(0.5, 0.1, len(x)), 2)
+    _assert_theilslopes_parity(x, y)
+
+    indices = rng.integers(0, len(x), len(x))
+    _assert_theilslopes_parity(x[indices], y[indices])
+
+
+def test_constant_and_binary_series():
+    x = np.arange(3000, dtype=float)
+    _assert_theilslopes_parity(x, np.full(len(x), 0.5))
+    rng = np.random.default_rng(1)
+    _assert_theilslopes_parity(x, rng.integers(0, 2, len(x)).astype(float))
+
+
+def test_select_every_rank_small_set():
+    rng = np.random.default_rng(3)
+    x = np.repeat(np.arange(20, dtype=float), 2)
+    y = np.round(rng.normal(0, 1, len(x)), 0)
+    slopes = PairwiseSlopes(x, y)
+    slopes.max_candidates = 8  # Force la sélection aléatoire
+    i, j = np.triu_indices(len(x), k=1)
+    valid = x[i] != x[j]
+    expected = np.sort((y[j] - y[i])[valid] / (x[j] - x[i])[valid])
+    assert slopes.size == len(expected)
+    assert [slopes.select(rank) for rank in range(slopes.size)] == list(expected)
+
+
+def test_all_times_equal():
+    with pytest.raises(ValueError):
+        sen_slope(np.zeros(5), np.arange(5.0))
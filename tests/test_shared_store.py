@@ -0,0 +1,184 @@
+"""
+Store partagé : aller-retour par fichiers mappés, lecture par un autre processus, nettoyage
+"""
+
+import json
+import mmap
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data import shared_store
+from data.shared_store import SharedDatasetStore, load_shared_frame
+
+ROOT = Path(__file__).resolve().parents[1]
+
+WORKER = """
+import json, sys
+import numpy as np
+from data.shared_store import SharedDatasetStore
+
+store = SharedDatasetStore(sys.argv[1])
+shared = store.attach(sys.argv[2], freshness=sys.argv[3] if len(sys.argv) > 3 else None)
+if shared is None:
+    print(json.dumps(None))
+    sys.exit()
+frame = shared.frame
+values = frame['pure_ice_mean'].to_numpy()
+base = values
+while getattr(base, 'base', None) is not None:
+    base = base.base
+mapped = type(base).__name__ == 'mmap'
+frame.loc[:, 'pure_ice_mean'] = -1.0  # Modification locale : le store ne change pas
+print(json.dumps({'rows': len(frame), 'mapped': mapped,
+                  'csv': shared.store.attach(sys.argv[2]).frame.to_csv(),
+                  'leases': len(list(shared.lease.parent.iterdir()))}))
+"""
+
+
+def _frame(n=500):
+    rng = np.random.default_rng(0)
+    dates = pd.date_range('2015-06-01', periods=n, freq='D')
+    return pd.DataFrame({
+        'date': dates,
+        'decimal_year': dates.year + (dates.dayofyear - 1) / 365.25,
+        'pure_ice_mean': rng.uniform(0.3, 0.8, n),
+        'pixel_count': rng.integers(0, 300, n).astype(np.int32),
+        'season': pd.Categorical(np.where(dates.month < 7, 'early_summer', 'late_summer')),
+        'region': ['saskatchewan'] * n,
+        'qa_flag': pd.array(np.where(rng.random(n) < 0.1, None, rng.integers(0, 4, n)),
+                            dtype='Int64'),
+        'valid': rng.random(n) < 0.9,
+        'acquired': dates.tz_localize('America/Edmonton'),
+    }, index=pd.Index(np.arange(n) * 2 + 7, name='row'))
+
+
+def _mapped(values):
+    while getattr(values, 'base', None) is not None:
+        values = values.base
+    return isinstance(values, mmap.mmap)
+
+
+def _worker(directory, name, *freshness):
+    env = dict(os.environ, PYTHONPATH=str(ROOT))
+    result = subprocess.run([sys.executable, '-c', WORKER, str(directory), name, *freshness],
+                            env=env, capture_output=True, text=True, check=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def _versions(directory, name):
+    return sorted(p.name for p in (directory / name).iterdir()
+                  if p.is_dir() and not p.name.startswith('.'))
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = SharedDatasetStore(tmp_path / 'shared')
+    yield store
+    store.release_all()
+
+
+def test_round_trip(store):
+    frame = _frame()
+    published = store.publish('MCD43A3', frame, freshness='v1')
+    attached = store.attach('MCD43A3', freshness='v1')
+
+    for shared in (published, attached):
+        pd.testing.assert_frame_equal(shared.frame, frame)
+        # Colonnes numériques : vues sur les fichiers mappés, sans copie
+        for column in ('date', 'pure_ice_mean', 'pixel_count', 'valid'):
+            assert _mapped(shared.frame[column].to_numpy())
+    assert attached.manifest.rows == len(frame)
+    assert attached.manifest.freshness == 'v1'
+    assert store.names() == ['MCD43A3']
+
+    # Source plus récente que la version publiée : pas de rattachement
+    assert store.attach('MCD43A3', freshness='v2') is None
+    assert store.attach('MOD10A1') is None
+
+
+def test_worker_process_sees_same_data(store, tmp_path):
+    frame = _frame()
+    with store.publish('MOD10A1@athabasca', frame, freshness='v1'):
+        result = _worker(store.directory, 'MOD10A1@athabasca', 'v1')
+        assert result['rows'] == len(frame) and result['mapped']
+        # Éditeur + deux rattachements du processus de travail
+        assert result['leases'] == 3
+        expected = store.attach('MOD10A1@athabasca').frame
+        assert result['csv'] == expected.to_csv()
+        pd.testing.assert_frame_equal(expected, frame)
+
+        # Baux du processus terminé libérés à sa sortie
+        version = store.manifest('MOD10A1@athabasca').version
+        leases = store.directory / 'MOD10A1@athabasca' / version / 'leases'
+        assert len(list(leases.iterdir())) == 2
+        assert _worker(store.directory, 'MOD10A1@athabasca', 'v2') is None
+
+
+def test_versions_deleted_with_last_lease(store):
+    first = store.publish('MCD43A3', _frame(100), freshness='v1')
+    reader = store.attach('MCD43A3')
+    second = store.publish('MCD43A3', _frame(200), freshness='v2')
+    assert _versions(store.directory, 'MCD43A3') == sorted([first.manifest.version,
+                                                            second.manifest.version])
+    assert store.manifest('MCD43A3').freshness == 'v2'
+
+    # L'ancienne version reste lisible tant qu'un lecteur la tient
+    first.release()
+    assert len(reader.frame) == 100
+    assert len(_versions(store.directory, 'MCD43A3')) == 2
+    reader.release()
+    assert _versions(store.directory, 'MCD43A3') == [second.manifest.version]
+    assert len(reader.frame) == 100  # Fichiers supprimés, pages encore mappées
+
+    # Dernier détenteur de la version courante : plus rien à servir
+    second.release()
+    assert _versions(store.directory, 'MCD43A3') == []
+    assert store.names() == [] and store.attach('MCD43A3') is None
+
+
+def test_unpublish_and_dead_leases(store):
+    shared = store.publish('MCD43A3', _frame(50))
+    store.unpublish('MCD43A3')
+    assert store.attach('MCD43A3') is None
+    assert len(_versions(store.directory, 'MCD43A3')) == 1  # Encore tenue
+    shared.release()
+    assert _versions(store.directory, 'MCD43A3') == []
+
+    # Bail d'un processus mort : supprimé par cleanup()
+    shared = store.publish('MOD10A1', _frame(50))
+    finished = subprocess.Popen([sys.executable, '-c', 'pass'])
+    finished.wait()
+    (shared.lease.parent / f'{finished.pid}-deadbeef').touch()
+    shared.lease.unlink()  # Seul le bail mort reste
+    store.cleanup()
+    assert _versions(store.directory, 'MOD10A1') == []
+
+
+def test_load_shared_frame(monkeypatch, tmp_path):
+    calls = []
+
+    def loader():
+        calls.append(1)
+        return _frame(30)
+
+    monkeypatch.delenv(shared_store.ENABLE_ENV, raising=False)
+    pd.testing.assert_frame_equal(load_shared_frame('MCD43A3', loader), _frame(30))
+
+    monkeypatch.setattr(shared_store, '_store', SharedDatasetStore(tmp_path / 'shared'))
+    shared_store.enable()
+    try:
+        published = load_shared_frame('MCD43A3', loader, freshness='v1')
+        attached = load_shared_frame('MCD43A3', loader, freshness='v1')
+    finally:
+        shared_store.disable()
+        shared_store.get_shared_store().release_all()
+    assert len(calls) == 2  # Une fois sans store, une fois pour publier
+    pd.testing.assert_frame_equal(attached, published)
+    attached['extra'] = 1.0  # Copie superficielle : la vue partagée n'est pas modifiée
+    assert 'extra' not in published.columns
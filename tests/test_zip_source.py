@@ -0,0 +1,110 @@
+"""
+Archives Drive : un CSV lu dans le zip égale la lecture du fichier extrait
+"""
+
+import io
+import os
+import zipfile
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.zip_source import ArchiveMember, ZipSourceResolver, archive_timestamp
+from utils.helpers import load_and_validate_csv
+
+NAME = 'MCD43A3_albedo_daily_stats_2010_2024.csv'
+READ_OPTIONS = {'dtypes': {'pure_ice_mean': 'float32', 'pure_ice_pixel_count': 'int32'}}
+
+
+def _csv_text(n=40, seed=0):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        'system:index': [f'{i:04d}' for i in range(n)],
+        'date': pd.date_range('2015-06-01', periods=n, freq='D').strftime('%Y-%m-%d'),
+        'pure_ice_mean': np.round(rng.uniform(0.3, 0.8, n), 4),
+        'pure_ice_pixel_count': rng.integers(0, 200, n),
+        '.geo': '{"type":"MultiPoint","coordinates":[]}',
+    })
+    return frame.to_csv(index=False)
+
+
+def _write_archive(directory, stamp, members):
+    """Archive construite en mémoire puis déposée sous un nom Drive horodaté"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zf:
+        for name, text in members.items():
+            zf.writestr(f'export/{name}', text)
+    path = directory / f'drive-download-{stamp}Z-001.zip'
+    path.write_bytes(buffer.getvalue())
+    return path
+
+
+def test_archive_member_matches_extracted_file(tmp_path):
+    text = _csv_text()
+    extracted = tmp_path / 'extracted' / NAME
+    extracted.parent.mkdir()
+    extracted.write_text(text)
+    _write_archive(tmp_path, '20240901T120000', {NAME: text, 'other.csv': 'date\n'})
+
+    resolver = ZipSourceResolver()
+    csv_path = tmp_path / NAME  # Chemin configuré, jamais extrait
+    source = resolver.resolve(csv_path)
+    assert isinstance(source, ArchiveMember)
+    assert source.name == f'export/{NAME}'
+
+    from_zip = resolver.read_csv(csv_path, **READ_OPTIONS)
+    direct = load_and_validate_csv(str(extracted), **READ_OPTIONS)
+    pd.testing.assert_frame_equal(from_zip, direct)
+    assert list(from_zip.columns) == ['date', 'pure_ice_mean', 'pure_ice_pixel_count']
+    assert from_zip['pure_ice_mean'].dtype == np.float32
+
+    probe = resolver.probe(csv_path)
+    assert probe['row_count'] == len(direct)
+    assert probe['date_min'] == '2015-06-01'
+    assert probe['date_max'] == direct['date'].max().strftime('%Y-%m-%d')
+    assert probe['freshness'] == f'drive-download-20240901T120000Z-001.zip:{source.crc:08x}'
+
+
+def test_newest_archive_and_crc_cache(tmp_path, capsys):
+    _write_archive(tmp_path, '20240901T120000', {NAME: _csv_text(seed=1)})
+    _write_archive(tmp_path, '20240902T120000', {NAME: _csv_text(seed=2)})
+    resolver = ZipSourceResolver(cache_dir=tmp_path / 'cache')
+    csv_path = tmp_path / NAME
+
+    # L'horodatage du nom Drive ordonne les archives (membres datés de 1980)
+    expected = pd.read_csv(io.StringIO(_csv_text(seed=2)))
+    first = resolver.read_csv(csv_path)
+    np.testing.assert_allclose(first['pure_ice_mean'], expected['pure_ice_mean'])
+
+    first.loc[0, 'pure_ice_mean'] = -1  # Copie : le cache n'est pas modifié
+    capsys.readouterr()
+    again = resolver.read_csv(csv_path)
+    assert 'Cache CRC32' in capsys.readouterr().out
+    assert again['pure_ice_mean'].iloc[0] == expected['pure_ice_mean'].iloc[0]
+
+    # Nouvelle instance : relu depuis le cache disque, même contenu
+    cached = ZipSourceResolver(cache_dir=tmp_path / 'cache').read_csv(csv_path)
+    assert 'Cache disque' in capsys.readouterr().out
+    pd.testing.assert_frame_equal(cached, again)
+
+
+def test_extracted_file_preferred_when_newer(tmp_path):
+    archive = _write_archive(tmp_path, '20240901T120000', {NAME: _csv_text(seed=3)})
+    csv_path = tmp_path / NAME
+    csv_path.write_text(_csv_text(seed=4))
+
+    older = archive_timestamp(archive) - 60
+    os.utime(csv_path, (older, older))
+    assert isinstance(ZipSourceResolver().resolve(csv_path), ArchiveMember)
+
+    newer = archive_timestamp(archive) + 60
+    os.utime(csv_path, (newer, newer))
+    assert ZipSourceResolver().resolve(csv_path) == str(csv_path)
+
+
+def test_missing_everywhere(tmp_path):
+    resolver = ZipSourceResolver()
+    assert not resolver.exists(tmp_path / NAME)
+    with pytest.raises(FileNotFoundError):
+        resolver.read_csv(tmp_path / NAME)
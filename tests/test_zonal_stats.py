@@ -0,0 +1,161 @@
+"""
+Index de fractions et statistiques zonales sur des rasters découpés
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.modis.processing import zonal_stats
+from data.modis.processing.fraction_index import (PixelFractionIndex, DEFAULT_MASK_PATH,
+                                                  GRID_X_MIN, GRID_Y_MAX, PIXEL_SIZE)
+from data.modis.processing.zonal_stats import (FRACTION_CLASSES, PRODUCTS,
+                                               FractionZonalStatsEngine)
+
+DATES = pd.date_range('2020-07-01', periods=6, freq='D')
+
+
+@pytest.fixture(scope='module')
+def index():
+    return PixelFractionIndex.from_geojson(DEFAULT_MASK_PATH, oversample=4)
+
+
+def _clipped_window(index, pad=(3, 2, 4, 5)):
+    """Fenêtre d'un raster découpé : plus large que celle de l'index, décalée"""
+    top, left, bottom, right = pad
+    window = index.window
+    return {'row0': window['row0'] - top, 'col0': window['col0'] - left,
+            'nrows': window['nrows'] + top + bottom, 'ncols': window['ncols'] + left + right}
+
+
+def _geotransform(window):
+    return (GRID_X_MIN + window['col0'] * PIXEL_SIZE, PIXEL_SIZE, 0.0,
+            GRID_Y_MAX - window['row0'] * PIXEL_SIZE, 0.0, -PIXEL_SIZE)
+
+
+def _stacks(shape, seed=0):
+    rng = np.random.default_rng(seed)
+    albedo = rng.integers(0, 1000, (len(DATES), *shape)).astype(np.int16)
+    qa = rng.integers(0, 3, (len(DATES), *shape)).astype(np.int16)
+    return albedo, qa
+
+
+def _reference(index, window, albedo, qa):
+    """Statistiques avec un index construit directement sur la grille du raster découpé"""
+    fraction = np.zeros((window['nrows'], window['ncols']))
+    top = index.window['row0'] - window['row0']
+    left = index.window['col0'] - window['col0']
+    fraction[top:top + index.window['nrows'], left:left + index.window['ncols']] = index.fraction_raster()
+    engine = FractionZonalStatsEngine(fraction.astype(np.float32), product='MCD43A3')
+    return engine.compute(albedo, qa, DATES)
+
+
+def test_engine_accepts_index_from_package_path(index):
+    engine = FractionZonalStatsEngine(index, product='MCD43A3')
+    assert engine.index is index
+    assert sum(engine.class_sizes.values()) == len(index)
+
+
+def test_clipped_raster_is_realigned(index):
+    window = _clipped_window(index)
+    shape = (window['nrows'], window['ncols'])
+    albedo, qa = _stacks(shape)
+
+    engine = FractionZonalStatsEngine(index, product='MCD43A3')
+    stats, quality = engine.compute(albedo, qa, DATES, geotransform=_geotransform(window),
+                                    raster_shape=shape)
+    assert engine.grid_shape == shape
+
+    ref_stats, ref_quality = _reference(index, window, albedo, qa)
+    pd.testing.assert_frame_equal(stats, ref_stats)
+    pd.testing.assert_frame_equal(quality, ref_quality)
+
+
+def test_mismatched_grid_without_geotransform_is_rejected(index):
+    engine = FractionZonalStatsEngine(index, product='MCD43A3')
+    albedo, qa = _stacks((index.window['nrows'] + 1, index.window['ncols']))
+    with pytest.raises(ValueError):
+        engine.compute(albedo, qa, DATES, raster_shape=albedo.shape[1:])
+
+
+def test_run_directory_on_clipped_rasters(index, tmp_path, monkeypatch):
+    window = _clipped_window(index, pad=(1, 4, 2, 0))
+    shape = (window['nrows'], window['ncols'])
+    albedo, qa = _stacks(shape, seed=1)
+
+    # GeoTIFF stand-ins: the raster reader returns the arrays of each file name
+    rasters = {}
+    clipped = tmp_path / 'clipped'
+    clipped.mkdir()
+    for day, date in enumerate(DATES):
+        stamp = f"A{date.year}{date.dayofyear:03d}"
+        for band, stack in (('Albedo_WSA_shortwave', albedo), ('BRDF_Albedo_Band_Mandatory_Quality_shortwave', qa)):
+            path = clipped / f"MCD43A3.{stamp}.h10v03.061_{band}_clipped.tif"
+            path.touch()
+            rasters[str(path)] = stack[day]
+    monkeypatch.setattr(zonal_stats, 'read_raster', lambda path: rasters[str(path)])
+    monkeypatch.setattr(zonal_stats, 'read_raster_grid', lambda path: (_geotransform(window), shape))
+
+    engine = FractionZonalStatsEngine(index, product='MCD43A3')
+    paths = engine.run_directory(str(clipped), str(tmp_path / 'csv'))
+
+    ref_stats, _ = _reference(index, window, albedo, qa)
+    written = pd.read_csv(paths['stats'])
+    np.testing.assert_allclose(written['pure_ice_mean'], ref_stats['pure_ice_mean'], equal_nan=True)
+    np.testing.assert_array_equal(written['total_valid_pixels'], ref_stats['total_valid_pixels'])
+
+
+def _naive_fraction_stats(fraction, albedo, qa, product):
+    """Référence indépendante : boucle jour × classe avec les règles des scripts GEE"""
+    spec = PRODUCTS[product]
+    bounds = [(0.0, 0.25), (0.25, 0.50), (0.50, 0.75), (0.75, 0.90), (0.90, np.inf)]
+    rows, quality_rows = [], []
+    glacier = np.isfinite(fraction) & (fraction > 0)
+    for day in range(albedo.shape[0]):
+        row = {}
+        for name, (low, high) in zip(FRACTION_CLASSES, bounds):
+            if name == 'border':
+                in_class = glacier & (fraction < high)
+            else:
+                in_class = glacier & (fraction >= low) & (fraction < high)
+            values, flags = albedo[day][in_class], qa[day][in_class]
+            ok = ((flags >= 0) & (flags <= spec['good_qa_max'])
+                  & (values >= 0) & (values <= spec['valid_max']))
+            scaled = values[ok] * spec['scale']
+            size = int(in_class.sum())
+            row[f'{name}_mean'] = scaled.mean() if len(scaled) else np.nan
+            row[f'{name}_median'] = np.median(scaled) if len(scaled) else np.nan
+            row[f'{name}_pixel_count'] = len(scaled)
+            row[f'{name}_data_quality'] = len(scaled) / size * 100 if size else 0.0
+        rows.append(row)
+        quality_rows.append({level: int(rule(qa[day][glacier]).sum())
+                             for level, rule in spec['quality_levels'].items()})
+    return pd.DataFrame(rows), pd.DataFrame(quality_rows)
+
+
+@pytest.mark.parametrize('product', ['MCD43A3', 'MOD10A1'])
+def test_engine_matches_naive_class_loop(product):
+    rng = np.random.default_rng(3)
+    shape = (23, 31)
+    fraction = rng.uniform(0, 1, shape)
+    # Seuils exacts, pixels hors glacier et NaN
+    fraction.flat[:6] = [0.25, 0.50, 0.75, 0.90, 1.0, 0.0]
+    fraction[rng.random(shape) < 0.15] = 0.0
+    fraction[rng.random(shape) < 0.05] = np.nan
+
+    valid_max = PRODUCTS[product]['valid_max']
+    albedo = rng.integers(-50, valid_max + 50, (len(DATES), *shape))
+    albedo[rng.random(albedo.shape) < 0.05] = -9999
+    qa = rng.integers(-1, 4, (len(DATES), *shape))
+
+    engine = FractionZonalStatsEngine(fraction, product=product)
+    stats, quality = engine.compute(albedo, qa, DATES)
+    expected, expected_quality = _naive_fraction_stats(fraction, albedo, qa, product)
+
+    for column in expected.columns:
+        np.testing.assert_allclose(stats[column].to_numpy(dtype=float), expected[column],
+                                   rtol=1e-12, equal_nan=True, err_msg=column)
+    np.testing.assert_array_equal(stats['total_valid_pixels'],
+                                  expected[[f'{n}_pixel_count' for n in FRACTION_CLASSES]].sum(axis=1))
+    for level in expected_quality.columns:
+        np.testing.assert_array_equal(quality[level], expected_quality[level], err_msg=level)
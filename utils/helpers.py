@@ -12,6 +12,9 @@ from datetime import datetime
 import warnings
 import os
 
+from utils.instrumentation import traced, count
+from utils.sen_slope import PairwiseSlopes
+
 # Gestion des imports optionnels
 try:
     import pymannkendall as mk
@@ -42,11 +45,11 @@ def manual_mann_kendall(data):
     """
     data = np.array(data)
     n = len(data)
-    s = 0
     
+    # S = Σ sign(x_j - x_i), une ligne vectorisée par i
+    s = 0
     for i in range(n-1):
-        for j in range(i+1, n):
-            s += np.sign(data[j] - data[i])
+        s += np.sign(data[i+1:] - data[i]).sum()
     
     # Correction pour les égalités (ties) - Hipel & McLeod 1994
     unique, counts = np.unique(data, return_counts=True)
@@ -104,14 +107,168 @@ def prewhiten_series(series):
     
     rho = np.corrcoef(series[:-1], series[1:])[0, 1]
     
-    # Série pré-blanchie
-    prewhitened = np.zeros(len(series))
-    prewhitened[0] = series[0]
+    # Série pré-blanchie (le premier élément est perdu)
+    return ar1_prewhiten(series, rho)
+
+def ar1_prewhiten(values, rho):
+    """
+    Pré-blanchiment AR(1) vectorisé: x[1:] - rho * x[:-1]
+    
+    Args:
+        values (np.ndarray): Série (n) ou séries (n_séries × n)
+        rho (float or np.ndarray): Coefficient AR(1) (un par série)
+        
+    Returns:
+        np.ndarray: Séries pré-blanchies (longueur n - 1)
+    """
+    values = np.asarray(values, dtype=float)
+    rho = np.asarray(rho, dtype=float)
+    if values.ndim == 2:
+        rho = rho.reshape(-1, 1)
+    return values[..., 1:] - rho * values[..., :-1]
+
+def batch_autocorrelation(series, max_lag=10):
+    """
+    Fonction d'autocorrélation (ACF) complète de plusieurs séries par FFT
+    
+    Estimateur standard r_k = Σ (x_t - x̄)(x_{t+k} - x̄) / Σ (x_t - x̄)²,
+    calculé pour toutes les séries en une seule FFT. Les séries de longueurs
+    différentes sont complétées par des zéros après centrage, ce qui ne
+    modifie pas les sommes.
+    
+    Args:
+        series (list or np.ndarray): Liste de séries (longueurs quelconques) ou
+            matrice (n_séries × n); les NaN sont retirés de chaque série
+        max_lag (int): Décalage maximal
+        
+    Returns:
+        np.ndarray: ACF (n_séries × (max_lag + 1)), lag 0 = 1; NaN au-delà de n - 1
+    """
+    if isinstance(series, np.ndarray) and series.ndim == 1:
+        series = [series]
+    cleaned = [np.asarray(s, dtype=float) for s in series]
+    cleaned = [s[np.isfinite(s)] for s in cleaned]
+    lengths = np.array([len(s) for s in cleaned])
+    n_series = len(cleaned)
+    
+    if n_series == 0:
+        return np.empty((0, max_lag + 1))
+    
+    n_max = int(lengths.max()) if n_series else 0
+    nfft = 1 << max(1, int(np.ceil(np.log2(max(2 * n_max - 1, 2)))))
+    
+    padded = np.zeros((n_series, nfft))
+    for k, s in enumerate(cleaned):
+        if len(s):
+            padded[k, :len(s)] = s - s.mean()
+    
+    spectrum = np.fft.rfft(padded, axis=1)
+    autocov = np.fft.irfft(spectrum * np.conj(spectrum), n=nfft, axis=1)[:, :max_lag + 1]
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        acf = autocov / autocov[:, :1]
+    
+    # Décalages sans paire d'observations
+    lags = np.arange(max_lag + 1)
+    acf[lags[None, :] >= lengths[:, None]] = np.nan
+    return acf
+
+def trend_free_prewhiten(values, times=None):
+    """
+    Pré-blanchiment sans tendance (TFPW, Yue et al. 2002)
+    
+    La tendance de Sen est retirée, la composante AR(1) du résidu est
+    supprimée, puis la tendance est rajoutée.
+    
+    Args:
+        values (array-like): Série temporelle
+        times (array-like, optional): Temps (défaut: indices 0..n-1)
+        
+    Returns:
+        tuple: (série TFPW de longueur n - 1, rho lag-1 du résidu, pente de Sen)
+    """
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    times = np.arange(n, dtype=float) if times is None else np.asarray(times, dtype=float)
+    if n < 3:
+        return values, 0.0, 0.0
+    
+    slope = PairwiseSlopes(times, values).median()
+    
+    trend = slope * times
+    detrended = values - trend
+    rho = float(batch_autocorrelation([detrended], max_lag=1)[0, 1])
+    rho = 0.0 if not np.isfinite(rho) else rho
+    
+    return ar1_prewhiten(detrended, rho) + trend[1:], rho, slope
+
+def hamed_rao_mann_kendall(values, max_lag=None, alpha=0.05):
+    """
+    Test Mann-Kendall modifié de Hamed & Rao (1998)
+    
+    La variance de S est corrigée par le rapport n/n* calculé à partir de
+    l'ACF complète (par FFT) des rangs de la série sans tendance; seuls les
+    décalages significatifs sont retenus.
     
-    for i in range(1, len(series)):
-        prewhitened[i] = series[i] - rho * series[i-1]
+    Args:
+        values (array-like): Série temporelle (sans NaN)
+        max_lag (int, optional): Décalage maximal (défaut: n - 1)
+        alpha (float): Niveau de signification
+        
+    Returns:
+        dict: Résultats avec keys: trend, p_value, z, s, tau, var_s,
+            correction_factor, significant_lags, method
+    """
+    from scipy.stats import norm, rankdata
+    
+    values = np.asarray(values, dtype=float)
+    n = len(values)
+    mk_result = manual_mann_kendall(values)
+    
+    if n < 4:
+        return {**mk_result, 'var_s': np.nan, 'correction_factor': 1.0,
+                'significant_lags': [], 'method': 'hamed_rao'}
+    
+    # Série sans tendance (pente de Sen sur les indices) puis rangs
+    slope = PairwiseSlopes(np.arange(n), values).median()
+    ranks = rankdata(values - slope * np.arange(1, n + 1))
+    
+    max_lag = n - 1 if max_lag is None else min(int(max_lag), n - 1)
+    acf = batch_autocorrelation([ranks], max_lag=max_lag)[0]
+    
+    lags = np.arange(1, max_lag + 1)
+    interval = norm.ppf(1 - alpha / 2) / np.sqrt(n)
+    significant = np.abs(acf[1:]) > interval
+    weights = (n - lags) * (n - lags - 1) * (n - lags - 2)
+    correction = 1 + 2 * np.sum(np.where(significant, weights * acf[1:], 0.0)) / (n * (n - 1) * (n - 2))
+    
+    unique, counts = np.unique(values, return_counts=True)
+    tie_term = np.sum(counts * (counts - 1) * (2 * counts + 5))
+    var_s = (n * (n - 1) * (2 * n + 5) - tie_term) / 18 * correction
     
-    return prewhitened[1:]  # Enlever le premier élément
+    s = mk_result['s']
+    if var_s <= 0 or s == 0:
+        z = 0.0
+    else:
+        z = (s - np.sign(s)) / np.sqrt(var_s)
+    p_value = 2 * norm.sf(abs(z))
+    
+    if p_value < alpha:
+        trend = 'increasing' if s > 0 else 'decreasing'
+    else:
+        trend = 'no trend'
+    
+    return {
+        'trend': trend,
+        'p_value': p_value,
+        'z': z,
+        's': s,
+        'tau': mk_result['tau'],
+        'var_s': var_s,
+        'correction_factor': correction,
+        'significant_lags': lags[significant].tolist(),
+        'method': 'hamed_rao'
+    }
 
 def calculate_autocorrelation(data, lag=1):
     """
@@ -256,10 +413,15 @@ def get_timestamp():
     """
     return datetime.now().strftime('%Y-%m-%d %H:%M:%S')
 
+@traced('sen')
 def calculate_sen_slope(times, values):
     """
     Calcule la pente de Sen et intervalle de confiance
     Trie les données par temps pour assurer la reproductibilité
+
+    Sélection exacte sur l'ensemble implicite des pentes par paires
+    (utils.sen_slope) : mêmes résultats que scipy.stats.theilslopes, en
+    mémoire O(n log n) au lieu de O(n²).
     
     Args:
         times (array): Temps (années décimales)
@@ -269,7 +431,7 @@ def calculate_sen_slope(times, values):
         dict: Résultats de la pente de Sen
     """
     try:
-        from scipy.stats import theilslopes
+        from utils.sen_slope import sen_slope
         
         # Convertir en arrays numpy et trier par temps pour reproductibilité
         times = np.array(times)
@@ -280,8 +442,8 @@ def calculate_sen_slope(times, values):
         times_sorted = times[sort_idx]
         values_sorted = values[sort_idx]
         
-        # Calcul avec theilslopes de scipy sur données triées
-        slope, intercept, low_slope, high_slope = theilslopes(values_sorted, times_sorted, 0.95)
+        # Pente médiane et bornes de l'IC par sélection de rang sur données triées
+        slope, intercept, low_slope, high_slope = sen_slope(times_sorted, values_sorted, 0.95)
         
         # Calculer les valeurs par décennie une seule fois
         slope_per_decade = slope * 10
@@ -298,7 +460,7 @@ def calculate_sen_slope(times, values):
                 'low_per_decade': low_per_decade,
                 'high_per_decade': high_per_decade
             },
-            'method': 'theilslopes'
+            'method': 'sen_selection'
         }
     except Exception as e:
         print(f"    ⚠️  Erreur calcul pente Sen: {e}")
@@ -315,6 +477,7 @@ def calculate_sen_slope(times, values):
             'method': 'failed'
         }
 
+@traced('mk')
 def perform_mann_kendall_test(values):
     """
     Effectue le test de Mann-Kendall
@@ -358,12 +521,51 @@ def create_output_filename(base_name, variable, extension='png'):
     timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
     return f"{base_name}_{variable}_{timestamp}.{extension}"
 
-def load_and_validate_csv(csv_path):
+def read_csv_header(csv_path, open_stream=None):
     """
-    Charge et valide un fichier CSV
+    Lit uniquement la ligne d'en-tête d'un fichier CSV
     
     Args:
         csv_path (str): Chemin vers le fichier CSV
+        open_stream (callable, optional): Ouvre le contenu en flux binaire
+            (membre d'archive zip) au lieu du chemin
+        
+    Returns:
+        list: Noms des colonnes
+    """
+    import csv
+    import io
+    stream = open_stream() if open_stream else open(csv_path, 'rb')
+    with io.TextIOWrapper(stream, encoding='utf-8', newline='') as f:
+        return next(csv.reader(f), [])
+
+def _csv_engine():
+    """Moteur de lecture CSV : pyarrow (lecture multithread) si disponible"""
+    try:
+        import pyarrow  # noqa: F401
+        return 'pyarrow'
+    except ImportError:
+        return 'c'
+
+@traced('csv.read')
+def load_and_validate_csv(csv_path, dtypes=None, skip_columns=('system:index', '.geo'),
+                          date_format='%Y-%m-%d', required_columns=('date',), open_stream=None):
+    """
+    Charge et valide un fichier CSV exporté de GEE
+    
+    Les colonnes requises sont vérifiées sur l'en-tête avant de lire le corps du
+    fichier ; les colonnes inutilisées (.geo, system:index) ne sont pas lues, les
+    types sont déclarés (voir DatasetConfig.csv_dtypes) au lieu d'être inférés et
+    la date est convertie avec un format fixe.
+    
+    Args:
+        csv_path (str): Chemin vers le fichier CSV
+        dtypes (dict, optional): Types des colonnes (colonnes absentes ignorées)
+        skip_columns (list): Colonnes à ne pas lire
+        date_format (str): Format de la colonne 'date' (None pour l'inférer)
+        required_columns (list): Colonnes qui doivent être présentes
+        open_stream (callable, optional): Ouvre le contenu en flux binaire ;
+            csv_path ne sert alors que de libellé (voir data.zip_source)
         
     Returns:
         pd.DataFrame: Données chargées et validées
@@ -372,20 +574,29 @@ def load_and_validate_csv(csv_path):
         FileNotFoundError: Si le fichier n'existe pas
         ValueError: Si les colonnes requises sont manquantes
     """
-    if not os.path.exists(csv_path):
+    if open_stream is None and not os.path.exists(csv_path):
         raise FileNotFoundError(f"Fichier non trouvé: {csv_path}")
     
+    header = read_csv_header(csv_path, open_stream)
+    missing_cols = [col for col in required_columns if col not in header]
+    if missing_cols:
+        raise ValueError(f"Colonnes requises manquantes: {missing_cols}")
+    
+    usecols = [col for col in header if col not in set(skip_columns)]
+    column_dtypes = {col: dtype for col, dtype in (dtypes or {}).items() if col in usecols}
+    
     try:
-        data = pd.read_csv(csv_path)
+        if open_stream is None:
+            data = pd.read_csv(csv_path, usecols=usecols, dtype=column_dtypes, engine=_csv_engine())
+            count('bytes_read', os.path.getsize(csv_path))
+        else:
+            with open_stream() as stream:
+                data = pd.read_csv(stream, usecols=usecols, dtype=column_dtypes,
+                                   engine=_csv_engine())
+        if 'date' in data.columns:
+            data['date'] = pd.to_datetime(data['date'], format=date_format)
+        count('csv_rows_read', len(data))
         print(f"✓ Fichier chargé: {len(data)} lignes, {len(data.columns)} colonnes")
-        
-        # Vérifier les colonnes essentielles
-        required_cols = ['date']
-        missing_cols = [col for col in required_cols if col not in data.columns]
-        
-        if missing_cols:
-            raise ValueError(f"Colonnes requises manquantes: {missing_cols}")
-        
         return data
         
     except Exception as e:
@@ -0,0 +1,271 @@
+"""
+Run instrumentation for Saskatchewan Albedo Analysis
+====================================================
+
+Timing spans and counters placed on the hot paths (load, filter, Mann-Kendall,
+Sen slope, bootstrap, dataset sync, QA aggregation, figure rendering, database
+queries). At the end of a run, ``finish_run()`` writes a Chrome trace
+(open it in chrome://tracing or https://ui.perfetto.dev) and a summary table.
+
+Disabled by default: ``span()`` then returns a shared no-op context manager
+and ``traced`` functions call straight through, so the cost is one flag test.
+Enable with ``enable()`` or the ``ALBEDO_TRACE=1`` environment variable;
+``enable(memory=True)`` / ``ALBEDO_TRACE_MEMORY=1`` also records the
+``tracemalloc`` allocation delta of every span (much slower). When enabled
+from the environment, the trace is written at interpreter exit unless the
+run already called ``finish_run()``.
+
+Usage::
+
+    from utils.instrumentation import span, traced, count
+
+    @traced('sen')
+    def calculate_sen_slope(times, values): ...
+
+    with span('load', dataset='MOD10A1'):
+        data = read_csv(...)
+        count('rows_loaded', len(data))
+"""
+
+import os
+import json
+import time
+import atexit
+import threading
+import functools
+import tracemalloc
+from pathlib import Path
+
+import pandas as pd
+
+DEFAULT_TRACE_DIR = Path('output') / 'traces'
+MAX_TRACE_EVENTS = 200_000  # Timeline cap; the summary keeps counting past it
+
+
+class _State:
+    enabled = False
+    memory = False
+    finished = False
+    started_ns = 0
+    events = []
+    stats = {}
+    counters = {}
+    lock = threading.Lock()
+
+
+_state = _State()
+
+
+class _NoSpan:
+    """Shared no-op span used while instrumentation is disabled"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NO_SPAN = _NoSpan()
+
+
+class _Span:
+    __slots__ = ('name', 'args', 'start_ns', 'memory_start')
+
+    def __init__(self, name, args):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        if _state.memory:
+            self.memory_start = tracemalloc.get_traced_memory()[0]
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        end_ns = time.perf_counter_ns()
+        duration_ns = end_ns - self.start_ns
+        memory_delta = None
+        if _state.memory:
+            memory_delta = tracemalloc.get_traced_memory()[0] - self.memory_start
+
+        with _state.lock:
+            stats = _state.stats.get(self.name)
+            if stats is None:
+                stats = _state.stats[self.name] = [0, 0, 0, 0]  # calls, total, max, memory
+            stats[0] += 1
+            stats[1] += duration_ns
+            stats[2] = max(stats[2], duration_ns)
+            if memory_delta is not None:
+                stats[3] = max(stats[3], memory_delta)
+
+            if len(_state.events) < MAX_TRACE_EVENTS:
+                args = dict(self.args) if self.args else {}
+                if memory_delta is not None:
+                    args['memory_delta_kb'] = round(memory_delta / 1024, 1)
+                _state.events.append({
+                    'name': self.name, 'ph': 'X', 'pid': os.getpid(),
+                    'tid': threading.get_ident(),
+                    'ts': (self.start_ns - _state.started_ns) / 1000,
+                    'dur': duration_ns / 1000, 'args': args,
+                })
+        return False
+
+
+def enable(memory=False):
+    """
+    Start recording spans and counters (clears the previous recording)
+
+    Args:
+        memory (bool): Also record tracemalloc allocation deltas
+    """
+    reset()
+    _state.memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+    _state.started_ns = time.perf_counter_ns()
+    _state.finished = False
+    _state.enabled = True
+
+
+def disable():
+    """Stop recording (the recording is kept until reset() or enable())"""
+    _state.enabled = False
+    if _state.memory and tracemalloc.is_tracing():
+        tracemalloc.stop()
+    _state.memory = False
+
+
+def is_enabled():
+    return _state.enabled
+
+
+def reset():
+    with _state.lock:
+        _state.events = []
+        _state.stats = {}
+        _state.counters = {}
+
+
+def span(name, **args):
+    """
+    Timing span (context manager)
+
+    Args:
+        name (str): Span name, aggregated in the summary
+        **args: Attributes shown in the trace (dataset, fraction, ...)
+    """
+    if not _state.enabled:
+        return _NO_SPAN
+    return _Span(name, args)
+
+
+def traced(name=None):
+    """Decorator recording every call of a function as a span"""
+    def decorator(func):
+        span_name = name or func.__qualname__
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _state.enabled:
+                return func(*args, **kwargs)
+            with _Span(span_name, None):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def count(name, value=1):
+    """Add to a counter (rows processed, bytes read, ...)"""
+    if not _state.enabled:
+        return
+    with _state.lock:
+        total = _state.counters.get(name, 0) + value
+        _state.counters[name] = total
+        if len(_state.events) < MAX_TRACE_EVENTS:
+            _state.events.append({
+                'name': name, 'ph': 'C', 'pid': os.getpid(),
+                'ts': (time.perf_counter_ns() - _state.started_ns) / 1000,
+                'args': {name: total},
+            })
+
+
+def counters():
+    with _state.lock:
+        return dict(_state.counters)
+
+
+def summary_table():
+    """
+    Aggregated spans, slowest total first
+
+    Returns:
+        pd.DataFrame: span, calls, total_s, mean_ms, max_ms (and max_memory_kb)
+    """
+    with _state.lock:
+        rows = [{
+            'span': name,
+            'calls': calls,
+            'total_s': total / 1e9,
+            'mean_ms': total / calls / 1e6,
+            'max_ms': max_ns / 1e6,
+            'max_memory_kb': memory / 1024,
+        } for name, (calls, total, max_ns, memory) in _state.stats.items()]
+
+    table = pd.DataFrame(rows, columns=['span', 'calls', 'total_s', 'mean_ms', 'max_ms',
+                                        'max_memory_kb'])
+    if not _state.memory:
+        table = table.drop(columns='max_memory_kb')
+    return table.sort_values('total_s', ascending=False).reset_index(drop=True)
+
+
+def write_trace(path):
+    """Write the recording as a Chrome trace JSON file"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _state.lock:
+        events = list(_state.events)
+        payload = {'traceEvents': events, 'displayTimeUnit': 'ms',
+                   'otherData': {'counters': dict(_state.counters),
+                                 'truncated': len(events) >= MAX_TRACE_EVENTS}}
+    with open(path, 'w') as f:
+        json.dump(payload, f, default=str)
+    return str(path)
+
+
+def finish_run(output_dir=DEFAULT_TRACE_DIR, label='run'):
+    """
+    Write the trace and summary of the current recording and print the summary
+
+    Returns:
+        dict: Paths of the trace and summary files (empty if disabled)
+    """
+    if not _state.enabled:
+        return {}
+    _state.finished = True
+
+    stamp = time.strftime('%Y%m%d_%H%M%S')
+    output_dir = Path(output_dir)
+    trace_path = write_trace(output_dir / f"{label}_{stamp}.trace.json")
+    table = summary_table()
+    summary_path = output_dir / f"{label}_{stamp}_summary.csv"
+    table.to_csv(summary_path, index=False)
+
+    print("\n⏱️  Instrumentation summary")
+    if len(table):
+        print(table.to_string(index=False, float_format=lambda v: f"{v:.3f}"))
+    for name, total in counters().items():
+        print(f"   {name}: {total:,}")
+    print(f"📁 Trace: {trace_path}")
+    return {'trace': trace_path, 'summary': str(summary_path)}
+
+
+def _finish_at_exit():
+    """Write the recording of an environment-enabled run nobody finished"""
+    if not _state.finished:
+        finish_run()
+
+
+if os.environ.get('ALBEDO_TRACE') == '1' or os.environ.get('ALBEDO_TRACE_MEMORY') == '1':
+    enable(memory=os.environ.get('ALBEDO_TRACE_MEMORY') == '1')
+    atexit.register(_finish_at_exit)
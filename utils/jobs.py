@@ -0,0 +1,459 @@
+"""
+Background job runner for long analyses
+=======================================
+
+Local job queue used by the menu and the Shiny dashboards so that full
+analyses, bootstrap runs and exports no longer block the caller:
+
+- jobs run in a process pool; their state lives in a SQLite table shared by
+  every process (and every dashboard session)
+- submit / status / cancel / result
+- analyzers report progress with ``report_progress()``, a no-op outside a job;
+  the same call is where a cancelled job stops (cooperative cancellation)
+- results are pickled to a cache directory keyed by a hash of the job inputs:
+  submitting the same job again returns the finished job, or the one still
+  queued or running in this runner's pool
+- each row records the pid of the process that owns its pool; a new runner
+  marks queued/running rows whose owner is gone as failed, so jobs left
+  behind by a crashed process are neither reported as running nor reused
+- the shared dataset store is enabled for the pool: the first worker that
+  loads a dataset publishes it, the others attach it (data.shared_store)
+"""
+
+import os
+import time
+import uuid
+import pickle
+import hashlib
+import sqlite3
+import importlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+
+STATUS_QUEUED = 'queued'
+STATUS_RUNNING = 'running'
+STATUS_CANCELLING = 'cancelling'
+STATUS_CANCELLED = 'cancelled'
+STATUS_COMPLETED = 'completed'
+STATUS_FAILED = 'failed'
+
+FINISHED_STATUSES = (STATUS_CANCELLED, STATUS_COMPLETED, STATUS_FAILED)
+ACTIVE_STATUSES = (STATUS_QUEUED, STATUS_RUNNING, STATUS_CANCELLING)
+
+DEFAULT_JOB_DIR = Path('output') / 'jobs'
+PROGRESS_INTERVAL = 0.5  # seconds between progress writes
+
+_JOB_COLUMNS = ('job_id', 'kind', 'func', 'input_hash', 'status', 'progress', 'message',
+                'submitted_at', 'started_at', 'finished_at', 'result_path', 'error', 'owner_pid')
+
+
+class JobCancelled(BaseException):
+    """
+    Raised inside a job when it has been cancelled
+
+    Derives from BaseException so that the analyzers' broad
+    ``except Exception`` handlers do not swallow it.
+    """
+
+
+class JobStore:
+    """SQLite job table, safe to open from several processes"""
+
+    def __init__(self, db_path):
+        self.db_path = str(db_path)
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, timeout=30, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                kind TEXT,
+                func TEXT,
+                input_hash TEXT,
+                status TEXT,
+                progress REAL DEFAULT 0,
+                message TEXT,
+                submitted_at TEXT,
+                started_at TEXT,
+                finished_at TEXT,
+                result_path TEXT,
+                error TEXT,
+                owner_pid INTEGER
+            )
+        """)
+        columns = {row[1] for row in self._conn.execute('PRAGMA table_info(jobs)')}
+        if 'owner_pid' not in columns:
+            self._conn.execute('ALTER TABLE jobs ADD COLUMN owner_pid INTEGER')
+        self._conn.execute('CREATE INDEX IF NOT EXISTS jobs_hash ON jobs (input_hash)')
+        self._conn.commit()
+
+    def insert(self, job_id, kind, func, input_hash):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (job_id, kind, func, input_hash, status, submitted_at, owner_pid) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (job_id, kind, func, input_hash, STATUS_QUEUED, _now(), os.getpid())
+            )
+            self._conn.commit()
+
+    def update(self, job_id, **fields):
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        with self._lock:
+            self._conn.execute(f"UPDATE jobs SET {assignments} WHERE job_id = ?",
+                               (*fields.values(), job_id))
+            self._conn.commit()
+
+    def transition(self, job_id, expected, **fields):
+        """Update only if the job is in one of the expected statuses; True if updated"""
+        assignments = ', '.join(f"{name} = ?" for name in fields)
+        placeholders = ', '.join('?' for _ in expected)
+        with self._lock:
+            cursor = self._conn.execute(
+                f"UPDATE jobs SET {assignments} WHERE job_id = ? AND status IN ({placeholders})",
+                (*fields.values(), job_id, *expected)
+            )
+            self._conn.commit()
+            return cursor.rowcount > 0
+
+    def get(self, job_id):
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs WHERE job_id = ?", (job_id,)
+            ).fetchone()
+        return dict(zip(_JOB_COLUMNS, row)) if row else None
+
+    def find_by_hash(self, input_hash, statuses):
+        placeholders = ', '.join('?' for _ in statuses)
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs "
+                f"WHERE input_hash = ? AND status IN ({placeholders}) "
+                f"ORDER BY submitted_at DESC LIMIT 1",
+                (input_hash, *statuses)
+            ).fetchone()
+        return dict(zip(_JOB_COLUMNS, row)) if row else None
+
+    def fail_orphans(self):
+        """
+        Mark queued/running jobs whose owner process no longer exists as failed
+
+        Returns:
+            list: Ids of the jobs marked failed
+        """
+        placeholders = ', '.join('?' for _ in ACTIVE_STATUSES)
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT job_id, owner_pid FROM jobs WHERE status IN ({placeholders})",
+                ACTIVE_STATUSES
+            ).fetchall()
+        orphans = [job_id for job_id, pid in rows if not _pid_alive(pid)]
+        for job_id in orphans:
+            self.transition(job_id, ACTIVE_STATUSES, status=STATUS_FAILED, finished_at=_now(),
+                            error='owner process exited before the job finished')
+        return orphans
+
+    def list(self, limit=50):
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {', '.join(_JOB_COLUMNS)} FROM jobs "
+                f"ORDER BY submitted_at DESC LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(zip(_JOB_COLUMNS, row)) for row in rows]
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def _now():
+    return datetime.now().isoformat(timespec='seconds')
+
+
+def _pid_alive(pid):
+    """True if a process with this pid exists (rows without a pid count as dead)"""
+    if not pid:
+        return False
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _func_ref(func):
+    """'module:qualname' reference of an importable function"""
+    if isinstance(func, str):
+        return func
+    return f"{func.__module__}:{func.__qualname__}"
+
+
+def _resolve(func_ref):
+    module_name, _, qualname = func_ref.partition(':')
+    target = importlib.import_module(module_name)
+    for part in qualname.split('.'):
+        target = getattr(target, part)
+    return target
+
+
+def input_hash(func, args=(), kwargs=None, input_files=(), input_token=None):
+    """
+    Hash identifying a job's inputs (function, arguments, input file versions)
+
+    Args:
+        func: Callable or 'module:function' reference
+        args (tuple): Positional arguments
+        kwargs (dict): Keyword arguments
+        input_files (list): Files whose size/mtime invalidate cached results
+        input_token (str, optional): Version of inputs that are not files
+            (e.g. a database freshness stamp)
+
+    Returns:
+        str: Hex digest
+    """
+    signatures = []
+    for path in input_files:
+        try:
+            stat = os.stat(path)
+            signatures.append((str(path), stat.st_size, stat.st_mtime_ns))
+        except OSError:
+            signatures.append((str(path), None, None))
+    payload = (_func_ref(func), tuple(args), sorted((kwargs or {}).items()), signatures)
+    if input_token is not None:
+        payload += (input_token,)
+    return hashlib.sha256(pickle.dumps(payload)).hexdigest()
+
+
+# ----------------------------------------------------------------------
+# Worker side
+# ----------------------------------------------------------------------
+
+_current_job = {'store': None, 'job_id': None, 'last_write': 0.0}
+
+
+def report_progress(progress, message=None):
+    """
+    Report the progress of the current job (no-op outside a job)
+
+    Args:
+        progress (float): Fraction done, 0 to 1
+        message (str, optional): Short status text
+
+    Raises:
+        JobCancelled: If the job was cancelled
+    """
+    store, job_id = _current_job['store'], _current_job['job_id']
+    if store is None:
+        return
+
+    now = time.monotonic()
+    if progress < 1 and now - _current_job['last_write'] < PROGRESS_INTERVAL:
+        return
+    _current_job['last_write'] = now
+
+    fields = {'progress': float(min(max(progress, 0.0), 1.0))}
+    if message is not None:
+        fields['message'] = message
+    store.update(job_id, **fields)
+
+    if store.get(job_id)['status'] == STATUS_CANCELLING:
+        raise JobCancelled(job_id)
+
+
+def _execute_job(db_path, cache_dir, job_id, func_ref, args, kwargs, result_name):
+    """Run one job in a worker process and record its outcome"""
+    store = JobStore(db_path)
+    if not store.transition(job_id, (STATUS_QUEUED,), status=STATUS_RUNNING, started_at=_now()):
+        store.close()
+        return  # cancelled before it started
+
+    _current_job.update(store=store, job_id=job_id, last_write=0.0)
+    try:
+        result = _resolve(func_ref)(*args, **kwargs)
+        result_path = Path(cache_dir) / result_name
+        tmp_path = result_path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(result, f)
+        os.replace(tmp_path, result_path)
+        if not store.transition(job_id, (STATUS_RUNNING,), status=STATUS_COMPLETED, progress=1.0,
+                                finished_at=_now(), result_path=str(result_path)):
+            # Cancelled after its last progress check
+            store.update(job_id, status=STATUS_CANCELLED, finished_at=_now())
+    except JobCancelled:
+        store.update(job_id, status=STATUS_CANCELLED, finished_at=_now())
+    except Exception as e:
+        store.update(job_id, status=STATUS_FAILED, finished_at=_now(),
+                     error=f"{type(e).__name__}: {e}")
+    finally:
+        _current_job.update(store=None, job_id=None)
+        store.close()
+
+
+# ----------------------------------------------------------------------
+# Caller side
+# ----------------------------------------------------------------------
+
+class JobRunner:
+    """
+    Process-pool job queue with a SQLite job table and a result cache
+
+    Args:
+        job_dir: Directory holding jobs.db and the result cache
+        max_workers: Worker processes (default: cores - 1)
+    """
+
+    def __init__(self, job_dir=None, max_workers=None):
+        self.job_dir = Path(job_dir or DEFAULT_JOB_DIR)
+        self.cache_dir = self.job_dir / 'results'
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.store = JobStore(self.job_dir / 'jobs.db')
+        orphans = self.store.fail_orphans()
+        if orphans:
+            print(f"⚠️ {len(orphans)} job(s) left by a stopped process marked failed")
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        # Workers attach datasets published in the shared store instead of reloading them
+        from data import shared_store
+        shared_store.enable()
+        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        self._futures = {}
+        self._inflight = {}  # input hash -> job id queued or running in this pool
+        self._lock = threading.Lock()
+
+    def submit(self, func, *args, kind=None, input_files=(), input_token=None, use_cache=True,
+               **kwargs):
+        """
+        Queue a job
+
+        Args:
+            func: Importable top-level function (or 'module:function')
+            *args, **kwargs: Arguments passed to func
+            kind (str, optional): Label shown in job lists
+            input_files (list): Data files whose changes invalidate the cache
+            input_token (str, optional): Version of non-file inputs (database
+                freshness stamp); a new token invalidates the cache as well
+            use_cache (bool): Reuse a completed job with the same inputs, or
+                one still queued or running in this runner's pool
+
+        Returns:
+            str: Job id
+        """
+        func_ref = _func_ref(func)
+        digest = input_hash(func_ref, args, kwargs, input_files, input_token)
+
+        with self._lock:
+            if use_cache:
+                running_id = self._inflight.get(digest)
+                if running_id in self._futures:
+                    running = self.store.get(running_id)
+                    if running and running['status'] in (STATUS_QUEUED, STATUS_RUNNING):
+                        return running_id
+                existing = self.store.find_by_hash(digest, (STATUS_COMPLETED,))
+                if existing and Path(existing['result_path'] or '').exists():
+                    return existing['job_id']
+
+            job_id = uuid.uuid4().hex[:12]
+            self.store.insert(job_id, kind or func_ref.split(':')[-1], func_ref, digest)
+            future = self._executor.submit(
+                _execute_job, self.store.db_path, str(self.cache_dir), job_id,
+                func_ref, args, kwargs, f"{digest}.pkl"
+            )
+            self._futures[job_id] = future
+            self._inflight[digest] = job_id
+            future.add_done_callback(lambda f, job_id=job_id: self._on_done(job_id, f))
+        return job_id
+
+    def _on_done(self, job_id, future):
+        """Mark jobs whose worker died (or that were cancelled in the queue)"""
+        with self._lock:
+            self._futures.pop(job_id, None)
+            for digest, inflight_id in list(self._inflight.items()):
+                if inflight_id == job_id:
+                    del self._inflight[digest]
+        if future.cancelled():
+            self.store.transition(job_id, (STATUS_QUEUED, STATUS_CANCELLING),
+                                  status=STATUS_CANCELLED, finished_at=_now())
+        elif future.exception() is not None:
+            self.store.transition(job_id, (STATUS_QUEUED, STATUS_RUNNING, STATUS_CANCELLING),
+                                  status=STATUS_FAILED, finished_at=_now(),
+                                  error=f"worker error: {future.exception()}")
+
+    def status(self, job_id):
+        """
+        Current state of a job
+
+        Returns:
+            dict: job_id, kind, status, progress, message, timestamps, error
+                (None if unknown)
+        """
+        return self.store.get(job_id)
+
+    def list_jobs(self, limit=50):
+        """Most recent jobs first"""
+        return self.store.list(limit)
+
+    def cancel(self, job_id):
+        """
+        Cancel a job: removed from the queue if not started, otherwise stopped
+        at its next report_progress() call
+
+        Returns:
+            bool: True if the job will not complete
+        """
+        with self._lock:
+            future = self._futures.get(job_id)
+        if future is not None and future.cancel():
+            return True
+        if self.store.transition(job_id, (STATUS_QUEUED,),
+                                 status=STATUS_CANCELLED, finished_at=_now()):
+            return True
+        return self.store.transition(job_id, (STATUS_RUNNING,), status=STATUS_CANCELLING)
+
+    def result(self, job_id, timeout=None):
+        """
+        Result of a completed job
+
+        Args:
+            job_id (str): Job id
+            timeout (float, optional): Seconds to wait for completion (None: do not wait)
+
+        Returns:
+            object: The job function's return value
+
+        Raises:
+            RuntimeError: If the job failed, was cancelled or is not finished
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            job = self.store.get(job_id)
+            if job is None:
+                raise KeyError(job_id)
+            if job['status'] == STATUS_COMPLETED:
+                with open(job['result_path'], 'rb') as f:
+                    return pickle.load(f)
+            if job['status'] in (STATUS_FAILED, STATUS_CANCELLED):
+                raise RuntimeError(f"Job {job_id} {job['status']}: {job['error'] or ''}".strip())
+            if deadline is None or time.monotonic() > deadline:
+                raise RuntimeError(f"Job {job_id} not finished ({job['status']})")
+            time.sleep(0.2)
+
+    def shutdown(self, wait=True):
+        """Stop the pool (queued jobs are cancelled)"""
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+        self.store.close()
+
+
+_runner = None
+_runner_lock = threading.Lock()
+
+
+def get_job_runner(job_dir=None, max_workers=None):
+    """Process-wide shared JobRunner (one pool for all menus and dashboard sessions)"""
+    global _runner
+    with _runner_lock:
+        if _runner is None:
+            _runner = JobRunner(job_dir, max_workers)
+        return _runner
@@ -0,0 +1,300 @@
+"""
+Stage-graph pipeline runner
+===========================
+
+Declarative analysis pipeline: each stage names the stages it depends on and
+receives their outputs. The runner
+
+- runs independent stages concurrently on a thread pool (stages sharing a
+  ``lock`` name, e.g. matplotlib figures, run one at a time)
+- caches each stage output under a content hash of the stage name, version,
+  parameters, upstream stage keys and an optional fingerprint of its external
+  inputs (dataset freshness stamp, input files, ...)
+- skips stages whose key is already cached, and only runs the upstream stages
+  whose outputs are actually needed to recompute an invalidated stage
+
+Stage functions are called as ``func(inputs, **params)`` where ``inputs`` maps
+each dependency name to its output.
+"""
+
+import json
+import time
+import pickle
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from utils.instrumentation import span
+
+DEFAULT_PIPELINE_DIR = Path('output') / 'pipeline'
+
+STAGE_CACHED = 'cached'
+STAGE_RAN = 'ran'
+STAGE_FAILED = 'failed'
+STAGE_SKIPPED = 'skipped'
+
+
+@dataclass
+class Stage:
+    """
+    One node of the stage graph
+
+    Args:
+        name: Unique stage name (e.g. 'MCD43A3:trends')
+        func: func(inputs, **params) -> output
+        deps: Names of the stages whose outputs are needed
+        params: Keyword parameters (part of the cache key)
+        cache: Persist the output (False for cheap or unpicklable outputs)
+        fingerprint: Callable returning a JSON-serializable stamp of the
+            stage's external inputs (part of the cache key)
+        lock: Stages with the same lock name never run concurrently
+        produces_files: Output is a path, or a list/dict of paths; a cached
+            output is only reused while every path exists
+        version: Bump to invalidate cached outputs after a code change
+    """
+    name: str
+    func: Callable[..., Any]
+    deps: Tuple[str, ...] = ()
+    params: Dict[str, Any] = field(default_factory=dict)
+    cache: bool = True
+    fingerprint: Optional[Callable[[], Any]] = None
+    lock: Optional[str] = None
+    produces_files: bool = False
+    version: int = 1
+
+
+@dataclass
+class StageRun:
+    """Outcome of one stage in a pipeline run"""
+    stage: str
+    status: str
+    key: str
+    seconds: float = 0.0
+    error: Optional[str] = None
+
+
+@dataclass
+class PipelineReport:
+    """Outcome of a pipeline run"""
+    runs: Dict[str, StageRun]
+    outputs: Dict[str, Any]
+    seconds: float
+
+    @property
+    def ok(self) -> bool:
+        return all(run.status in (STAGE_CACHED, STAGE_RAN) for run in self.runs.values())
+
+    def count(self, status: str) -> int:
+        return sum(run.status == status for run in self.runs.values())
+
+    def summary(self) -> str:
+        return (f"{len(self.runs)} stages in {self.seconds:.1f} s: "
+                f"{self.count(STAGE_RAN)} ran, {self.count(STAGE_CACHED)} cached, "
+                f"{self.count(STAGE_FAILED)} failed, {self.count(STAGE_SKIPPED)} skipped")
+
+
+def _file_paths(output):
+    if isinstance(output, (str, Path)):
+        return [output]
+    if isinstance(output, dict):
+        return [p for value in output.values() for p in _file_paths(value)]
+    if isinstance(output, (list, tuple)):
+        return [p for value in output for p in _file_paths(value)]
+    return []
+
+
+class Pipeline:
+    """
+    Stage graph with a content-addressed output cache
+
+    Args:
+        cache_dir: Directory of the cached stage outputs
+        max_workers: Worker threads (default: 4)
+    """
+
+    def __init__(self, cache_dir=DEFAULT_PIPELINE_DIR, max_workers: Optional[int] = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_workers = max_workers or 4
+        self.stages: Dict[str, Stage] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+
+    def add(self, stage: Stage) -> Stage:
+        """Add a stage (its dependencies must already be in the graph)"""
+        if stage.name in self.stages:
+            raise ValueError(f"Duplicate stage: {stage.name}")
+        missing = [dep for dep in stage.deps if dep not in self.stages]
+        if missing:
+            raise ValueError(f"Stage {stage.name} depends on unknown stages: {missing}")
+        self.stages[stage.name] = stage
+        return stage
+
+    # ------------------------------------------------------------------
+    # Keys and cache
+    # ------------------------------------------------------------------
+
+    def stage_keys(self, names: Optional[Sequence[str]] = None) -> Dict[str, str]:
+        """Content hash of every stage (stages are added in dependency order)"""
+        keys = {}
+        for name in self.closure(names or list(self.stages)):
+            stage = self.stages[name]
+            payload = {
+                'stage': name,
+                'func': f"{stage.func.__module__}:{stage.func.__qualname__}",
+                'version': stage.version,
+                'params': stage.params,
+                'deps': [keys[dep] for dep in stage.deps],
+                'fingerprint': stage.fingerprint() if stage.fingerprint else None,
+            }
+            encoded = json.dumps(payload, default=str, sort_keys=True).encode()
+            keys[name] = hashlib.sha256(encoded).hexdigest()[:16]
+        return keys
+
+    def closure(self, names: Sequence[str]) -> List[str]:
+        """Stages and all their dependencies, in graph order"""
+        wanted = set()
+        pending = list(names)
+        while pending:
+            name = pending.pop()
+            if name not in self.stages:
+                raise ValueError(f"Unknown stage: {name}")
+            if name not in wanted:
+                wanted.add(name)
+                pending.extend(self.stages[name].deps)
+        return [name for name in self.stages if name in wanted]
+
+    def sinks(self) -> List[str]:
+        """Stages no other stage depends on (the default run targets)"""
+        upstream = {dep for stage in self.stages.values() for dep in stage.deps}
+        return [name for name in self.stages if name not in upstream]
+
+    def _cache_path(self, name, key):
+        return self.cache_dir / name.replace(':', '__') / f"{key}.pkl"
+
+    def _load_cached(self, name, key):
+        """(True, output) if a valid cached output exists, else (False, None)"""
+        stage = self.stages[name]
+        path = self._cache_path(name, key)
+        if not stage.cache or not path.exists():
+            return False, None
+        with open(path, 'rb') as f:
+            output = pickle.load(f)
+        if stage.produces_files and not all(Path(p).exists() for p in _file_paths(output)):
+            return False, None
+        return True, output
+
+    def _store(self, name, key, output):
+        path = self._cache_path(name, key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(output, f)
+        tmp_path.replace(path)
+        # One cached version per stage
+        for old in path.parent.glob('*.pkl'):
+            if old != path:
+                old.unlink()
+
+    # ------------------------------------------------------------------
+    # Execution
+    # ------------------------------------------------------------------
+
+    def plan(self, targets: Optional[Sequence[str]] = None, force: bool = False):
+        """
+        Stages to run and cached outputs to reuse for the requested targets
+
+        Returns:
+            tuple: (keys, to_run list in graph order, cached outputs dict)
+        """
+        targets = list(targets or self.sinks())
+        names = self.closure(targets)
+        keys = self.stage_keys(names)
+        cached, needed = {}, set()
+        pending = list(targets)
+
+        # Walk down from the targets; a cached stage cuts the walk
+        while pending:
+            name = pending.pop()
+            if name in needed or name in cached:
+                continue
+            hit, output = (False, None) if force else self._load_cached(name, keys[name])
+            if hit:
+                cached[name] = output
+            else:
+                needed.add(name)
+                pending.extend(self.stages[name].deps)
+
+        return keys, [name for name in names if name in needed], cached
+
+    def run(self, targets: Optional[Sequence[str]] = None, force: bool = False) -> PipelineReport:
+        """
+        Run the stages needed for the targets
+
+        Args:
+            targets: Stage names to bring up to date (default: the final stages)
+            force: Ignore cached outputs
+
+        Returns:
+            PipelineReport: Per-stage status and timings, and the outputs
+        """
+        start = time.perf_counter()
+        keys, to_run, outputs = self.plan(targets, force)
+        runs = {name: StageRun(name, STAGE_CACHED, keys[name]) for name in outputs}
+        for name in outputs:
+            print(f"💾 {name}: cached ({keys[name]})")
+
+        remaining = list(to_run)
+        running = {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while remaining or running:
+                for name in list(remaining):
+                    deps = self.stages[name].deps
+                    if any(runs.get(dep) and runs[dep].status in (STAGE_FAILED, STAGE_SKIPPED)
+                           for dep in deps):
+                        remaining.remove(name)
+                        runs[name] = StageRun(name, STAGE_SKIPPED, keys[name])
+                        print(f"⏭️  {name}: skipped (upstream failure)")
+                    elif all(dep in outputs for dep in deps):
+                        remaining.remove(name)
+                        inputs = {dep: outputs[dep] for dep in deps}
+                        running[executor.submit(self._run_stage, name, keys[name], inputs)] = name
+
+                if not running:
+                    if remaining:
+                        raise RuntimeError(f"Unresolvable stages: {remaining}")
+                    continue
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    run, output = future.result()
+                    runs[name] = run
+                    if run.status == STAGE_RAN:
+                        outputs[name] = output
+
+        report = PipelineReport(runs, outputs, time.perf_counter() - start)
+        print(f"{'✅' if report.ok else '⚠️'} Pipeline: {report.summary()}")
+        return report
+
+    def _run_stage(self, name, key, inputs):
+        stage = self.stages[name]
+        lock = self._locks.setdefault(stage.lock, threading.Lock()) if stage.lock else None
+        print(f"▶️  {name}: running")
+        start = time.perf_counter()
+        try:
+            if lock is not None:
+                with lock, span(f'stage {name}'):
+                    output = stage.func(inputs, **stage.params)
+            else:
+                with span(f'stage {name}'):
+                    output = stage.func(inputs, **stage.params)
+            if stage.cache:
+                self._store(name, key, output)
+        except Exception as e:
+            seconds = time.perf_counter() - start
+            print(f"❌ {name}: {type(e).__name__}: {e}")
+            return StageRun(name, STAGE_FAILED, key, seconds, f"{type(e).__name__}: {e}"), None
+        seconds = time.perf_counter() - start
+        print(f"✅ {name}: {seconds:.2f} s")
+        return StageRun(name, STAGE_RAN, key, seconds), output
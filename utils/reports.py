@@ -0,0 +1,302 @@
+"""
+Report rendering utilities for Saskatchewan Albedo Analysis
+===========================================================
+
+Headless report builder: tables and figures are rendered once into an
+in-memory asset cache, then a single pass over the report blocks streams them
+to every requested output (Markdown, HTML, DOCX).
+
+A report is a list of blocks::
+
+    ('heading', text, level)
+    ('paragraph', text)
+    ('table', asset_name)
+    ('figure', asset_name, caption)
+"""
+
+import io
+import json
+import base64
+import pickle
+import hashlib
+import html
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+import pandas as pd
+
+REPORT_FORMATS = ('markdown', 'html', 'docx')
+FORMAT_SUFFIXES = {'markdown': '.md', 'html': '.html', 'docx': '.docx'}
+
+
+def check_docx():
+    """True if python-docx is available"""
+    try:
+        import docx  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class ReportAssets:
+    """
+    In-memory cache of rendered report assets
+
+    Tables are formatted to strings once; figures are drawn once to PNG bytes.
+    """
+
+    def __init__(self):
+        self.tables = {}
+        self.figures = {}
+
+    def add_table(self, name, df, float_format='{:.4f}'):
+        """Format a DataFrame once (header + string rows)"""
+        def fmt(value):
+            if value is None or (isinstance(value, float) and pd.isna(value)):
+                return ''
+            if isinstance(value, float):
+                return float_format.format(value)
+            return str(value)
+
+        self.tables[name] = {
+            'columns': [str(c) for c in df.columns],
+            'rows': [[fmt(v) for v in row] for row in df.itertuples(index=False)],
+        }
+        return self.tables[name]
+
+    def add_figure(self, name, draw, *args, figsize=(8, 4), dpi=150, **kwargs):
+        """
+        Draw a figure once and keep its PNG bytes
+
+        Args:
+            name (str): Asset name
+            draw (callable): draw(ax, *args, **kwargs) plotting on a matplotlib Axes
+        """
+        fig, ax = plt.subplots(figsize=figsize)
+        try:
+            draw(ax, *args, **kwargs)
+            fig.tight_layout()
+            buffer = io.BytesIO()
+            fig.savefig(buffer, format='png', dpi=dpi)
+        finally:
+            plt.close(fig)
+        self.figures[name] = buffer.getvalue()
+        return self.figures[name]
+
+
+# ----------------------------------------------------------------------
+# Writers
+# ----------------------------------------------------------------------
+
+class MarkdownWriter:
+    """Markdown output; figures are written as PNG files next to the document"""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.asset_dir = self.path.with_name(self.path.stem + '_files')
+        self.file = open(self.path, 'w', encoding='utf-8')
+
+    def heading(self, text, level):
+        self.file.write(f"{'#' * level} {text}\n\n")
+
+    def paragraph(self, text):
+        self.file.write(f"{text}\n\n")
+
+    def table(self, table):
+        columns = table['columns']
+        self.file.write('| ' + ' | '.join(columns) + ' |\n')
+        self.file.write('|' + '---|' * len(columns) + '\n')
+        for row in table['rows']:
+            self.file.write('| ' + ' | '.join(cell.replace('|', '\\|') for cell in row) + ' |\n')
+        self.file.write('\n')
+
+    def figure(self, name, png, caption):
+        self.asset_dir.mkdir(parents=True, exist_ok=True)
+        (self.asset_dir / f"{name}.png").write_bytes(png)
+        self.file.write(f"![{caption}]({self.asset_dir.name}/{name}.png)\n\n*{caption}*\n\n")
+
+    def close(self):
+        self.file.close()
+
+
+class HtmlWriter:
+    """Self-contained HTML output (figures embedded as base64)"""
+
+    def __init__(self, path, title):
+        self.path = Path(path)
+        self.file = open(self.path, 'w', encoding='utf-8')
+        self.file.write(
+            "<!DOCTYPE html>\n<html><head><meta charset='utf-8'>"
+            f"<title>{html.escape(title)}</title>"
+            "<style>body{font-family:sans-serif;max-width:960px;margin:auto}"
+            "table{border-collapse:collapse;margin:1em 0}"
+            "td,th{border:1px solid #ccc;padding:4px 8px;text-align:right}"
+            "th{background:#eef}figcaption{font-style:italic}</style>"
+            "</head><body>\n"
+        )
+
+    def heading(self, text, level):
+        self.file.write(f"<h{level}>{html.escape(text)}</h{level}>\n")
+
+    def paragraph(self, text):
+        self.file.write(f"<p>{html.escape(text)}</p>\n")
+
+    def table(self, table):
+        self.file.write("<table><tr>" + ''.join(f"<th>{html.escape(c)}</th>"
+                                                 for c in table['columns']) + "</tr>\n")
+        for row in table['rows']:
+            self.file.write("<tr>" + ''.join(f"<td>{html.escape(c)}</td>" for c in row)
+                            + "</tr>\n")
+        self.file.write("</table>\n")
+
+    def figure(self, name, png, caption):
+        encoded = base64.b64encode(png).decode('ascii')
+        self.file.write(f"<figure><img alt='{html.escape(name)}' "
+                        f"src='data:image/png;base64,{encoded}' style='max-width:100%'>"
+                        f"<figcaption>{html.escape(caption)}</figcaption></figure>\n")
+
+    def close(self):
+        self.file.write("</body></html>\n")
+        self.file.close()
+
+
+class DocxWriter:
+    """Word output (requires python-docx)"""
+
+    def __init__(self, path, title):
+        from docx import Document
+        from docx.shared import Inches
+        self.path = Path(path)
+        self.width = Inches(6)
+        self.document = Document()
+        self.document.core_properties.title = title
+
+    def heading(self, text, level):
+        self.document.add_heading(text, level=level - 1)
+
+    def paragraph(self, text):
+        self.document.add_paragraph(text)
+
+    def table(self, table):
+        doc_table = self.document.add_table(rows=1, cols=len(table['columns']))
+        doc_table.style = 'Light Grid Accent 1'
+        for cell, column in zip(doc_table.rows[0].cells, table['columns']):
+            cell.text = column
+        for row in table['rows']:
+            for cell, value in zip(doc_table.add_row().cells, row):
+                cell.text = value
+
+    def figure(self, name, png, caption):
+        self.document.add_picture(io.BytesIO(png), width=self.width)
+        self.document.add_paragraph(caption, style='Caption')
+
+    def close(self):
+        self.document.save(self.path)
+
+
+def render_report(title, blocks, assets, output_base, formats=REPORT_FORMATS):
+    """
+    Stream report blocks to every requested format in one pass
+
+    Args:
+        title (str): Document title
+        blocks (list): Report blocks (see module docstring)
+        assets (ReportAssets): Pre-rendered tables and figures
+        output_base (str): Output path without suffix
+        formats (tuple): Any of 'markdown', 'html', 'docx'
+
+    Returns:
+        dict: Output path per format
+    """
+    unknown = [f for f in formats if f not in FORMAT_SUFFIXES]
+    if unknown:
+        raise ValueError(f"Unknown report format: {', '.join(unknown)}")
+
+    output_base = Path(output_base)
+    output_base.parent.mkdir(parents=True, exist_ok=True)
+
+    writers = {}
+    for report_format in formats:
+        path = output_base.with_suffix(FORMAT_SUFFIXES[report_format])
+        if report_format == 'markdown':
+            writers[report_format] = MarkdownWriter(path)
+        elif report_format == 'html':
+            writers[report_format] = HtmlWriter(path, title)
+        elif report_format == 'docx':
+            if not check_docx():
+                print("⚠️ python-docx not installed, DOCX output skipped (pip install python-docx)")
+                continue
+            writers[report_format] = DocxWriter(path, title)
+
+    try:
+        for block in blocks:
+            kind = block[0]
+            for writer in writers.values():
+                if kind == 'heading':
+                    writer.heading(block[1], block[2])
+                elif kind == 'paragraph':
+                    writer.paragraph(block[1])
+                elif kind == 'table':
+                    writer.table(assets.tables[block[1]])
+                elif kind == 'figure':
+                    writer.figure(block[1], assets.figures[block[1]], block[2])
+    finally:
+        for writer in writers.values():
+            writer.close()
+
+    return {report_format: str(writer.path) for report_format, writer in writers.items()}
+
+
+# ----------------------------------------------------------------------
+# Input fingerprint cache
+# ----------------------------------------------------------------------
+
+def fingerprint(*parts):
+    """Stable hash of JSON-serializable report inputs"""
+    payload = json.dumps(parts, default=str, sort_keys=True).encode()
+    return hashlib.sha256(payload).hexdigest()[:16]
+
+
+class ReportCache:
+    """
+    Cache of report inputs and outputs keyed by an input fingerprint
+
+    Query results are pickled per fingerprint; a manifest records which
+    outputs were produced from which fingerprint, so an unchanged re-run
+    returns the existing files without querying or rendering.
+    """
+
+    def __init__(self, cache_dir):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.cache_dir / 'manifest.json'
+
+    def _manifest(self):
+        if self.manifest_path.exists():
+            return json.loads(self.manifest_path.read_text())
+        return {}
+
+    def get_outputs(self, key, formats):
+        """Existing output paths for this fingerprint, or None"""
+        outputs = self._manifest().get(key, {})
+        if all(f in outputs and Path(outputs[f]).exists() for f in formats):
+            return {f: outputs[f] for f in formats}
+        return None
+
+    def put_outputs(self, key, outputs):
+        manifest = self._manifest()
+        manifest.setdefault(key, {}).update(outputs)
+        self.manifest_path.write_text(json.dumps(manifest, indent=2))
+
+    def get_tables(self, key):
+        path = self.cache_dir / f"tables_{key}.pkl"
+        if path.exists():
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+        return None
+
+    def put_tables(self, key, tables):
+        with open(self.cache_dir / f"tables_{key}.pkl", 'wb') as f:
+            pickle.dump(tables, f)
@@ -0,0 +1,493 @@
+"""
+Columnar results store for Saskatchewan Albedo Analysis
+=======================================================
+
+Append-only Parquet tables for analyzer outputs, replacing the nested result
+dicts that are flattened to CSV/Excel/JSON after every run.
+
+Layout under the store root::
+
+    runs/run_id=<id>/part-*.parquet        one row per analysis run
+    <table>/run_id=<id>/part-*.parquet     typed result rows
+    arrays/<run_id>/<name>.npz             large per-series arrays (out of line)
+
+Every result row carries the key columns (run_id, dataset, fraction, variable,
+month, method); month is 0 when the result covers the whole season. Arrays
+such as the series ``data`` or ``bootstrap_slopes`` are saved once as .npz and
+referenced from the row by ``array_ref``. Prior runs can then be queried without
+re-running the analyses or loading every array.
+"""
+
+import os
+import json
+import time
+import uuid
+import threading
+from datetime import datetime
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+KEY_COLUMNS = {
+    'run_id': 'string',
+    'dataset': 'string',
+    'fraction': 'string',
+    'variable': 'string',
+    'month': 'int16',
+    'method': 'string',
+}
+
+TREND_COLUMNS = {
+    **KEY_COLUMNS,
+    'n_obs': 'int64',
+    'trend': 'string',
+    'p_value': 'float64',
+    'tau': 'float64',
+    's': 'float64',
+    'z': 'float64',
+    'slope': 'float64',
+    'slope_per_decade': 'float64',
+    'ci_low_per_decade': 'float64',
+    'ci_high_per_decade': 'float64',
+    'autocorr_lag1': 'float64',
+    'array_ref': 'string',
+}
+
+TABLE_SCHEMAS = {
+    'trends': TREND_COLUMNS,
+}
+
+DEFAULT_STORE_DIR = Path('results') / 'store'
+
+_run_clock = {'last_ns': 0}
+_run_clock_lock = threading.Lock()
+
+
+def check_parquet_engine():
+    """True if pandas can read/write Parquet (pyarrow or fastparquet)"""
+    for module in ('pyarrow', 'fastparquet'):
+        try:
+            __import__(module)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def _new_run_id():
+    """
+    Run id and creation time, strictly increasing within the process
+
+    The id is the creation time to the nanosecond plus a random suffix, so ids
+    also sort by creation time across processes.
+
+    Returns:
+        tuple: (run_id, pd.Timestamp)
+    """
+    with _run_clock_lock:
+        ns = max(time.time_ns(), _run_clock['last_ns'] + 1)
+        _run_clock['last_ns'] = ns
+    seconds, fraction = divmod(ns, 10 ** 9)
+    created = datetime.fromtimestamp(seconds)
+    run_id = f"{created.strftime('%Y%m%dT%H%M%S')}{fraction:09d}-{uuid.uuid4().hex[:6]}"
+    return run_id, pd.Timestamp(created) + pd.Timedelta(fraction, unit='ns')
+
+
+def _typed(df, schema=None):
+    """Apply a column schema; other object columns are stored as strings"""
+    df = df.copy()
+    schema = schema or {}
+    for column, dtype in schema.items():
+        if column not in df.columns:
+            df[column] = pd.Series(pd.NA if dtype == 'string' else np.nan,
+                                   index=df.index)
+        if dtype.startswith('int'):
+            df[column] = pd.to_numeric(df[column], errors='coerce').fillna(0).astype(dtype)
+        elif dtype == 'float64':
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype(dtype)
+        else:
+            df[column] = df[column].astype(dtype)
+    for column in df.columns:
+        if column not in schema and df[column].dtype == object:
+            df[column] = df[column].map(lambda v: None if v is None else str(v)).astype('string')
+    ordered = [c for c in schema if c in df.columns]
+    return df[ordered + [c for c in df.columns if c not in schema]]
+
+
+class ResultsStore:
+    """
+    Append-only Parquet store of analysis results
+
+    Args:
+        root: Store directory
+    """
+
+    def __init__(self, root=None):
+        if not check_parquet_engine():
+            raise ImportError("pyarrow (or fastparquet) is required for the results store: "
+                              "pip install pyarrow")
+        self.root = Path(root or DEFAULT_STORE_DIR)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Runs
+    # ------------------------------------------------------------------
+
+    def new_run(self, label='', **params):
+        """
+        Register a new run
+
+        Args:
+            label (str): Free text (e.g. 'nightly', 'MCD43A3 trends')
+            **params: Run parameters, stored as JSON
+
+        Returns:
+            str: run_id (sortable by creation time)
+        """
+        run_id, created_at = _new_run_id()
+        row = pd.DataFrame([{
+            'run_id': run_id,
+            'created_at': created_at,
+            'label': label,
+            'params': json.dumps(params, default=str, sort_keys=True),
+        }])
+        self._write_part('runs', _typed(row, {'run_id': 'string'}), run_id)
+        return run_id
+
+    def runs(self):
+        """All registered runs, oldest first"""
+        runs = self._read('runs')
+        if not len(runs):
+            return runs
+        return runs.sort_values(['created_at', 'run_id']).reset_index(drop=True)
+
+    def latest_rows(self, rows, by=None):
+        """
+        Keep the rows of the most recently created run
+
+        Runs are ordered by ``runs.created_at``; run ids missing from the runs
+        table (interrupted writes) come before every registered run.
+
+        Args:
+            rows (pd.DataFrame): Rows with a run_id column
+            by (list, optional): Columns (e.g. ['dataset']) giving one latest
+                run per group instead of one overall
+
+        Returns:
+            pd.DataFrame: Subset of rows
+        """
+        if not len(rows):
+            return rows
+        runs = self.runs()
+        order = (pd.Series(np.arange(len(runs)), index=runs['run_id'].astype(str))
+                 if len(runs) else pd.Series(dtype='int64'))
+        rank = rows['run_id'].astype(str).map(order).fillna(-1)
+        latest = rank.groupby([rows[c] for c in by]).transform('max') if by else rank.max()
+        return rows[rank == latest]
+
+    def latest_run_id(self, table=None, **filters):
+        """
+        Most recent run, optionally one that wrote rows matching filters in table
+
+        Returns:
+            str: run_id or None
+        """
+        if table is None:
+            runs = self.runs()
+            return runs['run_id'].iloc[-1] if len(runs) else None
+        rows = self.latest_rows(self.query(table, columns=['run_id'], latest=False, **filters))
+        return rows['run_id'].iloc[0] if len(rows) else None
+
+    # ------------------------------------------------------------------
+    # Tables
+    # ------------------------------------------------------------------
+
+    def write(self, table, rows, run_id, **keys):
+        """
+        Append rows to a table
+
+        Args:
+            table (str): Table name
+            rows (pd.DataFrame or list of dict): Result rows
+            run_id (str): Run the rows belong to
+            **keys: Key values applied to every row (dataset=..., variable=...)
+
+        Returns:
+            int: Rows written
+        """
+        frame = pd.DataFrame(rows)
+        if frame.empty:
+            return 0
+        frame['run_id'] = run_id
+        for key, value in keys.items():
+            frame[key] = value
+        schema = TABLE_SCHEMAS.get(table, KEY_COLUMNS)
+        self._write_part(table, _typed(frame, schema), run_id)
+        return len(frame)
+
+    def query(self, table, columns=None, run_id=None, latest=True, **filters):
+        """
+        Read rows of a table
+
+        Args:
+            table (str): Table name
+            columns (list, optional): Columns to load
+            run_id (str, optional): Restrict to one run
+            latest (bool): Without run_id, keep only the most recently created
+                matching run
+            **filters: Equality filters on columns (e.g. dataset='MOD10A1')
+
+        Returns:
+            pd.DataFrame: Matching rows
+        """
+        conditions = [(name, '=', value) for name, value in filters.items()]
+        if run_id is not None:
+            conditions.append(('run_id', '=', run_id))
+        if columns is not None:
+            columns = list(dict.fromkeys(['run_id', *columns]))
+        rows = self._read(table, columns=columns, filters=conditions or None)
+        if latest and run_id is None:
+            rows = self.latest_rows(rows)
+        return rows.reset_index(drop=True)
+
+    def tables(self):
+        """Names of the tables present in the store"""
+        return sorted(p.name for p in self.root.iterdir()
+                      if p.is_dir() and p.name not in ('arrays', 'runs'))
+
+    def _write_part(self, table, frame, run_id):
+        part_dir = self.root / table / f"run_id={run_id}"
+        part_dir.mkdir(parents=True, exist_ok=True)
+        path = part_dir / f"part-{uuid.uuid4().hex[:12]}.parquet"
+        tmp_path = path.with_suffix('.tmp')
+        # run_id is carried by the partition directory
+        frame.drop(columns='run_id').to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, path)
+
+    def _read(self, table, columns=None, filters=None):
+        table_dir = self.root / table
+        if not table_dir.exists() or not any(table_dir.glob('run_id=*/*.parquet')):
+            return pd.DataFrame()
+        frame = pd.read_parquet(table_dir, columns=columns, filters=filters)
+        if 'run_id' in frame.columns:
+            frame['run_id'] = frame['run_id'].astype('string')
+        return frame
+
+    # ------------------------------------------------------------------
+    # Out-of-line arrays
+    # ------------------------------------------------------------------
+
+    def put_arrays(self, run_id, name, **arrays):
+        """
+        Save arrays outside the tables
+
+        Returns:
+            str: Reference to store in an ``array_ref`` column
+        """
+        array_dir = self.root / 'arrays' / run_id
+        array_dir.mkdir(parents=True, exist_ok=True)
+        np.savez_compressed(array_dir / f"{name}.npz",
+                            **{k: np.asarray(v) for k, v in arrays.items()})
+        return f"{run_id}/{name}"
+
+    def get_arrays(self, ref):
+        """Load arrays saved by put_arrays() as a dict"""
+        with np.load(self.root / 'arrays' / f"{ref}.npz") as archive:
+            return {k: archive[k] for k in archive.files}
+
+
+# ----------------------------------------------------------------------
+# Adapters from analyzer outputs
+# ----------------------------------------------------------------------
+
+def _trend_row(result, fraction, variable, month, method):
+    mk = result.get('mann_kendall', {})
+    sen = result.get('sen_slope', {})
+    ci = sen.get('confidence_interval', {})
+    return {
+        'fraction': fraction,
+        'variable': variable,
+        'month': month,
+        'method': method,
+        'n_obs': result.get('n_obs', 0),
+        'trend': mk.get('trend'),
+        'p_value': mk.get('p_value'),
+        'tau': mk.get('tau'),
+        's': mk.get('s'),
+        'z': mk.get('z'),
+        'slope': sen.get('slope'),
+        'slope_per_decade': sen.get('slope_per_decade'),
+        'ci_low_per_decade': ci.get('low_per_decade'),
+        'ci_high_per_decade': ci.get('high_per_decade'),
+        'autocorr_lag1': result.get('autocorrelation', {}).get('lag1'),
+    }
+
+
+def record_trend_results(store, run_id, dataset, results, release_arrays=False):
+    """
+    Store TrendCalculator.results (basic, monthly, bootstrap, rolling, change points)
+
+    Args:
+        store (ResultsStore): Target store
+        run_id (str): Run id from store.new_run()
+        dataset (str): Dataset name
+        results (dict): TrendCalculator.results
+        release_arrays (bool): Remove the stored arrays ('data',
+            'bootstrap_slopes', ...) from results once saved, for long
+            sessions that no longer need them in memory
+
+    Returns:
+        dict: Rows written per table
+    """
+    trend_rows = []
+    written = {}
+
+    for key, value in results.items():
+        if key.startswith('basic_trends_'):
+            variable = key[len('basic_trends_'):]
+            for fraction, result in value.items():
+                if result.get('error'):
+                    continue
+                row = _trend_row(result, fraction, variable, 0, 'mann_kendall_sen')
+                if 'data' in result:
+                    row['array_ref'] = store.put_arrays(
+                        run_id, f"{dataset}_{fraction}_{variable}_series", **result['data'])
+                trend_rows.append(row)
+
+        elif key.startswith('monthly_trends_'):
+            variable = key[len('monthly_trends_'):]
+            for month, month_result in value.items():
+                for fraction, result in month_result['fractions'].items():
+                    row = _trend_row(result, fraction, variable, month, 'mann_kendall_sen')
+                    if 'data' in result:
+                        row['array_ref'] = store.put_arrays(
+                            run_id, f"{dataset}_{fraction}_{variable}_m{month}_series",
+                            **result['data'])
+                    trend_rows.append(row)
+
+        elif key.startswith('bootstrap_'):
+            variable = key[len('bootstrap_'):]
+            for fraction, result in value.items():
+                if result.get('error'):
+                    continue
+                slope = result['slope_bootstrap']
+                row = {
+                    'fraction': fraction,
+                    'variable': variable,
+                    'month': 0,
+                    'method': 'bootstrap',
+                    'n_obs': result['n_obs'],
+                    'p_value': result['pvalue_bootstrap']['mean'],
+                    'slope_per_decade': slope['median'],
+                    'ci_low_per_decade': slope['ci_95_low'],
+                    'ci_high_per_decade': slope['ci_95_high'],
+                    'array_ref': store.put_arrays(
+                        run_id, f"{dataset}_{fraction}_{variable}_bootstrap",
+                        slopes=result['bootstrap_slopes'],
+                        pvalues=result['bootstrap_pvalues']),
+                }
+                trend_rows.append(row)
+
+        elif key == 'rolling_trends' and len(value):
+            written['rolling_trends'] = store.write('rolling_trends', value, run_id,
+                                                    dataset=dataset, month=0,
+                                                    method='rolling_mann_kendall_sen')
+
+        elif key.startswith('change_points_'):
+            from analysis.change_points import change_point_summary
+            variable = key[len('change_points_'):]
+            table = change_point_summary(value).rename(columns={'Fraction': 'fraction'})
+            written['change_points'] = written.get('change_points', 0) + store.write(
+                'change_points', table, run_id, dataset=dataset, variable=variable,
+                month=0, method='pelt_pettitt')
+
+    if trend_rows:
+        written['trends'] = store.write('trends', trend_rows, run_id, dataset=dataset)
+
+    if release_arrays:
+        release_result_arrays(results)
+    return written
+
+
+def release_result_arrays(results):
+    """Drop per-series arrays from nested result dicts (in place)"""
+    for value in results.values():
+        if not isinstance(value, dict):
+            continue
+        for result in value.values():
+            if not isinstance(result, dict):
+                continue
+            for array_key in ('data', 'bootstrap_slopes', 'bootstrap_pvalues'):
+                result.pop(array_key, None)
+            for nested in result.get('fractions', {}).values():
+                nested.pop('data', None)
+
+
+def record_comparison_results(store, run_id, results):
+    """
+    Store ComparisonAnalyzer.results (one table per result kind)
+
+    Returns:
+        dict: Rows written per table
+    """
+    written = {}
+    for kind in ('correlations', 'differences'):
+        if kind in results:
+            frame = pd.DataFrame(results[kind]).T.rename_axis('fraction').reset_index()
+            written[f'comparison_{kind}'] = store.write(
+                f'comparison_{kind}', frame, run_id,
+                dataset='MCD43A3_vs_MOD10A1', variable='mean', month=0, method=kind)
+
+    if 'trend_comparison' in results:
+        rows = []
+        for fraction, comparison in results['trend_comparison'].items():
+            row = {'fraction': fraction}
+            for part in ('mcd43a3', 'mod10a1', 'agreement'):
+                for name, value in comparison.get(part, {}).items():
+                    row[f"{part}_{name}"] = value
+            rows.append(row)
+        written['comparison_trends'] = store.write(
+            'comparison_trends', rows, run_id,
+            dataset='MCD43A3_vs_MOD10A1', variable='mean', month=0, method='mann_kendall')
+    return written
+
+
+def record_elevation_trends(store, run_id, trends, dataset='MOD10A1', variable='mean'):
+    """
+    Store ElevationAnalyzer.trends (one row per fraction × elevation zone)
+
+    Returns:
+        int: Rows written
+    """
+    frame = pd.DataFrame.from_dict(trends, orient='index').rename_axis('combination')
+    frame = frame.reset_index().rename(columns={'fraction_class': 'fraction'})
+    return store.write('elevation_trends', frame, run_id, dataset=dataset,
+                       variable=variable, month=0, method='annual_mann_kendall_sen')
+
+
+def record_frame(store, run_id, table, frame, dataset, variable='', method='', month=0):
+    """
+    Store a result DataFrame (e.g. PixelCountAnalyzer outputs) with the key columns
+
+    Key columns already in the frame (e.g. 'fraction', 'month') are kept; the
+    arguments only fill the missing ones.
+
+    Returns:
+        int: Rows written
+    """
+    frame = frame.reset_index() if frame.index.name else frame
+    keys = {'dataset': dataset, 'variable': variable, 'method': method, 'month': month}
+    return store.write(table, frame, run_id,
+                       **{k: v for k, v in keys.items() if k not in frame.columns})
+
+
+_store = None
+
+
+def get_results_store(root=None):
+    """Shared ResultsStore instance"""
+    global _store
+    if _store is None or (root is not None and Path(root) != _store.root):
+        _store = ResultsStore(root)
+    return _store
@@ -0,0 +1,301 @@
+"""
+Pente de Sen exacte à mémoire bornée
+====================================
+
+La pente de Sen est la médiane des N ≈ n²/2 pentes par paires ;
+``scipy.stats.theilslopes`` les matérialise toutes (O(n²) en mémoire). Ici
+l'ensemble des pentes reste implicite :
+
+- les points étant triés par temps, chaque point définit la droite
+  z_i(t) = y_i - t·x_i ; deux droites se croisent en t = pente de la paire.
+  Le nombre de pentes ≤ t est donc le nombre d'inversions de l'ordre des
+  z(t), compté par un tri fusion vectorisé en O(n log² n)
+- sélection aléatoire (Matoušek, 1991) : les paires dont la pente tombe dans
+  l'intervalle courant (lo, hi] sont les inversions entre l'ordre des droites
+  en lo et en hi ; on en tire un échantillon uniforme, on resserre
+  l'intervalle autour du rang cherché, puis on énumère les O(n) pentes
+  restantes
+- un rang qui tombe dans un bloc de pentes égales (séries quantifiées) est
+  reconnu directement : count(< t) ≤ rang < count(≤ t) ; l'intervalle ne
+  pouvant pas devenir plus étroit que le bloc, la sélection s'arrête là
+- les bornes de l'intervalle de confiance (Sen 1968, éq. 2.6) sont d'autres
+  rangs du même ensemble, obtenus par la même sélection
+
+La mémoire reste en O(n log n) quel que soit n ; les résultats sont
+identiques à ``scipy.stats.theilslopes`` (méthode 'separate').
+"""
+
+import numpy as np
+from scipy.stats import norm
+
+CANDIDATES_PER_POINT = 16  # Pentes énumérées explicitement : au plus 16·n
+
+
+def _tie_weight(counts):
+    """Σ t(t-1)(2t+5) des groupes de valeurs égales"""
+    counts = counts[counts > 1].astype(float)
+    return float(np.sum(counts * (counts - 1) * (2 * counts + 5)))
+
+
+def _merge_levels(perm):
+    """
+    Niveaux du tri fusion ascendant d'une permutation
+
+    Pour chaque niveau, chaque élément de la moitié droite d'un bloc forme
+    une inversion avec les éléments de la moitié gauche de valeur supérieure,
+    qui occupent une plage contiguë de la liste des éléments gauches triés.
+
+    Yields:
+        tuple: (éléments gauches triés, éléments droits, début de plage, longueur)
+    """
+    n = len(perm)
+    pos = np.arange(n)
+    width = 1
+    while width < n:
+        block = pos // (2 * width)
+        is_left = (pos // width) % 2 == 0
+        order = np.argsort(block * n + perm, kind='stable')
+
+        left_sorted = is_left[order]
+        left_before = np.cumsum(left_sorted) - left_sorted
+        block_end = np.cumsum(np.bincount(block[is_left], minlength=block[-1] + 1))
+        right = ~left_sorted
+        start = left_before[right]
+        length = block_end[block[order][right]] - start
+
+        yield order[left_sorted], order[right], start, length
+        width *= 2
+
+
+def count_inversions(perm):
+    """Nombre de paires a < b avec perm[a] > perm[b] (perm : permutation de 0..n-1)"""
+    return int(sum(length.sum() for _, _, _, length in _merge_levels(perm)))
+
+
+class _InversionSet:
+    """Inversions d'une permutation : comptage, tirage uniforme et énumération"""
+
+    def __init__(self, perm):
+        lefts, rights, starts, lengths = [], [], [], []
+        offset = 0
+        for left, right, start, length in _merge_levels(perm):
+            keep = length > 0
+            lefts.append(left)
+            rights.append(right[keep])
+            starts.append(start[keep] + offset)
+            lengths.append(length[keep])
+            offset += len(left)
+        self.left = np.concatenate(lefts) if lefts else np.empty(0, dtype=int)
+        self.right = np.concatenate(rights) if rights else np.empty(0, dtype=int)
+        self.start = np.concatenate(starts) if starts else np.empty(0, dtype=int)
+        self.length = np.concatenate(lengths) if lengths else np.empty(0, dtype=int)
+        self.cumulative = np.cumsum(self.length)
+        self.total = int(self.cumulative[-1]) if len(self.cumulative) else 0
+
+    def sample(self, size, rng):
+        """Tirage uniforme (avec remise) de paires inversées"""
+        draws = rng.integers(0, self.total, size)
+        entry = np.searchsorted(self.cumulative, draws, side='right')
+        offset = draws - (self.cumulative[entry] - self.length[entry])
+        return self.left[self.start[entry] + offset], self.right[entry]
+
+    def pairs(self):
+        """Toutes les paires inversées"""
+        entry = np.repeat(np.arange(len(self.length)), self.length)
+        offset = np.arange(self.total) - np.repeat(self.cumulative - self.length, self.length)
+        return self.left[self.start[entry] + offset], self.right[entry]
+
+
+class PairwiseSlopes:
+    """
+    Ensemble implicite des pentes (y_j - y_i) / (x_j - x_i), x_i ≠ x_j
+
+    Args:
+        x (array-like): Abscisses (temps)
+        y (array-like): Valeurs
+        seed (int): Graine du tirage aléatoire (le résultat est exact quelle
+            que soit la graine ; seul le temps de calcul varie)
+    """
+
+    def __init__(self, x, y, seed=0):
+        x = np.asarray(x, dtype=float).ravel()
+        y = np.asarray(y, dtype=float).ravel()
+        # Ordre de base : x croissant, y décroissant à x égal
+        base = np.lexsort((-y, x))
+        self.x = x[base]
+        self.y = y[base]
+        self.n = len(x)
+        self.pos = np.arange(self.n)
+
+        # Les paires de même x (droites parallèles) sont toujours comptées
+        # comme inversées ; elles ne forment pas de pente
+        _, x_counts = np.unique(self.x, return_counts=True)
+        self.same_x_pairs = int(np.sum(x_counts * (x_counts - 1) // 2))
+        self.size = self.n * (self.n - 1) // 2 - self.same_x_pairs
+
+        self.max_candidates = max(CANDIDATES_PER_POINT * self.n, 1024)
+        self.rng = np.random.default_rng(seed)
+        self._orders = {}
+        self._counts = {-np.inf: 0, np.inf: self.size}
+        self._counts_lt = {-np.inf: 0, np.inf: self.size}
+
+    # ------------------------------------------------------------------
+    # Ordre des droites et comptage
+    # ------------------------------------------------------------------
+
+    def _order(self, t):
+        """Points triés par z(t) = y - t·x (à égalité : le dernier de l'ordre de base d'abord)"""
+        if t not in self._orders:
+            if t == -np.inf:
+                order = np.lexsort((-self.pos, self.y, self.x))
+            elif t == np.inf:
+                order = np.lexsort((-self.pos, self.y, -self.x))
+            else:
+                order = np.lexsort((-self.pos, self.y - t * self.x))
+            self._orders[t] = order
+        return self._orders[t]
+
+    def _ranks(self, t, order=None):
+        ranks = np.empty(self.n, dtype=np.int64)
+        ranks[self._order(t) if order is None else order] = self.pos
+        return ranks
+
+    def count_le(self, t):
+        """Nombre de pentes ≤ t"""
+        if t not in self._counts:
+            self._counts[t] = count_inversions(self._ranks(t)) - self.same_x_pairs
+        return self._counts[t]
+
+    def count_lt(self, t):
+        """Nombre de pentes < t"""
+        if t not in self._counts_lt:
+            # À égalité de z(t), le point de plus petit x d'abord : les paires
+            # de pente t ne sont pas inversées (celles de même x le restent)
+            order = np.lexsort((-self.pos, self.x, self.y - t * self.x))
+            self._counts_lt[t] = count_inversions(self._ranks(t, order)) - self.same_x_pairs
+        return self._counts_lt[t]
+
+    def _between(self, lo, hi):
+        """Paires dont la pente est dans (lo, hi] : inversions entre les ordres en lo et en hi"""
+        order_lo = self._order(lo)
+        return order_lo, _InversionSet(self._ranks(hi)[order_lo])
+
+    def _slopes(self, i, j):
+        return (self.y[j] - self.y[i]) / (self.x[j] - self.x[i])
+
+    # ------------------------------------------------------------------
+    # Sélection
+    # ------------------------------------------------------------------
+
+    def _bracket(self, rank):
+        """Seuils connus les plus serrés avec count(lo) ≤ rank < count(hi)"""
+        lo = max(t for t, c in self._counts.items() if c <= rank)
+        hi = min(t for t, c in self._counts.items() if c > rank)
+        return lo, hi
+
+    def select(self, rank):
+        """
+        Pente de rang donné (0 = plus petite) dans l'ensemble trié
+
+        Args:
+            rank (int): Rang, 0 ≤ rank < size
+
+        Returns:
+            float: Pente exacte de ce rang
+        """
+        if not 0 <= rank < self.size:
+            raise IndexError(f"Rang {rank} hors de [0, {self.size})")
+
+        if self.size <= self.max_candidates:
+            i, j = np.triu_indices(self.n, k=1)
+            valid = self.x[i] != self.x[j]
+            slopes = self._slopes(i[valid], j[valid])
+            return float(np.partition(slopes, rank)[rank])
+
+        lo, hi = self._bracket(rank)
+        while self.count_le(hi) - self.count_le(lo) > self.max_candidates:
+            # Rang dans le bloc des pentes égales à hi
+            if self.count_lt(hi) <= rank:
+                return float(hi)
+
+            previous = (lo, hi)
+            order_lo, candidates = self._between(lo, hi)
+            size = min(self.n, candidates.total)
+            a, b = candidates.sample(size, self.rng)
+            sample = np.sort(self._slopes(order_lo[a], order_lo[b]))
+
+            # Quantiles de l'échantillon encadrant le rang cherché (± 2 écarts-types)
+            position = (rank - self.count_le(lo) + 0.5) / candidates.total * size
+            margin = 2 * np.sqrt(size)
+            low_index = int(np.floor(position - margin))
+            high_index = int(np.ceil(position + margin))
+            if low_index >= 0 and self.count_le(sample[low_index]) <= rank:
+                lo = sample[low_index]
+            if high_index < size and self.count_le(sample[high_index]) > rank:
+                hi = sample[high_index]
+            lo, hi = self._bracket(rank)
+            if (lo, hi) == previous:
+                break  # Aucun progrès : énumération de l'intervalle
+
+        order_lo, candidates = self._between(lo, hi)
+        a, b = candidates.pairs()
+        slopes = self._slopes(order_lo[a], order_lo[b])
+        offset = rank - self.count_le(lo)
+        return float(np.partition(slopes, offset)[offset])
+
+    def median(self):
+        """Médiane des pentes (moyenne des deux rangs centraux si N est pair)"""
+        mid = self.size // 2
+        if self.size % 2:
+            return self.select(mid)
+        return (self.select(mid - 1) + self.select(mid)) / 2
+
+
+def sen_slope(times, values, confidence=0.95, seed=0):
+    """
+    Pente de Sen, ordonnée à l'origine et intervalle de confiance exacts
+
+    Mêmes résultats que ``scipy.stats.theilslopes(values, times, confidence)``
+    sans matérialiser les n(n-1)/2 pentes par paires.
+
+    Args:
+        times (array-like): Temps (ex. années décimales)
+        values (array-like): Valeurs
+        confidence (float): Niveau de l'intervalle de confiance
+        seed (int): Graine de la sélection aléatoire
+
+    Returns:
+        tuple: (pente, ordonnée à l'origine, borne basse, borne haute)
+
+    Raises:
+        ValueError: Moins de deux points ou tous les temps identiques
+    """
+    times = np.asarray(times, dtype=float).ravel()
+    values = np.asarray(values, dtype=float).ravel()
+    if len(times) != len(values):
+        raise ValueError("times et values doivent avoir la même longueur")
+    if len(times) < 2:
+        raise ValueError("Au moins deux points sont nécessaires")
+
+    slopes = PairwiseSlopes(times, values, seed)
+    nt = slopes.size
+    if nt == 0:
+        raise ValueError("Tous les temps sont identiques")
+
+    slope = slopes.median()
+    intercept = np.median(values) - slope * np.median(times)
+
+    # Sen (1968), équation 2.6 : même indexation que scipy.stats.theilslopes
+    alpha = 1 - confidence
+    z = norm.ppf(min(alpha, 1 - alpha) / 2)
+    n = len(values)
+    sigma_sq = (n * (n - 1) * (2 * n + 5)
+                - _tie_weight(np.unique(times, return_counts=True)[1])
+                - _tie_weight(np.unique(values, return_counts=True)[1])) / 18
+    if sigma_sq < 0 or not np.isfinite(sigma_sq):
+        return slope, intercept, np.nan, np.nan
+
+    sigma = np.sqrt(sigma_sq)
+    upper = min(int(np.round((nt - z * sigma) / 2)), nt - 1)
+    lower = max(int(np.round((nt + z * sigma) / 2)) - 1, 0)
+    return slope, intercept, slopes.select(lower), slopes.select(upper)
@@ -14,6 +14,7 @@ from datetime import datetime
 from config import (FRACTION_CLASSES, CLASS_LABELS, FRACTION_COLORS, PLOT_STYLES,
                      TREND_SYMBOLS, get_significance_marker, OUTPUT_DIR)
 from utils.helpers import print_section_header, format_pvalue, ensure_directory_exists
+from utils.instrumentation import traced
 import os
 import warnings
 
@@ -38,6 +39,7 @@ class ChartGenerator:
         self.fraction_classes = FRACTION_CLASSES
         self.class_labels = CLASS_LABELS
         
+    @traced('figure.trend_overview_graph')
     def create_trend_overview_graph(self, trend_results, variable='mean', save_path=None):
         """
         Crée un graphique d'aperçu des tendances pour toutes les fractions
@@ -116,6 +118,7 @@ class ChartGenerator:
         
         return save_path
     
+    @traced('figure.seasonal_patterns_graph')
     def create_seasonal_patterns_graph(self, variable='mean', save_path=None):
         """
         Crée un graphique des patterns saisonniers
@@ -230,6 +233,7 @@ class ChartGenerator:
         
         return save_path
     
+    @traced('figure.correlation_matrix_graph')
     def create_correlation_matrix_graph(self, variable='mean', save_path=None):
         """
         Crée une matrice de corrélation entre les fractions
@@ -283,6 +287,69 @@ class ChartGenerator:
         
         return save_path
     
+    @traced('figure.rolling_trend_heatmap')
+    def create_rolling_trend_heatmap(self, rolling_results, metric='slope_per_decade',
+                                     variable='mean', save_path=None):
+        """
+        Crée une heatmap (fenêtre × fraction) des tendances glissantes
+
+        Args:
+            rolling_results (pd.DataFrame): Résultats de TrendCalculator.calculate_rolling_trends()
+            metric (str): Métrique affichée ('slope_per_decade', 'tau' ou 'p_value')
+            variable (str): Variable analysée
+            save_path (str, optional): Chemin pour sauvegarder
+
+        Returns:
+            str: Chemin du fichier sauvegardé
+        """
+        from analysis.rolling_trends import rolling_trend_matrix
+
+        print_section_header(f"Heatmap des tendances glissantes - {metric}", level=3)
+
+        if rolling_results is None or len(rolling_results) == 0:
+            print("❌ Aucun résultat de tendances glissantes")
+            return None
+
+        subset = rolling_results[rolling_results['variable'] == variable]
+        widths = sorted(subset['window_years'].unique())
+        if not widths:
+            print(f"❌ Aucune fenêtre pour la variable {variable}")
+            return None
+
+        fig, axes = plt.subplots(1, len(widths), figsize=(6 * len(widths), 8), squeeze=False)
+        fig.suptitle(f'Tendances Glissantes - {metric} - Albédo {variable.title()}',
+                     fontsize=16, fontweight='bold')
+
+        is_pvalue = metric == 'p_value'
+        center = None if is_pvalue else 0
+        cmap = 'viridis_r' if is_pvalue else 'RdBu'
+
+        for ax, width in zip(axes[0], widths):
+            matrix = rolling_trend_matrix(subset, metric, variable, width, self.fraction_classes)
+            p_values = rolling_trend_matrix(subset, 'p_value', variable, width, self.fraction_classes)
+            markers = p_values.apply(lambda col: col.map(get_significance_marker))
+
+            sns.heatmap(matrix.rename(columns=self.class_labels), annot=markers.values, fmt='',
+                       cmap=cmap, center=center, linewidths=0.5, cbar_kws={"shrink": .8},
+                       ax=ax)
+            ax.set_title(f'Fenêtres de {width} ans', fontsize=12, fontweight='bold')
+            ax.set_xlabel('')
+            ax.set_ylabel('Période')
+
+        plt.tight_layout()
+
+        if save_path is None:
+            ensure_directory_exists(OUTPUT_DIR)
+            save_path = os.path.join(OUTPUT_DIR, f'rolling_trends_{metric}_{variable}.png')
+
+        plt.savefig(save_path, dpi=300, bbox_inches='tight')
+        print(f"✅ Heatmap des tendances glissantes sauvegardée: {save_path}")
+
+        plt.close()
+
+        return save_path
+
+    @traced('figure.time_series_graph')
     def create_time_series_graph(self, fraction, variable='mean', save_path=None):
         """
         Crée un graphique détaillé de série temporelle pour une fraction
@@ -362,6 +429,7 @@ class ChartGenerator:
         
         return save_path
     
+    @traced('figure.summary_dashboard')
     def create_summary_dashboard(self, basic_results, variable='mean', save_path=None):
         """
         Crée un dashboard de résumé avec les graphiques principaux